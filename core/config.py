@@ -34,6 +34,10 @@ def _int(name: str, default: int) -> int:
     return int(os.getenv(name, str(default)))
 
 
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
 def _str(name: str, default: str) -> str:
     return os.getenv(name, default)
 
@@ -73,7 +77,29 @@ class Settings:
 
     # === 数据库 ===
     DATABASE_URL: str = _str("DATABASE_URL", "")
+    # 只读副本连接地址（JSON 数组），为空时只读查询也走主库
+    DATABASE_REPLICA_URLS: list = _list("DATABASE_REPLICA_URLS", [])
+    DB_REPLICA_MAX_LAG_SECONDS: float = _float("DB_REPLICA_MAX_LAG_SECONDS", 5.0)
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: int = _int("DB_REPLICA_CHECK_INTERVAL_SECONDS", 10)
+    DB_REPLICA_RETRY_SECONDS: int = _int("DB_REPLICA_RETRY_SECONDS", 30)
     DB_POOL_PRE_PING: bool = _bool("DB_POOL_PRE_PING", True)
+    # 仅对空闲超过该秒数的连接预检；0 表示每次签出都预检
+    DB_POOL_PRE_PING_IDLE_SECONDS: int = _int("DB_POOL_PRE_PING_IDLE_SECONDS", 30)
+    DB_POOL_SIZE: int = _int("DB_POOL_SIZE", 5)
+    DB_POOL_MAX_OVERFLOW: int = _int("DB_POOL_MAX_OVERFLOW", 10)
+    DB_POOL_TIMEOUT: int = _int("DB_POOL_TIMEOUT", 30)
+    # 连接最长存活秒数，-1 表示不回收
+    DB_POOL_RECYCLE: int = _int("DB_POOL_RECYCLE", 1800)
+    # asyncpg 预编译语句缓存大小；经 PgBouncer 事务模式时设为 0
+    DB_STATEMENT_CACHE_SIZE: int = _int("DB_STATEMENT_CACHE_SIZE", 100)
+    # 同一请求内的 DAO 调用共享一个 Session / 事务，响应前统一提交
+    DB_REQUEST_UNIT_OF_WORK: bool = _bool("DB_REQUEST_UNIT_OF_WORK", True)
+    # 单条语句耗时达到该毫秒数时写入系统日志（SLOW_STATEMENT），0 表示关闭
+    DB_SLOW_STATEMENT_MS: int = _int("DB_SLOW_STATEMENT_MS", 200)
+    # 每请求语句数预算，超出时写入系统日志（STATEMENT_BUDGET_EXCEEDED），0 表示关闭
+    DB_REQUEST_STATEMENT_BUDGET: int = _int("DB_REQUEST_STATEMENT_BUDGET", 50)
+    # 开发环境下同一请求内同一语句形状执行超过 N 次时打印 N+1 警告，0 表示关闭
+    DB_N_PLUS_ONE_THRESHOLD: int = _int("DB_N_PLUS_ONE_THRESHOLD", 10)
 
     # === Redis ===
     REDIS_URL: str = _str("REDIS_URL", "")
@@ -90,6 +116,14 @@ class Settings:
     # === 用户认证缓存 ===
     AUTH_USER_CACHE_TTL_SECONDS: int = _int("AUTH_USER_CACHE_TTL_SECONDS", 60)
 
+    # === 管理端批量操作 ===
+    ADMIN_BATCH_STATUS_MAX_USERS: int = _int("ADMIN_BATCH_STATUS_MAX_USERS", 500)
+    QUESTION_IMPORT_MAX_ROWS: int = _int("QUESTION_IMPORT_MAX_ROWS", 5000)
+    QUESTION_IMPORT_MAX_BYTES: int = _int("QUESTION_IMPORT_MAX_BYTES", 10 * 1024 * 1024)
+
+    # === 条件 GET（ETag 版本戳）===
+    ETAG_VERSION_TTL_SECONDS: int = _int("ETAG_VERSION_TTL_SECONDS", 3600)
+
     # === 防火墙 ===
     FW_ENABLED: bool = _bool("FW_ENABLED", True)
     FW_MAX_REQUESTS_PER_SECOND: int = _int("FW_MAX_REQUESTS_PER_SECOND", 20)
@@ -109,11 +143,32 @@ class Settings:
     REG_CORRECT_THRESHOLD: int = _int("REG_CORRECT_THRESHOLD", 3)
     REG_QUESTION_COUNT: int = _int("REG_QUESTION_COUNT", 5)
     REG_SHEET_TTL_SECONDS: int = _int("REG_SHEET_TTL_SECONDS", 86400)
+    REG_QUESTION_POOL_TTL_SECONDS: int = _int("REG_QUESTION_POOL_TTL_SECONDS", 300)
     ACCOUNT_DELETION_GRACE_DAYS: int = _int("ACCOUNT_DELETION_GRACE_DAYS", 30)
     MAX_PWD_CHG_ATTEMPTS_PER_DAY: int = _int("MAX_PWD_CHG_ATTEMPTS_PER_DAY", 10)
 
+    # === 日志采样与存储 ===
+    LOG_SAMPLING_ENABLED: bool = _bool("LOG_SAMPLING_ENABLED", True)
+    LOG_SAMPLE_LOGIN_SUCCESS_RATIO: float = _float("LOG_SAMPLE_LOGIN_SUCCESS_RATIO", 1.0)
+    LOG_SAMPLE_FIREWALL_RATIO: float = _float("LOG_SAMPLE_FIREWALL_RATIO", 1.0)
+    LOG_RATE_CAP_PER_SECOND: int = _int("LOG_RATE_CAP_PER_SECOND", 50)
+    LOG_INTERN_STRINGS: bool = _bool("LOG_INTERN_STRINGS", True)
+    LOG_INTERN_CACHE_SIZE: int = _int("LOG_INTERN_CACHE_SIZE", 10000)
+    LOG_ARCHIVE_ENABLED: bool = _bool("LOG_ARCHIVE_ENABLED", True)
+    LOG_ARCHIVE_AFTER_DAYS: int = _int("LOG_ARCHIVE_AFTER_DAYS", 90)
+    LOG_ARCHIVE_DIR: str = _str("LOG_ARCHIVE_DIR", "archive/logs")
+    LOG_ARCHIVE_BATCH_SIZE: int = _int("LOG_ARCHIVE_BATCH_SIZE", 5000)
+    LOG_STREAM_ENABLED: bool = _bool("LOG_STREAM_ENABLED", True)
+    LOG_STREAM_QUEUE_SIZE: int = _int("LOG_STREAM_QUEUE_SIZE", 1000)
+    LOG_STREAM_HEARTBEAT_SECONDS: int = _int("LOG_STREAM_HEARTBEAT_SECONDS", 15)
+
     # === 定时任务 ===
     CRON_CLEANUP_INTERVAL_HOURS: int = _int("CRON_CLEANUP_INTERVAL_HOURS", 1)
+    CRON_ROLLUP_INTERVAL_MINUTES: int = _int("CRON_ROLLUP_INTERVAL_MINUTES", 5)
+    CRON_ROLLUP_SETTLE_SECONDS: int = _int("CRON_ROLLUP_SETTLE_SECONDS", 60)
+    CRON_ROLLUP_BATCH_SIZE: int = _int("CRON_ROLLUP_BATCH_SIZE", 50000)
+    CRON_ARCHIVE_INTERVAL_HOURS: int = _int("CRON_ARCHIVE_INTERVAL_HOURS", 24)
+    CRON_USER_STATS_INTERVAL_HOURS: int = _int("CRON_USER_STATS_INTERVAL_HOURS", 6)
 
     # === 安全清理 ===
     REFRESH_TOKEN_CLEANUP_DAYS: int = _int("REFRESH_TOKEN_CLEANUP_DAYS", 7)
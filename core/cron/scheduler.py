@@ -10,7 +10,10 @@ scheduler = AsyncIOScheduler()
 
 def start() -> None:
     """启动调度器并注册所有定时任务。"""
+    from core.cron.tasks.archive_logs import archive_old_logs
     from core.cron.tasks.cleanup_users import cleanup_expired_deletions
+    from core.cron.tasks.reconcile_user_stats import reconcile_user_stats
+    from core.cron.tasks.rollup_logs import rollup_hourly_stats
 
     scheduler.add_job(
         cleanup_expired_deletions,
@@ -19,6 +22,28 @@ def start() -> None:
         id="cleanup_expired_deletions",
         replace_existing=True,
     )
+    scheduler.add_job(
+        rollup_hourly_stats,
+        trigger="interval",
+        minutes=settings.CRON_ROLLUP_INTERVAL_MINUTES,
+        id="rollup_hourly_stats",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        reconcile_user_stats,
+        trigger="interval",
+        hours=settings.CRON_USER_STATS_INTERVAL_HOURS,
+        id="reconcile_user_stats",
+        replace_existing=True,
+    )
+    if settings.LOG_ARCHIVE_ENABLED:
+        scheduler.add_job(
+            archive_old_logs,
+            trigger="interval",
+            hours=settings.CRON_ARCHIVE_INTERVAL_HOURS,
+            id="archive_old_logs",
+            replace_existing=True,
+        )
 
     scheduler.start()
     CustomLog("SUCCESS", "[Cron] 定时任务调度器已启动")
@@ -0,0 +1,32 @@
+"""日志冷归档任务 — 按 CRON_ARCHIVE_INTERVAL_HOURS 周期执行。"""
+
+from datetime import datetime, timedelta
+
+from core.config import settings
+from core.database.archive.log_archive import archive_expired_logs
+from core.helper.CustomLog.index import CustomLog
+
+
+async def archive_old_logs() -> None:
+    """将早于 LOG_ARCHIVE_AFTER_DAYS 天的 system_logs / personal_logs / illegal_requests
+    移入 LOG_ARCHIVE_DIR 下的压缩归档文件。
+
+    多个 worker 同时触发时由归档目录下的文件锁保证只有一个执行。
+    """
+    cutoff = datetime.now() - timedelta(days=settings.LOG_ARCHIVE_AFTER_DAYS)
+    try:
+        archived = await archive_expired_logs(
+            settings.LOG_ARCHIVE_DIR,
+            cutoff,
+            batch_size=settings.LOG_ARCHIVE_BATCH_SIZE,
+        )
+    except Exception as exc:
+        CustomLog("ERROR", f"[Cron] 日志归档失败: {exc}")
+        return
+
+    if archived is None:
+        CustomLog("WARNING", "[Cron] 日志归档正在其他进程中执行，本轮跳过")
+        return
+    if any(archived.values()):
+        summary = " ".join(f"{k}={v}" for k, v in archived.items())
+        CustomLog("SUCCESS", f"[Cron] 日志归档完成: {summary}")
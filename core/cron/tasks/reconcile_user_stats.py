@@ -0,0 +1,21 @@
+"""用户统计计数校正任务 — 按 CRON_USER_STATS_INTERVAL_HOURS 周期执行。"""
+
+from core.database.dao.users import UsersDAO
+from core.helper.CustomLog.index import CustomLog
+
+
+async def reconcile_user_stats() -> None:
+    """按 users 表实际分布重建 user_stats 计数表。
+
+    计数由触发器在同一事务中维护，正常情况下不会偏差；
+    TRUNCATE、禁用触发器后的批量导入等绕过触发器的操作由本任务校正。
+    """
+    try:
+        drift = await UsersDAO.reconcile_stats()
+    except Exception as exc:
+        CustomLog("ERROR", f"[Cron] 用户统计校正失败: {exc}")
+        return
+
+    if drift:
+        summary = " ".join(f"{dim}:{value or '-'}={delta:+d}" for (dim, value), delta in sorted(drift.items()))
+        CustomLog("WARNING", f"[Cron] 用户统计计数存在偏差，已校正: {summary}")
@@ -0,0 +1,25 @@
+"""日志 / 防火墙小时级汇总任务 — 按 CRON_ROLLUP_INTERVAL_MINUTES 周期执行。"""
+
+from core.config import settings
+from core.database.dao.log_rollups import LogRollupsDAO
+from core.helper.CustomLog.index import CustomLog
+
+
+async def rollup_hourly_stats() -> None:
+    """将 system_logs / personal_logs / illegal_requests 的新增行累加进小时汇总表。
+
+    每张源表按高水位（rollup_watermarks.last_id）增量推进；
+    最近 CRON_ROLLUP_SETTLE_SECONDS 秒内写入的行留到下一轮，避免遗漏未提交的事务。
+    """
+    try:
+        advanced = await LogRollupsDAO.advance(
+            settle_seconds=settings.CRON_ROLLUP_SETTLE_SECONDS,
+            batch_size=settings.CRON_ROLLUP_BATCH_SIZE,
+        )
+    except Exception as exc:
+        CustomLog("ERROR", f"[Cron] 日志小时汇总失败: {exc}")
+        return
+
+    if any(advanced.values()):
+        summary = " ".join(f"{k}=+{v}" for k, v in advanced.items())
+        CustomLog("SUCCESS", f"[Cron] 日志小时汇总完成: {summary}")
@@ -0,0 +1,307 @@
+"""日志冷归档 — 将过期日志移出热表，写入本地按日期分区的 JSONL.gz 文件。
+
+目录结构::
+
+    <LOG_ARCHIVE_DIR>/
+        manifest.json                                  # 所有归档文件的索引
+        system_logs/2024-01-01/part-<时间戳>-<随机>.jsonl.gz
+        personal_logs/...
+        illegal_requests/...
+
+归档流程（每批一个事务）：
+``DELETE ... RETURNING`` 取出一批过期行 → 还原字典化字符串 → 按日期写文件并登记 manifest → 提交。
+任一步失败则回滚事务并删除本批已写文件，保证"至少一份"：行要么仍在热表，要么已在归档中。
+
+查询通过 :func:`query_archive` 完成，过滤条件与 ``SystemLogsDAO.search`` 相同。
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from sqlalchemy import delete, select
+
+from core.database.connection.pgsql import get_session
+from core.database.dao.illegal_requests import IllegalRequest
+from core.database.dao.log_strings import RESOLVED_COLUMNS, LogString
+from core.database.dao.personal_logs import PersonalLog
+from core.database.dao.system_logs import SystemLog
+from core.helper.CustomLog.filters import match_log_row
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows 开发环境无 fcntl，退化为不加锁
+    fcntl = None  # type: ignore[assignment]
+
+_MANIFEST = "manifest.json"
+_LOCK_FILE = ".archive.lock"
+
+
+@dataclass(frozen=True)
+class ArchiveTable:
+    """一张可归档的源表。"""
+
+    model: Any
+    time_field: str
+    # 过滤参数名 → 本表列名（列名一致时无需声明）
+    field_map: dict[str, str] = field(default_factory=dict)
+
+
+ARCHIVE_TABLES: dict[str, ArchiveTable] = {
+    "system_logs": ArchiveTable(SystemLog, "created_at"),
+    "personal_logs": ArchiveTable(PersonalLog, "created_at"),
+    "illegal_requests": ArchiveTable(
+        IllegalRequest,
+        "happened_at",
+        {"event_type": "type", "client_ip": "ip", "keyword": "path"},
+    ),
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+# ---------------------------------------------------------------------------
+# manifest 与文件
+# ---------------------------------------------------------------------------
+
+
+def load_manifest(root: str | os.PathLike) -> dict[str, Any]:
+    """读取 manifest，不存在时返回空索引。"""
+    path = Path(root) / _MANIFEST
+    if not path.exists():
+        return {"version": 1, "files": []}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(root: Path, manifest: dict[str, Any]) -> None:
+    """原子写入 manifest（先写临时文件再 rename）。"""
+    tmp = root / f"{_MANIFEST}.tmp"
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, root / _MANIFEST)
+
+
+@contextmanager
+def _archive_lock(root: Path) -> Iterator[bool]:
+    """进程间互斥：多个 worker 同时触发归档时只有一个真正执行。"""
+    root.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield True
+        return
+    with (root / _LOCK_FILE).open("w") as fd:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _write_partitions(
+    root: Path,
+    table: str,
+    rows: list[dict[str, Any]],
+    time_field: str,
+) -> list[dict[str, Any]]:
+    """按日期分区写入一批行，返回对应的 manifest 条目。"""
+    by_day: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        happened = row.get(time_field)
+        day = happened.date().isoformat() if isinstance(happened, datetime) else "unknown"
+        by_day.setdefault(day, []).append(row)
+
+    archived_at = datetime.now()
+    entries: list[dict[str, Any]] = []
+    for day, day_rows in sorted(by_day.items()):
+        rel = Path(table) / day / f"part-{archived_at:%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+        target = root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            for row in day_rows:
+                f.write(json.dumps(row, ensure_ascii=False, default=_json_default))
+                f.write("\n")
+        os.replace(tmp, target)
+
+        times = [r[time_field] for r in day_rows if isinstance(r.get(time_field), datetime)]
+        ids = [r["id"] for r in day_rows]
+        entries.append({
+            "table": table,
+            "date": day,
+            "path": rel.as_posix(),
+            "rows": len(day_rows),
+            "min_id": min(ids),
+            "max_id": max(ids),
+            "min_time": min(times).isoformat() if times else None,
+            "max_time": max(times).isoformat() if times else None,
+            "archived_at": archived_at.isoformat(),
+        })
+    return entries
+
+
+def _register(root: Path, entries: list[dict[str, Any]]) -> None:
+    manifest = load_manifest(root)
+    manifest["files"].extend(entries)
+    _save_manifest(root, manifest)
+
+
+def _unregister(root: Path, entries: list[dict[str, Any]]) -> None:
+    """回滚：删除本批文件并从 manifest 中移除。"""
+    paths = {e["path"] for e in entries}
+    for rel in paths:
+        try:
+            (root / rel).unlink()
+        except FileNotFoundError:
+            pass
+    manifest = load_manifest(root)
+    manifest["files"] = [e for e in manifest["files"] if e["path"] not in paths]
+    _save_manifest(root, manifest)
+
+
+# ---------------------------------------------------------------------------
+# 归档
+# ---------------------------------------------------------------------------
+
+
+async def _resolve_strings(session, table: str, rows: list[dict[str, Any]]) -> None:
+    """将字典化的 *_id 列还原为文本，使归档文件自包含。"""
+    kinds = RESOLVED_COLUMNS.get(table, ())
+    if not kinds:
+        return
+    ids = {row[f"{k}_id"] for row in rows for k in kinds if row.get(f"{k}_id") is not None}
+    values: dict[int, str] = {}
+    if ids:
+        result = await session.execute(select(LogString.id, LogString.value).where(LogString.id.in_(ids)))
+        values = {r.id: r.value for r in result}
+    for row in rows:
+        for kind in kinds:
+            string_id = row.pop(f"{kind}_id", None)
+            if row.get(kind) is None and string_id is not None:
+                row[kind] = values.get(string_id)
+
+
+async def _archive_batch(root: Path, table: str, cutoff: datetime, batch_size: int) -> int:
+    """归档一批过期行，返回行数（0 表示没有更多过期行）。"""
+    spec = ARCHIVE_TABLES[table]
+    source = spec.model.__table__
+    time_col = source.c[spec.time_field]
+    expired_ids = (
+        select(source.c.id)
+        .where(time_col < cutoff)
+        .order_by(source.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+    entries: list[dict[str, Any]] = []
+    try:
+        async with get_session() as session:
+            result = await session.execute(
+                delete(source).where(source.c.id.in_(expired_ids)).returning(*source.c)
+            )
+            rows = [dict(r) for r in result.mappings()]
+            if not rows:
+                return 0
+            await _resolve_strings(session, table, rows)
+            entries = await asyncio.to_thread(_write_partitions, root, table, rows, spec.time_field)
+            await asyncio.to_thread(_register, root, entries)
+        return len(rows)
+    except Exception:
+        if entries:
+            await asyncio.to_thread(_unregister, root, entries)
+        raise
+
+
+async def archive_expired_logs(
+    root: str | os.PathLike,
+    cutoff: datetime,
+    *,
+    batch_size: int = 5000,
+    tables: tuple[str, ...] = tuple(ARCHIVE_TABLES),
+) -> dict[str, int] | None:
+    """归档所有早于 cutoff 的行，返回每张表的归档行数。
+
+    另一个进程正在归档时直接返回 None。
+    """
+    root_path = Path(root)
+    with _archive_lock(root_path) as acquired:
+        if not acquired:
+            return None
+        archived: dict[str, int] = {}
+        for table in tables:
+            total = 0
+            while True:
+                count = await _archive_batch(root_path, table, cutoff, batch_size)
+                total += count
+                if count < batch_size:
+                    break
+            archived[table] = total
+        return archived
+
+
+# ---------------------------------------------------------------------------
+# 查询
+# ---------------------------------------------------------------------------
+
+
+def _iter_rows(root: Path, entries: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    for entry in entries:
+        path = root / entry["path"]
+        if not path.exists():
+            continue
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def query_archive(
+    root: str | os.PathLike,
+    table: str,
+    *,
+    limit: int = 100,
+    offset: int = 0,
+    **filters: Any,
+) -> tuple[list[dict[str, Any]], int]:
+    """查询归档文件，返回记录列表与总数（按时间倒序，与 search 一致）。
+
+    过滤参数同 ``SystemLogsDAO.search``（个人日志另支持 user_uuids / target_type / target_id）；
+    start_time / end_time 会先按 manifest 中的日期分区裁剪，再逐行过滤。
+    """
+    if table not in ARCHIVE_TABLES:
+        raise ValueError(f"不支持的归档表: {table}")
+    spec = ARCHIVE_TABLES[table]
+    root_path = Path(root)
+
+    start_time = filters.get("start_time")
+    end_time = filters.get("end_time")
+    entries = [
+        e for e in load_manifest(root_path)["files"]
+        if e["table"] == table
+        and not (start_time and e.get("max_time") and datetime.fromisoformat(e["max_time"]) < start_time)
+        and not (end_time and e.get("min_time") and datetime.fromisoformat(e["min_time"]) > end_time)
+    ]
+
+    matched = [
+        row for row in _iter_rows(root_path, entries)
+        if match_log_row(row, filters, time_field=spec.time_field, field_map=spec.field_map)
+    ]
+    matched.sort(key=lambda r: r.get(spec.time_field) or "", reverse=True)
+    return matched[offset:offset + limit], len(matched)
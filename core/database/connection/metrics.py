@@ -0,0 +1,201 @@
+"""连接池指标：每请求签出次数、连接池占用、获取连接耗时分布、超时与预检次数。
+
+连接池的 ``checkout`` 事件在 SQLAlchemy 的 greenlet 中同步触发，
+greenlet 继承调用方的 contextvars，因此可以用 ContextVar 把计数归属到当前请求。
+获取耗时与超时由 :class:`core.database.connection.pool.InstrumentedAsyncQueuePool` 上报。
+
+典型用法::
+
+    with track_request_checkouts() as counter:
+        ...  # 处理请求
+    counter.checkouts  # 本请求的签出次数
+"""
+
+import asyncio
+import contextvars
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+__all__ = [
+    "RequestCheckouts",
+    "install_pool_listeners",
+    "track_request_checkouts",
+    "record_pool_wait",
+    "record_pool_timeout",
+    "record_pre_ping",
+    "record_pre_ping_failure",
+    "snapshot",
+    "reset",
+]
+
+# 直方图分桶上界（每请求签出次数），最后一档为 "> 最大值"
+_HISTOGRAM_BUCKETS = (0, 1, 2, 3, 5, 8, 13)
+
+# 获取连接耗时直方图分桶上界（毫秒）
+_WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class RequestCheckouts:
+    """单个请求的签出计数器（可变对象，供 greenlet 内累加）。"""
+
+    __slots__ = ("checkouts", "owner")
+
+    def __init__(self):
+        self.checkouts = 0
+        # 后台任务（如 CustomLog 落库）会复制 contextvars，只统计请求任务自身的签出
+        self.owner = _current_task()
+
+
+_current_request: contextvars.ContextVar[RequestCheckouts | None] = contextvars.ContextVar(
+    "db_request_checkouts", default=None
+)
+
+_lock = threading.Lock()
+_stats = {
+    "checkouts_total": 0,
+    "requests_total": 0,
+    "request_checkouts_total": 0,
+    "histogram": {},
+    "wait_histogram": {},
+    "wait_seconds_total": 0.0,
+    "waits_total": 0,
+    "timeouts_total": 0,
+    "pre_pings_total": 0,
+    "pre_ping_failures_total": 0,
+}
+
+# 已注册的 Engine（名称 → sync Engine），快照时读取其当前连接池的占用情况
+_engines: dict = {}
+
+
+def _current_task() -> asyncio.Task | None:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+def _bucket_label(value: float, buckets: tuple[int, ...] = _HISTOGRAM_BUCKETS) -> str:
+    for bound in buckets:
+        if value <= bound:
+            return f"<={bound}"
+    return f">{buckets[-1]}"
+
+
+def _ordered(histogram: dict[str, int], buckets: tuple[int, ...]) -> dict[str, int]:
+    labels = [*(f"<={b}" for b in buckets), f">{buckets[-1]}"]
+    return {label: histogram[label] for label in labels if label in histogram}
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    with _lock:
+        _stats["checkouts_total"] += 1
+    counter = _current_request.get()
+    if counter is not None and counter.owner is _current_task():
+        counter.checkouts += 1
+
+
+def install_pool_listeners(engine, name: str = "primary") -> None:
+    """在 Engine 的连接池上注册 checkout 监听（AsyncEngine 取其 sync_engine），并登记到快照。"""
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "checkout", _on_checkout):
+        event.listen(target, "checkout", _on_checkout)
+    _engines[name] = target
+
+
+def record_pool_wait(seconds: float) -> None:
+    """记录一次获取连接的耗时（排队等待 + 新建连接）。"""
+    label = _bucket_label(seconds * 1000, _WAIT_BUCKETS_MS)
+    with _lock:
+        _stats["waits_total"] += 1
+        _stats["wait_seconds_total"] += seconds
+        _stats["wait_histogram"][label] = _stats["wait_histogram"].get(label, 0) + 1
+
+
+def record_pool_timeout() -> None:
+    with _lock:
+        _stats["timeouts_total"] += 1
+
+
+def record_pre_ping() -> None:
+    with _lock:
+        _stats["pre_pings_total"] += 1
+
+
+def record_pre_ping_failure() -> None:
+    with _lock:
+        _stats["pre_ping_failures_total"] += 1
+
+
+def _pool_gauges() -> dict[str, dict]:
+    gauges = {}
+    for name, engine in list(_engines.items()):
+        pool = engine.pool
+        if not hasattr(pool, "checkedout"):
+            continue
+        gauges[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        }
+    return gauges
+
+
+@contextmanager
+def track_request_checkouts():
+    """统计块内（同一上下文）发生的连接签出次数，退出时计入请求直方图。"""
+    counter = RequestCheckouts()
+    token = _current_request.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_request.reset(token)
+        label = _bucket_label(counter.checkouts)
+        with _lock:
+            _stats["requests_total"] += 1
+            _stats["request_checkouts_total"] += counter.checkouts
+            _stats["histogram"][label] = _stats["histogram"].get(label, 0) + 1
+
+
+def snapshot() -> dict:
+    """返回当前进程的连接池指标快照。"""
+    pools = _pool_gauges()
+    with _lock:
+        requests = _stats["requests_total"]
+        waits = _stats["waits_total"]
+        return {
+            "checkouts_total": _stats["checkouts_total"],
+            "requests_total": requests,
+            "request_checkouts_total": _stats["request_checkouts_total"],
+            "checkouts_per_request_avg": (
+                round(_stats["request_checkouts_total"] / requests, 3) if requests else 0.0
+            ),
+            "checkouts_per_request_histogram": _ordered(_stats["histogram"], _HISTOGRAM_BUCKETS),
+            "pools": pools,
+            "pool_waits_total": waits,
+            "pool_wait_ms_avg": round(_stats["wait_seconds_total"] / waits * 1000, 3) if waits else 0.0,
+            "pool_wait_ms_histogram": _ordered(_stats["wait_histogram"], _WAIT_BUCKETS_MS),
+            "pool_timeouts_total": _stats["timeouts_total"],
+            "pre_pings_total": _stats["pre_pings_total"],
+            "pre_ping_failures_total": _stats["pre_ping_failures_total"],
+        }
+
+
+def reset() -> None:
+    """清零统计（测试与基准使用）。"""
+    with _lock:
+        _stats.update(
+            checkouts_total=0,
+            requests_total=0,
+            request_checkouts_total=0,
+            histogram={},
+            wait_histogram={},
+            wait_seconds_total=0.0,
+            waits_total=0,
+            timeouts_total=0,
+            pre_pings_total=0,
+            pre_ping_failures_total=0,
+        )
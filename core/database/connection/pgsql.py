@@ -6,10 +6,22 @@
 
     async with get_session() as session:
         session.add(obj)
+
+请求级工作单元（unit of work）：在 :func:`unit_of_work` 内，同一任务中的所有
+``get_session()`` 共享同一个 Session / 连接 / 事务，整个请求结束时统一提交或回滚。
+需要捕获数据库错误后继续执行的调用方以 :func:`savepoint` 包裹，只回滚该块的修改。
+
+只读查询可使用 ``get_session(readonly=True)``，在配置了 ``DATABASE_REPLICA_URLS`` 时
+路由到只读副本（见 :mod:`core.database.connection.replicas`），否则与普通 session 相同。
 """
 
+import asyncio
+import contextvars
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -19,7 +31,7 @@ from sqlalchemy.orm import DeclarativeBase
 
 from core.config import settings
 
-__all__ = ["Base", "get_session", "dispose_engine"]
+__all__ = ["Base", "get_session", "unit_of_work", "savepoint", "call_after_commit", "dispose_engine"]
 
 # ------------------------------------------------------------------
 # 声明式基类（所有 ORM 模型均应继承此类）
@@ -36,6 +48,30 @@ class Base(DeclarativeBase):
 
 _engine = None
 _session_factory = None
+_replica_router = None
+_replica_session_factories: dict = {}
+
+
+def _async_url(url: str) -> str:
+    """统一使用 asyncpg 异步驱动。"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def _create_engine(url: str, name: str):
+    """按连接池配置创建 Engine，并注册指标、语句埋点与空闲预检监听。"""
+    from core.database.connection.metrics import install_pool_listeners
+    from core.database.connection.pool import engine_options, install_idle_pre_ping
+    from core.database.connection.statements import install_statement_listeners
+
+    engine = create_async_engine(_async_url(url), **engine_options())
+    install_pool_listeners(engine, name)
+    install_statement_listeners(engine)
+    install_idle_pre_ping(engine)
+    return engine
 
 
 def _get_engine():
@@ -44,12 +80,7 @@ def _get_engine():
         url = settings.DATABASE_URL
         if not url:
             raise EnvironmentError("环境变量 DATABASE_URL 未设置")
-        # 使用 asyncpg 异步驱动
-        if url.startswith("postgresql://"):
-            url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
-        elif url.startswith("postgresql+psycopg2://"):
-            url = url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
-        _engine = create_async_engine(url, pool_pre_ping=settings.DB_POOL_PRE_PING)
+        _engine = _create_engine(url, "primary")
     return _engine
 
 
@@ -65,24 +96,194 @@ def _get_session_factory():
     return _session_factory
 
 
+def _get_replica_router():
+    """未配置 DATABASE_REPLICA_URLS 时返回 None。"""
+    global _replica_router
+    if _replica_router is None and settings.DATABASE_REPLICA_URLS:
+        from core.database.connection.replicas import ReplicaRouter
+
+        _replica_router = ReplicaRouter(
+            settings.DATABASE_REPLICA_URLS,
+            _create_engine,
+            max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+            check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+            retry_interval=settings.DB_REPLICA_RETRY_SECONDS,
+        )
+    return _replica_router
+
+
+def _replica_session_factory(replica):
+    factory = _replica_session_factories.get(replica.name)
+    if factory is None:
+        factory = async_sessionmaker(
+            bind=replica.engine,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        _replica_session_factories[replica.name] = factory
+    return factory
+
+
+def replica_status() -> list[dict]:
+    """各只读副本的可用状态与最近一次探测到的复制延迟。"""
+    router = _get_replica_router()
+    return router.status() if router is not None else []
+
+
 async def dispose_engine() -> None:
     """释放引擎，关闭连接池中的所有连接。在应用停止时调用。"""
-    global _engine, _session_factory
+    global _engine, _session_factory, _replica_router
     if _engine is not None:
         await _engine.dispose()
         _engine = None
         _session_factory = None
+    if _replica_router is not None:
+        await _replica_router.dispose()
+        _replica_router = None
+        _replica_session_factories.clear()
+
+
+# ------------------------------------------------------------------
+# 请求级工作单元
+# ------------------------------------------------------------------
+
+
+@dataclass
+class _UnitOfWork:
+    session: AsyncSession
+    # 只有创建工作单元的任务可以复用它；CustomLog 等后台任务会继承 contextvar，
+    # 但运行在其他任务中，必须使用独立 Session，避免并发使用同一连接
+    owner: asyncio.Task | None
+
+
+_unit_of_work_var: contextvars.ContextVar[_UnitOfWork | None] = contextvars.ContextVar(
+    "db_unit_of_work", default=None
+)
+
+
+def _active_unit_of_work() -> _UnitOfWork | None:
+    uow = _unit_of_work_var.get()
+    if uow is None:
+        return None
+    try:
+        current = asyncio.current_task()
+    except RuntimeError:
+        return None
+    return uow if uow.owner is current else None
+
+
+def _commits_on(exc: BaseException) -> bool:
+    """业务异常（HTTPException 4xx）不回滚已完成的写入，与逐次提交时的语义一致。"""
+    status_code = getattr(exc, "status_code", None)
+    return isinstance(status_code, int) and status_code < 500
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncSession:
+    """开启请求级工作单元：块内所有 ``get_session()`` 共享一个事务。
+
+    正常结束或以 4xx HTTPException 结束时提交；其他异常回滚。
+    可重入：已处于工作单元中时直接复用外层 Session。
+    """
+    current = _active_unit_of_work()
+    if current is not None:
+        yield current.session
+        return
+
+    session: AsyncSession = _get_session_factory()()
+    token = _unit_of_work_var.set(_UnitOfWork(session, asyncio.current_task()))
+    try:
+        yield session
+        await session.commit()
+    except BaseException as exc:
+        if _commits_on(exc):
+            await session.commit()
+        else:
+            await session.rollback()
+        raise
+    finally:
+        _unit_of_work_var.reset(token)
+        await session.close()
+
+
+@asynccontextmanager
+async def savepoint():
+    """在工作单元内以 SAVEPOINT 包裹本块：块内异常只回滚本块的修改，外层事务仍可继续提交。
+
+    仅用于会捕获数据库错误并继续处理的调用（如唯一约束冲突转 409）；
+    其他 ``get_session()`` 直接复用工作单元的事务，不额外付出 SAVEPOINT / RELEASE 往返。
+    不在工作单元中时各次 ``get_session()`` 本就独立提交，此处不做任何事。
+    """
+    uow = _active_unit_of_work()
+    if uow is None:
+        yield
+        return
+    async with uow.session.begin_nested():
+        yield
+
+
+def call_after_commit(callback) -> None:
+    """在当前工作单元提交后调用 ``callback()``（回滚则不调用）；不在工作单元中时立即调用。
+
+    用于写入后通知其他进程（如递增缓存版本号），避免对方在提交前重新加载到旧数据。
+    """
+    uow = _active_unit_of_work()
+    if uow is None:
+        callback()
+        return
+    event.listen(uow.session.sync_session, "after_commit", lambda _session: callback(), once=True)
+
+
+def _is_connection_error(exc: BaseException) -> bool:
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return True
+    return isinstance(exc, (OperationalError, InterfaceError, OSError))
 
 
 @asynccontextmanager
-async def get_session() -> AsyncSession:
+async def _replica_session(router, replica) -> AsyncSession:
+    """只读副本 session：不提交，退出时关闭（连接错误会使该副本暂停使用）。"""
+    session: AsyncSession = _replica_session_factory(replica)()
+    try:
+        yield session
+    except Exception as exc:
+        if _is_connection_error(exc):
+            router.mark_down(replica, str(exc))
+        raise
+    finally:
+        await session.close()
+
+
+@asynccontextmanager
+async def get_session(readonly: bool = False) -> AsyncSession:
     """异步上下文管理器，自动提交或回滚，并在退出时关闭 session。
 
+    处于 :func:`unit_of_work` 中时复用请求级 Session，由工作单元统一提交
+    （块内异常不会单独回滚本块，需要时见 :func:`savepoint`）。
+
+    ``readonly=True`` 时优先使用只读副本（轮询、跳过不健康或延迟过大的副本，
+    无可用副本时回退主库）；工作单元已在主库开启事务时仍复用其 Session，保证读到本请求的写入。
+
     示例::
 
         async with get_session() as session:
             session.add(some_object)
     """
+    uow = _active_unit_of_work()
+    if readonly and (uow is None or not uow.session.in_transaction()):
+        router = _get_replica_router()
+        replica = await router.pick() if router is not None else None
+        if replica is not None:
+            async with _replica_session(router, replica) as session:
+                yield session
+            return
+
+    if uow is not None:
+        # 工作单元内：直接复用请求事务，需要局部回滚时由调用方使用 savepoint()
+        yield uow.session
+        return
+
     factory = _get_session_factory()
     session: AsyncSession = factory()
     try:
@@ -0,0 +1,88 @@
+"""PostgreSQL 连接池：配置、获取耗时统计与按空闲时长触发的预检（pre-ping）。
+
+SQLAlchemy 自带的 ``pool_pre_ping`` 会在每次签出时发送一次 ping，多一个往返；
+这里改为只对空闲超过 ``DB_POOL_PRE_PING_IDLE_SECONDS`` 的连接预检，
+刚归还的热连接直接复用。阈值为 0 时退回 SQLAlchemy 原生的每次预检。
+"""
+
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.config import settings
+from core.database.connection import metrics
+
+# ConnectionPoolEntry.info 中记录最近一次归还时间（time.monotonic()）的键
+_CHECKIN_AT = "tinder_checked_in_at"
+
+
+class _InstrumentedPoolMixin:
+    """统计获取连接的耗时（含排队等待与新建连接）与超时次数。"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.record_pool_timeout()
+            raise
+        finally:
+            metrics.record_pool_wait(time.perf_counter() - start)
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """带统计的 AsyncAdaptedQueuePool（create_async_engine 的默认连接池）。"""
+
+
+def engine_options() -> dict[str, Any]:
+    """根据 Settings 生成 create_async_engine 的连接池参数。"""
+    idle_ping = settings.DB_POOL_PRE_PING and settings.DB_POOL_PRE_PING_IDLE_SECONDS > 0
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        # 按空闲时长预检时关闭原生的每次预检，由 install_idle_pre_ping 接管
+        "pool_pre_ping": settings.DB_POOL_PRE_PING and not idle_ping,
+        "connect_args": {
+            # asyncpg 连接级预编译语句缓存 + SQLAlchemy 适配层缓存；经 PgBouncer（事务模式）时应设为 0
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    }
+
+
+def _mark_checkin(dbapi_connection, connection_record) -> None:
+    if dbapi_connection is not None:
+        connection_record.info[_CHECKIN_AT] = time.monotonic()
+
+
+def _idle_pre_ping(idle_seconds: float, dialect):
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        checked_in_at = connection_record.info.get(_CHECKIN_AT)
+        # 新建的连接无需预检
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        metrics.record_pre_ping()
+        try:
+            alive = dialect.do_ping(dbapi_connection)
+        except Exception:
+            alive = False
+        if not alive:
+            metrics.record_pre_ping_failure()
+            # 连接池捕获后作废该连接并重新签出
+            raise exc.DisconnectionError("空闲连接预检失败")
+
+    return on_checkout
+
+
+def install_idle_pre_ping(engine) -> None:
+    """注册按空闲时长触发的预检（仅在 DB_POOL_PRE_PING 开启且阈值 > 0 时生效）。"""
+    if not (settings.DB_POOL_PRE_PING and settings.DB_POOL_PRE_PING_IDLE_SECONDS > 0):
+        return
+    target = getattr(engine, "sync_engine", engine)
+    event.listen(target, "checkin", _mark_checkin)
+    event.listen(target, "checkout", _idle_pre_ping(settings.DB_POOL_PRE_PING_IDLE_SECONDS, target.dialect))
@@ -0,0 +1,125 @@
+"""只读副本路由：在 ``DATABASE_REPLICA_URLS`` 之间轮询，按健康状态与复制延迟选择副本。
+
+- 每个副本每 ``DB_REPLICA_CHECK_INTERVAL_SECONDS`` 秒最多探测一次复制延迟；
+- 探测失败（连接不上）的副本在 ``DB_REPLICA_RETRY_SECONDS`` 秒内不再使用；
+- 延迟超过 ``DB_REPLICA_MAX_LAG_SECONDS`` 的副本暂不使用，直到下一次探测恢复；
+- 没有可用副本时由调用方回退到主库。
+
+探测在选择副本的请求中内联执行，同一副本的并发请求只会有一个去探测，其余沿用上一次的结果。
+"""
+
+import time
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import text
+
+from core.helper.CustomLog.index import CustomLog
+
+# 主库（非 recovery 状态）或 WAL 已全部回放时视为无延迟，
+# 避免主库空闲时 pg_last_xact_replay_timestamp() 过旧造成误判
+_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+async def probe_replication_lag(engine) -> float:
+    """返回副本的复制延迟（秒）。"""
+    async with engine.connect() as conn:
+        return float(await conn.scalar(_LAG_SQL) or 0)
+
+
+class Replica:
+    """单个只读副本：延迟创建的 Engine + 健康状态。"""
+
+    def __init__(self, name: str, url: str, engine_factory: Callable[[str, str], Any]):
+        self.name = name
+        self.url = url
+        self._engine_factory = engine_factory
+        self._engine = None
+        self.available = True
+        self.lag_seconds: float | None = None
+        self.next_check = 0.0
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = self._engine_factory(self.url, self.name)
+        return self._engine
+
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+
+class ReplicaRouter:
+    """轮询选择可用副本。"""
+
+    def __init__(
+        self,
+        urls: list[str],
+        engine_factory: Callable[[str, str], Any],
+        *,
+        max_lag_seconds: float,
+        check_interval: float,
+        retry_interval: float,
+        probe: Callable[[Any], Awaitable[float]] = probe_replication_lag,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.replicas = [Replica(f"replica-{i}", url, engine_factory) for i, url in enumerate(urls)]
+        self._max_lag = max_lag_seconds
+        self._check_interval = check_interval
+        self._retry_interval = retry_interval
+        self._probe = probe
+        self._clock = clock
+        self._cursor = 0
+
+    async def pick(self) -> Replica | None:
+        """返回下一个可用副本；全部不可用时返回 None。"""
+        count = len(self.replicas)
+        for _ in range(count):
+            replica = self.replicas[self._cursor % count]
+            self._cursor += 1
+            if self._clock() >= replica.next_check:
+                await self._check(replica)
+            if replica.available:
+                return replica
+        return None
+
+    async def _check(self, replica: Replica) -> None:
+        # 先推迟下一次探测时间，避免并发请求重复探测
+        replica.next_check = self._clock() + self._check_interval
+        try:
+            lag = await self._probe(replica.engine)
+        except Exception as exc:
+            self.mark_down(replica, f"探测失败: {exc}")
+            return
+        replica.lag_seconds = lag
+        healthy = lag <= self._max_lag
+        if healthy != replica.available:
+            level, state = ("SUCCESS", "恢复可用") if healthy else ("WARNING", "复制延迟过大，暂停使用")
+            CustomLog(level, f"[DB] 只读副本 {replica.name} {state}（延迟 {lag:.1f}s）")
+        replica.available = healthy
+
+    def mark_down(self, replica: Replica, reason: str) -> None:
+        """将副本标记为不可用，``retry_interval`` 秒后再探测。"""
+        if replica.available:
+            CustomLog("WARNING", f"[DB] 只读副本 {replica.name} 不可用，回退主库: {reason}")
+        replica.available = False
+        replica.next_check = self._clock() + self._retry_interval
+
+    def status(self) -> list[dict[str, Any]]:
+        return [
+            {"name": r.name, "available": r.available, "lag_seconds": r.lag_seconds}
+            for r in self.replicas
+        ]
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
@@ -0,0 +1,243 @@
+"""SQL 语句埋点：单条语句耗时、每请求语句数、慢语句日志与 N+1 检测。
+
+在 Engine 的 ``before_cursor_execute`` / ``after_cursor_execute`` 事件中计时。
+事件与连接池事件一样在 SQLAlchemy 的 greenlet 中同步触发，
+greenlet 继承调用方的 contextvars，因此可以把语句归属到当前请求与 ``LogContext.trace_id``。
+
+- 超过 ``DB_SLOW_STATEMENT_MS`` 的语句经 CustomLog 写入系统日志（``event_type=SLOW_STATEMENT``）；
+- 请求结束时语句数超过 ``DB_REQUEST_STATEMENT_BUDGET`` 记一条 ``STATEMENT_BUDGET_EXCEEDED``；
+- 开发环境下同一请求内同一语句形状执行超过 ``DB_N_PLUS_ONE_THRESHOLD`` 次时打印一次 N+1 警告。
+
+典型用法::
+
+    with track_request_statements() as counter:
+        ...  # 处理请求
+    counter.statements  # 本请求执行的语句数
+"""
+
+import contextvars
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from core.config import settings
+from core.database.connection.metrics import _bucket_label, _current_task, _ordered
+from core.helper.CustomLog.index import CustomLog, get_log_context
+
+__all__ = [
+    "RequestStatements",
+    "install_statement_listeners",
+    "track_request_statements",
+    "statement_shape",
+    "snapshot",
+    "reset",
+]
+
+# 语句耗时直方图分桶上界（毫秒）
+_LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# 每请求语句数直方图分桶上界
+_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# 日志与快照中保留的 SQL 最大长度
+_SQL_PREVIEW_CHARS = 500
+
+# 连续的绑定参数（IN 列表展开、多行 VALUES）折叠为一个，使其形状与参数个数无关
+_PARAM_RUN = re.compile(r"(?:\$\d+|%\(\w+\)s|\?)(?:\s*,\s*(?:\$\d+|%\(\w+\)s|\?))*")
+_VALUES_RUN = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+_STARTED_AT = "_tinder_statement_started_at"
+
+
+class RequestStatements:
+    """单个请求的语句计数器（可变对象，供 greenlet 内累加）。"""
+
+    __slots__ = ("statements", "elapsed", "shapes", "warned", "owner")
+
+    def __init__(self):
+        self.statements = 0
+        self.elapsed = 0.0
+        self.shapes: dict[str, int] = {}
+        self.warned: set[str] = set()
+        # 后台任务（如 CustomLog 落库）会复制 contextvars，只统计请求任务自身的语句
+        self.owner = _current_task()
+
+
+_current_request: contextvars.ContextVar[RequestStatements | None] = contextvars.ContextVar(
+    "db_request_statements", default=None
+)
+
+# 慢语句日志的落库任务复制了该标记，其自身的语句不再触发慢语句日志，避免循环
+_in_statement_log: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "db_in_statement_log", default=False
+)
+
+_lock = threading.Lock()
+_stats = {
+    "statements_total": 0,
+    "statement_seconds_total": 0.0,
+    "latency_histogram": {},
+    "slow_total": 0,
+    "requests_total": 0,
+    "request_statements_total": 0,
+    "request_histogram": {},
+    "budget_exceeded_total": 0,
+    "n_plus_one_total": 0,
+}
+_recent_slow: deque = deque(maxlen=20)
+
+
+def _preview(statement: str) -> str:
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    return sql if len(sql) <= _SQL_PREVIEW_CHARS else sql[:_SQL_PREVIEW_CHARS] + "..."
+
+
+def statement_shape(statement: str) -> str:
+    """返回语句形状：折叠空白与连续的绑定参数，只有参数个数不同的语句形状相同。"""
+    shape = _PARAM_RUN.sub("?", _WHITESPACE.sub(" ", statement).strip())
+    return _VALUES_RUN.sub(r"\1", shape)
+
+
+def _log(level: str, content: str, **kwargs) -> None:
+    token = _in_statement_log.set(True)
+    try:
+        CustomLog(level, content, log_type="db", **kwargs)
+    finally:
+        _in_statement_log.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        setattr(context, _STARTED_AT, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, _STARTED_AT, None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+    elapsed_ms = elapsed * 1000
+    trace_id = get_log_context().trace_id
+
+    with _lock:
+        _stats["statements_total"] += 1
+        _stats["statement_seconds_total"] += elapsed
+        label = _bucket_label(elapsed_ms, _LATENCY_BUCKETS_MS)
+        _stats["latency_histogram"][label] = _stats["latency_histogram"].get(label, 0) + 1
+
+    counter = _current_request.get()
+    if counter is not None and counter.owner is _current_task():
+        counter.statements += 1
+        counter.elapsed += elapsed
+        threshold = settings.DB_N_PLUS_ONE_THRESHOLD
+        if threshold > 0 and settings.APP_ENV == "development":
+            shape = statement_shape(statement)
+            seen = counter.shapes[shape] = counter.shapes.get(shape, 0) + 1
+            if seen > threshold and shape not in counter.warned:
+                counter.warned.add(shape)
+                with _lock:
+                    _stats["n_plus_one_total"] += 1
+                _log(
+                    "WARNING",
+                    f"[DB] 疑似 N+1：同一语句在本请求中已执行 {seen} 次: {_preview(shape)}",
+                    trace_id=trace_id,
+                )
+
+    slow_ms = settings.DB_SLOW_STATEMENT_MS
+    if slow_ms > 0 and elapsed_ms >= slow_ms and not _in_statement_log.get():
+        sql = _preview(statement)
+        with _lock:
+            _stats["slow_total"] += 1
+            _recent_slow.append({"sql": sql, "ms": round(elapsed_ms, 3), "trace_id": trace_id})
+        _log(
+            "WARNING",
+            f"[DB] 慢语句 {elapsed_ms:.1f}ms: {sql}",
+            sid=True,
+            sidp="system",
+            event_type="SLOW_STATEMENT",
+            trace_id=trace_id,
+            metric_value=f"{elapsed_ms:.3f}",
+            extra_data={"sql": sql, "executemany": bool(executemany)},
+        )
+
+
+def install_statement_listeners(engine) -> None:
+    """在 Engine 上注册语句计时监听（AsyncEngine 取其 sync_engine）。"""
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_request_statements():
+    """统计块内（同一上下文）执行的语句，退出时计入请求直方图并检查语句预算。"""
+    counter = RequestStatements()
+    token = _current_request.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_request.reset(token)
+        budget = settings.DB_REQUEST_STATEMENT_BUDGET
+        exceeded = budget > 0 and counter.statements > budget
+        label = _bucket_label(counter.statements, _COUNT_BUCKETS)
+        with _lock:
+            _stats["requests_total"] += 1
+            _stats["request_statements_total"] += counter.statements
+            _stats["request_histogram"][label] = _stats["request_histogram"].get(label, 0) + 1
+            if exceeded:
+                _stats["budget_exceeded_total"] += 1
+        if exceeded:
+            _log(
+                "WARNING",
+                f"[DB] 请求执行了 {counter.statements} 条语句，超出预算 {budget}"
+                f"（累计 {counter.elapsed * 1000:.1f}ms）",
+                sid=True,
+                sidp="system",
+                event_type="STATEMENT_BUDGET_EXCEEDED",
+                metric_value=str(counter.statements),
+            )
+
+
+def snapshot() -> dict:
+    """返回当前进程的语句指标快照。"""
+    with _lock:
+        statements = _stats["statements_total"]
+        requests = _stats["requests_total"]
+        return {
+            "statements_total": statements,
+            "statement_ms_avg": (
+                round(_stats["statement_seconds_total"] / statements * 1000, 3) if statements else 0.0
+            ),
+            "statement_ms_histogram": _ordered(_stats["latency_histogram"], _LATENCY_BUCKETS_MS),
+            "slow_statements_total": _stats["slow_total"],
+            "recent_slow_statements": list(_recent_slow),
+            "statements_per_request_avg": (
+                round(_stats["request_statements_total"] / requests, 3) if requests else 0.0
+            ),
+            "statements_per_request_histogram": _ordered(_stats["request_histogram"], _COUNT_BUCKETS),
+            "statement_budget_exceeded_total": _stats["budget_exceeded_total"],
+            "n_plus_one_warnings_total": _stats["n_plus_one_total"],
+        }
+
+
+def reset() -> None:
+    """清零统计（测试与基准使用）。"""
+    with _lock:
+        _stats.update(
+            statements_total=0,
+            statement_seconds_total=0.0,
+            latency_histogram={},
+            slow_total=0,
+            requests_total=0,
+            request_statements_total=0,
+            request_histogram={},
+            budget_exceeded_total=0,
+            n_plus_one_total=0,
+        )
+        _recent_slow.clear()
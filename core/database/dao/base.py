@@ -1,9 +1,355 @@
-from typing import Any, ClassVar, Type
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Mapping
+from contextlib import asynccontextmanager
+from operator import attrgetter
+from typing import Any, Callable, ClassVar, Iterable, Iterator, Type
 
-from sqlalchemy import Text, select
+from sqlalchemy import Select, Text, column, delete, func, insert, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database.connection.pgsql import Base, get_session
 
+# asyncpg 单条语句的绑定参数上限
+_MAX_BIND_PARAMS = 32767
+
+
+def _tuple_getter(attrs: tuple[str, ...]) -> Callable[[Any], tuple]:
+    getter = attrgetter(*attrs)
+    return getter if len(attrs) > 1 else (lambda obj: (getter(obj),))
+
+
+class Record(Mapping):
+    """由 :attr:`RowConverter.record_type` 生成的轻量行记录的基类。
+
+    值存放在 ``__slots__`` 中（实例没有 ``__dict__``），以列名为键提供只读 Mapping 接口
+    （``record["uuid"]`` / ``record.get(...)`` / ``in`` / ``dict(record)``），可直接替代 DAO 返回的字典；
+    也可按属性名访问（``record.class_``）。作为 FastAPI 响应返回前先 :meth:`to_dict`。
+    """
+
+    __slots__ = ()
+
+    #: 列名（Mapping 的键，顺序与 RowConverter.names 一致）
+    _names: ClassVar[tuple[str, ...]] = ()
+    #: 列名 → 属性名（slot 名）
+    _attr_of: ClassVar[dict[str, str]] = {}
+    #: 列名元组的摘要，写入 :meth:`dumps` 的结果，列增减或换序后旧的序列化结果不再被接受
+    _schema: ClassVar[str] = ""
+    _getter: ClassVar[Callable[[Any], tuple]]
+
+    def __getitem__(self, key: str) -> Any:
+        attr = self._attr_of.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self._attr_of.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._attr_of
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self._names, self.astuple()))
+        return f"{type(self).__name__}({fields})"
+
+    def astuple(self) -> tuple:
+        return self._getter(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为以列名为键的普通字典（与 :meth:`RowConverter.from_row` 的结果相同）。"""
+        return dict(zip(self._names, self._getter(self)))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Record":
+        """由字典构造，键可为列名或属性名，缺少的列为 None，多余的键被忽略。"""
+        return cls(*(
+            data[name] if name in data else data.get(attr)
+            for name, attr in cls._attr_of.items()
+        ))
+
+    def dumps(self) -> str:
+        """紧凑序列化：``[列摘要, 按列顺序的值...]`` 的 JSON 数组（不重复键名）。
+
+        datetime 等非 JSON 类型转为字符串；列摘要供 :meth:`loads` 校验列是否一致。
+        """
+        return json.dumps(
+            (self._schema, *self._getter(self)), ensure_ascii=False, default=str, separators=(",", ":")
+        )
+
+    @classmethod
+    def loads(cls, raw: str | bytes) -> "Record":
+        """:meth:`dumps` 的逆操作；兼容以 JSON 对象存储的旧格式。
+
+        数组的列摘要与当前列不一致时（投影在两次部署之间增减或调整了列）抛出 ValueError，
+        避免按位置把值解码到错误的列上。
+        """
+        data = json.loads(raw)
+        if isinstance(data, dict):
+            return cls.from_dict(data)
+        if not data or data[0] != cls._schema:
+            raise ValueError(f"{cls.__name__}: serialized columns do not match")
+        return cls(*data[1:])
+
+
+def _columns_digest(names: tuple[str, ...]) -> str:
+    return hashlib.md5(",".join(names).encode("utf-8")).hexdigest()[:8]
+
+
+def _build_record_type(name: str, names: tuple[str, ...], attrs: tuple[str, ...]) -> type[Record]:
+    # 与 dataclasses 相同，生成逐个赋值的 __init__，构造时不经过循环与 setattr
+    params = ", ".join(f"{attr}=None" for attr in attrs)
+    body = "".join(f"\n    self.{attr} = {attr}" for attr in attrs) or "\n    pass"
+    namespace: dict[str, Any] = {}
+    exec(f"def __init__(self, {params}):{body}", namespace)
+    return type(name, (Record,), {
+        "__slots__": attrs,
+        "__init__": namespace["__init__"],
+        "_names": names,
+        "_attr_of": dict(zip(names, attrs)),
+        "_schema": _columns_digest(names),
+        "_getter": staticmethod(_tuple_getter(attrs)),
+    })
+
+
+class RowConverter:
+    """按模型预先计算的行 → 字典转换器，每个模型（及列投影）只构建一次（见 :func:`row_converter`）。
+
+    列顺序、列名 / 属性名映射、需要强制转字符串的 TEXT 列都在构建时确定，
+    转换单行时不再反射 mapper。:meth:`from_row` 直接消费 Core ``Row``
+    （由 :meth:`select` 或 ``RETURNING *columns`` 产生），跳过 ORM 实例化与 identity map。
+
+    传入 ``columns``（列名或属性名）时只包含这些列，顺序仍与模型定义一致；
+    未知列名抛出 TypeError。
+    """
+
+    __slots__ = (
+        "model", "columns", "names", "attr_to_col", "col_to_attr",
+        "_text_names", "_text_attrs", "_getter", "_record_type",
+    )
+
+    def __init__(self, model: Type[Base], columns: Iterable[str] | None = None):
+        self.model = model
+        props = list(model.__mapper__.column_attrs)
+        if columns is not None:
+            wanted = set(columns)
+            known = {p.key for p in props} | {p.columns[0].name for p in props}
+            unknown = sorted(wanted - known)
+            if unknown:
+                raise TypeError(f"{model.__name__} has no column(s): {', '.join(unknown)}")
+            props = [p for p in props if p.key in wanted or p.columns[0].name in wanted]
+        self.columns = tuple(p.columns[0] for p in props)
+        self.names = tuple(c.name for c in self.columns)
+        attrs = tuple(p.key for p in props)
+        self.attr_to_col = dict(zip(attrs, self.names))
+        self.col_to_attr = dict(zip(self.names, attrs))
+        self._text_names = tuple(c.name for c in self.columns if isinstance(c.type, Text))
+        self._text_attrs = tuple(self.col_to_attr[name] for name in self._text_names)
+        self._getter = _tuple_getter(attrs)
+        self._record_type: type[Record] | None = None
+
+    def select(self) -> Select:
+        """``SELECT`` 转换器包含的列（顺序与 :meth:`from_row` 一致），可继续追加列 / 条件。"""
+        return select(*self.columns)
+
+    def _finish(self, data: dict[str, Any]) -> dict[str, Any]:
+        # TEXT 列中意外存储的非字符串值（如 JSON 对象）转为字符串，避免前端出现 [object Object]
+        for name in self._text_names:
+            value = data[name]
+            if value is not None and not isinstance(value, str):
+                data[name] = str(value)
+        return data
+
+    def from_row(self, row) -> dict[str, Any]:
+        """转换一行 Core 结果；行中多出的列（如 JOIN 的附加列）被忽略。"""
+        return self._finish(dict(zip(self.names, row)))
+
+    def from_rows(self, rows: Iterable) -> list[dict[str, Any]]:
+        names, finish = self.names, self._finish
+        return [finish(dict(zip(names, row))) for row in rows]
+
+    def from_object(self, obj) -> dict[str, Any]:
+        """转换一个 ORM 实例（用于已经持有 ORM 对象的场景）。"""
+        return self._finish(dict(zip(self.names, self._getter(obj))))
+
+    # ------------------------------------------------------------------
+    # 轻量记录
+    # ------------------------------------------------------------------
+
+    @property
+    def record_type(self) -> type[Record]:
+        """本转换器对应的 :class:`Record` 子类（slot 为各列的属性名），首次访问时生成。"""
+        if self._record_type is None:
+            self._record_type = _build_record_type(
+                f"{self.model.__name__}Record", self.names, tuple(self.col_to_attr.values())
+            )
+        return self._record_type
+
+    def _finish_record(self, record: Record) -> Record:
+        for attr in self._text_attrs:
+            value = getattr(record, attr)
+            if value is not None and not isinstance(value, str):
+                setattr(record, attr, str(value))
+        return record
+
+    def record(self, row) -> Record:
+        """与 :meth:`from_row` 相同，但返回 :attr:`record_type` 实例而非字典。"""
+        width = len(self.names)
+        values = row if len(row) == width else tuple(row)[:width]
+        return self._finish_record(self.record_type(*values))
+
+    def records(self, rows: Iterable) -> list[Record]:
+        record = self.record
+        return [record(row) for row in rows]
+
+
+_CONVERTERS: dict[tuple[type, tuple[str, ...] | None], RowConverter] = {}
+
+
+def row_converter(model: Type[Base], columns: Iterable[str] | None = None) -> RowConverter:
+    """返回模型（或其列投影）的转换器，首次使用时构建并缓存。"""
+    key = (model, None if columns is None else tuple(columns))
+    converter = _CONVERTERS.get(key)
+    if converter is None:
+        converter = _CONVERTERS[key] = RowConverter(model, key[1])
+    return converter
+
+
+# ----------------------------------------------------------------------
+# 键集分页
+# ----------------------------------------------------------------------
+
+class Page(list):
+    """一页查询结果：即普通 list，另附翻页游标。
+
+    ``next_cursor`` / ``prev_cursor`` 为不透明字符串（见 :func:`encode_cursor`），
+    没有下一页 / 上一页时为 None。``total`` 为全部匹配行数，仅在请求时（``with_total=True``）填充。
+    """
+
+    __slots__ = ("next_cursor", "prev_cursor", "total")
+
+    def __init__(
+        self,
+        items: Iterable = (),
+        next_cursor: str | None = None,
+        prev_cursor: str | None = None,
+        total: int | None = None,
+    ):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+
+def encode_cursor(direction: str, key: int) -> str:
+    """生成游标：``direction`` 为 ``"a"``（该键之后）或 ``"b"``（该键之前）。"""
+    return base64.urlsafe_b64encode(f"{direction}:{key}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int | None, int | None]:
+    """解析游标，返回 ``(after_id, before_id)``；格式不合法时抛出 ValueError。"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        direction, _, key = raw.partition(":")
+        key_value = int(key)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"invalid cursor: {cursor!r}") from None
+    if direction == "a":
+        return key_value, None
+    if direction == "b":
+        return None, key_value
+    raise ValueError(f"invalid cursor: {cursor!r}")
+
+
+async def keyset_page(
+    session: AsyncSession,
+    stmt: Select,
+    convert: Callable[[Iterable], list],
+    key,
+    *,
+    limit: int,
+    offset: int = 0,
+    after_id: int | None = None,
+    before_id: int | None = None,
+    descending: bool = False,
+    with_total: bool = False,
+) -> Page:
+    """按唯一键 ``key`` 做键集分页，返回 :class:`Page`。
+
+    ``stmt`` 为尚未排序的查询，``convert`` 将结果行批量转换（如 ``converter.from_rows``）。
+    ``after_id`` / ``before_id`` 取自上一页的游标，均为 None 时从第一页开始（可叠加 ``offset``）。
+    ``descending=True`` 表示按键倒序展示，此时“之后”指键更小的行。
+    翻页只需 ``WHERE key > ? ORDER BY key LIMIT n``，走索引定位，与页的深度无关。
+
+    ``with_total=True`` 时在同一条语句中以 ``count(*) OVER ()`` 计算全部匹配行数，写入 ``page.total``，
+    代替单独的 COUNT 查询（需要扫描全部匹配行，只在确实需要总数时使用）。
+    """
+    counted = stmt
+    if with_total:
+        # 窗口计数放在子查询内、游标条件之前计算，总数与翻页位置无关；
+        # 外层按原列顺序取出子查询各列，总数列在键列之前（row[-2]）
+        inner = stmt.add_columns(func.count().over().label("_total"), key.label("_key")).subquery()
+        key = inner.c._key
+        stmt = select(*(c for c in inner.c if c is not key))
+    backward = before_id is not None
+    # 向前翻页时反转比较方向与排序，取回后再倒序恢复展示顺序
+    reverse = descending != backward
+    if after_id is not None:
+        stmt = stmt.where(key < after_id if descending else key > after_id)
+    if backward:
+        stmt = stmt.where(key > before_id if descending else key < before_id)
+    stmt = stmt.add_columns(key).order_by(key.desc() if reverse else key.asc()).limit(limit + 1)
+    if offset:
+        stmt = stmt.offset(offset)
+
+    rows = (await session.execute(stmt)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+
+    if backward:
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, after_id is not None or offset > 0
+
+    # 键列追加在行尾，转换器会忽略多出的列
+    page = Page(convert(rows))
+    if with_total:
+        if rows:
+            page.total = rows[0][-2]
+        elif after_id is None and before_id is None and not offset:
+            page.total = 0
+        else:
+            # 游标 / 偏移越过末尾时本页没有行可带出总数，退回单独计数
+            page.total = (await session.execute(select(func.count()).select_from(counted.subquery()))).scalar()
+    if rows:
+        if has_next:
+            page.next_cursor = encode_cursor("a", rows[-1][-1])
+        if has_prev:
+            page.prev_cursor = encode_cursor("b", rows[0][-1])
+    return page
+
+
+@asynccontextmanager
+async def _session_scope(session: AsyncSession | None):
+    """传入 session 时直接使用（由调用方负责提交），否则开启新的 :func:`get_session`。"""
+    if session is not None:
+        yield session
+    else:
+        async with get_session() as new_session:
+            yield new_session
+
 
 class BaseDAO:
     """所有 DAO 的基类，基于 SQLAlchemy 异步 ORM 提供通用 CRUD 操作。
@@ -11,15 +357,31 @@ class BaseDAO:
     子类只需声明 :attr:`MODEL` 属性（对应 ORM 模型类），即可继承：
 
     * :meth:`find_by_uuid` – 根据 uuid 查询单条记录
-    * :meth:`find_all`     – 分页查询所有记录
+    * :meth:`find_all`     – 键集分页查询所有记录（见 :func:`keyset_page`）
     * :meth:`create`       – 插入新记录
     * :meth:`update`       – 根据 uuid 更新记录
     * :meth:`delete`       – 根据 uuid 删除记录
+    * :meth:`bulk_create` / :meth:`bulk_upsert` / :meth:`bulk_update_by_uuid` – 批量写入
+
+    读方法的 ``columns`` 参数可只查询部分列：传入列名 / 属性名序列，
+    或 :attr:`PROJECTIONS` 中声明的投影名。
+
+    写操作均为单条 Core 语句（``INSERT/UPDATE/DELETE ... RETURNING``），
+    每次调用只需一次数据库往返；批量写入按块生成多行 ``VALUES``，每块一次往返。
     """
 
     #: 子类必须将此属性设置为对应的 SQLAlchemy ORM 模型类。
     MODEL: ClassVar[Type[Base]]
 
+    #: 命名列投影：投影名 → 列名元组，供读方法的 ``columns`` 参数引用
+    PROJECTIONS: ClassVar[dict[str, tuple[str, ...]]] = {}
+
+    #: 键集分页使用的排序键（须唯一且有索引）
+    KEYSET_COLUMN: ClassVar[str] = "id"
+
+    #: 批量写入每条语句的最大行数（另受 asyncpg 绑定参数上限约束）
+    BULK_CHUNK_SIZE: ClassVar[int] = 1000
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
@@ -33,25 +395,57 @@ class BaseDAO:
             )
         return model
 
+    @classmethod
+    def _converter(cls, columns: str | Iterable[str] | None = None) -> RowConverter:
+        """返回 ``columns`` 对应的转换器；投影名未在 :attr:`PROJECTIONS` 中声明时抛出 ValueError。"""
+        if columns is None:
+            return row_converter(cls.MODEL)
+        if isinstance(columns, str):
+            try:
+                columns = cls.PROJECTIONS[columns]
+            except KeyError:
+                raise ValueError(f"{cls.__name__} has no projection {columns!r}") from None
+        return row_converter(cls.MODEL, columns)
+
+    @classmethod
+    def record_type(cls, columns: str | Iterable[str] | None = None) -> type[Record]:
+        """返回模型（或 ``columns`` 投影）对应的 :class:`Record` 子类。"""
+        return cls._converter(columns).record_type
+
     @staticmethod
     def _to_dict(obj) -> dict[str, Any]:
         """将 ORM 实例转换为字典。
 
-        使用 SQLAlchemy 的 __mapper__.column_attrs 获取所有列属性，
-        确保字典的键为数据库列名而非模型属性名。
-
-        对于 TEXT 等文本类型列，若数据库中意外存储了非字符串值（如 JSON 对象），
-        会强制转换为字符串，避免前端出现 [object Object]。
+        字典的键为数据库列名而非模型属性名；TEXT 列中的非字符串值会被转为字符串。
         """
         if obj is None:
             return {}
+        return row_converter(type(obj)).from_object(obj)
+
+    @classmethod
+    def _row_to_dict(cls, row) -> dict[str, Any]:
+        """将 :meth:`RowConverter.select` / ``RETURNING`` 得到的 Core 行转换为字典。"""
+        if row is None:
+            return {}
+        return row_converter(cls.MODEL).from_row(row)
+
+    @classmethod
+    def _data_to_columns(cls, data: dict[str, Any], *, strict: bool = False) -> dict[str, Any]:
+        """将数据字典的键（列名或模型属性名）统一转换为列名，供 Core 语句使用。
+
+        ``strict=True`` 时遇到未知键抛出 TypeError（与 ORM 构造函数行为一致），
+        否则忽略未知键（与 ORM setattr 后 flush 的行为一致）。
+        """
+        converter = row_converter(cls.MODEL)
+        col_to_attr, attr_to_col = converter.col_to_attr, converter.attr_to_col
         result: dict[str, Any] = {}
-        for col_prop in type(obj).__mapper__.column_attrs:
-            col = col_prop.columns[0]
-            value = getattr(obj, col_prop.key)
-            if value is not None and isinstance(col.type, Text) and not isinstance(value, str):
-                value = str(value)
-            result[col.name] = value
+        for key, value in data.items():
+            name = key if key in col_to_attr else attr_to_col.get(key)
+            if name is None:
+                if strict:
+                    raise TypeError(f"{key!r} is an invalid keyword argument for {cls.MODEL.__name__}")
+                continue
+            result[name] = value
         return result
 
     @classmethod
@@ -61,68 +455,238 @@ class BaseDAO:
         处理数据库列名与 ORM 模型属性名不一致的情况（如列名为 snake_case，
         属性名可能为 camelCase）。
         """
-        col_to_attr = {
-            col_prop.columns[0].name: col_prop.key
-            for col_prop in cls.MODEL.__mapper__.column_attrs
-        }
+        col_to_attr = row_converter(cls.MODEL).col_to_attr
         return {col_to_attr.get(k, k): v for k, v in data.items()}
 
     # ------------------------------------------------------------------
     # CRUD
     # ------------------------------------------------------------------
 
-    async def find_by_uuid(self, uuid: str) -> dict[str, Any] | None:
-        """根据 uuid 查询单条记录，不存在时返回 None。"""
+    async def find_by_uuid(
+        self, uuid: str, columns: str | Iterable[str] | None = None
+    ) -> dict[str, Any] | None:
+        """根据 uuid 查询单条记录，不存在时返回 None；``columns`` 指定时只查询这些列。"""
         model = self._get_model()
+        converter = self._converter(columns)
         async with get_session() as session:
-            obj = (
-                await session.scalars(select(model).where(model.uuid == uuid))
+            row = (
+                await session.execute(converter.select().where(model.uuid == uuid))
             ).first()
-            return self._to_dict(obj) if obj else None
+            return converter.from_row(row) if row is not None else None
 
-    async def find_all(self, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
-        """分页查询所有记录，默认返回前 100 条。"""
+    async def find_record_by_uuid(
+        self, uuid: str, columns: str | Iterable[str] | None = None
+    ) -> Record | None:
+        """同 :meth:`find_by_uuid`，返回 :class:`Record`（热点路径使用，省去字典分配）。"""
         model = self._get_model()
+        converter = self._converter(columns)
         async with get_session() as session:
-            objs = await session.scalars(
-                select(model).order_by(model.id).limit(limit).offset(offset)
+            row = (
+                await session.execute(converter.select().where(model.uuid == uuid))
+            ).first()
+            return converter.record(row) if row is not None else None
+
+    async def find_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        columns: str | Iterable[str] | None = None,
+        *,
+        after_id: int | None = None,
+        before_id: int | None = None,
+    ) -> Page:
+        """按 :attr:`KEYSET_COLUMN` 顺序分页查询所有记录，默认返回前 100 条；``columns`` 指定时只查询这些列。
+
+        返回 :class:`Page`，翻页时将其游标经 :func:`decode_cursor` 解析为 ``after_id`` / ``before_id`` 传回。
+        """
+        model = self._get_model()
+        converter = self._converter(columns)
+        async with get_session() as session:
+            return await keyset_page(
+                session, converter.select(), converter.from_rows, getattr(model, self.KEYSET_COLUMN),
+                limit=limit, offset=offset, after_id=after_id, before_id=before_id,
             )
-            return [self._to_dict(o) for o in objs]
 
     async def create(self, data: dict[str, Any]) -> dict[str, Any]:
         """插入新记录并返回完整行（含数据库生成的字段）。"""
-        model = self._get_model()
-        obj = model(**self._data_to_kwargs(data))
+        converter = row_converter(self._get_model())
+        stmt = (
+            insert(self._get_model().__table__)
+            .values(self._data_to_columns(data, strict=True))
+            .returning(*converter.columns)
+        )
+        async with get_session() as session:
+            row = (await session.execute(stmt)).one()
+            return converter.from_row(row)
+
+    async def _update_where(self, condition, data: dict[str, Any]) -> dict[str, Any] | None:
+        """按条件更新单行并返回更新后的行，无匹配时返回 None。"""
+        converter = row_converter(self._get_model())
+        values = self._data_to_columns(data)
+        if values:
+            stmt = (
+                update(self._get_model().__table__)
+                .where(condition)
+                .values(values)
+                .returning(*converter.columns)
+            )
+        else:
+            stmt = converter.select().where(condition)
         async with get_session() as session:
-            session.add(obj)
-            await session.flush()
-            await session.refresh(obj)
-            return self._to_dict(obj)
+            row = (await session.execute(stmt)).first()
+            return converter.from_row(row) if row is not None else None
+
+    async def _delete_where(self, condition) -> bool:
+        """按条件删除，有行被删除时返回 True。"""
+        table = self._get_model().__table__
+        async with get_session() as session:
+            pk = next(iter(table.primary_key.columns))
+            deleted = await session.scalar(delete(table).where(condition).returning(pk))
+            return deleted is not None
 
     async def update(self, uuid: str, data: dict[str, Any]) -> dict[str, Any] | None:
         """根据 uuid 更新字段，返回更新后的行，若记录不存在则返回 None。"""
-        model = self._get_model()
-        async with get_session() as session:
-            obj = (
-                await session.scalars(select(model).where(model.uuid == uuid))
-            ).first()
-            if obj is None:
-                return None
-            for k, v in self._data_to_kwargs(data).items():
-                setattr(obj, k, v)
-            await session.flush()
-            await session.refresh(obj)
-            return self._to_dict(obj)
+        return await self._update_where(self._get_model().__table__.c.uuid == uuid, data)
 
     async def delete(self, uuid: str) -> bool:
         """根据 uuid 删除记录，成功删除返回 True，记录不存在返回 False。"""
-        model = self._get_model()
-        async with get_session() as session:
-            obj = (
-                await session.scalars(select(model).where(model.uuid == uuid))
-            ).first()
-            if obj is None:
-                return False
-            await session.delete(obj)
-            return True
+        return await self._delete_where(self._get_model().__table__.c.uuid == uuid)
+
+    # ------------------------------------------------------------------
+    # 批量写入
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _column_names(cls, keys: Iterable[str]) -> list[str]:
+        """将列名或属性名列表统一为列名，未知名称抛出 TypeError。"""
+        return list(cls._data_to_columns({key: None for key in keys}, strict=True))
+
+    @classmethod
+    def _bulk_chunks(
+        cls, rows: Iterable[dict[str, Any]], chunk_size: int | None
+    ) -> Iterator[tuple[tuple[str, ...], list[dict[str, Any]]]]:
+        """按列集合分组（同组才能共用一条多行 VALUES），再按块大小切分。
+
+        块大小同时受绑定参数上限约束（按模型全部列数估算，含 Python 端默认值列）。
+        """
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for row in rows:
+            data = cls._data_to_columns(row, strict=True)
+            groups.setdefault(tuple(sorted(data)), []).append(data)
+        limit = max(1, _MAX_BIND_PARAMS // len(cls.MODEL.__table__.columns))
+        size = max(1, min(chunk_size or cls.BULK_CHUNK_SIZE, limit))
+        for cols, group in groups.items():
+            for start in range(0, len(group), size):
+                yield cols, group[start:start + size]
+
+    async def _execute_bulk(
+        self, stmts: Iterable, returning: bool, session: AsyncSession | None
+    ) -> int | list[dict[str, Any]]:
+        converter = row_converter(self._get_model())
+        affected = 0
+        returned: list[dict[str, Any]] = []
+        async with _session_scope(session) as active:
+            for stmt in stmts:
+                if returning:
+                    returned.extend(
+                        converter.from_rows(await active.execute(stmt.returning(*converter.columns)))
+                    )
+                else:
+                    affected += (await active.execute(stmt)).rowcount
+        return returned if returning else affected
+
+    async def bulk_create(
+        self,
+        rows: Iterable[dict[str, Any]],
+        *,
+        returning: bool = False,
+        chunk_size: int | None = None,
+        session: AsyncSession | None = None,
+    ) -> int | list[dict[str, Any]]:
+        """批量插入，返回插入行数；``returning=True`` 时返回插入后的完整行。
+
+        键可为列名或属性名，未知键抛出 TypeError。列集合不同的行分别成批，
+        返回行的顺序为分组后的顺序。传入 ``session`` 时在该 session 中执行，由调用方提交。
+        """
+        table = self._get_model().__table__
+        stmts = (pg_insert(table).values(chunk) for _, chunk in self._bulk_chunks(rows, chunk_size))
+        return await self._execute_bulk(stmts, returning, session)
+
+    async def bulk_upsert(
+        self,
+        rows: Iterable[dict[str, Any]],
+        conflict_cols: Iterable[str],
+        update_cols: Iterable[str] | None = None,
+        *,
+        returning: bool = False,
+        chunk_size: int | None = None,
+        session: AsyncSession | None = None,
+    ) -> int | list[dict[str, Any]]:
+        """批量 ``INSERT ... ON CONFLICT (conflict_cols) DO UPDATE``。
+
+        ``update_cols`` 为 None 时更新除冲突列外的所有已提供列；为空时 ``DO NOTHING``
+        （此时返回值只包含新插入的行）。``conflict_cols`` 须对应唯一约束 / 唯一索引。
+        输入中冲突键重复的行只保留最后一条（PostgreSQL 不允许一条语句两次修改同一行）。
+        """
+        table = self._get_model().__table__
+        conflict = self._column_names(conflict_cols)
+        update_names = None if update_cols is None else self._column_names(update_cols)
+
+        latest: dict[tuple, dict[str, Any]] = {}
+        for row in rows:
+            data = self._data_to_columns(row, strict=True)
+            try:
+                key = tuple(data[name] for name in conflict)
+            except KeyError as exc:
+                raise ValueError(f"bulk_upsert 的每一行都必须包含冲突列 {exc.args[0]!r}") from None
+            latest.pop(key, None)
+            latest[key] = data
+
+        def statements():
+            for cols, chunk in self._bulk_chunks(latest.values(), chunk_size):
+                stmt = pg_insert(table).values(chunk)
+                names = [c for c in cols if c not in conflict] if update_names is None else update_names
+                set_ = {name: stmt.excluded[name] for name in names if name in cols}
+                if set_:
+                    yield stmt.on_conflict_do_update(index_elements=conflict, set_=set_)
+                else:
+                    yield stmt.on_conflict_do_nothing(index_elements=conflict)
+
+        return await self._execute_bulk(statements(), returning, session)
+
+    async def bulk_update_by_uuid(
+        self,
+        rows: Iterable[dict[str, Any]],
+        *,
+        returning: bool = False,
+        chunk_size: int | None = None,
+        session: AsyncSession | None = None,
+    ) -> int | list[dict[str, Any]]:
+        """按 uuid 批量更新，每行为 ``{"uuid": ..., 列: 新值, ...}``，各行可更新不同的列。
+
+        生成 ``UPDATE ... FROM (VALUES ...) AS v WHERE t.uuid = v.uuid``，每块一次往返；
+        返回更新行数，``returning=True`` 时返回更新后的行（不存在的 uuid 被忽略）。
+        """
+        table = self._get_model().__table__
+        if "uuid" not in table.c:
+            raise TypeError(f"{self._get_model().__name__} 没有 uuid 列，不支持 bulk_update_by_uuid")
+        rows = list(rows)
+        if any("uuid" not in row for row in rows):
+            raise ValueError("bulk_update_by_uuid 的每一行都必须包含 uuid")
+
+        def statements():
+            for cols, chunk in self._bulk_chunks(rows, chunk_size):
+                set_cols = [c for c in cols if c != "uuid"]
+                if not set_cols:
+                    continue
+                ordered = ("uuid", *set_cols)
+                source = values(
+                    *(column(name, table.c[name].type) for name in ordered), name="v"
+                ).data([tuple(row[name] for name in ordered) for row in chunk])
+                yield (
+                    update(table)
+                    .where(table.c.uuid == source.c.uuid)
+                    .values({name: source.c[name] for name in set_cols})
+                )
 
+        return await self._execute_bulk(statements(), returning, session)
@@ -3,12 +3,12 @@
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Index, Integer, Text, func, select
+from sqlalchemy import Index, Integer, Text, func
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.database.connection.pgsql import Base, get_session
-from core.database.dao.base import BaseDAO
+from core.database.dao.base import BaseDAO, row_converter
 
 
 class IllegalRequest(Base):
@@ -39,24 +39,26 @@ class IllegalRequestsDAO(BaseDAO):
 
     async def find_by_ip(self, ip: str, limit: int = 100) -> list[dict[str, Any]]:
         """查询指定 IP 的所有违规记录。"""
+        converter = row_converter(IllegalRequest)
         async with get_session() as session:
-            objs = await session.scalars(
-                select(IllegalRequest)
+            rows = await session.execute(
+                converter.select()
                 .where(IllegalRequest.ip == ip)
                 .order_by(IllegalRequest.happened_at.desc())
                 .limit(limit)
             )
-            return [self._to_dict(o) for o in objs]
+            return converter.from_rows(rows)
 
     async def find_by_user(self, user: str, limit: int = 100) -> list[dict[str, Any]]:
         """查询指定用户的所有违规记录。"""
+        converter = row_converter(IllegalRequest)
         async with get_session() as session:
-            objs = await session.scalars(
-                select(IllegalRequest)
+            rows = await session.execute(
+                converter.select()
                 .where(IllegalRequest.user == user)
                 .order_by(IllegalRequest.happened_at.desc())
                 .limit(limit)
             )
-            return [self._to_dict(o) for o in objs]
+            return converter.from_rows(rows)
 
 
@@ -0,0 +1,358 @@
+"""日志 / 防火墙小时级汇总表的数据访问对象（含 ORM 模型定义）。
+
+汇总表由定时任务 :func:`core.cron.tasks.rollup_logs.rollup_hourly_stats` 增量维护：
+每张源表在 ``rollup_watermarks`` 中记录已汇总到的最大 id（高水位），
+每次只聚合高水位之后的新行，并以 ``INSERT ... ON CONFLICT DO UPDATE`` 累加计数。
+管理端看板直接读取汇总表，无需扫描原始日志。
+"""
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import BigInteger, Integer, Text, UniqueConstraint, func, literal, literal_column, select, update
+from sqlalchemy.dialects.postgresql import TIMESTAMP, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.database.connection.pgsql import Base, get_session
+from core.database.dao.base import BaseDAO
+from core.database.dao.illegal_requests import IllegalRequest
+from core.database.dao.personal_logs import PersonalLog
+from core.database.dao.system_logs import SystemLog
+
+
+class LogHourlyRollup(Base):
+    """log_hourly_rollups 表的 ORM 模型。"""
+
+    __tablename__ = "log_hourly_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket_hour: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+    source: Mapped[str] = mapped_column(Text, nullable=False)
+    event_type: Mapped[str] = mapped_column(Text, nullable=False, server_default="")
+    status: Mapped[str] = mapped_column(Text, nullable=False, server_default="")
+    log_type: Mapped[str] = mapped_column(Text, nullable=False, server_default="")
+    event_count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket_hour", "source", "event_type", "status", "log_type",
+            name="uq_log_hourly_rollups_key",
+        ),
+    )
+
+
+class FirewallHourlyRollup(Base):
+    """firewall_hourly_rollups 表的 ORM 模型。"""
+
+    __tablename__ = "firewall_hourly_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket_hour: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+    type: Mapped[str] = mapped_column(Text, nullable=False)
+    ip: Mapped[str] = mapped_column(Text, nullable=False)
+    event_count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+
+    __table_args__ = (
+        UniqueConstraint("bucket_hour", "type", "ip", name="uq_firewall_hourly_rollups_key"),
+    )
+
+
+class RollupWatermark(Base):
+    """rollup_watermarks 表的 ORM 模型。"""
+
+    __tablename__ = "rollup_watermarks"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
+    last_id: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    updated_at: Mapped[datetime | None] = mapped_column(TIMESTAMP, server_default=func.now())
+
+
+# 日志汇总允许的分组维度
+LOG_ROLLUP_DIMENSIONS: tuple[str, ...] = ("source", "event_type", "status", "log_type")
+
+# 防火墙汇总允许的分组维度
+FIREWALL_ROLLUP_DIMENSIONS: tuple[str, ...] = ("type", "ip")
+
+
+def _hour(col):
+    """将时间列截断到小时（单位以字面量渲染，保证 SELECT 与 GROUP BY 表达式一致）。"""
+    return func.date_trunc(literal_column("'hour'"), col)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    """将 Python 端时间截断到整点，与 bucket_hour 对齐。"""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _dim(col):
+    """维度列 NULL → ''，与汇总表的 NOT NULL DEFAULT '' 对齐。"""
+    return func.coalesce(col, literal_column("''"))
+
+
+def _blank_to_none(value: Any) -> Any:
+    """汇总表中的 '' 在返回给调用方时还原为 None。"""
+    return None if value == "" else value
+
+
+class LogRollupsDAO(BaseDAO):
+    """日志 / 防火墙汇总表的数据访问对象。"""
+
+    MODEL = LogHourlyRollup
+
+    # ------------------------------------------------------------------
+    # 增量汇总
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _lock_watermark(session: AsyncSession, name: str) -> int:
+        """读取并锁定指定源表的高水位（不存在时初始化为 0）。
+
+        ``FOR UPDATE`` 保证多个 worker 同时运行汇总任务时串行推进，不会重复累加。
+        """
+        await session.execute(
+            insert(RollupWatermark)
+            .values(name=name, last_id=0)
+            .on_conflict_do_nothing(index_elements=[RollupWatermark.name])
+        )
+        return (
+            await session.scalar(
+                select(RollupWatermark.last_id)
+                .where(RollupWatermark.name == name)
+                .with_for_update()
+            )
+        ) or 0
+
+    @staticmethod
+    async def _set_watermark(session: AsyncSession, name: str, last_id: int) -> None:
+        await session.execute(
+            update(RollupWatermark)
+            .where(RollupWatermark.name == name)
+            .values(last_id=last_id, updated_at=func.now())
+        )
+
+    @staticmethod
+    async def _next_upper_id(
+        session: AsyncSession,
+        id_col,
+        time_col,
+        last_id: int,
+        settle_before: datetime,
+        batch_size: int,
+    ) -> int | None:
+        """计算本批次的上界 id。
+
+        批次止于第一条 ``time_col > settle_before`` 的行之前：给仍在进行中的写事务
+        留出提交时间，避免高水位越过尚未可见的较小 id。
+        """
+        first_unsettled = await session.scalar(
+            select(func.min(id_col)).where(id_col > last_id, time_col > settle_before)
+        )
+        window = select(id_col.label("id")).where(id_col > last_id)
+        if first_unsettled is not None:
+            window = window.where(id_col < first_unsettled)
+        window = window.order_by(id_col).limit(batch_size).subquery()
+        upper = await session.scalar(select(func.max(window.c.id)))
+        return int(upper) if upper is not None else None
+
+    @classmethod
+    async def _advance_log_source(
+        cls,
+        source: str,
+        model,
+        settle_before: datetime,
+        batch_size: int,
+    ) -> int:
+        """将一张日志源表（system_logs / personal_logs）的一个批次累加进汇总表。
+
+        返回本批次推进的源行数上界（0 表示已追平）。
+        """
+        name = f"{source}_logs"
+        async with get_session() as session:
+            last_id = await cls._lock_watermark(session, name)
+            upper = await cls._next_upper_id(
+                session, model.id, model.created_at, last_id, settle_before, batch_size,
+            )
+            if upper is None:
+                return 0
+
+            bucket = _hour(model.created_at).label("bucket_hour")
+            event_type = _dim(model.event_type).label("event_type")
+            status = _dim(model.status).label("status")
+            log_type = _dim(model.log_type).label("log_type")
+            source_select = (
+                select(
+                    bucket,
+                    literal(source, Text).label("source"),
+                    event_type,
+                    status,
+                    log_type,
+                    func.count().label("event_count"),
+                )
+                .where(model.id > last_id, model.id <= upper, model.created_at.is_not(None))
+                .group_by(bucket, event_type, status, log_type)
+            )
+            stmt = insert(LogHourlyRollup).from_select(
+                ["bucket_hour", "source", "event_type", "status", "log_type", "event_count"],
+                source_select,
+            )
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_log_hourly_rollups_key",
+                set_={"event_count": LogHourlyRollup.event_count + stmt.excluded.event_count},
+            )
+            await session.execute(stmt)
+            await cls._set_watermark(session, name, upper)
+            return upper - last_id
+
+    @classmethod
+    async def _advance_firewall(cls, settle_before: datetime, batch_size: int) -> int:
+        """将 illegal_requests 的一个批次累加进防火墙汇总表。"""
+        name = "illegal_requests"
+        async with get_session() as session:
+            last_id = await cls._lock_watermark(session, name)
+            upper = await cls._next_upper_id(
+                session, IllegalRequest.id, IllegalRequest.happened_at,
+                last_id, settle_before, batch_size,
+            )
+            if upper is None:
+                return 0
+
+            bucket = _hour(IllegalRequest.happened_at).label("bucket_hour")
+            source_select = (
+                select(
+                    bucket,
+                    IllegalRequest.type,
+                    IllegalRequest.ip,
+                    func.count().label("event_count"),
+                )
+                .where(
+                    IllegalRequest.id > last_id,
+                    IllegalRequest.id <= upper,
+                    IllegalRequest.happened_at.is_not(None),
+                )
+                .group_by(bucket, IllegalRequest.type, IllegalRequest.ip)
+            )
+            stmt = insert(FirewallHourlyRollup).from_select(
+                ["bucket_hour", "type", "ip", "event_count"],
+                source_select,
+            )
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_firewall_hourly_rollups_key",
+                set_={"event_count": FirewallHourlyRollup.event_count + stmt.excluded.event_count},
+            )
+            await session.execute(stmt)
+            await cls._set_watermark(session, name, upper)
+            return upper - last_id
+
+    @classmethod
+    async def advance(
+        cls,
+        *,
+        settle_seconds: int = 60,
+        batch_size: int = 50000,
+        max_batches: int = 20,
+    ) -> dict[str, int]:
+        """推进所有源表的高水位，返回每张源表本次推进的 id 跨度。
+
+        每个批次独立成一个事务；单次最多执行 ``max_batches`` 批，
+        剩余积压留给下一轮调度，避免首次回填时长时间占用连接。
+        """
+        settle_before = datetime.now() - timedelta(seconds=settle_seconds)
+        advanced: dict[str, int] = {}
+
+        for source, model in (("system", SystemLog), ("personal", PersonalLog)):
+            total = 0
+            for _ in range(max_batches):
+                step = await cls._advance_log_source(source, model, settle_before, batch_size)
+                if step == 0:
+                    break
+                total += step
+            advanced[f"{source}_logs"] = total
+
+        total = 0
+        for _ in range(max_batches):
+            step = await cls._advance_firewall(settle_before, batch_size)
+            if step == 0:
+                break
+            total += step
+        advanced["illegal_requests"] = total
+
+        return advanced
+
+    # ------------------------------------------------------------------
+    # 看板查询
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def query_log_hourly(
+        *,
+        start_time: datetime,
+        end_time: datetime,
+        event_type: str | None = None,
+        status: str | None = None,
+        log_type: str | None = None,
+        source: str | None = None,
+        group_by: tuple[str, ...] = (),
+    ) -> list[dict[str, Any]]:
+        """按小时查询日志计数。
+
+        ``group_by`` 为空时每小时一行（各维度求和）；
+        否则按指定维度（见 :data:`LOG_ROLLUP_DIMENSIONS`）细分。
+        """
+        dims = [getattr(LogHourlyRollup, d) for d in group_by if d in LOG_ROLLUP_DIMENSIONS]
+        total = func.sum(LogHourlyRollup.event_count).label("count")
+        stmt = select(LogHourlyRollup.bucket_hour, *dims, total).where(
+            LogHourlyRollup.bucket_hour >= _floor_hour(start_time),
+            LogHourlyRollup.bucket_hour <= end_time,
+        )
+        if event_type:
+            stmt = stmt.where(LogHourlyRollup.event_type == event_type)
+        if status:
+            stmt = stmt.where(LogHourlyRollup.status == status)
+        if log_type:
+            stmt = stmt.where(LogHourlyRollup.log_type == log_type)
+        if source:
+            stmt = stmt.where(LogHourlyRollup.source == source)
+        stmt = stmt.group_by(LogHourlyRollup.bucket_hour, *dims).order_by(
+            LogHourlyRollup.bucket_hour, *dims
+        )
+
+        async with get_session() as session:
+            rows = (await session.execute(stmt)).mappings().all()
+        return [
+            {k: (int(v) if k == "count" else _blank_to_none(v)) for k, v in row.items()}
+            for row in rows
+        ]
+
+    @staticmethod
+    async def query_firewall_top(
+        *,
+        start_time: datetime,
+        end_time: datetime,
+        group_by: tuple[str, ...] = FIREWALL_ROLLUP_DIMENSIONS,
+        type: str | None = None,
+        ip: str | None = None,
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        """查询时间范围内命中次数最多的攻击类型 / IP 组合。"""
+        dims = [getattr(FirewallHourlyRollup, d) for d in group_by if d in FIREWALL_ROLLUP_DIMENSIONS]
+        if not dims:
+            dims = [FirewallHourlyRollup.type, FirewallHourlyRollup.ip]
+        total = func.sum(FirewallHourlyRollup.event_count).label("count")
+        stmt = select(*dims, total).where(
+            FirewallHourlyRollup.bucket_hour >= _floor_hour(start_time),
+            FirewallHourlyRollup.bucket_hour <= end_time,
+        )
+        if type:
+            stmt = stmt.where(FirewallHourlyRollup.type == type)
+        if ip:
+            stmt = stmt.where(FirewallHourlyRollup.ip == ip)
+        stmt = stmt.group_by(*dims).order_by(total.desc()).limit(limit)
+
+        async with get_session() as session:
+            rows = (await session.execute(stmt)).mappings().all()
+        return [
+            {k: (int(v) if k == "count" else v) for k, v in row.items()}
+            for row in rows
+        ]
@@ -0,0 +1,225 @@
+"""log_strings 字典表的数据访问对象（含 ORM 模型定义）。
+
+system_logs / personal_logs 中高度重复的长文本（user_agent、host_name、service_name）
+只在字典表中存一份，日志行改存整数 id：
+
+* 写入：:meth:`LogStringsDAO.intern_many` 先查进程内 LRU 缓存，未命中的值用一条
+  ``INSERT ... ON CONFLICT DO NOTHING ... RETURNING`` 插入新值，已存在的值再用一条 SELECT 取回 id，
+  取回的 id 在所在事务提交后才写入缓存；
+* 查询：:func:`select_with_strings` 为日志模型 LEFT JOIN 字典表，
+  :func:`resolve_strings` 将字典值回填到原列名，调用方无感知；
+  :func:`select_resolved` 直接在 SQL 中回填，结果行可转换为 :class:`Record`。
+"""
+
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, ClassVar, Mapping
+
+from sqlalchemy import Integer, Select, Text, event, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import TIMESTAMP, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, aliased, mapped_column
+
+from core.config import settings
+from core.database.connection.pgsql import Base
+from core.database.dao.base import BaseDAO, RowConverter, row_converter
+
+
+class LogString(Base):
+    """log_strings 表的 ORM 模型。"""
+
+    __tablename__ = "log_strings"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+    value_hash: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime | None] = mapped_column(TIMESTAMP, server_default=func.now())
+
+
+# 各日志表中写入时字典化的列（列名即 kind，对应 id 列为 f"{kind}_id"）
+# request_url 带查询串，取值数量没有上界，不字典化，原样写入文本列
+INTERNED_COLUMNS: dict[str, tuple[str, ...]] = {
+    "system_logs": ("user_agent", "host_name", "service_name"),
+    "personal_logs": ("user_agent",),
+}
+
+# 查询 / 归档时需要还原的列：在 INTERNED_COLUMNS 之外还包括曾经字典化过的 request_url（旧行的 request_url_id）
+RESOLVED_COLUMNS: dict[str, tuple[str, ...]] = {
+    "system_logs": ("user_agent", "request_url", "host_name", "service_name"),
+    "personal_logs": ("user_agent", "request_url"),
+}
+
+# 查询结果中字典值的标签后缀
+_LABEL_SUFFIX = "__str"
+
+# session.info 中待提交后写入缓存的 (kind, value, id) 列表
+_PENDING_KEY = "log_strings_pending"
+
+
+def _hash(value: str) -> str:
+    """与迁移脚本约定一致：value_hash = md5(value) 的十六进制串。"""
+    return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+class LogStringsDAO(BaseDAO):
+    """log_strings 表的数据访问对象（带进程内 intern 缓存）。"""
+
+    MODEL = LogString
+
+    # (kind, value) → id；按最近使用顺序排列，超过 LOG_INTERN_CACHE_SIZE 时淘汰最久未用的一项
+    _cache: ClassVar[OrderedDict[tuple[str, str], int]] = OrderedDict()
+
+    @classmethod
+    def _lookup(cls, kind: str, value: str) -> int | None:
+        string_id = cls._cache.get((kind, value))
+        if string_id is not None:
+            cls._cache.move_to_end((kind, value))
+        return string_id
+
+    @classmethod
+    def _remember(cls, kind: str, value: str, string_id: int) -> None:
+        cls._cache[(kind, value)] = string_id
+        cls._cache.move_to_end((kind, value))
+        while len(cls._cache) > settings.LOG_INTERN_CACHE_SIZE:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    def _remember_after_commit(cls, session: AsyncSession, entries: list[tuple[str, str, int]]) -> None:
+        """事务提交后再把 id 写入缓存；事务或其中的 SAVEPOINT 回滚时丢弃。
+
+        新插入的字典行在回滚后并不存在，提前缓存会让后续日志行写入悬空的 ``*_id``。
+        同一事务中先前插入、尚未提交的值也可能经 SELECT 取回，因此一律等到提交。
+        """
+        pending = session.info.get(_PENDING_KEY)
+        if pending is None:
+            pending = session.info[_PENDING_KEY] = []
+
+            def _commit(_session) -> None:
+                for kind, value, string_id in session.info.pop(_PENDING_KEY, ()):
+                    cls._remember(kind, value, string_id)
+
+            def _rollback(_session, _transaction) -> None:
+                session.info.pop(_PENDING_KEY, None)
+
+            event.listen(session.sync_session, "after_commit", _commit)
+            event.listen(session.sync_session, "after_soft_rollback", _rollback)
+        pending.extend(entries)
+
+    @classmethod
+    async def intern_many(
+        cls,
+        session: AsyncSession,
+        values: Mapping[str, str | None],
+    ) -> dict[str, int]:
+        """将 {kind: value} 映射为 {kind: id}，空值跳过。
+
+        缓存全部命中时不访问数据库；否则对未命中的值执行一次批量 ``INSERT ... ON CONFLICT DO NOTHING``，
+        RETURNING 中没有的（已存在的）值再按 (kind, value_hash) 查询一次。
+        查到的 id 在 ``session`` 提交后才进入缓存（见 :meth:`_remember_after_commit`）。
+        不用 ``DO UPDATE``：它会改写并锁住已存在的字典行，并发写日志时相互等待。
+        """
+        ids: dict[str, int] = {}
+        missing: list[dict[str, str]] = []
+        for kind, value in values.items():
+            if not value:
+                continue
+            cached = cls._lookup(kind, value)
+            if cached is not None:
+                ids[kind] = cached
+            else:
+                missing.append({"kind": kind, "value": value, "value_hash": _hash(value)})
+
+        if not missing:
+            return ids
+
+        stmt = (
+            insert(LogString)
+            .values(missing)
+            .on_conflict_do_nothing(constraint="uq_log_strings_kind_hash")
+            .returning(LogString.id, LogString.kind, LogString.value_hash)
+        )
+        by_key = {(r.kind, r.value_hash): r.id for r in (await session.execute(stmt)).all()}
+        existing = [(m["kind"], m["value_hash"]) for m in missing if (m["kind"], m["value_hash"]) not in by_key]
+        if existing:
+            rows = await session.execute(
+                select(LogString.id, LogString.kind, LogString.value_hash).where(
+                    tuple_(LogString.kind, LogString.value_hash).in_(existing)
+                )
+            )
+            by_key.update({(r.kind, r.value_hash): r.id for r in rows.all()})
+
+        learned: list[tuple[str, str, int]] = []
+        for item in missing:
+            string_id = by_key.get((item["kind"], item["value_hash"]))
+            if string_id is not None:
+                ids[item["kind"]] = string_id
+                learned.append((item["kind"], item["value"], string_id))
+        if learned:
+            cls._remember_after_commit(session, learned)
+        return ids
+
+    @classmethod
+    def match(cls, model, kind: str, value: str):
+        """生成"字典化列等于 value"的过滤条件，兼容尚未字典化的旧行。
+
+        缓存中已有该值的 id 时直接比较整数列，否则用子查询按 value_hash 查找。
+        """
+        id_col = getattr(model, f"{kind}_id")
+        cached = cls._lookup(kind, value)
+        if cached is not None:
+            id_match = id_col == cached
+        else:
+            id_match = id_col.in_(
+                select(LogString.id).where(
+                    LogString.kind == kind,
+                    LogString.value_hash == _hash(value),
+                )
+            )
+        return or_(getattr(model, kind) == value, id_match)
+
+
+def select_with_strings(model) -> Select:
+    """构造 ``SELECT 全部列, 字典值...``，为每个字典化列 LEFT JOIN 一次 log_strings。
+
+    前半部分列顺序与 :func:`row_converter` 一致，结果行可直接交给 ``from_row`` 转换。
+    """
+    stmt = row_converter(model).select()
+    for kind in RESOLVED_COLUMNS.get(model.__tablename__, ()):
+        alias = aliased(LogString, name=f"{kind}{_LABEL_SUFFIX}")
+        stmt = stmt.add_columns(alias.value.label(f"{kind}{_LABEL_SUFFIX}")).outerjoin(
+            alias, alias.id == getattr(model, f"{kind}_id")
+        )
+    return stmt
+
+
+def resolve_strings(tablename: str, data: dict[str, Any], row: Mapping[str, Any]) -> dict[str, Any]:
+    """把 JOIN 得到的字典值回填到原列名，并移除内部使用的 *_id 列。"""
+    for kind in RESOLVED_COLUMNS.get(tablename, ()):
+        data.pop(f"{kind}_id", None)
+        if data.get(kind) is None:
+            data[kind] = row.get(f"{kind}{_LABEL_SUFFIX}")
+    return data
+
+
+def select_resolved(model) -> tuple[Select, RowConverter]:
+    """构造日志查询：字典化列以 ``COALESCE(原文本列, 字典值)`` 回填，不返回 ``*_id`` 列。
+
+    返回语句与对应列投影的转换器；结果与 :func:`select_with_strings` + :func:`resolve_strings`
+    相同，但无需逐行修改字典，可直接交给 ``converter.records`` 生成 :class:`Record`。
+    """
+    kinds = RESOLVED_COLUMNS.get(model.__tablename__, ())
+    id_names = {f"{kind}_id" for kind in kinds}
+    converter = row_converter(model, tuple(n for n in row_converter(model).names if n not in id_names))
+    exprs, aliases = [], {}
+    for col in converter.columns:
+        if col.name in kinds:
+            alias = aliases[col.name] = aliased(LogString, name=f"{col.name}{_LABEL_SUFFIX}")
+            exprs.append(func.coalesce(col, alias.value).label(col.name))
+        else:
+            exprs.append(col)
+    stmt = select(*exprs).select_from(model)
+    for kind, alias in aliases.items():
+        stmt = stmt.outerjoin(alias, alias.id == getattr(model, f"{kind}_id"))
+    return stmt, converter
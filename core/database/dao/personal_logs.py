@@ -1,14 +1,17 @@
 """personal_logs 表的数据访问对象（含 ORM 模型定义）。"""
 
+import uuid as uuid_lib
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
 
 from sqlalchemy import Integer, Text, false, func, select
 from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column
 
+from core.config import settings
 from core.database.connection.pgsql import Base, get_session
-from core.database.dao.base import BaseDAO
+from core.database.dao.base import BaseDAO, Record
+from core.database.dao.log_strings import LogStringsDAO, select_resolved
 
 
 class PersonalLog(Base):
@@ -42,6 +45,10 @@ class PersonalLog(Base):
     error_msg: Mapped[str | None] = mapped_column(Text)
     extra_data: Mapped[dict[str, Any] | None] = mapped_column(JSONB)
 
+    # 字典化字符串 id（见 log_strings.py），新写入的行只存 id，原文本列为空
+    user_agent_id: Mapped[int | None] = mapped_column(Integer)
+    request_url_id: Mapped[int | None] = mapped_column(Integer)
+
 
 class PersonalLogsDAO(BaseDAO):
     """personal_logs 表的数据访问对象。"""
@@ -65,13 +72,13 @@ class PersonalLogsDAO(BaseDAO):
         end_time: datetime | None = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> tuple[list[dict[str, Any]], int]:
+    ) -> tuple[list[Record], int]:
         """按条件分页查询个人日志，返回记录列表与总数。
 
         user_uuids 用于权限过滤：普通用户传自己的 uuid，管理员可传多个。
         """
-        async with get_session() as session:
-            stmt = select(PersonalLog)
+        async with get_session(readonly=True) as session:
+            stmt, converter = select_resolved(PersonalLog)
             count_stmt = select(func.count(PersonalLog.id))
 
             filters = []
@@ -108,6 +115,35 @@ class PersonalLogsDAO(BaseDAO):
 
             stmt = stmt.order_by(PersonalLog.created_at.desc()).limit(limit).offset(offset)
 
-            objs = await session.scalars(stmt)
+            rows = (await session.execute(stmt)).all()
             total = (await session.scalar(count_stmt)) or 0
-            return [cls._to_dict(o) for o in objs], total
+            return converter.records(rows), total
+
+    @classmethod
+    async def write_many(
+        cls,
+        entries: Iterable[dict[str, Any]],
+        *,
+        user_agent: str | None = None,
+        request_url: str | None = None,
+    ) -> int:
+        """批量写入个人日志（多行 INSERT），返回写入条数；用于批量操作的审计记录。
+
+        ``entries`` 为各行的列值（须含 ``user_uuid``，``uuid`` 自动生成）；
+        同一请求共享的 user_agent 只字典化一次（见 :meth:`LogStringsDAO.intern_many`），request_url 原样写入。
+        与 ``CustomLog`` 不同，不经过采样器，在调用方的事务中同步写入。
+        """
+        entries = list(entries)
+        if not entries:
+            return 0
+        strings: dict[str, Any] = {"user_agent": user_agent}
+        async with get_session() as session:
+            if settings.LOG_INTERN_STRINGS:
+                ids = await LogStringsDAO.intern_many(session, strings)
+                strings = {
+                    **{kind: None for kind in strings},
+                    **{f"{kind}_id": string_id for kind, string_id in ids.items()},
+                }
+            strings["request_url"] = request_url
+            rows = [{"uuid": str(uuid_lib.uuid4()), **entry, **strings} for entry in entries]
+            return await cls().bulk_create(rows, session=session)
@@ -1,12 +1,12 @@
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import Integer, Text, delete, select
+from sqlalchemy import Integer, Text, delete, select, update
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.config import settings
 from core.database.connection.pgsql import Base, get_session
-from core.database.dao.base import BaseDAO
+from core.database.dao.base import BaseDAO, Record, row_converter
 
 
 class RefreshToken(Base):
@@ -34,19 +34,18 @@ class RefreshTokensDAO(BaseDAO):
             await session.flush()
 
     @classmethod
-    async def find_active(cls, token_hash: str) -> dict | None:
+    async def find_active(cls, token_hash: str) -> Record | None:
+        converter = row_converter(RefreshToken)
         async with get_session() as session:
-            obj = (
-                await session.scalars(
-                    select(RefreshToken).where(
+            row = (
+                await session.execute(
+                    converter.select().where(
                         RefreshToken.token_hash == token_hash,
                         RefreshToken.revoked_at.is_(None),
                     )
                 )
             ).first()
-            if obj is None:
-                return None
-            return cls._to_dict(obj)
+            return converter.record(row) if row is not None else None
 
     @staticmethod
     async def revoke(token_hash: str) -> None:
@@ -77,6 +76,22 @@ class RefreshTokensDAO(BaseDAO):
                 obj.revoked_at = now
             await session.flush()
 
+    @staticmethod
+    async def revoke_all_for_users(user_uuids: list[str]) -> int:
+        """吊销多个用户的全部有效 token（单条 UPDATE），返回吊销数量。"""
+        if not user_uuids:
+            return 0
+        async with get_session() as session:
+            result = await session.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.user_uuid.in_(user_uuids),
+                    RefreshToken.revoked_at.is_(None),
+                )
+                .values(revoked_at=datetime.now(timezone.utc))
+            )
+            return result.rowcount
+
     @staticmethod
     async def _cleanup_old_revoked() -> None:
         """删除吊销超过 N 天的旧 token 记录。"""
@@ -1,15 +1,27 @@
 """register_questions 表的数据访问对象（含 ORM 模型定义）。"""
 
+import random
+import time
 from datetime import datetime
-from typing import Any
+from typing import Any, ClassVar
 
 from sqlalchemy import Integer, Text, func, select
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
-from core.database.connection.pgsql import Base, get_session
-from core.database.dao.base import BaseDAO
+from core.config import settings
+from core.database.connection.pgsql import Base, call_after_commit, get_session
+from core.database.connection.redis import redis_conn
+from core.database.dao.base import BaseDAO, Page, keyset_page, row_converter
+from core.helper.CustomLog.index import CustomLog
+from core.helper.etag import ETAG_PREFIX, bump_etag
+
+# 题库版本号：题目变更时递增，各进程据此判断内存中的题库是否过期
+POOL_VERSION_KEY = "register:questions:version"
+
+# 管理端题目读取接口的 ETag 版本戳（与题库版本号同时更换）
+QUESTIONS_ETAG_KEY = f"{ETAG_PREFIX}register_questions"
 
 
 class RegisterQuestions(Base):
@@ -35,28 +47,146 @@ class RegisterQuestionsDAO(BaseDAO):
 
     MODEL = RegisterQuestions
 
+    # ------------------------------------------------------------------
+    # 进程内题库缓存
+    # ------------------------------------------------------------------
+
+    #: 进程内缓存的 active 题目 (uuid, question, answer)
+    _pool: ClassVar[list[tuple[str, str, str]]] = []
+    #: 加载 _pool 时 Redis 中的版本号（Redis 不可用时为 None）
+    _pool_version: ClassVar[str | None] = None
+    #: 加载 _pool 的时间（time.monotonic()），0 表示尚未加载或已本地失效
+    _pool_loaded_at: ClassVar[float] = 0.0
+    #: 进程内缓存的题目统计（见 :meth:`get_stats`），版本号 / 加载时间含义同 _pool
+    _stats: ClassVar[dict[str, Any]] = {}
+    _stats_version: ClassVar[str | None] = None
+    _stats_loaded_at: ClassVar[float] = 0.0
+
+    @staticmethod
+    def _read_pool_version() -> str | None:
+        client = redis_conn.get_client()
+        if client is None:
+            return None
+        try:
+            version = client.get(POOL_VERSION_KEY)
+        except Exception as exc:
+            CustomLog("WARNING", f"[Register] 读取题库版本号失败: {exc}")
+            return None
+        return version.decode() if isinstance(version, bytes) else version
+
     @staticmethod
-    async def find_random_active(count: int = 5) -> list[dict[str, Any]]:
+    async def load_active_pool() -> list[tuple[str, str, str]]:
+        """从数据库读取全部 active 题目的 (uuid, question, answer)。
+
+        读主库：版本号递增后立即重新加载，只读副本可能尚未同步该次修改。
+        """
+        async with get_session() as session:
+            rows = await session.execute(
+                select(RegisterQuestions.uuid, RegisterQuestions.question, RegisterQuestions.answer)
+                .where(RegisterQuestions.current_status == "active")
+            )
+            return [tuple(row) for row in rows]
+
+    @classmethod
+    async def find_random_active(cls, count: int = 5) -> list[dict[str, Any]]:
         """从 current_status='active' 的题库中随机抽取指定数量的题目。
 
-        使用数据库层面的随机排序，避免一次性加载全表数据。
+        题库按进程缓存在内存中，抽样为 O(count)；Redis 中的版本号（见 :meth:`invalidate_pool`）
+        变化或缓存超过 ``REG_QUESTION_POOL_TTL_SECONDS`` 时重新加载。
         返回含 uuid、question、answer 字段的字典列表。
         """
+        version = cls._read_pool_version()
+        expired = time.monotonic() - cls._pool_loaded_at >= settings.REG_QUESTION_POOL_TTL_SECONDS
+        if not cls._pool_loaded_at or expired or version != cls._pool_version:
+            # 并发请求可能同时重新加载，结果相同，不加锁
+            cls._pool = await cls.load_active_pool()
+            cls._pool_version = version
+            cls._pool_loaded_at = time.monotonic()
+
+        pool = cls._pool
+        return [
+            {"uuid": uuid, "question": question, "answer": answer}
+            for uuid, question, answer in random.sample(pool, min(count, len(pool)))
+        ]
+
+    @staticmethod
+    async def load_stats() -> list[tuple[str | None, str | None, int]]:
+        """单条 ``GROUP BY question_type, current_status`` 查询，返回 (题型, 状态, 题目数)。
+
+        与 :meth:`load_active_pool` 相同，版本号递增后立即重新加载，读主库。
+        """
         async with get_session() as session:
-            objs = await session.scalars(
-                select(RegisterQuestions)
-                .where(RegisterQuestions.current_status == "active")
-                .order_by(func.random())
-                .limit(count)
+            rows = await session.execute(
+                select(
+                    RegisterQuestions.question_type,
+                    RegisterQuestions.current_status,
+                    func.count(),
+                ).group_by(RegisterQuestions.question_type, RegisterQuestions.current_status)
             )
-            return [
-                {
-                    "uuid": o.uuid,
-                    "question": o.question,
-                    "answer": o.answer,
-                }
-                for o in objs
-            ]
+            return [tuple(row) for row in rows]
+
+    @classmethod
+    async def get_stats(cls) -> dict[str, Any]:
+        """题目统计：总数、各题型数量，以及按状态 / 题型 × 状态的分布。
+
+        结果按进程缓存，失效规则同 :meth:`find_random_active` 的题库缓存（Redis 版本号变化或超过 TTL）。
+        题型 / 状态为 NULL 的题目记入 ``unknown``。
+        """
+        version = cls._read_pool_version()
+        expired = time.monotonic() - cls._stats_loaded_at >= settings.REG_QUESTION_POOL_TTL_SECONDS
+        if not cls._stats_loaded_at or expired or version != cls._stats_version:
+            rows = await cls.load_stats()
+            by_type: dict[str, dict[str, int]] = {}
+            by_status: dict[str, int] = {}
+            for question_type, current_status, count in rows:
+                status_key = current_status or "unknown"
+                type_counts = by_type.setdefault(question_type or "unknown", {"total": 0})
+                type_counts["total"] += count
+                type_counts[status_key] = type_counts.get(status_key, 0) + count
+                by_status[status_key] = by_status.get(status_key, 0) + count
+            cls._stats = {
+                "total": sum(by_status.values()),
+                **{t: by_type.get(t, {}).get("total", 0) for t in ("choice", "true_false", "fill_blank")},
+                "by_status": by_status,
+                "by_type": by_type,
+            }
+            cls._stats_version = version
+            cls._stats_loaded_at = time.monotonic()
+        return cls._stats
+
+    @classmethod
+    def invalidate_pool(cls) -> None:
+        """题目新增 / 修改 / 删除 / 状态变更后调用：事务提交后递增 Redis 版本号，所有进程下次抽题时重新加载
+        （题目统计缓存同样失效），并更换管理端题目接口的 ETag 版本戳。
+
+        Redis 不可用时只失效本进程缓存，其余进程最迟在 ``REG_QUESTION_POOL_TTL_SECONDS`` 后刷新。
+        """
+        call_after_commit(cls._bump_pool_version)
+        bump_etag(QUESTIONS_ETAG_KEY)
+
+    @classmethod
+    def _bump_pool_version(cls) -> None:
+        cls._pool_loaded_at = 0.0
+        cls._stats_loaded_at = 0.0
+        client = redis_conn.get_client()
+        if client is None:
+            return
+        try:
+            client.incr(POOL_VERSION_KEY)
+        except Exception as exc:
+            CustomLog("WARNING", f"[Register] 题库版本号更新失败: {exc}")
+
+    @staticmethod
+    def _search_conditions(keyword: str | None, question_type: str | None, status: str | None) -> list:
+        """题目搜索 / 计数共用的过滤条件。"""
+        conditions = []
+        if keyword:
+            conditions.append(RegisterQuestions.question.ilike(f"%{keyword}%"))
+        if question_type:
+            conditions.append(RegisterQuestions.question_type == question_type)
+        if status:
+            conditions.append(RegisterQuestions.current_status == status)
+        return conditions
 
     @staticmethod
     async def search_questions(
@@ -65,55 +195,41 @@ class RegisterQuestionsDAO(BaseDAO):
         status: str | None = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> list[dict[str, Any]]:
-        """分页搜索题目，支持 keyword 模糊匹配 question，type/status 精确筛选。"""
-        async with get_session() as session:
-            stmt = select(RegisterQuestions)
-            conditions = []
-            if keyword:
-                conditions.append(RegisterQuestions.question.ilike(f"%{keyword}%"))
-            if question_type:
-                conditions.append(RegisterQuestions.question_type == question_type)
-            if status:
-                conditions.append(RegisterQuestions.current_status == status)
-            if conditions:
-                stmt = stmt.where(*conditions)
-            objs = await session.scalars(
-                stmt.order_by(RegisterQuestions.id.desc()).limit(limit).offset(offset)
+        after_id: int | None = None,
+        before_id: int | None = None,
+        readonly: bool = True,
+    ) -> Page:
+        """按 id 倒序键集分页搜索题目，支持 keyword 模糊匹配 question，type/status 精确筛选。
+
+        ``readonly=False`` 时读主库（结果与 ETag 绑定的接口使用，见 admin 题目接口）。
+        """
+        converter = row_converter(RegisterQuestions)
+        stmt = converter.select()
+        conditions = RegisterQuestionsDAO._search_conditions(keyword, question_type, status)
+        if conditions:
+            stmt = stmt.where(*conditions)
+        async with get_session(readonly=readonly) as session:
+            return await keyset_page(
+                session, stmt, converter.from_rows, RegisterQuestions.id,
+                limit=limit, offset=offset, after_id=after_id, before_id=before_id, descending=True,
             )
-            return [RegisterQuestionsDAO._to_dict(o) for o in objs]
 
     @staticmethod
     async def count_questions(
         keyword: str | None = None,
         question_type: str | None = None,
         status: str | None = None,
+        readonly: bool = True,
     ) -> int:
-        """按条件统计题目总数。"""
-        async with get_session() as session:
+        """按条件统计题目总数；``readonly`` 同 :meth:`search_questions`。"""
+        async with get_session(readonly=readonly) as session:
             stmt = select(func.count(RegisterQuestions.id))
-            conditions = []
-            if keyword:
-                conditions.append(RegisterQuestions.question.ilike(f"%{keyword}%"))
-            if question_type:
-                conditions.append(RegisterQuestions.question_type == question_type)
-            if status:
-                conditions.append(RegisterQuestions.current_status == status)
+            conditions = RegisterQuestionsDAO._search_conditions(keyword, question_type, status)
             if conditions:
                 stmt = stmt.where(*conditions)
             result = await session.execute(stmt)
             return result.scalar() or 0
 
-    @staticmethod
-    async def count_by_type(question_type: str) -> int:
-        """按题型统计题目数。"""
-        async with get_session() as session:
-            result = await session.execute(
-                select(func.count(RegisterQuestions.id))
-                .where(RegisterQuestions.question_type == question_type)
-            )
-            return result.scalar() or 0
-
     @staticmethod
     async def batch_delete_by_uuids(
         uuids: list[str],
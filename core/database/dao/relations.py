@@ -6,12 +6,12 @@ relations 表没有独立的 uuid 主键，使用自增 id 作为主键。
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Integer, Text, func, select
+from sqlalchemy import Integer, Text, func
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.database.connection.pgsql import Base, get_session
-from core.database.dao.base import BaseDAO
+from core.database.dao.base import BaseDAO, row_converter
 
 
 class Relation(Base):
@@ -44,46 +44,25 @@ class RelationsDAO(BaseDAO):
         raise NotImplementedError("relations 表不包含 uuid 字段，请使用 delete_by_id")
 
     async def find_by_id(self, record_id: int) -> dict[str, Any] | None:
+        converter = row_converter(Relation)
         async with get_session() as session:
-            obj = (
-                await session.scalars(
-                    select(Relation).where(Relation.id == record_id)
+            row = (
+                await session.execute(
+                    converter.select().where(Relation.id == record_id)
                 )
             ).first()
-            return self._to_dict(obj) if obj else None
+            return converter.from_row(row) if row is not None else None
 
     async def find_by_tags_uuid(self, tags_uuid: str) -> list[dict[str, Any]]:
+        converter = row_converter(Relation)
         async with get_session() as session:
-            objs = await session.scalars(
-                select(Relation).where(Relation.tags_uuid == tags_uuid)
+            rows = await session.execute(
+                converter.select().where(Relation.tags_uuid == tags_uuid)
             )
-            return [self._to_dict(o) for o in objs]
+            return converter.from_rows(rows)
 
     async def update_by_id(self, record_id: int, data: dict[str, Any]) -> dict[str, Any] | None:
-        async with get_session() as session:
-            obj = (
-                await session.scalars(
-                    select(Relation).where(Relation.id == record_id)
-                )
-            ).first()
-            if obj is None:
-                return None
-            for k, v in self._data_to_kwargs(data).items():
-                setattr(obj, k, v)
-            await session.flush()
-            await session.refresh(obj)
-            return self._to_dict(obj)
+        return await self._update_where(Relation.__table__.c.id == record_id, data)
 
     async def delete_by_id(self, record_id: int) -> bool:
-        async with get_session() as session:
-            obj = (
-                await session.scalars(
-                    select(Relation).where(Relation.id == record_id)
-                )
-            ).first()
-            if obj is None:
-                return False
-            await session.delete(obj)
-            return True
-
-
+        return await self._delete_where(Relation.__table__.c.id == record_id)
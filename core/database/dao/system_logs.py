@@ -8,7 +8,8 @@ from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.database.connection.pgsql import Base, get_session
-from core.database.dao.base import BaseDAO
+from core.database.dao.base import BaseDAO, Record
+from core.database.dao.log_strings import LogStringsDAO, select_resolved
 
 
 class SystemLog(Base):
@@ -43,6 +44,12 @@ class SystemLog(Base):
     metric_value: Mapped[str | None] = mapped_column(Text)
     extra_data: Mapped[dict[str, Any] | None] = mapped_column(JSONB)
 
+    # 字典化字符串 id（见 log_strings.py），新写入的行只存 id，原文本列为空
+    user_agent_id: Mapped[int | None] = mapped_column(Integer)
+    request_url_id: Mapped[int | None] = mapped_column(Integer)
+    host_name_id: Mapped[int | None] = mapped_column(Integer)
+    service_name_id: Mapped[int | None] = mapped_column(Integer)
+
 
 class SystemLogsDAO(BaseDAO):
     """system_logs 表的数据访问对象。"""
@@ -65,10 +72,10 @@ class SystemLogsDAO(BaseDAO):
         end_time: datetime | None = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> tuple[list[dict[str, Any]], int]:
+    ) -> tuple[list[Record], int]:
         """按条件分页查询系统日志，返回记录列表与总数。"""
-        async with get_session() as session:
-            stmt = select(SystemLog)
+        async with get_session(readonly=True) as session:
+            stmt, converter = select_resolved(SystemLog)
             count_stmt = select(func.count(SystemLog.id))
 
             filters = []
@@ -81,7 +88,7 @@ class SystemLogsDAO(BaseDAO):
             if severity:
                 filters.append(SystemLog.severity == severity)
             if service_name:
-                filters.append(SystemLog.service_name == service_name)
+                filters.append(LogStringsDAO.match(SystemLog, "service_name", service_name))
             if trace_id:
                 filters.append(SystemLog.trace_id == trace_id)
             if client_ip:
@@ -99,6 +106,6 @@ class SystemLogsDAO(BaseDAO):
 
             stmt = stmt.order_by(SystemLog.created_at.desc()).limit(limit).offset(offset)
 
-            objs = await session.scalars(stmt)
+            rows = (await session.execute(stmt)).all()
             total = (await session.scalar(count_stmt)) or 0
-            return [cls._to_dict(o) for o in objs], total
+            return converter.records(rows), total
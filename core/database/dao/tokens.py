@@ -1,14 +1,13 @@
 """tokens 表的数据访问对象（含 ORM 模型定义）。"""
 
 from datetime import datetime
-from typing import Any
 
-from sqlalchemy import Index, Integer, Text, func, or_, select
+from sqlalchemy import Index, Integer, Text, func, or_
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.database.connection.pgsql import Base, get_session
-from core.database.dao.base import BaseDAO
+from core.database.dao.base import BaseDAO, Record, row_converter
 
 
 class Token(Base):
@@ -36,24 +35,26 @@ class TokensDAO(BaseDAO):
 
     MODEL = Token
 
-    async def find_by_belong_to(self, belong_to: str) -> list[dict[str, Any]]:
+    async def find_by_belong_to(self, belong_to: str) -> list[Record]:
         """查询指定用户的所有 token。"""
+        converter = row_converter(Token)
         async with get_session() as session:
-            objs = await session.scalars(
-                select(Token).where(Token.belong_to == belong_to)
+            rows = await session.execute(
+                converter.select().where(Token.belong_to == belong_to)
             )
-            return [self._to_dict(o) for o in objs]
+            return converter.records(rows)
 
-    async def find_active_by_belong_to(self, belong_to: str) -> list[dict[str, Any]]:
+    async def find_active_by_belong_to(self, belong_to: str) -> list[Record]:
         """查询指定用户的所有未过期 token。"""
+        converter = row_converter(Token)
         async with get_session() as session:
-            objs = await session.scalars(
-                select(Token).where(
+            rows = await session.execute(
+                converter.select().where(
                     Token.belong_to == belong_to,
                     or_(Token.expired_at.is_(None), Token.expired_at > func.now()),
                     Token.current_status != "revoked",
                 )
             )
-            return [self._to_dict(o) for o in objs]
+            return converter.records(rows)
 
 
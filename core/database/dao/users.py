@@ -1,15 +1,16 @@
 """users 表的数据访问对象（含 ORM 模型定义）。"""
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
 
-from sqlalchemy import Boolean, Integer, Text, func, select, or_, and_, delete as sa_delete
-from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, Boolean, Index, Integer, Text, func, literal, literal_column, select, or_, and_, union_all, update, delete as sa_delete
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, aliased, mapped_column
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database.connection.pgsql import Base
-from core.database.dao.base import BaseDAO
+from core.database.connection.pgsql import Base, get_session
+from core.database.dao.base import BaseDAO, Page, keyset_page, row_converter
 
 
 class User(Base):
@@ -40,12 +41,64 @@ class User(Base):
     password: Mapped[str | None] = mapped_column(Text)
     deletion_scheduled_at: Mapped[datetime | None] = mapped_column(TIMESTAMP)
 
+    __table_args__ = (
+        # 同名同班级的学生唯一（见 alter_users_unique_real_name_class.sql）
+        Index(
+            "uq_users_real_name_class",
+            "real_name",
+            "class",
+            unique=True,
+            postgresql_where=and_(real_name.isnot(None), class_.isnot(None)),
+        ),
+        # 管理端模糊搜索（ILIKE '%关键词%'）使用的 pg_trgm GIN 索引（见 alter_users_trgm_search_indexes.sql）
+        *(
+            Index(
+                f"idx_users_{name}_trgm",
+                name,
+                postgresql_using="gin",
+                postgresql_ops={name: "gin_trgm_ops"},
+            )
+            for name in ("username", "email", "real_name", "nickname")
+        ),
+    )
+
+
+class UserStat(Base):
+    """user_stats 表的 ORM 模型（由 users 表上的触发器维护，见 initial_user_stats.sql）。"""
+
+    __tablename__ = "user_stats"
+
+    dimension: Mapped[str] = mapped_column(Text, primary_key=True)
+    value: Mapped[str] = mapped_column(Text, primary_key=True)
+    user_count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+
+
+# user_stats 的维度 → users 表中对应的列
+USER_STATS_DIMENSIONS = {
+    "status": User.current_status,
+    "role": User.user_role,
+}
+
 
 class UsersDAO(BaseDAO):
     """users 表的数据访问对象。"""
 
     MODEL = User
 
+    PROJECTIONS = {
+        # get_current_user 及其 Redis 缓存：鉴权与接口中读取的字段（不含 password / other_info）
+        "auth": (
+            "uuid", "username", "nickname", "real_name", "class", "class_type",
+            "current_status", "user_role", "is_verified",
+        ),
+        # GET /users/me 返回的非敏感字段
+        "profile": (
+            "uuid", "username", "email", "avatar_url", "nickname", "real_name", "class",
+            "class_type", "joined_at", "current_status", "last_login_at", "score",
+            "user_role", "title", "invited_by", "views", "is_verified",
+        ),
+    }
+
     @staticmethod
     async def is_role_valid(role: str | None) -> bool:
         if role is None:
@@ -62,36 +115,44 @@ class UsersDAO(BaseDAO):
         )
         return result.first()
 
-    @staticmethod
-    async def find_duplicate_student(session: AsyncSession, real_name: str, class_: str) -> User | None:
-        """检查是否存在同名同班级的学生，存在则返回该用户，否则返回 None。
+    # 同名同班级唯一索引（部分索引，real_name / class 均非空时生效）
+    STUDENT_INDEX = "uq_users_real_name_class"
+    # PostgreSQL unique_violation
+    UNIQUE_VIOLATION = "23505"
+
+    async def create_student(self, data: dict[str, Any]) -> dict[str, Any] | None:
+        """插入新学生并返回完整行；已存在同名同班级的学生时不插入，返回 None。
 
-        用于注册时防止重复注册。
+        由唯一索引 ``uq_users_real_name_class`` 判重（``ON CONFLICT DO NOTHING``），
+        无需预先查询，并发注册也不会产生重复学生。
         """
-        result = await session.scalars(
-            select(User).where(
-                User.real_name == real_name,
-                User.class_ == class_,
+        converter = row_converter(User)
+        stmt = (
+            pg_insert(User.__table__)
+            .values(self._data_to_columns(data, strict=True))
+            .on_conflict_do_nothing(
+                index_elements=[User.real_name, User.class_],
+                index_where=and_(User.real_name.isnot(None), User.class_.isnot(None)),
             )
+            .returning(*converter.columns)
         )
-        return result.first()
+        async with get_session() as session:
+            row = (await session.execute(stmt)).first()
+            return converter.from_row(row) if row is not None else None
 
-    @staticmethod
-    async def find_duplicate_student_exclude_self(
-        session: AsyncSession, real_name: str, class_: str, exclude_uuid: str
-    ) -> User | None:
-        """检查是否存在同名同班级但不同 uuid 的学生，存在则返回该用户，否则返回 None。
+    @classmethod
+    def is_duplicate_student(cls, exc: BaseException) -> bool:
+        """判断异常是否为同名同班级唯一索引冲突（修改个人信息、管理端写用户时使用）。
 
-        用于修改个人信息时防止与其他用户产生冲突（排除自身）。
+        按 SQLSTATE 23505 与 asyncpg 异常的 ``constraint_name`` 判断，不解析错误文本。
+        SQLAlchemy 的 asyncpg 适配层把原始异常放在 ``exc.orig.__cause__``。
         """
-        result = await session.scalars(
-            select(User).where(
-                User.real_name == real_name,
-                User.class_ == class_,
-                User.uuid != exclude_uuid,
-            )
-        )
-        return result.first()
+        if not isinstance(exc, IntegrityError):
+            return False
+        orig = exc.orig
+        if getattr(orig, "sqlstate", None) != cls.UNIQUE_VIOLATION:
+            return False
+        return getattr(orig.__cause__, "constraint_name", None) == cls.STUDENT_INDEX
 
     @staticmethod
     async def find_password_hash(session: AsyncSession, user_uuid: str) -> str | None:
@@ -111,30 +172,34 @@ class UsersDAO(BaseDAO):
         return result.first()
 
     @staticmethod
-    async def count_users(
-        session: AsyncSession,
-        keyword: str | None = None,
-        status: str | None = None,
-        role: str | None = None,
-    ) -> int:
-        """根据条件统计用户总数。"""
+    def _search_conditions(keyword: str | None, status: str | None, role: str | None) -> list:
+        """用户搜索 / 计数共用的过滤条件。
+
+        关键词按字面匹配（转义 ``%`` / ``_``）；四列各有 pg_trgm GIN 索引，
+        PostgreSQL 以 BitmapOr 合并四个索引扫描，不再顺序扫描整张表。
+        """
         conditions = []
         if keyword:
-            pattern = f"%{keyword}%"
-            conditions.append(
-                or_(
-                    User.username.ilike(pattern),
-                    User.email.ilike(pattern),
-                    User.real_name.ilike(pattern),
-                    User.nickname.ilike(pattern),
-                )
-            )
+            escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
+            searchable = (User.username, User.email, User.real_name, User.nickname)
+            conditions.append(or_(*(col.ilike(pattern, escape="\\") for col in searchable)))
         if status:
             conditions.append(User.current_status == status)
         if role:
             conditions.append(User.user_role == role)
+        return conditions
 
+    @staticmethod
+    async def count_users(
+        session: AsyncSession,
+        keyword: str | None = None,
+        status: str | None = None,
+        role: str | None = None,
+    ) -> int:
+        """根据条件统计用户总数。"""
         query = select(func.count(User.id))
+        conditions = UsersDAO._search_conditions(keyword, status, role)
         if conditions:
             query = query.where(and_(*conditions))
         result = await session.execute(query)
@@ -148,61 +213,82 @@ class UsersDAO(BaseDAO):
         role: str | None = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> list[dict[str, Any]]:
-        """分页搜索用户，支持关键词、状态、角色过滤。"""
-        conditions = []
-        if keyword:
-            pattern = f"%{keyword}%"
-            conditions.append(
-                or_(
-                    User.username.ilike(pattern),
-                    User.email.ilike(pattern),
-                    User.real_name.ilike(pattern),
-                    User.nickname.ilike(pattern),
-                )
-            )
-        if status:
-            conditions.append(User.current_status == status)
-        if role:
-            conditions.append(User.user_role == role)
+        after_id: int | None = None,
+        before_id: int | None = None,
+        with_total: bool = False,
+    ) -> Page:
+        """按 id 键集分页搜索用户，支持关键词、状态、角色过滤（游标见 :func:`keyset_page`）。
 
-        query = select(User).order_by(User.id)
+        ``with_total=True`` 时同一条语句以窗口计数带出匹配总数（``page.total``），无需再调用 :meth:`count_users`。
+        """
+        converter = row_converter(User)
+        query = converter.select()
+        conditions = UsersDAO._search_conditions(keyword, status, role)
         if conditions:
             query = query.where(and_(*conditions))
-        query = query.limit(limit).offset(offset)
+        return await keyset_page(
+            session, query, converter.from_rows, User.id,
+            limit=limit, offset=offset, after_id=after_id, before_id=before_id,
+            with_total=with_total,
+        )
+
+    @staticmethod
+    async def batch_set_status(
+        session: AsyncSession,
+        uuids: list[str],
+        status: str,
+        protected_roles: Iterable[str] = (),
+    ) -> list[dict[str, Any]]:
+        """单条 ``UPDATE ... RETURNING`` 批量修改用户状态，返回实际变更的 ``[{"uuid", "before"}]``。
 
-        objs = (await session.scalars(query)).all()
-        dao = UsersDAO()
-        return [dao._to_dict(o) for o in objs]
+        不存在、已处于目标状态或角色属于 ``protected_roles`` 的用户不会被修改，也不出现在返回值中。
+        ``before`` 为修改前的状态，取自 ``FROM users AS old`` 自连接（同一语句快照中的旧行）。
+        """
+        old = aliased(User, name="old")
+        stmt = (
+            update(User)
+            .where(
+                User.uuid.in_(uuids),
+                User.current_status.is_distinct_from(status),
+                old.id == User.id,
+            )
+            .values(current_status=status)
+            .returning(User.uuid, old.current_status.label("before"))
+        )
+        protected = list(protected_roles)
+        if protected:
+            stmt = stmt.where(or_(User.user_role.is_(None), User.user_role.not_in(protected)))
+        result = await session.execute(stmt)
+        return [{"uuid": row.uuid, "before": row.before} for row in result]
 
     @staticmethod
     async def batch_delete(session: AsyncSession, uuids: list[str]) -> int:
         """批量删除用户（单条 SQL DELETE 语句）。"""
         result = await session.execute(sa_delete(User).where(User.uuid.in_(uuids)))
-        await session.commit()
         return result.rowcount
 
+    # ------------------------------------------------------------------
+    # 统计计数（user_stats）
+    # ------------------------------------------------------------------
+
     @staticmethod
     async def count_by_role(session: AsyncSession, role: str) -> int:
-        """统计指定角色的用户总数。"""
+        """统计指定角色的用户总数（读取 user_stats 计数，不扫描 users）。"""
         result = await session.execute(
-            select(func.count(User.id)).where(User.user_role == role)
+            select(UserStat.user_count).where(UserStat.dimension == "role", UserStat.value == role)
         )
         return result.scalar() or 0
 
     @staticmethod
     async def get_user_stats(session: AsyncSession) -> dict[str, int]:
-        """获取用户统计信息。"""
-        total_result = await session.execute(select(func.count(User.id)))
-        total = total_result.scalar() or 0
-
+        """获取用户统计信息（总数 + 各状态分布），读取 user_stats 计数表。"""
         result = await session.execute(
-            select(User.current_status, func.count(User.id)).group_by(User.current_status)
+            select(UserStat.value, UserStat.user_count).where(UserStat.dimension == "status")
         )
-        status_counts = {row[0] or "unknown": row[1] for row in result.all()}
+        status_counts = {row[0]: row[1] for row in result.all()}
 
         return {
-            "total": total,
+            "total": sum(status_counts.values()),
             "normal": status_counts.get("normal", 0),
             "disabled": status_counts.get("disabled", 0),
             "banned": status_counts.get("banned", 0),
@@ -210,10 +296,66 @@ class UsersDAO(BaseDAO):
         }
 
     @staticmethod
-    async def find_by_uuids(session: AsyncSession, uuids: list[str]) -> list[dict[str, Any]]:
-        """根据 uuid 列表批量查询用户，返回字典列表。"""
-        result = await session.scalars(
-            select(User).where(User.uuid.in_(uuids))
+    async def reconcile_stats() -> dict[tuple[str, str], int]:
+        """按 users 表实际分布校正 user_stats，返回被校正的项 ``{(维度, 取值): 计数表 - 实际}``。
+
+        实际分布与计数表在同一条语句（同一快照）中读取：触发器与 users 写入同事务提交，
+        两者在任一快照中都对应同一批已提交事务，差值即为真实偏差。
+        校正与触发器一样以增量 ``ON CONFLICT DO UPDATE`` 累加，只锁住有偏差的计数行，
+        与并发写入的累加可交换；不锁表，users 的写入（如登录时间更新）不会被阻塞。
+        """
+        # NULL → ''，与触发器一致（字面量渲染，保证 SELECT 与 GROUP BY 表达式相同）
+        values = {
+            dimension: func.coalesce(col, literal_column("''"))
+            for dimension, col in USER_STATS_DIMENSIONS.items()
+        }
+        snapshot_select = union_all(
+            *(
+                select(
+                    literal("actual", Text).label("source"),
+                    literal(dimension, Text).label("dimension"),
+                    value.label("value"),
+                    func.count().label("user_count"),
+                ).group_by(value)
+                for dimension, value in values.items()
+            ),
+            select(
+                literal("stored", Text).label("source"),
+                UserStat.dimension,
+                UserStat.value,
+                UserStat.user_count,
+            ),
+        )
+        async with get_session() as session:
+            actual: dict[tuple[str, str], int] = {}
+            stored: dict[tuple[str, str], int] = {}
+            for row in (await session.execute(snapshot_select)).all():
+                target = actual if row.source == "actual" else stored
+                target[(row.dimension, row.value)] = row.user_count
+            drift = {
+                key: stored.get(key, 0) - actual.get(key, 0)
+                for key in stored.keys() | actual.keys()
+                if stored.get(key, 0) != actual.get(key, 0)
+            }
+            if drift:
+                # 按主键顺序加锁，与触发器一致，避免与并发批量写入死锁
+                stmt = pg_insert(UserStat).values([
+                    {"dimension": dimension, "value": value, "user_count": -delta}
+                    for (dimension, value), delta in sorted(drift.items())
+                ])
+                await session.execute(stmt.on_conflict_do_update(
+                    index_elements=[UserStat.dimension, UserStat.value],
+                    set_={"user_count": UserStat.user_count + stmt.excluded.user_count},
+                ))
+        return drift
+
+    @classmethod
+    async def find_by_uuids(
+        cls, session: AsyncSession, uuids: list[str], columns: str | Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """根据 uuid 列表批量查询用户，返回字典列表；``columns`` 同 :meth:`find_by_uuid`。"""
+        converter = cls._converter(columns)
+        result = await session.execute(
+            converter.select().where(User.uuid.in_(uuids))
         )
-        dao = UsersDAO()
-        return [dao._to_dict(obj) for obj in result.all()]
+        return converter.from_rows(result)
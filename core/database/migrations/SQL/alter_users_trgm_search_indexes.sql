@@ -0,0 +1,9 @@
+-- 管理端用户搜索：ILIKE '%关键词%' 无法使用 btree 索引，为四个搜索列建立 pg_trgm GIN 索引
+-- 关键词至少 3 个字符时索引才有选择性；中文等多字节字符需数据库 LC_CTYPE 非 C（如 zh_CN.UTF-8 / en_US.UTF-8）才会生成三元组
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm ON users USING gin (username gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_email_trgm ON users USING gin (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_real_name_trgm ON users USING gin (real_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_nickname_trgm ON users USING gin (nickname gin_trgm_ops);
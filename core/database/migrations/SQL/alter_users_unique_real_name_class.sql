@@ -0,0 +1,10 @@
+-- 同名同班级学生唯一：注册与修改个人信息依赖该索引判重（INSERT ... ON CONFLICT / 唯一约束错误），不再预先查询
+-- 部分索引仅覆盖 real_name 与 class 均非空的行（管理员账号等未填写姓名/班级的用户不受约束）
+-- 执行前需先处理已存在的重复数据，可用以下语句排查：
+--   SELECT real_name, "class", COUNT(*) FROM users
+--   WHERE real_name IS NOT NULL AND "class" IS NOT NULL
+--   GROUP BY real_name, "class" HAVING COUNT(*) > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_users_real_name_class
+    ON users (real_name, "class")
+    WHERE real_name IS NOT NULL AND "class" IS NOT NULL;
@@ -0,0 +1,36 @@
+-- 日志 / 防火墙小时级汇总表（由定时任务增量维护）
+-- log_hourly_rollups:      (小时, 来源表, event_type, status, log_type) → 条数（event_count）
+-- firewall_hourly_rollups: (小时, 攻击类型, ip) → 条数（event_count）
+-- rollup_watermarks:       每张源表已汇总到的最大 id（高水位）
+-- 维度列统一以 '' 代替 NULL，保证唯一约束可用于 ON CONFLICT 累加
+
+CREATE TABLE IF NOT EXISTS log_hourly_rollups (
+    id SERIAL PRIMARY KEY,
+    bucket_hour TIMESTAMP NOT NULL,
+    source TEXT NOT NULL,
+    event_type TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    log_type TEXT NOT NULL DEFAULT '',
+    event_count BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT uq_log_hourly_rollups_key UNIQUE (bucket_hour, source, event_type, status, log_type)
+);
+
+CREATE INDEX IF NOT EXISTS idx_log_hourly_rollups_event_type ON log_hourly_rollups (event_type, bucket_hour);
+
+CREATE TABLE IF NOT EXISTS firewall_hourly_rollups (
+    id SERIAL PRIMARY KEY,
+    bucket_hour TIMESTAMP NOT NULL,
+    type TEXT NOT NULL,
+    ip TEXT NOT NULL,
+    event_count BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT uq_firewall_hourly_rollups_key UNIQUE (bucket_hour, type, ip)
+);
+
+CREATE INDEX IF NOT EXISTS idx_firewall_hourly_rollups_ip ON firewall_hourly_rollups (ip);
+
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    last_id INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,24 @@
+-- 日志高重复字符串字典表（user_agent / request_url / host_name / service_name）
+-- 日志表只存字典 id，查询时 LEFT JOIN 还原；value_hash = md5(value) 用于唯一约束（value 可能超出 btree 行宽限制）
+-- 旧数据仍保留在原文本列中，查询时 COALESCE(原列, 字典值) 兼容两种存储
+
+CREATE TABLE IF NOT EXISTS log_strings (
+    id SERIAL PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    value_hash TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_log_strings_kind_hash UNIQUE (kind, value_hash)
+);
+
+ALTER TABLE system_logs
+    ADD COLUMN IF NOT EXISTS user_agent_id INTEGER,
+    ADD COLUMN IF NOT EXISTS request_url_id INTEGER,
+    ADD COLUMN IF NOT EXISTS host_name_id INTEGER,
+    ADD COLUMN IF NOT EXISTS service_name_id INTEGER;
+
+ALTER TABLE personal_logs
+    ADD COLUMN IF NOT EXISTS user_agent_id INTEGER,
+    ADD COLUMN IF NOT EXISTS request_url_id INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_system_logs_service_name_id ON system_logs(service_name_id);
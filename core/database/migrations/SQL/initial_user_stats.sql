@@ -0,0 +1,86 @@
+-- 用户统计计数表（由 users 表上的触发器增量维护）
+-- user_stats: (维度, 取值) → 用户数；dimension 为 'status'（current_status）或 'role'（user_role），
+--             取值 NULL 以 '' 代替，保证主键可用于 ON CONFLICT 累加；用户总数 = status 维度之和
+-- 触发器为语句级（transition table），批量更新只累加一次，并按主键顺序加锁，避免并发批量操作互相死锁
+-- TRUNCATE 等绕过触发器的操作造成的偏差由定时任务 reconcile_user_stats 校正
+
+CREATE TABLE IF NOT EXISTS user_stats (
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    user_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, value)
+);
+
+CREATE OR REPLACE FUNCTION user_stats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO user_stats (dimension, value, user_count)
+        SELECT d.dimension, d.value, SUM(d.n)
+        FROM (
+            SELECT 'status' AS dimension, COALESCE(current_status, '') AS value, 1 AS n FROM new_rows
+            UNION ALL
+            SELECT 'role', COALESCE(user_role, ''), 1 FROM new_rows
+        ) d
+        GROUP BY d.dimension, d.value
+        ORDER BY d.dimension, d.value
+        ON CONFLICT (dimension, value) DO UPDATE SET user_count = user_stats.user_count + EXCLUDED.user_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO user_stats (dimension, value, user_count)
+        SELECT d.dimension, d.value, SUM(d.n)
+        FROM (
+            SELECT 'status' AS dimension, COALESCE(current_status, '') AS value, -1 AS n FROM old_rows
+            UNION ALL
+            SELECT 'role', COALESCE(user_role, ''), -1 FROM old_rows
+        ) d
+        GROUP BY d.dimension, d.value
+        ORDER BY d.dimension, d.value
+        ON CONFLICT (dimension, value) DO UPDATE SET user_count = user_stats.user_count + EXCLUDED.user_count;
+    ELSE
+        -- 只改了其他列（如登录时间）时各项相互抵消，HAVING 过滤后不写入任何行
+        INSERT INTO user_stats (dimension, value, user_count)
+        SELECT d.dimension, d.value, SUM(d.n)
+        FROM (
+            SELECT 'status' AS dimension, COALESCE(current_status, '') AS value, 1 AS n FROM new_rows
+            UNION ALL
+            SELECT 'role', COALESCE(user_role, ''), 1 FROM new_rows
+            UNION ALL
+            SELECT 'status', COALESCE(current_status, ''), -1 FROM old_rows
+            UNION ALL
+            SELECT 'role', COALESCE(user_role, ''), -1 FROM old_rows
+        ) d
+        GROUP BY d.dimension, d.value
+        HAVING SUM(d.n) <> 0
+        ORDER BY d.dimension, d.value
+        ON CONFLICT (dimension, value) DO UPDATE SET user_count = user_stats.user_count + EXCLUDED.user_count;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_users_stats_insert ON users;
+CREATE TRIGGER trg_users_stats_insert
+    AFTER INSERT ON users
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_users_stats_delete ON users;
+CREATE TRIGGER trg_users_stats_delete
+    AFTER DELETE ON users
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_stats_apply();
+
+-- 带 transition table 的触发器不能指定 UPDATE OF 列，未变化的更新由函数内 HAVING 过滤
+DROP TRIGGER IF EXISTS trg_users_stats_update ON users;
+CREATE TRIGGER trg_users_stats_update
+    AFTER UPDATE ON users
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_stats_apply();
+
+-- 回填现有用户（迁移在事务中执行，表锁保证回填与触发器启用之间没有遗漏的写入）
+LOCK TABLE users IN SHARE MODE;
+DELETE FROM user_stats;
+INSERT INTO user_stats (dimension, value, user_count)
+SELECT 'status', COALESCE(current_status, ''), COUNT(*) FROM users GROUP BY 1, 2
+UNION ALL
+SELECT 'role', COALESCE(user_role, ''), COUNT(*) FROM users GROUP BY 1, 2;
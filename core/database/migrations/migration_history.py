@@ -25,4 +25,9 @@ migration_history =[
     "alter_register_questions_add_options.sql",
     "alter_system_logs_add_structured_fields.sql",
     "alter_personal_logs_add_structured_fields.sql",
+    "initial_log_hourly_rollups.sql",
+    "initial_log_strings.sql",
+    "alter_users_unique_real_name_class.sql",
+    "alter_users_trgm_search_indexes.sql",
+    "initial_user_stats.sql",
 ]
@@ -0,0 +1,96 @@
+"""日志行的内存过滤。
+
+与 ``SystemLogsDAO.search`` / ``PersonalLogsDAO.search`` 的 SQL 过滤条件一一对应，
+用于无法下推到数据库的场景（归档文件查询、实时日志推送），保证两边语义一致：
+
+* 等值字段：event_type / log_type / status / severity / service_name / trace_id / client_ip
+  （个人日志另有 target_type / target_id / user_uuids）
+* keyword：content 不区分大小写的子串匹配（对应 ILIKE '%kw%'）
+* start_time / end_time：时间字段闭区间
+"""
+
+from datetime import datetime
+from typing import Any, Mapping
+
+# 与 SystemLogsDAO.search 相同的过滤参数
+LOG_FILTER_KEYS: tuple[str, ...] = (
+    "event_type",
+    "log_type",
+    "status",
+    "severity",
+    "service_name",
+    "trace_id",
+    "client_ip",
+    "keyword",
+    "start_time",
+    "end_time",
+)
+
+# PersonalLogsDAO.search 额外支持的过滤参数
+PERSONAL_FILTER_KEYS: tuple[str, ...] = ("user_uuids", "target_type", "target_id")
+
+_EQUALITY_KEYS: tuple[str, ...] = (
+    "event_type",
+    "log_type",
+    "status",
+    "severity",
+    "service_name",
+    "trace_id",
+    "client_ip",
+    "target_type",
+    "target_id",
+)
+
+
+def _as_datetime(value: Any) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def match_log_row(
+    row: Mapping[str, Any],
+    filters: Mapping[str, Any],
+    *,
+    time_field: str = "created_at",
+    field_map: Mapping[str, str] | None = None,
+) -> bool:
+    """判断一条日志（列名 → 值）是否满足过滤条件。
+
+    ``field_map`` 用于列名不同的表（如 illegal_requests 的 client_ip → ip），
+    未出现在 ``filters`` 中或值为空的条件视为不过滤。
+    """
+    field_map = field_map or {}
+
+    for key in _EQUALITY_KEYS:
+        expected = filters.get(key)
+        if expected in (None, ""):
+            continue
+        if row.get(field_map.get(key, key)) != expected:
+            return False
+
+    user_uuids = filters.get("user_uuids")
+    if user_uuids is not None and row.get("user_uuid") not in user_uuids:
+        return False
+
+    keyword = filters.get("keyword")
+    if keyword:
+        content = row.get(field_map.get("keyword", "content")) or ""
+        if keyword.lower() not in str(content).lower():
+            return False
+
+    start_time = _as_datetime(filters.get("start_time"))
+    end_time = _as_datetime(filters.get("end_time"))
+    if start_time or end_time:
+        happened = _as_datetime(row.get(time_field))
+        if happened is None:
+            return False
+        if start_time and happened < start_time:
+            return False
+        if end_time and happened > end_time:
+            return False
+
+    return True
@@ -16,6 +16,9 @@ import uuid
 from dataclasses import dataclass, field
 from typing import Any
 
+from core.helper.CustomLog.sampling import SUPPRESSED_EVENT_TYPE, SuppressedSummary, log_sampler
+from core.helper.CustomLog.stream import stream_has_subscribers
+
 # ANSI 颜色代码
 _GREEN = "\033[92m"
 _ORANGE = "\033[38;5;208m"
@@ -206,11 +209,24 @@ class CustomLog:
     # ------------------------------------------------------------------
 
     def _execute(self) -> None:
-        """执行日志输出与存储。"""
+        """执行日志输出与存储。
+
+        写库前经过采样器：被采样丢弃或超出每秒上限的日志只打印不入库，
+        被抑制的条数会以一条 LOG_SUPPRESSED 汇总日志补写。
+        """
         if self.print_out:
             self._print()
         if self.sid:
-            self._store()
+            keep, summaries = log_sampler.admit(
+                event_type=self.event_type,
+                log_type=self.log_type,
+                level=self.log_level,
+                status=self.status,
+            )
+            for summary in summaries:
+                _store_suppressed_summary(summary)
+            if keep:
+                self._store()
 
     def _print(self) -> None:
         """根据样式将日志输出到控制台。"""
@@ -232,44 +248,93 @@ class CustomLog:
             return  # 无运行中的事件循环，跳过 DB 写入
         loop.create_task(self._async_store())
 
+    async def _interned_columns(self, session, kinds: tuple[str, ...]) -> dict[str, Any]:
+        """将重复字符串字段换成 log_strings 字典 id。
+
+        返回可直接传给 ORM 模型的列参数：已字典化的列写 *_id 并清空原文本列，
+        关闭字典化（LOG_INTERN_STRINGS=false）时原样写文本。
+        """
+        from core.config import settings
+
+        columns: dict[str, Any] = {kind: getattr(self, kind) for kind in kinds}
+        if not settings.LOG_INTERN_STRINGS:
+            return columns
+
+        from core.database.dao.log_strings import LogStringsDAO
+
+        ids = await LogStringsDAO.intern_many(session, columns)
+        for kind, string_id in ids.items():
+            columns[kind] = None
+            columns[f"{kind}_id"] = string_id
+        return columns
+
+    async def _publish(self, session, log_uuid: str, severity: str) -> None:
+        """在写库事务中推送一条系统日志通知（提交后才会送达订阅者）。"""
+        from core.helper.CustomLog.stream import publish_system_log
+
+        await publish_system_log(session, {
+            "uuid": log_uuid,
+            "log_level": self.log_level,
+            "log_type": self.log_type,
+            "content": self.content,
+            "event_type": self.event_type,
+            "status": self.status,
+            "severity": severity,
+            "trace_id": self.trace_id,
+            "client_ip": self.client_ip,
+            "request_method": self.request_method,
+            "request_url": self.request_url,
+            "service_name": self.service_name,
+            "host_name": self.host_name,
+            "error_code": self.error_code,
+            "error_msg": self.error_msg,
+            "metric_value": self.metric_value,
+            "created_at": datetime.datetime.now().isoformat(),
+        })
+
     async def _async_store(self) -> None:
         """实际执行数据库写入的异步方法。"""
         try:
+            from core.config import settings
             from core.database.connection.pgsql import get_session
+            from core.database.dao.log_strings import INTERNED_COLUMNS
 
             if self.sidp == "system":
                 from core.database.dao.system_logs import SystemLog
 
+                log_uuid = str(uuid.uuid4())
+                severity = _LEVEL_TO_SEVERITY.get(self.log_level, "INFO")
                 async with get_session() as session:
+                    strings = await self._interned_columns(session, INTERNED_COLUMNS["system_logs"])
                     session.add(
                         SystemLog(
-                            uuid=str(uuid.uuid4()),
+                            uuid=log_uuid,
                             log_level=self.log_level,
                             log_type=self.log_type,
                             content=self.content,
                             event_type=self.event_type,
                             status=self.status,
-                            severity=_LEVEL_TO_SEVERITY.get(self.log_level, "INFO"),
-                            service_name=self.service_name,
-                            host_name=self.host_name,
+                            severity=severity,
                             host_ip=self.host_ip,
                             process_id=self.process_id,
                             trace_id=self.trace_id,
                             client_ip=self.client_ip,
-                            user_agent=self.user_agent,
                             request_method=self.request_method,
-                            request_url=self.request_url,
                             error_code=self.error_code,
                             error_msg=self.error_msg,
                             metric_value=self.metric_value,
                             extra_data=_json_safe(self.extra_data) if self.extra_data else None,
+                            **strings,
                         )
                     )
+                    if settings.LOG_STREAM_ENABLED and stream_has_subscribers():
+                        await self._publish(session, log_uuid, severity)
             elif self.sidp == "personal" and (self.user_uuid or get_log_context().user_uuid):
                 from core.database.dao.personal_logs import PersonalLog
 
                 user_uuid = self.user_uuid or get_log_context().user_uuid
                 async with get_session() as session:
+                    strings = await self._interned_columns(session, INTERNED_COLUMNS["personal_logs"])
                     session.add(
                         PersonalLog(
                             uuid=str(uuid.uuid4()),
@@ -286,13 +351,12 @@ class CustomLog:
                             after_data=_json_safe(self.after_data) if self.after_data else None,
                             operation_result=self.operation_result,
                             client_ip=self.client_ip,
-                            user_agent=self.user_agent,
                             request_method=self.request_method,
-                            request_url=self.request_url,
                             trace_id=self.trace_id,
                             error_code=self.error_code,
                             error_msg=self.error_msg,
                             extra_data=_json_safe(self.extra_data) if self.extra_data else None,
+                            **strings,
                         )
                     )
         except Exception:
@@ -300,5 +364,26 @@ class CustomLog:
             pass
 
 
+def _store_suppressed_summary(summary: SuppressedSummary) -> None:
+    """写入一条"已抑制 N 条相似日志"的系统日志。"""
+    event_type, log_type, level = summary.key
+    CustomLog(
+        "WARNING",
+        f"[LogSampling] 已抑制 {summary.suppressed} 条相似日志 "
+        f"event_type={event_type or '*'} log_type={log_type or '*'} level={level or '*'}",
+        print_out=False,
+        sid=True,
+        sidp="system",
+        log_type="log_sampling",
+        event_type=SUPPRESSED_EVENT_TYPE,
+        metric_value=str(summary.suppressed),
+        extra_data={
+            "suppressed_event_type": event_type,
+            "suppressed_log_type": log_type,
+            "suppressed_level": level,
+        },
+    )
+
+
 # 简化别名
 CtLog = CustomLog
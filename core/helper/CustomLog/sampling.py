@@ -0,0 +1,188 @@
+"""CustomLog 持久化采样与限速。
+
+按 (event_type, log_type, log_level) 注册采样策略，在 CustomLog 写库前决定是否保留：
+
+* ``sample_ratio``   — 保留比例（0~1），按随机数采样；
+* ``max_per_second`` — 每秒最多保留条数，超出部分被抑制，
+  并在下一秒写入一条 ``LOG_SUPPRESSED`` 汇总日志（"已抑制 N 条相似日志"）。
+
+status=FAIL 或 level=ERROR 的日志永远保留，不参与采样与计数。
+策略匹配时字段为 None 表示通配，匹配字段越多优先级越高。
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from itertools import product
+from typing import Callable
+
+# 汇总日志自身的 event_type，永远不参与采样
+SUPPRESSED_EVENT_TYPE = "LOG_SUPPRESSED"
+
+# 策略键：(event_type, log_type, log_level)，None 为通配
+PolicyKey = tuple[str | None, str | None, str | None]
+
+
+@dataclass(frozen=True)
+class SamplingPolicy:
+    """单条采样策略。"""
+
+    sample_ratio: float = 1.0
+    max_per_second: int | None = None
+
+
+@dataclass(frozen=True)
+class SuppressedSummary:
+    """某策略在一个秒级窗口内被抑制的日志数。"""
+
+    key: PolicyKey
+    suppressed: int
+    window_start: int
+
+
+# 按具体程度从高到低排列的 8 种通配组合（True 表示使用该字段）
+_LOOKUP_ORDER: list[tuple[bool, bool, bool]] = sorted(
+    product((True, False), repeat=3), key=lambda mask: -sum(mask)
+)
+
+
+class LogSampler:
+    """采样策略注册表 + 每秒限速计数器（线程安全）。"""
+
+    def __init__(
+        self,
+        rng: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._rng = rng
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._policies: dict[PolicyKey, SamplingPolicy] = {}
+        # key → [window, kept, suppressed]
+        self._windows: dict[PolicyKey, list[int]] = {}
+        self._last_sweep = 0
+        self.enabled = True
+
+    # ------------------------------------------------------------------
+    # 注册
+    # ------------------------------------------------------------------
+
+    def register(
+        self,
+        policy: SamplingPolicy,
+        *,
+        event_type: str | None = None,
+        log_type: str | None = None,
+        level: str | None = None,
+    ) -> None:
+        """注册（或覆盖）一条策略。"""
+        key = (event_type, log_type, level.upper() if level else None)
+        with self._lock:
+            self._policies[key] = policy
+
+    def clear(self) -> None:
+        """清空所有策略与计数。"""
+        with self._lock:
+            self._policies.clear()
+            self._windows.clear()
+
+    def resolve(
+        self,
+        event_type: str | None,
+        log_type: str | None,
+        level: str | None,
+    ) -> tuple[PolicyKey, SamplingPolicy] | None:
+        """返回最具体的匹配策略，无匹配时返回 None。"""
+        if not self._policies:
+            return None
+        fields = (event_type, log_type, level)
+        for mask in _LOOKUP_ORDER:
+            key: PolicyKey = tuple(f if use else None for f, use in zip(fields, mask))  # type: ignore[assignment]
+            policy = self._policies.get(key)
+            if policy is not None:
+                return key, policy
+        return None
+
+    # ------------------------------------------------------------------
+    # 决策
+    # ------------------------------------------------------------------
+
+    def admit(
+        self,
+        *,
+        event_type: str | None,
+        log_type: str | None,
+        level: str,
+        status: str | None,
+    ) -> tuple[bool, list[SuppressedSummary]]:
+        """判断一条日志是否应写库，并返回需要补写的抑制汇总。"""
+        if not self.enabled:
+            return True, []
+        if status == "FAIL" or level == "ERROR" or event_type == SUPPRESSED_EVENT_TYPE:
+            return True, []
+
+        with self._lock:
+            now = int(self._clock())
+            summaries = self._sweep(now)
+
+            matched = self.resolve(event_type, log_type, level)
+            if matched is None:
+                return True, summaries
+            key, policy = matched
+
+            if policy.sample_ratio < 1.0 and self._rng() >= policy.sample_ratio:
+                return False, summaries
+
+            if policy.max_per_second is None:
+                return True, summaries
+
+            window = self._windows.get(key)
+            if window is None or window[0] != now:
+                # 上一窗口的抑制计数已在 _sweep 中收集
+                window = [now, 0, 0]
+                self._windows[key] = window
+            if window[1] >= policy.max_per_second:
+                window[2] += 1
+                return False, summaries
+            window[1] += 1
+            return True, summaries
+
+    def _sweep(self, now: int) -> list[SuppressedSummary]:
+        """每秒最多一次：收集已结束窗口中的抑制计数（需持有锁）。"""
+        if now == self._last_sweep:
+            return []
+        self._last_sweep = now
+        summaries: list[SuppressedSummary] = []
+        for key, window in self._windows.items():
+            if window[0] < now and window[2]:
+                summaries.append(SuppressedSummary(key, window[2], window[0]))
+                window[2] = 0
+        return summaries
+
+
+def _install_default_policies(sampler: LogSampler) -> None:
+    """按配置注册默认策略：登录成功事件、防火墙日志、慢语句日志。"""
+    from core.config import settings
+
+    sampler.enabled = settings.LOG_SAMPLING_ENABLED
+    cap = settings.LOG_RATE_CAP_PER_SECOND or None
+    sampler.register(
+        SamplingPolicy(settings.LOG_SAMPLE_LOGIN_SUCCESS_RATIO, cap),
+        event_type="LOGIN",
+    )
+    sampler.register(
+        SamplingPolicy(settings.LOG_SAMPLE_FIREWALL_RATIO, cap),
+        log_type="firewall",
+    )
+    # 数据库变慢时慢语句日志会成批出现，再逐条写库只会加重负载；
+    # 超出上限的条数以 LOG_SUPPRESSED 汇总，完整计数仍见 /admin/metrics/db
+    sampler.register(
+        SamplingPolicy(1.0, cap),
+        event_type="SLOW_STATEMENT",
+    )
+
+
+# 全局采样器
+log_sampler = LogSampler()
+_install_default_policies(log_sampler)
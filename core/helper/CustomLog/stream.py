@@ -0,0 +1,221 @@
+"""系统日志实时推送（PostgreSQL LISTEN/NOTIFY）。
+
+写入端：CustomLog 在写入 system_logs 的同一事务中执行 ``pg_notify``，
+事务提交后通知才会投递，回滚的日志不会被推送。``pg_notify`` 多一次往返，且提交时要取全局的
+NOTIFY 队列锁，因此只在有订阅者时发送：持有 LISTEN 连接的进程定期刷新 Redis 标志
+``logstream:active``（带 TTL），写入端按 :func:`stream_has_subscribers` 的结果（进程内缓存 1 秒）决定是否推送。
+
+订阅端：每个 worker 只持有一条 LISTEN 连接（:class:`LogStreamHub`），
+第一个订阅者出现时建立、最后一个离开时关闭；收到的通知按各订阅者的过滤条件
+（与 ``SystemLogsDAO.search`` 相同，见 :mod:`core.helper.CustomLog.filters`）分发到各自队列。
+慢消费者的队列写满时丢弃最旧的一条并计数，不会阻塞其他订阅者。
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Mapping
+
+from core.helper.CustomLog.filters import match_log_row
+
+# NOTIFY 通道名
+LOG_STREAM_CHANNEL = "system_logs_stream"
+
+# 跨进程的“有订阅者”标志：LISTEN 连接存活期间每 _ACTIVE_REFRESH_SECONDS 秒刷新，TTL 到期即视为无订阅者
+LOG_STREAM_ACTIVE_KEY = "logstream:active"
+_ACTIVE_KEY_TTL_SECONDS = 30
+_ACTIVE_REFRESH_SECONDS = 10
+# 写入端查询标志的进程内缓存时间（新订阅者最多错过这段时间内的日志）
+_ACTIVE_CHECK_INTERVAL = 1.0
+_active_checked_at = 0.0
+_active = True
+
+# pg_notify 负载上限为 8000 字节，长文本字段截断后推送
+_TRUNCATE_FIELDS: dict[str, int] = {
+    "content": 2000,
+    "error_msg": 1000,
+    "request_url": 500,
+}
+
+
+def build_notify_payload(row: Mapping[str, Any]) -> str:
+    """将一条日志序列化为 NOTIFY 负载（JSON 字符串）。"""
+    data = {k: v for k, v in row.items() if v is not None}
+    for key, max_len in _TRUNCATE_FIELDS.items():
+        value = data.get(key)
+        if isinstance(value, str) and len(value) > max_len:
+            data[key] = value[:max_len] + "…"
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+async def publish_system_log(session, row: Mapping[str, Any]) -> None:
+    """在当前事务中发送一条系统日志通知。"""
+    from sqlalchemy import func, select
+
+    await session.execute(select(func.pg_notify(LOG_STREAM_CHANNEL, build_notify_payload(row))))
+
+
+def mark_stream_active() -> None:
+    """设置 / 续期“有订阅者”标志（Redis 不可用时忽略）。"""
+    from core.database.connection.redis import redis_conn
+    from core.helper.CustomLog.index import CustomLog
+
+    client = redis_conn.get_client()
+    if client is None:
+        return
+    try:
+        client.set(LOG_STREAM_ACTIVE_KEY, "1", ex=_ACTIVE_KEY_TTL_SECONDS)
+    except Exception as exc:
+        CustomLog("WARNING", f"[LogStream] 订阅标志刷新失败: {exc}")
+
+
+def stream_has_subscribers() -> bool:
+    """是否有进程在监听日志推送；结果缓存 _ACTIVE_CHECK_INTERVAL 秒。
+
+    Redis 不可用时无法判断，照常推送（与未启用该判断前的行为一致）。
+    """
+    global _active, _active_checked_at
+    from core.database.connection.redis import redis_conn
+
+    now = time.monotonic()
+    if now - _active_checked_at < _ACTIVE_CHECK_INTERVAL:
+        return _active
+    client = redis_conn.get_client()
+    try:
+        _active = client is None or bool(client.exists(LOG_STREAM_ACTIVE_KEY))
+    except Exception:
+        _active = True
+    _active_checked_at = now
+    return _active
+
+
+class LogSubscription:
+    """单个订阅者：过滤条件 + 有界队列。"""
+
+    def __init__(self, filters: Mapping[str, Any], maxsize: int):
+        self.filters = {k: v for k, v in filters.items() if v not in (None, "")}
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, row: dict[str, Any]) -> None:
+        """非阻塞投递；队列已满时丢弃最旧的一条。"""
+        if not match_log_row(row, self.filters):
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(row)
+
+
+def _listener_dsn() -> str:
+    """asyncpg 只接受 postgresql:// 形式的 DSN。"""
+    from core.config import settings
+
+    url = settings.DATABASE_URL
+    if not url:
+        raise EnvironmentError("环境变量 DATABASE_URL 未设置")
+    for prefix in ("postgresql+asyncpg://", "postgresql+psycopg2://"):
+        if url.startswith(prefix):
+            return "postgresql://" + url[len(prefix):]
+    return url
+
+
+async def _default_connect():
+    import asyncpg
+
+    return await asyncpg.connect(_listener_dsn())
+
+
+class LogStreamHub:
+    """进程内的日志推送中心：一条 LISTEN 连接，多个订阅者。"""
+
+    def __init__(
+        self,
+        channel: str = LOG_STREAM_CHANNEL,
+        connect: Callable[[], Awaitable[Any]] = _default_connect,
+        retry_interval: float = 3.0,
+    ):
+        self.channel = channel
+        self._connect = connect
+        self._retry_interval = retry_interval
+        self._subscribers: set[LogSubscription] = set()
+        self._listener_task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, filters: Mapping[str, Any], maxsize: int | None = None) -> LogSubscription:
+        """注册订阅者，必要时启动监听任务。"""
+        if maxsize is None:
+            from core.config import settings
+
+            maxsize = settings.LOG_STREAM_QUEUE_SIZE
+        subscription = LogSubscription(filters, maxsize)
+        self._subscribers.add(subscription)
+        mark_stream_active()
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.get_running_loop().create_task(self._listen_loop())
+        return subscription
+
+    async def unsubscribe(self, subscription: LogSubscription) -> None:
+        """移除订阅者；没有订阅者时关闭监听连接。"""
+        self._subscribers.discard(subscription)
+        if not self._subscribers:
+            await self.close()
+
+    async def close(self) -> None:
+        """停止监听任务（应用关闭时调用）。"""
+        task, self._listener_task = self._listener_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def dispatch(self, payload: str) -> None:
+        """解析一条通知并分发给匹配的订阅者。"""
+        try:
+            row = json.loads(payload)
+        except ValueError:
+            return
+        for subscription in list(self._subscribers):
+            subscription.offer(row)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.dispatch(payload)
+
+    async def _listen_loop(self) -> None:
+        """保持 LISTEN 连接，断线后按 retry_interval 重连。"""
+        from core.helper.CustomLog.index import CustomLog
+
+        while True:
+            conn = None
+            try:
+                conn = await self._connect()
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: lost.set())
+                await conn.add_listener(self.channel, self._on_notify)
+                while not lost.is_set():
+                    mark_stream_active()
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=_ACTIVE_REFRESH_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                CustomLog("WARNING", "[LogStream] 监听连接已断开，正在重连...")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                CustomLog("ERROR", f"[LogStream] 监听连接失败: {exc}")
+            finally:
+                if conn is not None and not conn.is_closed():
+                    try:
+                        await conn.close()
+                    except Exception:
+                        pass
+            await asyncio.sleep(self._retry_interval)
+
+
+# 全局单例（每个 worker 一个）
+log_stream_hub = LogStreamHub()
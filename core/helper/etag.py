@@ -0,0 +1,95 @@
+"""条件 GET：基于 Redis 版本戳的 ETag / If-None-Match。
+
+每个资源（单个用户、题库等）在 Redis 中有一个随机版本戳 ``etag:{资源}``：
+
+- 读取接口先取版本戳作为 ETag（不存在时 ``SET NX`` 生成一个新的），
+  与请求的 ``If-None-Match`` 相同则直接返回 304，不再查询数据库；
+- 写入路径调用 :func:`bump_etag`，在事务提交后删除版本戳，下次读取生成新的 ETag。
+
+版本戳是随机值而不是自增计数，Redis 数据丢失或 key 过期后重新生成的 ETag 不会与旧值重复；
+key 带 TTL，绕过接口直接改库（如 CLI 的 DB 模式）时最多在 TTL 内返回旧的 304。
+Redis 不可用时不产生 ETag，接口照常返回完整响应。
+
+典型用法::
+
+    etag = resource_etag(key, ttl)           # 必须在读取数据之前获取
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    ...  # 查询并返回数据，response 已带 ETag 头
+"""
+
+import uuid as uuid_lib
+
+from fastapi import Request, Response
+
+from core.database.connection.pgsql import call_after_commit
+from core.database.connection.redis import redis_conn
+from core.helper.CustomLog.index import CustomLog
+
+__all__ = [
+    "ETAG_PREFIX",
+    "resource_etag",
+    "bump_etag",
+    "not_modified",
+]
+
+ETAG_PREFIX = "etag:"
+
+
+def resource_etag(key: str, ttl: int) -> str | None:
+    """返回资源当前的弱 ETag（``W/"..."``），Redis 不可用时返回 None。
+
+    需在读取数据之前调用：读取期间发生的写入会删除版本戳，下次请求必然拿到新的 ETag。
+    """
+    client = redis_conn.get_client()
+    if client is None:
+        return None
+    try:
+        stamp = client.get(key)
+        if stamp is None:
+            fresh = uuid_lib.uuid4().hex[:16]
+            # 并发首次读取时只有一个 SET 生效，其余读取胜出者的值
+            stamp = fresh if client.set(key, fresh, nx=True, ex=ttl) else client.get(key)
+    except Exception as exc:
+        CustomLog("WARNING", f"[ETag] 读取版本戳失败 key={key}: {exc}")
+        return None
+    return f'W/"{stamp}"' if stamp else None
+
+
+def bump_etag(*keys: str) -> None:
+    """资源写入后调用：当前工作单元提交后删除版本戳（回滚则不删除）。"""
+    if not keys:
+        return
+
+    def _bump() -> None:
+        client = redis_conn.get_client()
+        if client is None:
+            return
+        try:
+            client.delete(*keys)
+        except Exception as exc:
+            CustomLog("WARNING", f"[ETag] 删除版本戳失败 count={len(keys)}: {exc}")
+
+    call_after_commit(_bump)
+
+
+def _matches(header: str, etag: str) -> bool:
+    """If-None-Match 的弱比较：忽略 ``W/`` 前缀，``*`` 匹配任意 ETag。"""
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def not_modified(request: Request, response: Response, etag: str | None) -> Response | None:
+    """在 ``response`` 上设置 ETag；请求的 If-None-Match 命中时返回 304 响应，否则返回 None。"""
+    if etag is None:
+        return None
+    response.headers["ETag"] = etag
+    header = request.headers.get("if-none-match")
+    if header and _matches(header, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -1,13 +1,14 @@
-import json
 from typing import List
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
 
 from core.config import settings
-from core.database.connection.pgsql import get_session
+from core.database.connection.pgsql import call_after_commit, get_session
 from core.database.connection.redis import redis_conn
+from core.database.dao.base import Record
 from core.database.dao.users import UsersDAO, User
+from core.helper.etag import ETAG_PREFIX, bump_etag
 from core.security.jwt_handler import decode_access_token
 from core.security.rbac import role_includes
 from core.helper.CustomLog.index import CustomLog
@@ -18,26 +19,51 @@ temp_token_scheme = HTTPBearer()
 USER_CACHE_PREFIX = "auth:user:"
 USER_CACHE_TTL_SECONDS = settings.AUTH_USER_CACHE_TTL_SECONDS
 
+# GET /users/me 的 ETag 版本戳：etag:user:{uuid}
+USER_ETAG_PREFIX = f"{ETAG_PREFIX}user:"
+
 
 def _get_user_cache_key(user_uuid: str) -> str:
     return f"{USER_CACHE_PREFIX}{user_uuid}"
 
 
+def user_etag_key(user_uuid: str) -> str:
+    return f"{USER_ETAG_PREFIX}{user_uuid}"
+
+
+def bump_user_etag(*user_uuids: str) -> None:
+    """用户数据写入后调用：提交后更换其 ETag 版本戳（不影响鉴权缓存）。"""
+    bump_etag(*(user_etag_key(uid) for uid in user_uuids))
+
+
 def invalidate_user_cache(user_uuid: str) -> None:
-    """主动失效用户缓存。
+    """在当前工作单元提交后失效用户缓存，并更换该用户的 ETag 版本戳。
+
+    推迟到提交之后：否则并发的 :func:`get_current_user` 可能在提交前按旧数据重新写入缓存，
+    封禁 / 改角色在缓存 TTL 内不生效。不在工作单元中时立即删除。
 
     注意：为了避免在没有 Redis 的情况下影响主流程，这里只记录日志，不抛异常。
     """
-    client = redis_conn.get_client()
-    if client is None:
-        return
-    try:
-        client.delete(_get_user_cache_key(user_uuid))
-    except Exception as exc:
-        CustomLog("WARNING", f"[RBAC] 用户缓存失效失败 uuid={user_uuid} exc={exc}")
-
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
-    """基于提供的 JWT token 获取当前用户信息。"""
+    bump_user_etag(user_uuid)
+
+    def _delete() -> None:
+        client = redis_conn.get_client()
+        if client is None:
+            return
+        try:
+            client.delete(_get_user_cache_key(user_uuid))
+        except Exception as exc:
+            CustomLog("WARNING", f"[RBAC] 用户缓存失效失败 uuid={user_uuid} exc={exc}")
+
+    call_after_commit(_delete)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Record:
+    """基于提供的 JWT token 获取当前用户信息。
+
+    返回 ``UsersDAO`` "auth" 投影的 :class:`Record`（只读 Mapping，用法同字典）；
+    Redis 中以 :meth:`Record.dumps` 的 JSON 数组缓存，列摘要与当前投影不一致的缓存视为未命中。
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="无法验证凭据",
@@ -57,25 +83,24 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
         try:
             cached = client.get(_get_user_cache_key(user_uuid))
             if cached:
-                return json.loads(cached)
+                return UsersDAO.record_type("auth").loads(cached)
+        except ValueError:
+            # 投影列在部署前后发生变化时写入的旧缓存：重新查询并覆盖
+            pass
         except Exception as exc:
             CustomLog("WARNING", f"[RBAC] Redis 读取用户缓存失败 uuid={user_uuid} exc={exc}")
 
-    user_dict = await UsersDAO().find_by_uuid(user_uuid)
-    if user_dict is None:
+    # 只查询鉴权投影（不含 password / other_info），缓存中也只保存这些字段
+    user = await UsersDAO().find_record_by_uuid(user_uuid, columns="auth")
+    if user is None:
         raise credentials_exception
-    user_dict.pop("password", None)
 
     if client is not None:
         try:
-            client.setex(
-                _get_user_cache_key(user_uuid),
-                USER_CACHE_TTL_SECONDS,
-                json.dumps(user_dict, ensure_ascii=False, default=str),
-            )
+            client.setex(_get_user_cache_key(user_uuid), USER_CACHE_TTL_SECONDS, user.dumps())
         except Exception as exc:
             CustomLog("WARNING", f"[RBAC] Redis 写入用户缓存失败 uuid={user_uuid} exc={exc}")
-    return user_dict
+    return user
 
 class RoleChecker:
     """检查用户是否具有所需的角色权限。"""
@@ -140,9 +165,7 @@ async def get_temp_user(
     if user_uuid is None:
         raise credentials_exception
 
-    user_dict = await UsersDAO().find_by_uuid(user_uuid)
+    user_dict = await UsersDAO().find_by_uuid(user_uuid, columns="auth")
     if user_dict is None:
         raise credentials_exception
-
-    user_dict.pop("password", None)
     return user_dict
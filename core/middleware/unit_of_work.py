@@ -0,0 +1,32 @@
+"""请求级工作单元依赖。
+
+挂在 API 路由上后，同一请求内的 DAO 调用（``get_session()``）共享一个 Session 与连接，
+在响应发送前统一提交（4xx 业务异常同样提交，5xx / 未处理异常回滚），
+并统计本请求的连接池签出次数（见 :mod:`core.database.connection.metrics`）
+与执行的语句数（见 :mod:`core.database.connection.statements`）。
+
+AsyncSession 在首次执行语句时才签出连接：不访问数据库的请求不会占用连接。
+但工作单元的事务一旦开启（如鉴权查询），连接会保持签出直到响应前提交；
+需要长时间读取请求体的路由改挂 :func:`request_db_metrics`，只统计、不开启工作单元。
+"""
+
+from core.config import settings
+from core.database.connection.metrics import track_request_checkouts
+from core.database.connection.pgsql import unit_of_work
+from core.database.connection.statements import track_request_statements
+
+
+async def request_unit_of_work():
+    """FastAPI 依赖：以 ``Depends(request_unit_of_work, scope="function")`` 挂载。"""
+    with track_request_checkouts(), track_request_statements():
+        if not settings.DB_REQUEST_UNIT_OF_WORK:
+            yield None
+            return
+        async with unit_of_work() as session:
+            yield session
+
+
+async def request_db_metrics():
+    """FastAPI 依赖：只统计签出次数与语句数，不开启工作单元（各 ``get_session()`` 独立提交）。"""
+    with track_request_checkouts(), track_request_statements():
+        yield
@@ -1,26 +1,45 @@
+import codecs
+import csv
 import json
 import re
 import uuid as uuid_lib
-from typing import Any, Literal
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from pydantic import BaseModel, Field, field_validator, model_validator
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
 from sqlalchemy import select as sa_select
 
 from core.config import settings
-from core.database.connection.pgsql import get_session
+from core.database.connection import metrics as db_metrics
+from core.database.connection import statements as db_statements
+from core.database.connection.pgsql import call_after_commit, get_session, replica_status, savepoint
 from core.database.connection.redis import redis_conn
-from core.database.dao.register_questions import RegisterQuestionsDAO
+from core.database.dao.base import Page, decode_cursor
+from core.database.dao.log_rollups import FIREWALL_ROLLUP_DIMENSIONS, LOG_ROLLUP_DIMENSIONS, LogRollupsDAO
+from core.database.dao.personal_logs import PersonalLogsDAO
+from core.database.dao.register_questions import QUESTIONS_ETAG_KEY, RegisterQuestionsDAO
 from core.database.dao.refresh_tokens import RefreshTokensDAO
 from core.database.dao.users import UsersDAO, User
-from core.helper.CustomLog.index import CustomLog
-from core.middleware.auth.dependencies import USER_CACHE_PREFIX, MinRoleChecker, get_current_user, invalidate_user_cache
+from core.helper.CustomLog.index import CustomLog, get_log_context
+from core.helper.etag import not_modified, resource_etag
+from core.middleware.auth.dependencies import (
+    USER_CACHE_PREFIX,
+    MinRoleChecker,
+    bump_user_etag,
+    get_current_user,
+    invalidate_user_cache,
+)
 from core.security.hash import get_password_hash
 from core.security.rbac import Role
 
 
 router = APIRouter(prefix="/admin", tags=["Admin v1"])
 
+# 需要长时间读取请求体的上传接口：不挂请求级工作单元（见 modules/api/v1/router.py），
+# 鉴权查询与最终写入各自使用短事务，读取请求体期间不占用连接池中的连接
+upload_router = APIRouter(prefix="/admin", tags=["Admin v1"])
+
 
 def _verify_super_password(password: str) -> None:
     """校验超级密码 SUPER_PASSWORD。
@@ -47,6 +66,36 @@ def _client_ip(request: Request) -> str:
     return request.client.host if request.client else "unknown"
 
 
+def _page_args(cursor: str | None, offset: int) -> dict[str, int | None]:
+    """解析列表接口的 cursor 参数为 after_id / before_id；游标非法或与 offset 同时使用时抛 400。"""
+    if cursor is None:
+        return {"after_id": None, "before_id": None}
+    if offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor 与 offset 不能同时使用",
+        )
+    try:
+        after_id, before_id = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的分页游标",
+        ) from None
+    return {"after_id": after_id, "before_id": before_id}
+
+
+def _set_page_headers(response: Response, page: Page) -> Page:
+    """将翻页游标写入 X-Next-Cursor / X-Prev-Cursor 响应头（请求了总数时另写 X-Total-Count），响应体仍为列表。"""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.prev_cursor:
+        response.headers["X-Prev-Cursor"] = page.prev_cursor
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
+    return page
+
+
 def _log_user_personal_event(
     *,
     request: Request,
@@ -82,17 +131,27 @@ def _log_user_personal_event(
 
 
 def _batch_invalidate_user_cache(uuids: list[str]) -> None:
-    """批量失效 Redis 用户缓存，使用 pipeline 减少网络往返。"""
-    client = redis_conn.get_client()
-    if client is None:
+    """批量失效 Redis 用户缓存：事务提交后以一个 pipeline 删除，减少网络往返。
+
+    推迟到提交之后，避免并发请求在提交前按旧数据重新写入缓存。
+    """
+    if not uuids:
         return
-    try:
-        pipe = client.pipeline()
-        for uid in uuids:
-            pipe.delete(f"{USER_CACHE_PREFIX}{uid}")
-        pipe.execute()
-    except Exception as exc:
-        CustomLog("WARNING", f"[Admin] 批量缓存失效失败 count={len(uuids)} exc={exc}")
+    bump_user_etag(*uuids)
+
+    def _delete() -> None:
+        client = redis_conn.get_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            for uid in uuids:
+                pipe.delete(f"{USER_CACHE_PREFIX}{uid}")
+            pipe.execute()
+        except Exception as exc:
+            CustomLog("WARNING", f"[Admin] 批量缓存失效失败 count={len(uuids)} exc={exc}")
+
+    call_after_commit(_delete)
 
 
 class ResetPasswordRequest(BaseModel):
@@ -108,6 +167,17 @@ class ResetPasswordRequest(BaseModel):
         return v
 
 
+class BatchUserStatusRequest(BaseModel):
+    """批量修改用户状态请求体。"""
+    uuids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.ADMIN_BATCH_STATUS_MAX_USERS,
+        description="要修改的用户 UUID 列表",
+    )
+    status: Literal["normal", "disabled", "banned"] = Field(..., description="目标状态")
+
+
 class SensitiveDataRequest(BaseModel):
     """敏感信息查看请求体。"""
     super_password: str = Field(..., description="超级密码")
@@ -116,23 +186,30 @@ class SensitiveDataRequest(BaseModel):
 
 @router.get("/users", response_model=list[dict[str, Any]])
 async def admin_list_users(
+    response: Response,
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
     keyword: str | None = Query(None, description="搜索关键词（用户名/邮箱/昵称/真实姓名）"),
     status: str | None = Query(None, description="按状态筛选（normal/disabled/banned/pending_deletion）"),
     role: str | None = Query(None, description="按角色筛选（superadmin/songlist_editor/normal-user）"),
+    cursor: str | None = Query(None, description="翻页游标（取自上一页的 X-Next-Cursor / X-Prev-Cursor 响应头）"),
+    with_total: bool = Query(False, description="同时返回匹配总数（X-Total-Count 响应头），代替 /admin/users/total"),
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
     """管理员：分页搜索用户列表。
 
     支持关键词模糊搜索、状态筛选、角色筛选。
+    按 id 键集分页：下一页 / 上一页的游标通过 X-Next-Cursor / X-Prev-Cursor 响应头返回。
+    ``with_total=true`` 时在同一条查询中以窗口计数带出匹配总数，写入 X-Total-Count 响应头。
     仅 superadmin 可访问。
     """
-    async with get_session() as session:
-        return await UsersDAO.search_users(
+    page_args = _page_args(cursor, offset)
+    async with get_session(readonly=True) as session:
+        page = await UsersDAO.search_users(
             session, keyword=keyword, status=status, role=role,
-            limit=limit, offset=offset,
+            limit=limit, offset=offset, with_total=with_total, **page_args,
         )
+    return _set_page_headers(response, page)
 
 
 @router.get("/users/total", response_model=dict[str, Any])
@@ -143,7 +220,7 @@ async def admin_users_total(
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
     """管理员：获取用户总数（可选筛选）。"""
-    async with get_session() as session:
+    async with get_session(readonly=True) as session:
         total = await UsersDAO.count_users(session, keyword=keyword, status=status, role=role)
     return {"total": total}
 
@@ -153,10 +230,19 @@ async def admin_users_stats(
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
     """管理员：用户统计（总数 + 各状态分布）。"""
-    async with get_session() as session:
+    async with get_session(readonly=True) as session:
         return await UsersDAO.get_user_stats(session)
 
 
+def _raise_if_duplicate_student(exc: BaseException) -> None:
+    """同名同班级唯一索引冲突时转为 409（与修改个人信息接口一致），其他异常由调用方继续抛出。"""
+    if UsersDAO.is_duplicate_student(exc):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="该姓名和班级的学生已存在",
+        ) from None
+
+
 @router.post("/users", response_model=dict[str, Any])
 async def admin_create_user(
     payload: dict[str, Any],
@@ -170,7 +256,12 @@ async def admin_create_user(
         payload["password"] = get_password_hash(str(payload["password"]))
     if "uuid" not in payload or not payload["uuid"]:
         payload["uuid"] = str(uuid_lib.uuid4())
-    created = await UsersDAO().create(payload)
+    try:
+        async with savepoint():
+            created = await UsersDAO().create(payload)
+    except Exception as exc:
+        _raise_if_duplicate_student(exc)
+        raise
     invalidate_user_cache(created.get("uuid") or "")
     return created
 
@@ -191,7 +282,12 @@ async def admin_update_user(
     if payload.get("password"):
         payload["password"] = get_password_hash(str(payload["password"]))
 
-    updated = await UsersDAO().update(user_uuid, payload)
+    try:
+        async with savepoint():
+            updated = await UsersDAO().update(user_uuid, payload)
+    except Exception as exc:
+        _raise_if_duplicate_student(exc)
+        raise
     if updated is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
     invalidate_user_cache(user_uuid)
@@ -282,6 +378,87 @@ async def admin_batch_delete_users(
     return {"deleted": deleted_count}
 
 
+# 批量修改状态时各目标状态对应的个人日志事件类型（与单个用户的 ban/disable/enable/unban 接口一致）
+_STATUS_EVENT_TYPES = {"banned": "USER_BAN", "disabled": "USER_DISABLE", "normal": "USER_ENABLE"}
+
+
+@router.post("/users/batch-status", response_model=dict[str, Any])
+async def admin_batch_update_user_status(
+    request: Request,
+    payload: BatchUserStatusRequest,
+    current_user: dict = Depends(get_current_user),
+    _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
+):
+    """管理员：批量修改用户状态（封禁 / 禁用 / 恢复正常）。
+
+    1. 单条 ``UPDATE ... RETURNING`` 修改全部用户，超级管理员、不存在或已处于目标状态的用户跳过
+    2. 目标状态为 banned / disabled 时，单条 UPDATE 撤销这些用户的全部 refresh token
+    3. 事务提交后以一个 Redis pipeline 失效用户缓存
+    4. 个人日志（审计）以一条多行 INSERT 在同一事务中写入，另记一条系统日志
+    """
+    uuids = list(dict.fromkeys(payload.uuids))
+    if current_user["uuid"] in uuids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="批量修改列表中包含当前登录的管理员账户，已取消操作",
+        )
+
+    async with get_session() as session:
+        changed = await UsersDAO.batch_set_status(
+            session, uuids, payload.status, protected_roles=(Role.SUPERADMIN.value,)
+        )
+    changed_uuids = [row["uuid"] for row in changed]
+
+    revoked = 0
+    if payload.status != "normal":
+        revoked = await RefreshTokensDAO.revoke_all_for_users(changed_uuids)
+    _batch_invalidate_user_cache(changed_uuids)
+
+    admin_uuid = current_user.get("uuid")
+    client_ip = _client_ip(request)
+    trace_id = get_log_context().trace_id
+    entries = []
+    for row in changed:
+        event_type = _STATUS_EVENT_TYPES[payload.status]
+        if payload.status == "normal" and row["before"] == "banned":
+            event_type = "USER_UNBAN"
+        entries.append({
+            "user_uuid": row["uuid"],
+            "log_level": "SUCCESS",
+            "log_type": "admin",
+            "content": f"[Admin] 管理员 {admin_uuid} 批量修改用户状态为 {payload.status}",
+            "event_type": event_type,
+            "status": "SUCCESS",
+            "target_type": "USER",
+            "target_id": row["uuid"],
+            "before_data": {"current_status": row["before"]},
+            "after_data": {"current_status": payload.status},
+            "client_ip": client_ip,
+            "request_method": request.method,
+            "trace_id": trace_id,
+        })
+    await PersonalLogsDAO.write_many(
+        entries, user_agent=request.headers.get("user-agent"), request_url=str(request.url)
+    )
+
+    changed_set = set(changed_uuids)
+    skipped = [uid for uid in uuids if uid not in changed_set]
+    CustomLog(
+        "SUCCESS",
+        f"[Admin] 批量修改用户状态 status={payload.status} count={len(uuids)} "
+        f"updated={len(changed_uuids)} revoked_tokens={revoked}",
+        sid=True,
+        sidp="system",
+        log_type="admin",
+        event_type="USER_BATCH_STATUS",
+        client_ip=client_ip,
+        request_method=request.method,
+        request_url=str(request.url),
+        user_agent=request.headers.get("user-agent"),
+    )
+    return {"updated": len(changed_uuids), "skipped": skipped, "revoked_tokens": revoked}
+
+
 @router.delete("/users/{user_uuid}", response_model=dict[str, Any])
 async def admin_delete_user(
     request: Request,
@@ -310,7 +487,7 @@ async def admin_delete_user(
         )
 
     async with get_session() as session:
-        target_user = await UsersDAO().find_by_uuid(user_uuid)
+        target_user = await UsersDAO().find_by_uuid(user_uuid, columns="auth")
         if target_user is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
 
@@ -356,7 +533,7 @@ async def admin_disable_user(
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
     """管理员：禁用用户。"""
-    target_user = await UsersDAO().find_by_uuid(user_uuid)
+    target_user = await UsersDAO().find_by_uuid(user_uuid, columns="auth")
     if target_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
 
@@ -384,7 +561,7 @@ async def admin_enable_user(
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
     """管理员：启用用户。"""
-    target_user = await UsersDAO().find_by_uuid(user_uuid)
+    target_user = await UsersDAO().find_by_uuid(user_uuid, columns="auth")
     if target_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
 
@@ -412,7 +589,7 @@ async def admin_ban_user(
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
     """管理员：封禁用户。"""
-    target_user = await UsersDAO().find_by_uuid(user_uuid)
+    target_user = await UsersDAO().find_by_uuid(user_uuid, columns="auth")
     if target_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
 
@@ -440,7 +617,7 @@ async def admin_unban_user(
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
     """管理员：解除封禁。"""
-    target_user = await UsersDAO().find_by_uuid(user_uuid)
+    target_user = await UsersDAO().find_by_uuid(user_uuid, columns="auth")
     if target_user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
 
@@ -519,7 +696,9 @@ async def admin_sensitive_data(
 
     # 2. 批量查询用户
     async with get_session() as session:
-        users = await UsersDAO.find_by_uuids(session, payload.uuids)
+        users = await UsersDAO.find_by_uuids(
+            session, payload.uuids, columns=("uuid", "real_name", "class")
+        )
 
     # 3. 只返回 real_name 和 class
     result: dict[str, dict[str, str | None]] = {}
@@ -610,49 +789,74 @@ class BatchStatusRequest(BaseModel):
     status: Literal["active", "inactive"] = Field(..., description="目标状态")
 
 
+def _questions_not_modified(request: Request, response: Response) -> Response | None:
+    """题目读取接口的条件 GET：题目未变更（If-None-Match 命中）时返回 304，须在查询之前调用。"""
+    etag = resource_etag(QUESTIONS_ETAG_KEY, settings.ETAG_VERSION_TTL_SECONDS)
+    return not_modified(request, response, etag)
+
+
+def _replica_ok(response: Response) -> bool:
+    """未签发 ETag 时才可读只读副本。
+
+    写入删除版本戳后，下一次读取会生成新 ETag；若此时读到延迟副本上的旧数据，
+    客户端会在 ``ETAG_VERSION_TTL_SECONDS`` 内对旧数据一直收到 304，因此带 ETag 的响应读主库。
+    """
+    return "ETag" not in response.headers
+
+
 @router.get("/questions/stats", response_model=dict[str, Any])
 async def admin_questions_stats(
+    request: Request,
+    response: Response,
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
-    """管理员：题目统计（按题型分布）。"""
-    total = await RegisterQuestionsDAO.count_questions()
-    choice_count = await RegisterQuestionsDAO.count_by_type("choice")
-    true_false_count = await RegisterQuestionsDAO.count_by_type("true_false")
-    fill_blank_count = await RegisterQuestionsDAO.count_by_type("fill_blank")
-    return {
-        "total": total,
-        "choice": choice_count,
-        "true_false": true_false_count,
-        "fill_blank": fill_blank_count,
-    }
+    """管理员：题目统计（按题型 / 状态分布，单条聚合查询并缓存，支持 ETag 条件请求）。"""
+    cached = _questions_not_modified(request, response)
+    if cached is not None:
+        return cached
+    return await RegisterQuestionsDAO.get_stats()
 
 
 @router.get("/questions", response_model=list[dict[str, Any]])
 async def admin_list_questions(
+    request: Request,
+    response: Response,
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
     keyword: str | None = Query(None, description="搜索关键词（模糊匹配题目内容）"),
     question_type: str | None = Query(None, alias="type", description="按题型筛选"),
     status: str | None = Query(None, description="按状态筛选（active/inactive）"),
+    cursor: str | None = Query(None, description="翻页游标（取自上一页的 X-Next-Cursor / X-Prev-Cursor 响应头）"),
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
-    """管理员：分页搜索题目列表。"""
-    return await RegisterQuestionsDAO.search_questions(
+    """管理员：分页搜索题目列表（按 id 倒序键集分页，游标见响应头，支持 ETag 条件请求）。"""
+    cached = _questions_not_modified(request, response)
+    if cached is not None:
+        return cached
+    page = await RegisterQuestionsDAO.search_questions(
         keyword=keyword, question_type=question_type, status=status,
-        limit=limit, offset=offset,
+        limit=limit, offset=offset, **_page_args(cursor, offset),
+        readonly=_replica_ok(response),
     )
+    return _set_page_headers(response, page)
 
 
 @router.get("/questions/total", response_model=dict[str, Any])
 async def admin_questions_total(
+    request: Request,
+    response: Response,
     keyword: str | None = Query(None),
     question_type: str | None = Query(None, alias="type"),
     status: str | None = Query(None),
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
-    """管理员：获取题目总数（可选筛选）。"""
+    """管理员：获取题目总数（可选筛选，支持 ETag 条件请求）。"""
+    cached = _questions_not_modified(request, response)
+    if cached is not None:
+        return cached
     total = await RegisterQuestionsDAO.count_questions(
         keyword=keyword, question_type=question_type, status=status,
+        readonly=_replica_ok(response),
     )
     return {"total": total}
 
@@ -664,14 +868,225 @@ async def admin_create_question(
     _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
 ):
     """管理员：创建题目。"""
-    data = payload.model_dump(exclude_none=True)
+    data = _question_row(payload, current_user["uuid"], exclude_none=True)
+    created = await RegisterQuestionsDAO().create(data)
+    RegisterQuestionsDAO.invalidate_pool()
+    return created
+
+
+def _question_row(payload: QuestionCreateRequest, created_by: str, *, exclude_none: bool = False) -> dict[str, Any]:
+    """将校验后的题目转换为 register_questions 的列值（新题目均为 active）。"""
+    data = payload.model_dump(exclude_none=exclude_none)
     data["uuid"] = str(uuid_lib.uuid4())
-    data["created_by"] = current_user["uuid"]
+    data["created_by"] = created_by
     data["current_status"] = "active"
     if data.get("options") is not None:
         data["options"] = json.dumps(data["options"], ensure_ascii=False)
-    created = await RegisterQuestionsDAO().create(data)
-    return created
+    return data
+
+
+# ---------------------------------------------------------------------------
+# 题目批量导入（流式 CSV / NDJSON）
+# ---------------------------------------------------------------------------
+
+# Content-Type → 导入格式
+_IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-jsonlines": "ndjson",
+}
+
+# CSV 表头必须包含的列
+_IMPORT_CSV_REQUIRED = ("question", "question_type", "answer")
+
+# 响应中最多列出的错误行数（error_count 为全部错误数）
+_IMPORT_MAX_REPORTED_ERRORS = 100
+
+
+def _import_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"单次最多导入 {settings.QUESTION_IMPORT_MAX_ROWS} 行、{settings.QUESTION_IMPORT_MAX_BYTES} 字节",
+    )
+
+
+async def _iter_upload_lines(request: Request) -> AsyncIterator[str]:
+    """逐块读取请求体并按行产出（UTF-8，可带 BOM）。
+
+    累计字节数超过 ``QUESTION_IMPORT_MAX_BYTES`` 时返回 413，没有换行的请求体也不会无限缓冲。
+    """
+    limit = settings.QUESTION_IMPORT_MAX_BYTES
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise _import_too_large()
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise _import_too_large()
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                yield line.removesuffix("\r")
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="文件必须为 UTF-8 编码") from None
+    if buffer:
+        yield buffer.removesuffix("\r")
+
+
+async def _iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    """解析 CSV：首行为表头，产出 ``(起始行号, 行字典 | 错误信息)``。
+
+    引号内的字段可以跨行：累积到引号数为偶数时才视为一条完整记录（转义引号 ``""`` 不改变奇偶）。
+    ``options`` 列可为 JSON 数组或以 ``|`` 分隔的选项。
+    """
+    header: list[str] | None = None
+    pending: list[str] = []
+    start = line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start = line_no
+        pending.append(line)
+        record = "\n".join(pending)
+        if record.count('"') % 2:
+            continue
+        pending = []
+        if not record.strip():
+            continue
+        try:
+            fields = next(csv.reader([record]))
+        except csv.Error as exc:
+            yield start, f"CSV 格式错误: {exc}"
+            continue
+        if header is None:
+            header = [name.strip() for name in fields]
+            missing = [name for name in _IMPORT_CSV_REQUIRED if name not in header]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"CSV 表头缺少列: {', '.join(missing)}",
+                )
+            continue
+        if len(fields) != len(header):
+            yield start, f"列数 {len(fields)} 与表头 {len(header)} 不一致"
+            continue
+        row: dict[str, Any] = {name: value.strip() or None for name, value in zip(header, fields)}
+        options = row.get("options")
+        if options:
+            if options.startswith("["):
+                try:
+                    row["options"] = json.loads(options)
+                except ValueError:
+                    yield start, "options 不是合法的 JSON 数组"
+                    continue
+            else:
+                row["options"] = [opt.strip() for opt in options.split("|") if opt.strip()]
+        yield start, row
+    if pending:
+        yield start, "引号未闭合"
+
+
+async def _iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    """解析 NDJSON：每个非空行为一个 JSON 对象，产出 ``(行号, 行字典 | 错误信息)``。"""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_no, f"JSON 格式错误: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, "每行必须是 JSON 对象"
+            continue
+        yield line_no, row
+
+
+def _validation_message(exc: ValidationError) -> str:
+    """将 pydantic 校验错误压缩为一行。"""
+    parts = []
+    for error in exc.errors():
+        loc = ".".join(str(part) for part in error.get("loc", ()))
+        # 自定义校验器抛出的 ValueError 去掉 pydantic 添加的 "Value error, " 前缀
+        msg = str(error["ctx"]["error"]) if error["type"] == "value_error" else error["msg"]
+        parts.append(f"{loc}: {msg}" if loc else msg)
+    return "; ".join(parts)
+
+
+@upload_router.post("/questions/import", response_model=dict[str, Any])
+async def admin_import_questions(
+    request: Request,
+    import_format: Literal["csv", "ndjson"] | None = Query(
+        None, alias="format", description="文件格式，缺省时按 Content-Type 判断"
+    ),
+    atomic: bool = Query(False, description="为 true 时任一行有错误即整体放弃导入"),
+    current_user: dict = Depends(get_current_user),
+    _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
+):
+    """管理员：批量导入题目（请求体为 CSV 或 NDJSON 原始内容）。
+
+    先读完请求体并逐行按 :class:`QuestionCreateRequest` 校验（选项数量 / 去重、答案须在选项中、判断题答案），
+    行数与字节数均有上限；之后才开启数据库会话，有效行按 ``BULK_CHUNK_SIZE`` 分块以多行 INSERT
+    在同一事务中写入。本接口挂在 :data:`upload_router` 上，不在请求级工作单元中：
+    鉴权查询的事务在读取请求体之前就已提交，慢速上传不会占用连接池中的连接。
+    错误行逐行报告（行号从 1 开始，CSV 含表头行）。导入结束后只递增一次题库版本号。
+    """
+    if import_format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        import_format = _IMPORT_CONTENT_TYPES.get(content_type)
+        if import_format is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="请以 text/csv 或 application/x-ndjson 上传，或通过 format 参数指定格式",
+            )
+
+    lines = _iter_upload_lines(request)
+    records = _iter_csv_records(lines) if import_format == "csv" else _iter_ndjson_records(lines)
+    valid: list[dict[str, Any]] = []
+    errors: list[dict[str, Any]] = []
+    error_count = inserted = rows = 0
+
+    async for line_no, row in records:
+        rows += 1
+        if rows > settings.QUESTION_IMPORT_MAX_ROWS:
+            raise _import_too_large()
+        if isinstance(row, dict):
+            try:
+                valid.append(_question_row(QuestionCreateRequest.model_validate(row), current_user["uuid"]))
+            except ValidationError as exc:
+                row = _validation_message(exc)
+        if isinstance(row, str):
+            error_count += 1
+            if len(errors) < _IMPORT_MAX_REPORTED_ERRORS:
+                errors.append({"line": line_no, "error": row})
+
+    if atomic and error_count:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail={"message": "存在错误行，未导入任何题目", "error_count": error_count, "errors": errors},
+        )
+    if valid:
+        async with get_session() as session:
+            inserted = await RegisterQuestionsDAO().bulk_create(valid, session=session)
+
+    if inserted:
+        RegisterQuestionsDAO.invalidate_pool()
+    CustomLog(
+        "SUCCESS",
+        f"[Admin] 管理员 {current_user.get('uuid')} 导入题目 format={import_format} "
+        f"rows={rows} inserted={inserted} errors={error_count}",
+    )
+    return {"inserted": inserted, "error_count": error_count, "errors": errors}
 
 
 @router.post("/questions/batch-delete", response_model=dict[str, Any])
@@ -682,6 +1097,8 @@ async def admin_batch_delete_questions(
 ):
     """管理员：批量删除题目。"""
     deleted = await RegisterQuestionsDAO.batch_delete_by_uuids(payload.uuids)
+    if deleted:
+        RegisterQuestionsDAO.invalidate_pool()
     CustomLog("SUCCESS", f"[Admin] 批量删除题目 count={len(payload.uuids)} actual_deleted={deleted}")
     return {"deleted": deleted}
 
@@ -694,6 +1111,8 @@ async def admin_batch_update_question_status(
 ):
     """管理员：批量切换题目状态。"""
     updated = await RegisterQuestionsDAO.batch_update_status(payload.uuids, payload.status)
+    if updated:
+        RegisterQuestionsDAO.invalidate_pool()
     CustomLog("SUCCESS", f"[Admin] 管理员批量切换题目状态 count={len(payload.uuids)} actual_updated={updated} -> {payload.status}")
     return {"updated": updated}
 
@@ -747,6 +1166,7 @@ async def admin_update_question(
     updated = await RegisterQuestionsDAO().update(question_uuid, data)
     if updated is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="题目不存在")
+    RegisterQuestionsDAO.invalidate_pool()
     CustomLog("SUCCESS", f"[Admin] 管理员编辑题目 uuid={question_uuid}")
     return updated
 
@@ -761,10 +1181,97 @@ async def admin_delete_question(
     ok = await RegisterQuestionsDAO().delete(question_uuid)
     if not ok:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="题目不存在")
+    RegisterQuestionsDAO.invalidate_pool()
     CustomLog("SUCCESS", f"[Admin] 管理员删除题目 uuid={question_uuid}")
     return {"success": True}
 
 
+def _parse_group_by(raw: str | None, allowed: tuple[str, ...]) -> tuple[str, ...]:
+    """解析逗号分隔的分组维度，非法维度返回 400。"""
+    if not raw:
+        return ()
+    dims = tuple(d.strip() for d in raw.split(",") if d.strip())
+    invalid = [d for d in dims if d not in allowed]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"不支持的分组维度: {', '.join(invalid)}（可选: {', '.join(allowed)}）",
+        )
+    return dims
+
+
+def _resolve_time_range(
+    start_time: datetime | None,
+    end_time: datetime | None,
+    default_hours: int,
+) -> tuple[datetime, datetime]:
+    """补全看板查询的时间范围，默认最近 default_hours 小时。"""
+    end = end_time or datetime.now()
+    start = start_time or end - timedelta(hours=default_hours)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_time 不能晚于 end_time")
+    return start, end
+
+
+@router.get("/analytics/logs/hourly", response_model=dict[str, Any])
+async def admin_log_hourly_rollups(
+    start_time: datetime | None = Query(None, description="开始时间（默认 end_time 前 7 天）"),
+    end_time: datetime | None = Query(None, description="结束时间（默认当前时间）"),
+    event_type: str | None = Query(None, description="按事件类型筛选，如 LOGIN"),
+    log_status: str | None = Query(None, alias="status", description="按事件状态筛选，如 FAIL"),
+    log_type: str | None = Query(None, description="按日志分类筛选"),
+    source: Literal["system", "personal"] | None = Query(None, description="来源表"),
+    group_by: str | None = Query(None, description="逗号分隔的细分维度：source,event_type,status,log_type"),
+    _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
+):
+    """管理员：按小时统计日志条数（读取小时汇总表）。
+
+    例：本周每小时 LOGIN 失败次数 → ``?event_type=LOGIN&status=FAIL``。
+    汇总表由定时任务增量维护，最新数据约有 CRON_ROLLUP_INTERVAL_MINUTES 分钟延迟。
+    """
+    dims = _parse_group_by(group_by, LOG_ROLLUP_DIMENSIONS)
+    start, end = _resolve_time_range(start_time, end_time, default_hours=24 * 7)
+    items = await LogRollupsDAO.query_log_hourly(
+        start_time=start, end_time=end,
+        event_type=event_type, status=log_status, log_type=log_type,
+        source=source, group_by=dims,
+    )
+    return {"start_time": start, "end_time": end, "items": items}
+
+
+@router.get("/analytics/firewall/top", response_model=dict[str, Any])
+async def admin_firewall_top(
+    start_time: datetime | None = Query(None, description="开始时间（默认 end_time 前 24 小时）"),
+    end_time: datetime | None = Query(None, description="结束时间（默认当前时间）"),
+    attack_type: str | None = Query(None, alias="type", description="按攻击类型筛选"),
+    ip: str | None = Query(None, description="按 IP 筛选"),
+    group_by: str | None = Query(None, description="逗号分隔的聚合维度：type,ip（默认两者）"),
+    limit: int = Query(20, ge=1, le=500),
+    _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
+):
+    """管理员：时间范围内命中最多的攻击类型 / IP（读取防火墙小时汇总表）。"""
+    dims = _parse_group_by(group_by, FIREWALL_ROLLUP_DIMENSIONS) or FIREWALL_ROLLUP_DIMENSIONS
+    start, end = _resolve_time_range(start_time, end_time, default_hours=24)
+    items = await LogRollupsDAO.query_firewall_top(
+        start_time=start, end_time=end, group_by=dims,
+        type=attack_type, ip=ip, limit=limit,
+    )
+    return {"start_time": start, "end_time": end, "items": items}
+
+
+@router.get("/metrics/db", response_model=dict[str, Any])
+async def admin_db_metrics(
+    _: dict = Depends(MinRoleChecker(Role.SUPERADMIN.value)),
+):
+    """管理员：当前 worker 的连接池指标（签出总数、每请求签出次数分布）、语句指标与只读副本状态。"""
+    return {
+        "unit_of_work": settings.DB_REQUEST_UNIT_OF_WORK,
+        **db_metrics.snapshot(),
+        "statements": db_statements.snapshot(),
+        "replicas": replica_status(),
+    }
+
+
 class ConfigViewRequest(BaseModel):
     """查看系统配置请求体。"""
     super_password: str = Field(..., description="超级密码")
@@ -773,6 +1280,7 @@ class ConfigViewRequest(BaseModel):
 # 敏感配置项：值用 ****** 屏蔽
 _SENSITIVE_KEYS: set[str] = {
     "DATABASE_URL",
+    "DATABASE_REPLICA_URLS",
     "REDIS_URL",
     "JWT_SECRET_KEY",
     "SUPER_PASSWORD",
@@ -796,7 +1304,21 @@ _CONFIG_GROUPS: list[tuple[str, list[tuple[str, str]]]] = [
     ]),
     ("数据库", [
         ("DATABASE_URL", "连接地址"),
+        ("DATABASE_REPLICA_URLS", "只读副本地址"),
+        ("DB_REPLICA_MAX_LAG_SECONDS", "副本最大复制延迟（秒）"),
+        ("DB_REPLICA_CHECK_INTERVAL_SECONDS", "副本探测间隔（秒）"),
+        ("DB_REPLICA_RETRY_SECONDS", "副本故障重试间隔（秒）"),
         ("DB_POOL_PRE_PING", "连接池预检"),
+        ("DB_POOL_PRE_PING_IDLE_SECONDS", "预检空闲阈值（秒）"),
+        ("DB_POOL_SIZE", "连接池大小"),
+        ("DB_POOL_MAX_OVERFLOW", "最大溢出连接数"),
+        ("DB_POOL_TIMEOUT", "获取连接超时（秒）"),
+        ("DB_POOL_RECYCLE", "连接回收周期（秒）"),
+        ("DB_STATEMENT_CACHE_SIZE", "预编译语句缓存大小"),
+        ("DB_REQUEST_UNIT_OF_WORK", "请求级工作单元"),
+        ("DB_SLOW_STATEMENT_MS", "慢语句阈值（毫秒）"),
+        ("DB_REQUEST_STATEMENT_BUDGET", "每请求语句数预算"),
+        ("DB_N_PLUS_ONE_THRESHOLD", "N+1 告警阈值（开发环境）"),
     ]),
     ("Redis", [
         ("REDIS_URL", "连接地址"),
@@ -813,6 +1335,14 @@ _CONFIG_GROUPS: list[tuple[str, list[tuple[str, str]]]] = [
     ("用户认证", [
         ("AUTH_USER_CACHE_TTL_SECONDS", "认证缓存 TTL（秒）"),
     ]),
+    ("管理端批量操作", [
+        ("ADMIN_BATCH_STATUS_MAX_USERS", "批量修改状态单次上限"),
+        ("QUESTION_IMPORT_MAX_ROWS", "题目导入单次行数上限"),
+        ("QUESTION_IMPORT_MAX_BYTES", "题目导入单次请求体字节上限"),
+    ]),
+    ("条件 GET", [
+        ("ETAG_VERSION_TTL_SECONDS", "ETag 版本戳有效期（秒）"),
+    ]),
     ("防火墙", [
         ("FW_ENABLED", "总开关"),
         ("FW_MAX_REQUESTS_PER_SECOND", "每秒最大请求数"),
@@ -832,11 +1362,32 @@ _CONFIG_GROUPS: list[tuple[str, list[tuple[str, str]]]] = [
         ("REG_CORRECT_THRESHOLD", "及格正确题数"),
         ("REG_QUESTION_COUNT", "题目数量"),
         ("REG_SHEET_TTL_SECONDS", "答题卷有效期（秒）"),
+        ("REG_QUESTION_POOL_TTL_SECONDS", "题库缓存最长有效期（秒）"),
         ("ACCOUNT_DELETION_GRACE_DAYS", "账户注销宽限期（天）"),
         ("MAX_PWD_CHG_ATTEMPTS_PER_DAY", "每日最大改密次数"),
     ]),
+    ("日志采样与存储", [
+        ("LOG_SAMPLING_ENABLED", "采样开关"),
+        ("LOG_SAMPLE_LOGIN_SUCCESS_RATIO", "登录成功日志保留比例"),
+        ("LOG_SAMPLE_FIREWALL_RATIO", "防火墙日志保留比例"),
+        ("LOG_RATE_CAP_PER_SECOND", "每类事件每秒写库上限"),
+        ("LOG_INTERN_STRINGS", "日志字符串字典化"),
+        ("LOG_INTERN_CACHE_SIZE", "字典化进程内缓存条数"),
+        ("LOG_ARCHIVE_ENABLED", "冷归档开关"),
+        ("LOG_ARCHIVE_AFTER_DAYS", "日志保留天数（超出后归档）"),
+        ("LOG_ARCHIVE_DIR", "归档目录"),
+        ("LOG_ARCHIVE_BATCH_SIZE", "归档单批行数"),
+        ("LOG_STREAM_ENABLED", "实时日志推送"),
+        ("LOG_STREAM_QUEUE_SIZE", "推送订阅者队列长度"),
+        ("LOG_STREAM_HEARTBEAT_SECONDS", "推送心跳间隔（秒）"),
+    ]),
     ("定时任务", [
         ("CRON_CLEANUP_INTERVAL_HOURS", "清理任务间隔（小时）"),
+        ("CRON_ROLLUP_INTERVAL_MINUTES", "日志汇总间隔（分钟）"),
+        ("CRON_ROLLUP_SETTLE_SECONDS", "日志汇总沉淀时间（秒）"),
+        ("CRON_ROLLUP_BATCH_SIZE", "日志汇总单批行数"),
+        ("CRON_ARCHIVE_INTERVAL_HOURS", "日志归档间隔（小时）"),
+        ("CRON_USER_STATS_INTERVAL_HOURS", "用户统计校正间隔（小时）"),
     ]),
     ("安全清理", [
         ("REFRESH_TOKEN_CLEANUP_DAYS", "刷新令牌清理天数"),
@@ -908,5 +1459,6 @@ async def admin_update_question_status(
     updated = await RegisterQuestionsDAO().update(question_uuid, {"current_status": payload.status})
     if updated is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="题目不存在")
+    RegisterQuestionsDAO.invalidate_pool()
     CustomLog("SUCCESS", f"[Admin] 管理员切换题目状态 uuid={question_uuid} -> {payload.status}")
     return updated
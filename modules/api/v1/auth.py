@@ -10,7 +10,7 @@ from core.database.connection.pgsql import get_session
 from core.database.dao.refresh_tokens import RefreshTokensDAO
 from core.database.dao.users import UsersDAO
 from core.helper.CustomLog.index import CustomLog
-from core.middleware.auth.dependencies import get_current_user
+from core.middleware.auth.dependencies import bump_user_etag, get_current_user, invalidate_user_cache
 from core.security.hash import verify_password
 from core.security.jwt_handler import create_access_token, generate_refresh_token
 
@@ -160,6 +160,7 @@ async def login(request: Request, body: LoginRequest):
                     "current_status": "normal",
                     "deletion_scheduled_at": None,
                 })
+                invalidate_user_cache(user_uuid)
                 CustomLog(
                     "SUCCESS",
                     f"[Login] uuid={user_uuid} 冷却期内登录，账号已恢复",
@@ -187,6 +188,7 @@ async def login(request: Request, body: LoginRequest):
         "last_login_at": datetime.now(),
         "last_login_ip": client_ip,
     })
+    bump_user_etag(user_uuid)
 
     CustomLog(
         "SUCCESS",
@@ -225,7 +227,7 @@ async def refresh_tokens(body: RefreshRequest):
     user_uuid = record["user_uuid"]
 
     # 校验用户是否存在且未被禁用
-    user = await UsersDAO().find_by_uuid(user_uuid)
+    user = await UsersDAO().find_by_uuid(user_uuid, columns=("uuid", "current_status"))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
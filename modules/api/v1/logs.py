@@ -5,14 +5,19 @@
 - /personal：本人或 superadmin
 """
 
+import asyncio
+import json
 from datetime import datetime
-from typing import Any
+from typing import Any, AsyncIterator
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from core.config import settings
 from core.database.dao.personal_logs import PersonalLogsDAO
 from core.database.dao.system_logs import SystemLogsDAO
+from core.helper.CustomLog.stream import log_stream_hub
 from core.middleware.auth.dependencies import get_current_user
 from core.security.log_permissions import (
     can_access_system_logs,
@@ -66,7 +71,62 @@ async def query_system_logs(
         limit=limit,
         offset=offset,
     )
-    return {"total": total, "items": items}
+    return {"total": total, "items": [item.to_dict() for item in items]}
+
+
+async def _sse_events(request: Request, filters: dict[str, Any]) -> AsyncIterator[str]:
+    """订阅并将队列转为 SSE 帧；空闲时发送心跳注释，客户端断开后退订。
+
+    在生成器内订阅：客户端在响应开始前断开时生成器不会运行，不会留下无人退订的订阅。
+    """
+    subscription = log_stream_hub.subscribe(filters)
+    try:
+        while not await request.is_disconnected():
+            try:
+                row = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.LOG_STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield f": ping dropped={subscription.dropped}\n\n"
+                continue
+            data = json.dumps(row, ensure_ascii=False)
+            yield f"id: {row.get('uuid', '')}\nevent: log\ndata: {data}\n\n"
+    finally:
+        await log_stream_hub.unsubscribe(subscription)
+
+
+@router.get("/system/stream")
+async def stream_system_logs(
+    request: Request,
+    _: dict = Depends(require_system_log_access),
+    event_type: str | None = Query(None, description="事件类型"),
+    log_type: str | None = Query(None, description="日志类型"),
+    status: str | None = Query(None, description="结果状态"),
+    severity: str | None = Query(None, description="严重程度"),
+    service_name: str | None = Query(None, description="服务名"),
+    trace_id: str | None = Query(None, description="追踪 ID"),
+    client_ip: str | None = Query(None, description="客户端 IP"),
+    keyword: str | None = Query(None, description="内容关键词"),
+):
+    """实时推送新写入的系统日志（Server-Sent Events，仅 superadmin）。
+
+    过滤条件与 /logs/system 相同（不含时间范围与分页），在服务端匹配后再推送。
+    """
+    filters = {
+        "event_type": event_type,
+        "log_type": log_type,
+        "status": status,
+        "severity": severity,
+        "service_name": service_name,
+        "trace_id": trace_id,
+        "client_ip": client_ip,
+        "keyword": keyword,
+    }
+    return StreamingResponse(
+        _sse_events(request, filters),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -112,7 +172,7 @@ async def query_personal_logs(
         limit=limit,
         offset=offset,
     )
-    return {"total": total, "items": items}
+    return {"total": total, "items": [item.to_dict() for item in items]}
 
 
 @router.get("/personal/{user_uuid}", response_model=PaginatedLogResponse)
@@ -150,4 +210,4 @@ async def query_personal_logs_by_user(
         limit=limit,
         offset=offset,
     )
-    return {"total": total, "items": items}
+    return {"total": total, "items": [item.to_dict() for item in items]}
@@ -1,12 +1,23 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from core.middleware.unit_of_work import request_db_metrics, request_unit_of_work
 from modules.api.v1.admin import router as admin_router
+from modules.api.v1.admin import upload_router as admin_upload_router
 from modules.api.v1.auth import router as auth_router
 from modules.api.v1.logs import router as logs_router
 from modules.api.v1.users import router as users_router
 
+# scope="function"：工作单元在端点返回后、响应发送前提交
+unit_of_work_router = APIRouter(dependencies=[Depends(request_unit_of_work, scope="function")])
+unit_of_work_router.include_router(auth_router)
+unit_of_work_router.include_router(users_router)
+unit_of_work_router.include_router(admin_router)
+unit_of_work_router.include_router(logs_router)
+
+# 长时间读取请求体的上传接口不进入工作单元，避免读取期间一直占用连接
+upload_router = APIRouter(dependencies=[Depends(request_db_metrics, scope="function")])
+upload_router.include_router(admin_upload_router)
+
 router = APIRouter()
-router.include_router(auth_router)
-router.include_router(users_router)
-router.include_router(admin_router)
-router.include_router(logs_router)
+router.include_router(unit_of_work_router)
+router.include_router(upload_router)
@@ -20,22 +20,28 @@
 - DELETE /users/me              — 账号注销（30 天冷却期）
 """
 
-import json
 import uuid as uuid_lib
 from datetime import date, datetime, timedelta
 from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel, Field, field_validator, model_validator
 
-from core.database.connection.pgsql import get_session
+from core.database.connection.pgsql import get_session, savepoint
 from core.database.connection.redis import redis_conn
 from core.database.dao.refresh_tokens import RefreshTokensDAO
 from core.database.dao.register_questions import RegisterQuestionsDAO
 from core.database.dao.users import UsersDAO
 from core.config import settings
 from core.helper.CustomLog.index import CustomLog
-from core.middleware.auth.dependencies import get_current_user, get_temp_user, invalidate_user_cache
+from core.helper.etag import not_modified, resource_etag
+from core.middleware.auth.dependencies import (
+    bump_user_etag,
+    get_current_user,
+    get_temp_user,
+    invalidate_user_cache,
+    user_etag_key,
+)
 from core.middleware.firewall.helpers import get_client_ip
 from core.security.hash import get_password_hash, verify_password
 from core.security.jwt_handler import create_access_token, create_temp_token, generate_refresh_token
@@ -45,8 +51,7 @@ router = APIRouter(prefix="/users", tags=["Users v1"])
 # ---------------------------------------------------------------------------
 # Redis key 前缀常量
 # ---------------------------------------------------------------------------
-_REDIS_QSHEET_PREFIX = "reg:qsheet:"          # reg:qsheet:{sheet_id}  → JSON
-_REDIS_QSHEET_ATTEMPTS = "reg:qsheet_atm:"    # reg:qsheet_atm:{sheet_id} → int
+_REDIS_QSHEET_PREFIX = "reg:qsheet:"          # reg:qsheet:{sheet_id}  → Hash（ip / atm / a:{uuid}）
 _REDIS_IP_ATTEMPTS = "reg:ip_atm:"            # reg:ip_atm:{ip}:{date} → int
 _REDIS_NAME_ATTEMPTS = "reg:name_atm:"        # reg:name_atm:{name}:{date} → int
 _REDIS_IP_SHEETS = "reg:ip_sheets:"           # reg:ip_sheets:{ip}:{date} → int
@@ -84,6 +89,12 @@ class RegisterRequest(BaseModel):
         return v.strip()
 
 
+# 问题表 Hash 字段：签发 IP、已尝试次数、各题答案（a:{question_uuid} → 规范化答案）
+_SHEET_FIELD_IP = "ip"
+_SHEET_FIELD_ATTEMPTS = "atm"
+_SHEET_ANSWER_PREFIX = "a:"
+
+
 # ---------------------------------------------------------------------------
 # Redis 辅助函数
 # ---------------------------------------------------------------------------
@@ -119,6 +130,78 @@ def _redis_incr_with_ttl(client, key: str, ttl: int) -> int:
         return 0
 
 
+def _sheet_mapping(questions: list[dict], client_ip: str) -> dict[str, str | int]:
+    """构造问题表 Hash：尝试次数与答案存于同一个 key，共享同一个 TTL，删除即作废。"""
+    mapping: dict[str, str | int] = {_SHEET_FIELD_IP: client_ip, _SHEET_FIELD_ATTEMPTS: 0}
+    for q in questions:
+        mapping[f"{_SHEET_ANSWER_PREFIX}{q['uuid']}"] = _normalize_answer(q["answer"])
+    return mapping
+
+
+def _sheet_answers(fields: dict[str, str]) -> dict[str, str]:
+    """从问题表 Hash 字段中取出 {question_uuid: 规范化答案}。"""
+    offset = len(_SHEET_ANSWER_PREFIX)
+    return {k[offset:]: v for k, v in fields.items() if k.startswith(_SHEET_ANSWER_PREFIX)}
+
+
+def _restore_sheet(client, key: str, fields: dict[str, str], ttl: int) -> None:
+    """把已消费的问题表按原字段与剩余 TTL 写回（创建用户失败于重复学生时调用）。"""
+    if ttl is None or ttl <= 0:
+        ttl = settings.REG_SHEET_TTL_SECONDS
+    try:
+        pipe = client.pipeline()
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, ttl)
+        pipe.execute()
+    except Exception as exc:
+        CustomLog("WARNING", f"[Register] 恢复问题表失败 key={key}: {exc}")
+
+
+# 注册尝试计数脚本：依次检查 IP / real_name 当日次数、问题表是否存在、问题表尝试次数，
+# 全部未超限时才一起递增（IP / name 首次设置 TTL；问题表计数为 Hash 字段，沿用问题表的 TTL），
+# 并返回问题表全部字段；整个过程在 Redis 中原子执行，并发提交不会越过限额。
+# 非 Hash 类型的问题表（旧版 JSON 字符串）按不存在处理。
+# KEYS: ip 计数, name 计数, 问题表   ARGV: ip 上限, name 上限, 问题表上限, TTL
+# 返回 {超限项, 问题表计数, 问题表字段}：超限项为 "" 表示通过，否则为 ip / name / sheet_missing / sheet
+_REGISTER_ATTEMPT_LUA = """
+local ip = tonumber(redis.call('GET', KEYS[1]) or '0')
+if ip >= tonumber(ARGV[1]) then return {'ip', ip, false} end
+local name = tonumber(redis.call('GET', KEYS[2]) or '0')
+if name >= tonumber(ARGV[2]) then return {'name', name, false} end
+if redis.call('TYPE', KEYS[3]).ok ~= 'hash' then return {'sheet_missing', 0, false} end
+local attempts = tonumber(redis.call('HGET', KEYS[3], 'atm') or '0')
+if attempts >= tonumber(ARGV[3]) then return {'sheet', attempts, false} end
+for _, key in ipairs({KEYS[1], KEYS[2]}) do
+    if redis.call('INCR', key) == 1 then redis.call('EXPIRE', key, ARGV[4]) end
+end
+redis.call('HINCRBY', KEYS[3], 'atm', 1)
+return {'', attempts + 1, redis.call('HGETALL', KEYS[3])}
+"""
+
+
+def _claim_register_attempt(
+    client, *, ip_key: str, name_key: str, sheet_key: str
+) -> tuple[str, int, dict[str, str] | None]:
+    """原子地检查并递增注册尝试计数，返回 ``(超限项, 问题表计数, 问题表字段)``。
+
+    超限项为空字符串表示通过（此时三个计数均已递增，问题表计数为递增后的值）；
+    否则为 ``ip`` / ``name`` / ``sheet_missing`` / ``sheet``，计数均未改变，问题表字段为 None。
+    """
+    script = client.register_script(_REGISTER_ATTEMPT_LUA)
+    tripped, attempts, flat = script(
+        keys=[ip_key, name_key, sheet_key],
+        args=[
+            settings.REG_MAX_IP_ATTEMPTS_PER_DAY,
+            settings.REG_MAX_NAME_ATTEMPTS_PER_DAY,
+            settings.REG_MAX_SHEET_ATTEMPTS,
+            settings.REG_SHEET_TTL_SECONDS,
+        ],
+    )
+    # Lua 的 false 在回复中为 nil；HGETALL 返回扁平的 [field, value, ...] 列表
+    fields = dict(zip(flat[::2], flat[1::2])) if flat else None
+    return tripped, int(attempts), fields
+
+
 # ---------------------------------------------------------------------------
 # POST /users/register/sheet/request — 获取答题卡
 # ---------------------------------------------------------------------------
@@ -158,20 +241,15 @@ async def request_register_sheet(request: Request):
 
     # ----- 生成 sheet_id，存入 Redis -----
     sheet_id = str(uuid_lib.uuid4())
-    # 存储完整题目数据（含答案），供校验时使用
-    sheet_data = {
-        "questions": [{"uuid": q["uuid"], "question": q["question"]} for q in questions],
-        "answers": {q["uuid"]: _normalize_answer(q["answer"]) for q in questions},
-        "issued_ip": client_ip,
-    }
+    sheet_key = f"{_REDIS_QSHEET_PREFIX}{sheet_id}"
 
     if redis is not None:
         try:
-            redis.set(
-                f"{_REDIS_QSHEET_PREFIX}{sheet_id}",
-                json.dumps(sheet_data, ensure_ascii=False),
-                ex=settings.REG_SHEET_TTL_SECONDS,
-            )
+            # 答案与尝试次数写入同一个 Hash（校验时只需答案，题干无需存储）
+            pipe = redis.pipeline(transaction=False)
+            pipe.hset(sheet_key, mapping=_sheet_mapping(questions, client_ip))
+            pipe.expire(sheet_key, settings.REG_SHEET_TTL_SECONDS)
+            pipe.execute()
             # 递增 IP 今日问题表计数
             _redis_incr_with_ttl(redis, f"{_REDIS_IP_SHEETS}{client_ip}:{_today_str()}", settings.REG_SHEET_TTL_SECONDS)
         except Exception as exc:
@@ -191,7 +269,7 @@ async def request_register_sheet(request: Request):
     CustomLog("SUCCESS", f"[Register] IP {client_ip} 获取问题表 sheet_id={sheet_id}")
     return {
         "sheet_id": sheet_id,
-        "questions": sheet_data["questions"],  # 不含答案
+        "questions": [{"uuid": q["uuid"], "question": q["question"]} for q in questions],  # 不含答案
     }
 
 
@@ -208,16 +286,13 @@ async def register_user(body: RegisterRequest, request: Request):
     2. real_name 当日尝试次数 ≤ 3
     3. sheet_id 对应的问题表存在且尝试次数 ≤ 3
     4. 至少 3 道题目答对
-    5. 数据库中不存在相同 real_name + class 的学生
+    5. 数据库中不存在相同 real_name + class 的学生（插入时由唯一索引判定；冲突时恢复问题表）
     全部通过后创建用户并返回 JWT token。
     """
     client_ip = get_client_ip(request)
     today = _today_str()
     redis = redis_conn.get_client()
 
-    # ----------------------------------------------------------------
-    # 步骤 1：检查 IP 当日注册尝试次数
-    # ----------------------------------------------------------------
     if redis is None:
         CustomLog("ERROR", "[Register] Redis 不可用，拒绝注册请求")
         raise HTTPException(
@@ -225,77 +300,55 @@ async def register_user(body: RegisterRequest, request: Request):
             detail="服务暂时不可用，请稍后再试",
         )
 
-    ip_attempts_key = f"{_REDIS_IP_ATTEMPTS}{client_ip}:{today}"
-    ip_attempts = _redis_get_int(redis, ip_attempts_key)
-    if ip_attempts >= settings.REG_MAX_IP_ATTEMPTS_PER_DAY:
-        CustomLog("WARNING", f"[Register] IP {client_ip} 今日注册尝试次数已达上限")
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"该 IP 今日注册尝试次数已达上限（{settings.REG_MAX_IP_ATTEMPTS_PER_DAY} 次），请明日再试",
-        )
-
     # ----------------------------------------------------------------
-    # 步骤 2：检查 real_name 当日尝试次数
+    # 步骤 1–3：一次脚本调用完成 IP / real_name / 问题表的限额检查与计数
+    # （在校验答案前递增，防止暴力枚举）
     # ----------------------------------------------------------------
     # 使用 real_name 的十六进制编码作为 key，避免特殊字符问题
     name_key_part = body.real_name.encode("utf-8").hex()
-    name_attempts_key = f"{_REDIS_NAME_ATTEMPTS}{name_key_part}:{today}"
-    name_attempts = _redis_get_int(redis, name_attempts_key)
-    if name_attempts >= settings.REG_MAX_NAME_ATTEMPTS_PER_DAY:
-        CustomLog("WARNING", f"[Register] real_name '{body.real_name}' 今日尝试次数已达上限")
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"该姓名今日注册尝试次数已达上限（{settings.REG_MAX_NAME_ATTEMPTS_PER_DAY} 次），请明日再试",
-        )
-
-    # ----------------------------------------------------------------
-    # 步骤 3：验证问题表存在且未超过最大尝试次数
-    # ----------------------------------------------------------------
     sheet_redis_key = f"{_REDIS_QSHEET_PREFIX}{body.sheet_id}"
-    sheet_attempts_key = f"{_REDIS_QSHEET_ATTEMPTS}{body.sheet_id}"
 
     try:
-        sheet_raw = redis.get(sheet_redis_key)
+        tripped, sheet_attempts, sheet_fields = _claim_register_attempt(
+            redis,
+            ip_key=f"{_REDIS_IP_ATTEMPTS}{client_ip}:{today}",
+            name_key=f"{_REDIS_NAME_ATTEMPTS}{name_key_part}:{today}",
+            sheet_key=sheet_redis_key,
+        )
     except Exception as exc:
-        CustomLog("ERROR", f"[Register] Redis 读取问题表失败: {exc}")
+        CustomLog("ERROR", f"[Register] Redis 注册计数脚本执行失败: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="服务暂时不可用，请稍后再试",
         )
 
-    if not sheet_raw:
+    if tripped == "ip":
+        CustomLog("WARNING", f"[Register] IP {client_ip} 今日注册尝试次数已达上限")
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="问题表不存在或已过期，请重新获取",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"该 IP 今日注册尝试次数已达上限（{settings.REG_MAX_IP_ATTEMPTS_PER_DAY} 次），请明日再试",
         )
-
-    try:
-        sheet_data: dict = json.loads(sheet_raw)
-    except (json.JSONDecodeError, TypeError):
-        CustomLog("ERROR", f"[Register] 问题表数据损坏 sheet_id={body.sheet_id}")
+    if tripped == "name":
+        CustomLog("WARNING", f"[Register] real_name '{body.real_name}' 今日尝试次数已达上限")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="服务暂时不可用，请稍后再试",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"该姓名今日注册尝试次数已达上限（{settings.REG_MAX_NAME_ATTEMPTS_PER_DAY} 次），请明日再试",
         )
-
-    sheet_attempts = _redis_get_int(redis, sheet_attempts_key)
-    if sheet_attempts >= settings.REG_MAX_SHEET_ATTEMPTS:
+    if tripped == "sheet_missing":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="问题表不存在或已过期，请重新获取",
+        )
+    if tripped == "sheet":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"该问题表尝试次数已达上限（{settings.REG_MAX_SHEET_ATTEMPTS} 次），请换一张问题表",
         )
 
-    # ----------------------------------------------------------------
-    # 递增各计数器（在校验答案前，防止暴力枚举）
-    # ----------------------------------------------------------------
-    _redis_incr_with_ttl(redis, ip_attempts_key, settings.REG_SHEET_TTL_SECONDS)
-    _redis_incr_with_ttl(redis, name_attempts_key, settings.REG_SHEET_TTL_SECONDS)
-    _redis_incr_with_ttl(redis, sheet_attempts_key, settings.REG_SHEET_TTL_SECONDS)
-
     # ----------------------------------------------------------------
     # 步骤 4：校验答案（大小写不敏感，至少答对 3 题）
     # ----------------------------------------------------------------
-    correct_answers: dict[str, str] = sheet_data.get("answers", {})
+    correct_answers = _sheet_answers(sheet_fields)
     correct_count = 0
     for item in body.answers:
         expected = correct_answers.get(item.question_uuid)
@@ -309,8 +362,8 @@ async def register_user(body: RegisterRequest, request: Request):
     )
 
     if correct_count < settings.REG_CORRECT_THRESHOLD:
-        # sheet_attempts 已在步骤 3 之后递增，所以此处加 1 反映本次消耗后的最新值
-        remaining = settings.REG_MAX_SHEET_ATTEMPTS - (sheet_attempts + 1)
+        # sheet_attempts 为脚本递增后的值，已包含本次尝试
+        remaining = settings.REG_MAX_SHEET_ATTEMPTS - sheet_attempts
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"答题未通过（答对 {correct_count} 道，需至少 {settings.REG_CORRECT_THRESHOLD} 道）。"
@@ -318,23 +371,29 @@ async def register_user(body: RegisterRequest, request: Request):
         )
 
     # ----------------------------------------------------------------
-    # 步骤 5：检查是否存在重复学生（相同 real_name + class）
+    # 步骤 5：作废问题表并创建用户
+    # DELETE 原子地消费问题表：同一张表的并发提交只有一个能删除成功，
+    # 其余请求直接拒绝，不会重复创建用户；同时取回剩余 TTL，重复学生时用于恢复问题表
     # ----------------------------------------------------------------
-    async with get_session() as session:
-        duplicate = await UsersDAO.find_duplicate_student(session, body.real_name, body.class_)
-        if duplicate:
-            CustomLog(
-                "WARNING",
-                f"[Register] 重复学生 real_name='{body.real_name}' class='{body.class_}'",
-            )
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="该姓名和班级的学生已存在，如有问题请联系管理员",
-            )
+    try:
+        pipe = redis.pipeline()
+        pipe.ttl(sheet_redis_key)
+        pipe.delete(sheet_redis_key)
+        sheet_ttl, deleted = pipe.execute()
+        consumed = deleted == 1
+    except Exception as exc:
+        CustomLog("ERROR", f"[Register] Redis 作废问题表失败: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="服务暂时不可用，请稍后再试",
+        )
+    if not consumed:
+        CustomLog("WARNING", f"[Register] 问题表已被使用 sheet_id={body.sheet_id}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="问题表已被使用或已过期，请重新获取",
+        )
 
-    # ----------------------------------------------------------------
-    # 步骤 6：创建用户
-    # ----------------------------------------------------------------
     new_uuid = str(uuid_lib.uuid4())
     user_data = {
         "uuid": new_uuid,
@@ -347,24 +406,29 @@ async def register_user(body: RegisterRequest, request: Request):
         "current_status": "normal",
     }
 
+    # 重复学生（相同 real_name + class）由唯一索引判定：冲突时不插入，返回 None
     try:
-        created_user = await UsersDAO().create(user_data)
+        created_user = await UsersDAO().create_student(user_data)
     except Exception as exc:
         CustomLog("ERROR", f"[Register] 用户写入数据库失败: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="注册失败，请稍后重试",
         )
-
-    # 注册成功后删除问题表，防止同一张表被再次使用
-    try:
-        redis.delete(sheet_redis_key)
-        redis.delete(sheet_attempts_key)
-    except Exception as exc:
-        CustomLog("WARNING", f"[Register] 清理 Redis 问题表失败（不影响注册结果）: {exc}")
+    if created_user is None:
+        CustomLog(
+            "WARNING",
+            f"[Register] 重复学生 real_name='{body.real_name}' class='{body.class_}'",
+        )
+        # 旧流程在消费问题表之前查重；这里恢复问题表（含已递增的尝试次数），用户修正姓名 / 班级后可继续使用
+        _restore_sheet(redis, sheet_redis_key, sheet_fields, sheet_ttl)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="该姓名和班级的学生已存在，如有问题请联系管理员",
+        )
 
     # ----------------------------------------------------------------
-    # 步骤 7：颁发临时 token（仅用于 Step 2 完成注册）
+    # 步骤 6：颁发临时 token（仅用于 Step 2 完成注册）
     # ----------------------------------------------------------------
     temp_token = create_temp_token(subject=new_uuid, purpose="register_complete", expires_minutes=settings.TEMP_TOKEN_EXPIRE_MINUTES)
     CustomLog("SUCCESS", f"[Register] 新用户答题通过 uuid={new_uuid} real_name='{body.real_name}'")
@@ -467,6 +531,7 @@ async def complete_register(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="完成注册失败，用户不存在",
         )
+    invalidate_user_cache(user_uuid)
 
     # 颁发正式 token
     access_token = create_access_token(subject=user_uuid)
@@ -652,6 +717,8 @@ async def change_password(
             detail="用户不存在",
         )
 
+    bump_user_etag(user_uuid)
+
     # 密码变更后，撤销该用户的所有 Refresh Token，强制所有设备重新登录
     await RefreshTokensDAO.revoke_all_for_user(user_uuid)
 
@@ -678,8 +745,7 @@ async def update_profile(
 
     支持修改昵称（nickname）、班级（class）、真实姓名（real_name）中的一个或多个字段。
 
-    若修改了 real_name 或 class，会检查数据库中是否已存在相同姓名+班级的其他用户，
-    防止数据冲突。
+    若修改后的 real_name + class 与其他用户相同，唯一索引拒绝更新，返回 409。
     """
     user_uuid: str = current_user["uuid"]
 
@@ -705,39 +771,23 @@ async def update_profile(
         update_data["class"] = body.class_  # 注意：传入数据库列名 "class"
 
     # ----------------------------------------------------------------
-    # 若涉及 real_name 或 class 的变更，检查是否与其他用户冲突
+    # 更新数据库（real_name + class 与其他用户冲突时由唯一索引拒绝）
     # ----------------------------------------------------------------
-    if "real_name" in update_data or "class" in update_data:
-        # 取变更后的有效值（未变更的字段沿用当前值）；使用 is None 而非 or，
-        # 避免将空字符串（数据库中理论上可能存在）错误地当作"未提供"处理。
-        effective_real_name: str = (
-            update_data["real_name"] if "real_name" in update_data else (current_user.get("real_name") or "")
-        )
-        effective_class: str = (
-            update_data["class"] if "class" in update_data else (current_user.get("class") or "")
-        )
-
-        async with get_session() as session:
-            duplicate = await UsersDAO.find_duplicate_student_exclude_self(
-                session, effective_real_name, effective_class, user_uuid
-            )
-        if duplicate:
+    try:
+        async with savepoint():
+            updated = await UsersDAO().update(user_uuid, update_data)
+    except Exception as exc:
+        if UsersDAO.is_duplicate_student(exc):
             CustomLog(
                 "WARNING",
-                f"[UpdateProfile] uuid={user_uuid} real_name='{effective_real_name}' "
-                f"class='{effective_class}' 与已有用户冲突",
+                f"[UpdateProfile] uuid={user_uuid} "
+                f"real_name='{update_data.get('real_name', current_user.get('real_name'))}' "
+                f"class='{update_data.get('class', current_user.get('class'))}' 与已有用户冲突",
             )
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="该姓名和班级的学生已存在，如有问题请联系管理员",
             )
-
-    # ----------------------------------------------------------------
-    # 更新数据库
-    # ----------------------------------------------------------------
-    try:
-        updated = await UsersDAO().update(user_uuid, update_data)
-    except Exception as exc:
         CustomLog("ERROR", f"[UpdateProfile] uuid={user_uuid} 个人信息更新失败: {exc}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -751,6 +801,9 @@ async def update_profile(
             detail="用户不存在",
         )
 
+    # 昵称 / 姓名 / 班级属于鉴权缓存字段
+    invalidate_user_cache(user_uuid)
+
     CustomLog("SUCCESS", f"[UpdateProfile] uuid={user_uuid} 个人信息修改成功 fields={list(update_data.keys())}")
     return {
         "uuid": updated["uuid"],
@@ -769,14 +822,25 @@ async def update_profile(
 # ---------------------------------------------------------------------------
 
 @router.get("/me", response_model=dict[str, Any])
-async def read_users_me(current_user: dict = Depends(get_current_user)):
+async def read_users_me(
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+):
     """返回当前用户的完整个人信息（非敏感字段）。
 
     注意：不从 Redis 缓存读取，直接从数据库获取最新数据。
     排除字段：password, id, other_info, deletion_scheduled_at, last_login_ip
+
+    响应带 ETag（用户版本戳，所有 users 写入路径都会更换）；
+    If-None-Match 命中时返回 304，不查询数据库。
     """
     user_uuid: str = current_user["uuid"]
-    user = await UsersDAO().find_by_uuid(user_uuid)
+    etag = resource_etag(user_etag_key(user_uuid), settings.ETAG_VERSION_TTL_SECONDS)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    user = await UsersDAO().find_by_uuid(user_uuid, columns="profile")
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
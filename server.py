@@ -42,6 +42,8 @@ async def lifespan(app: FastAPI):
 
     # 停止定时任务调度器
     stop_scheduler()
+    from core.helper.CustomLog.stream import log_stream_hub
+    await log_stream_hub.close()
     await dispose_engine()
     CustomLog("SUCCESS", "PostgreSQL 连接已关闭")
     redis_conn.stop()
@@ -57,6 +59,8 @@ app.add_middleware(
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 管理端列表接口通过响应头返回键集分页游标
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "X-Total-Count", "ETag"],
 )
 # 注册防火墙中间件（在 CORS 之后，路由之前）
 if settings.FW_ENABLED:
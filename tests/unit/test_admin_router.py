@@ -10,6 +10,7 @@ from fastapi.testclient import TestClient
 from modules.api.v1 import admin as admin_v1
 from core.middleware.auth.dependencies import get_current_user
 from core.database.connection.pgsql import get_session
+from core.database.dao.base import Page, decode_cursor, encode_cursor
 
 
 # ---------------------------------------------------------------------------
@@ -42,11 +43,14 @@ def admin_client(monkeypatch):
     return TestClient(app)
 
 
-async def _mock_search_users(session, keyword=None, status=None, role=None, limit=100, offset=0):
-    return [
+async def _mock_search_users(
+    session, keyword=None, status=None, role=None, limit=100, offset=0, after_id=None, before_id=None,
+    with_total=False,
+):
+    return Page([
         {"uuid": "u-1", "nickname": "Alice", "user_role": "normal-user"},
         {"uuid": "u-2", "nickname": "Bob", "user_role": "normal-user"},
-    ]
+    ], total=2 if with_total else None)
 
 
 async def _mock_count_users(session, keyword=None, status=None, role=None):
@@ -180,7 +184,7 @@ def test_admin_update_user(admin_client, monkeypatch):
     monkeypatch.setattr(admin_v1.UsersDAO, "update", _mock_update, raising=False)
     monkeypatch.setattr(admin_v1, "invalidate_user_cache", _mock_invalidate)
 
-    async def _mock_find_by_uuid(self, uuid):
+    async def _mock_find_by_uuid(self, uuid, columns=None):
         return None if uuid == "nonexistent-uuid" else {"uuid": uuid, "nickname": "OldName"}
     monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
 
@@ -197,7 +201,7 @@ def test_admin_update_user(admin_client, monkeypatch):
 def test_admin_update_user_returns_404_when_not_found(admin_client, monkeypatch):
     monkeypatch.setattr(admin_v1.UsersDAO, "update", _mock_update, raising=False)
 
-    async def _mock_find_by_uuid(self, uuid):
+    async def _mock_find_by_uuid(self, uuid, columns=None):
         return None if uuid == "nonexistent-uuid" else {"uuid": uuid, "nickname": "OldName"}
     monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
 
@@ -208,6 +212,36 @@ def test_admin_update_user_returns_404_when_not_found(admin_client, monkeypatch)
     assert resp.status_code == 404
 
 
+def _student_conflict():
+    """SQLAlchemy asyncpg 适配层的同名同班级唯一冲突（原始异常在 orig.__cause__）。"""
+    from sqlalchemy.exc import IntegrityError
+
+    cause = Exception("duplicate key value violates unique constraint")
+    cause.constraint_name = admin_v1.UsersDAO.STUDENT_INDEX
+    orig = Exception("UniqueViolationError")
+    orig.sqlstate = "23505"
+    orig.__cause__ = cause
+    return IntegrityError("INSERT INTO users ...", {}, orig)
+
+
+def test_admin_create_and_update_user_map_duplicate_student_to_409(admin_client, monkeypatch):
+    async def _conflict(self, *args, **kwargs):
+        raise _student_conflict()
+
+    async def _mock_find_by_uuid(self, uuid, columns=None):
+        return {"uuid": uuid, "real_name": "张三", "class": "1班"}
+
+    monkeypatch.setattr(admin_v1.UsersDAO, "create", _conflict, raising=False)
+    monkeypatch.setattr(admin_v1.UsersDAO, "update", _conflict, raising=False)
+    monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
+    monkeypatch.setattr(admin_v1, "invalidate_user_cache", _mock_invalidate)
+
+    body = {"real_name": "李四", "class": "2班"}
+    assert admin_client.post("/admin/users", json=body).status_code == 409
+    resp = admin_client.patch("/admin/users/u-1", json=body)
+    assert resp.status_code == 409 and "已存在" in resp.json()["detail"]
+
+
 # ---------------------------------------------------------------------------
 # DELETE /admin/users/{user_uuid}
 # ---------------------------------------------------------------------------
@@ -220,7 +254,7 @@ def test_admin_delete_user(admin_client, monkeypatch):
     monkeypatch.setattr(admin_v1.UsersDAO, "count_by_role", _mock_count_users, raising=False)
     monkeypatch.setattr("core.database.dao.base.get_session", _fake_session)
 
-    async def _mock_find_by_uuid(self, uuid):
+    async def _mock_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "user_role": "normal-user"}
     monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
 
@@ -234,7 +268,7 @@ def test_admin_delete_user_returns_404(admin_client, monkeypatch):
     monkeypatch.setattr(admin_v1.UsersDAO, "delete", _mock_delete, raising=False)
     monkeypatch.setattr("core.database.dao.base.get_session", _fake_session)
 
-    async def _mock_find_by_uuid(self, uuid):
+    async def _mock_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "user_role": "normal-user"}
     monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
     monkeypatch.setattr(admin_v1.UsersDAO, "count_by_role", _mock_count_users, raising=False)
@@ -254,7 +288,7 @@ def test_admin_disable_user(admin_client, monkeypatch):
     monkeypatch.setattr(admin_v1.UsersDAO, "update", capture_update, raising=False)
     monkeypatch.setattr(admin_v1, "invalidate_user_cache", _mock_invalidate)
 
-    async def _mock_find_by_uuid(self, uuid):
+    async def _mock_find_by_uuid(self, uuid, columns=None):
         return None if uuid == "nonexistent-uuid" else {"uuid": uuid, "current_status": "normal"}
     monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
 
@@ -272,7 +306,7 @@ def test_admin_disable_user_returns_404(admin_client, monkeypatch):
 
     monkeypatch.setattr(admin_v1.UsersDAO, "update", capture_update, raising=False)
 
-    async def _mock_find_by_uuid(self, uuid):
+    async def _mock_find_by_uuid(self, uuid, columns=None):
         return None if uuid == "nonexistent-uuid" else {"uuid": uuid, "current_status": "normal"}
     monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
 
@@ -301,7 +335,7 @@ def test_admin_enable_user(admin_client, monkeypatch):
     monkeypatch.setattr(admin_v1.UsersDAO, "update", capture_update, raising=False)
     monkeypatch.setattr(admin_v1, "invalidate_user_cache", _mock_invalidate)
 
-    async def _mock_find_by_uuid(self, uuid):
+    async def _mock_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "current_status": "disabled"}
     monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
 
@@ -322,7 +356,7 @@ def test_admin_ban_user(admin_client, monkeypatch):
     monkeypatch.setattr(admin_v1.UsersDAO, "update", capture_update, raising=False)
     monkeypatch.setattr(admin_v1, "invalidate_user_cache", _mock_invalidate)
 
-    async def _mock_find_by_uuid(self, uuid):
+    async def _mock_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "current_status": "normal"}
     monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
 
@@ -344,7 +378,7 @@ def test_admin_unban_user(admin_client, monkeypatch):
     monkeypatch.setattr(admin_v1.UsersDAO, "update", capture_update, raising=False)
     monkeypatch.setattr(admin_v1, "invalidate_user_cache", _mock_invalidate)
 
-    async def _mock_find_by_uuid(self, uuid):
+    async def _mock_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "current_status": "banned"}
     monkeypatch.setattr(admin_v1.UsersDAO, "find_by_uuid", _mock_find_by_uuid, raising=False)
 
@@ -428,7 +462,7 @@ def test_admin_sensitive_data_success(admin_client, monkeypatch):
     """查看敏感信息成功，返回 real_name 和 class。"""
     monkeypatch.setattr("core.config.settings.SUPER_PASSWORD", "super-secret")
 
-    async def fake_find_by_uuids(session, uuids):
+    async def fake_find_by_uuids(session, uuids, columns=None):
         return [
             {"uuid": "u-1", "real_name": "张三", "class": "高一(1)班"},
             {"uuid": "u-2", "real_name": "李四", "class": "高二(2)班"},
@@ -520,6 +554,100 @@ def test_admin_batch_delete_users_contains_self(admin_client, monkeypatch):
     assert "当前登录的管理员账户" in resp.json()["detail"]
 
 
+# ---------------------------------------------------------------------------
+# POST /admin/users/batch-status
+# ---------------------------------------------------------------------------
+
+
+def test_admin_batch_status_updates_revokes_and_audits_in_bulk(admin_client, monkeypatch):
+    calls = {}
+
+    async def fake_batch_set_status(session, uuids, status, protected_roles=()):
+        calls["update"] = (uuids, status, tuple(protected_roles))
+        return [{"uuid": "u-1", "before": "normal"}, {"uuid": "u-2", "before": "disabled"}]
+
+    async def fake_revoke(user_uuids):
+        calls["revoke"] = user_uuids
+        return 3
+
+    async def fake_write_many(entries, *, user_agent=None, request_url=None):
+        calls["audit"] = list(entries)
+        return len(calls["audit"])
+
+    monkeypatch.setattr(admin_v1.UsersDAO, "batch_set_status", fake_batch_set_status)
+    monkeypatch.setattr(admin_v1.RefreshTokensDAO, "revoke_all_for_users", fake_revoke)
+    monkeypatch.setattr(admin_v1.PersonalLogsDAO, "write_many", fake_write_many)
+    monkeypatch.setattr(admin_v1, "_batch_invalidate_user_cache", lambda uuids: calls.setdefault("cache", uuids))
+    monkeypatch.setattr(admin_v1, "CustomLog", lambda *a, **kw: None)
+
+    resp = admin_client.post(
+        "/admin/users/batch-status",
+        json={"uuids": ["u-1", "u-2", "u-1", "u-super"], "status": "banned"},
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"updated": 2, "skipped": ["u-super"], "revoked_tokens": 3}
+    assert calls["update"] == (["u-1", "u-2", "u-super"], "banned", ("superadmin",))
+    assert calls["revoke"] == calls["cache"] == ["u-1", "u-2"]
+    assert [e["event_type"] for e in calls["audit"]] == ["USER_BAN", "USER_BAN"]
+    assert calls["audit"][1]["before_data"] == {"current_status": "disabled"}
+
+
+def test_admin_batch_status_normal_keeps_tokens(admin_client, monkeypatch):
+    audit = []
+
+    async def fake_batch_set_status(session, uuids, status, protected_roles=()):
+        return [{"uuid": "u-1", "before": "banned"}, {"uuid": "u-2", "before": "disabled"}]
+
+    async def fake_revoke(user_uuids):
+        raise AssertionError("恢复正常不应撤销 token")
+
+    async def fake_write_many(entries, *, user_agent=None, request_url=None):
+        audit.extend(entries)
+        return len(audit)
+
+    monkeypatch.setattr(admin_v1.UsersDAO, "batch_set_status", fake_batch_set_status)
+    monkeypatch.setattr(admin_v1.RefreshTokensDAO, "revoke_all_for_users", fake_revoke)
+    monkeypatch.setattr(admin_v1.PersonalLogsDAO, "write_many", fake_write_many)
+    monkeypatch.setattr(admin_v1, "_batch_invalidate_user_cache", lambda uuids: None)
+    monkeypatch.setattr(admin_v1, "CustomLog", lambda *a, **kw: None)
+
+    resp = admin_client.post("/admin/users/batch-status", json={"uuids": ["u-1", "u-2"], "status": "normal"})
+    assert resp.status_code == 200 and resp.json()["revoked_tokens"] == 0
+    assert [e["event_type"] for e in audit] == ["USER_UNBAN", "USER_ENABLE"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"uuids": ["admin-uuid", "u-2"], "status": "banned"},
+        {"uuids": ["u-1"], "status": "pending_deletion"},
+        {"uuids": [], "status": "banned"},
+    ],
+)
+def test_admin_batch_status_rejects_invalid_requests(admin_client, body):
+    resp = admin_client.post("/admin/users/batch-status", json=body)
+    assert resp.status_code in (400, 422)
+
+
+def test_batch_set_status_is_a_single_update_returning_old_status():
+    import asyncio
+
+    from sqlalchemy.dialects import postgresql
+
+    class _Session:
+        async def execute(self, stmt):
+            self.sql = str(stmt.compile(dialect=postgresql.dialect()))
+            return [SimpleNamespace(uuid="u-1", before="normal")]
+
+    session = _Session()
+    rows = asyncio.run(admin_v1.UsersDAO.batch_set_status(session, ["u-1"], "banned", ("superadmin",)))
+    assert rows == [{"uuid": "u-1", "before": "normal"}]
+    assert session.sql.startswith("UPDATE users SET current_status=")
+    assert 'FROM users AS "old"' in session.sql
+    assert "IS DISTINCT FROM" in session.sql and "users.user_role NOT IN" in session.sql
+    assert session.sql.endswith('RETURNING users.uuid, "old".current_status AS before')
+
+
 # ---------------------------------------------------------------------------
 # GET /admin/users — 筛选参数
 # ---------------------------------------------------------------------------
@@ -528,9 +656,12 @@ def test_admin_list_users_filters(admin_client, monkeypatch):
     """GET /admin/users 传筛选参数，确认参数正确传递给 DAO。"""
     captured = {}
 
-    async def fake_search(session, keyword=None, status=None, role=None, limit=100, offset=0):
+    async def fake_search(
+        session, keyword=None, status=None, role=None, limit=100, offset=0, after_id=None, before_id=None,
+        with_total=False,
+    ):
         captured.update(keyword=keyword, status=status, role=role, limit=limit, offset=offset)
-        return []
+        return Page()
 
     monkeypatch.setattr(admin_v1.UsersDAO, "search_users", fake_search, raising=False)
 
@@ -545,6 +676,54 @@ def test_admin_list_users_filters(admin_client, monkeypatch):
     assert captured["offset"] == 10
 
 
+def test_admin_list_users_cursor_pagination(admin_client, monkeypatch):
+    """cursor 解析为 after_id 传给 DAO，下一页 / 上一页游标通过响应头返回。"""
+    captured = {}
+
+    async def fake_search(session, limit=100, offset=0, after_id=None, before_id=None, **filters):
+        captured.update(after_id=after_id, before_id=before_id)
+        return Page(
+            [{"uuid": "u-3"}],
+            next_cursor=encode_cursor("a", 3),
+            prev_cursor=encode_cursor("b", 3),
+        )
+
+    monkeypatch.setattr(admin_v1.UsersDAO, "search_users", fake_search, raising=False)
+
+    resp = admin_client.get(f"/admin/users?cursor={encode_cursor('a', 2)}")
+    assert resp.status_code == 200
+    assert resp.json() == [{"uuid": "u-3"}]
+    assert captured == {"after_id": 2, "before_id": None}
+    assert decode_cursor(resp.headers["X-Next-Cursor"]) == (3, None)
+    assert decode_cursor(resp.headers["X-Prev-Cursor"]) == (None, 3)
+
+
+def test_admin_list_users_with_total_sets_header(admin_client, monkeypatch):
+    """with_total=true 时总数随列表一并返回（X-Total-Count），默认不计算。"""
+    monkeypatch.setattr(admin_v1.UsersDAO, "search_users", _mock_search_users, raising=False)
+
+    resp = admin_client.get("/admin/users?with_total=true")
+    assert resp.status_code == 200 and resp.headers["X-Total-Count"] == "2"
+    assert "X-Total-Count" not in admin_client.get("/admin/users").headers
+
+
+def test_user_search_keyword_is_matched_literally():
+    """关键词中的 % / _ 按字面匹配，不作为通配符。"""
+    from sqlalchemy import and_
+
+    (condition,) = admin_v1.UsersDAO._search_conditions("50%_off", None, None)
+    params = and_(condition).compile().params
+    assert set(params.values()) == {"%50\\%\\_off%"}
+
+
+def test_admin_list_users_rejects_bad_cursor(admin_client, monkeypatch):
+    monkeypatch.setattr(admin_v1.UsersDAO, "search_users", _mock_search_users, raising=False)
+
+    assert admin_client.get("/admin/users?cursor=not-a-cursor").status_code == 400
+    resp = admin_client.get(f"/admin/users?cursor={encode_cursor('a', 2)}&offset=5")
+    assert resp.status_code == 400
+
+
 # ---------------------------------------------------------------------------
 # GET /admin/users/total
 # ---------------------------------------------------------------------------
@@ -560,3 +739,76 @@ def test_admin_users_total(admin_client, monkeypatch):
     resp = admin_client.get("/admin/users/total")
     assert resp.status_code == 200
     assert resp.json()["total"] == 42
+
+
+# ---------------------------------------------------------------------------
+# GET /admin/analytics/*
+# ---------------------------------------------------------------------------
+
+def test_admin_log_hourly_rollups_passes_filters(admin_client, monkeypatch):
+    """GET /admin/analytics/logs/hourly 将筛选条件与分组维度透传给汇总 DAO。"""
+    captured = {}
+
+    async def fake_query(**kwargs):
+        captured.update(kwargs)
+        return [{"bucket_hour": "2024-01-01T10:00:00", "count": 7}]
+
+    monkeypatch.setattr(admin_v1.LogRollupsDAO, "query_log_hourly", fake_query)
+
+    resp = admin_client.get(
+        "/admin/analytics/logs/hourly?event_type=LOGIN&status=FAIL&group_by=status,log_type"
+    )
+    assert resp.status_code == 200
+    assert resp.json()["items"][0]["count"] == 7
+    assert captured["event_type"] == "LOGIN"
+    assert captured["status"] == "FAIL"
+    assert captured["group_by"] == ("status", "log_type")
+    assert captured["end_time"] - captured["start_time"] == admin_v1.timedelta(days=7)
+
+
+def test_admin_log_hourly_rollups_rejects_unknown_dimension(admin_client):
+    resp = admin_client.get("/admin/analytics/logs/hourly?group_by=user_agent")
+    assert resp.status_code == 400
+
+
+def test_admin_log_hourly_rollups_rejects_inverted_range(admin_client):
+    resp = admin_client.get(
+        "/admin/analytics/logs/hourly"
+        "?start_time=2024-01-02T00:00:00&end_time=2024-01-01T00:00:00"
+    )
+    assert resp.status_code == 400
+
+
+def test_admin_firewall_top_defaults_to_type_and_ip(admin_client, monkeypatch):
+    """GET /admin/analytics/firewall/top 默认按 (type, ip) 聚合最近 24 小时。"""
+    captured = {}
+
+    async def fake_top(**kwargs):
+        captured.update(kwargs)
+        return [{"type": "rate_limit", "ip": "1.2.3.4", "count": 99}]
+
+    monkeypatch.setattr(admin_v1.LogRollupsDAO, "query_firewall_top", fake_top)
+
+    resp = admin_client.get("/admin/analytics/firewall/top?limit=5")
+    assert resp.status_code == 200
+    assert resp.json()["items"][0]["ip"] == "1.2.3.4"
+    assert captured["group_by"] == ("type", "ip")
+    assert captured["limit"] == 5
+    assert captured["end_time"] - captured["start_time"] == admin_v1.timedelta(hours=24)
+
+
+def test_admin_db_metrics_returns_pool_snapshot(admin_client):
+    """GET /admin/metrics/db 返回连接池签出统计。"""
+    from core.database.connection import metrics
+
+    metrics.reset()
+    with metrics.track_request_checkouts():
+        metrics._on_checkout(None, None, None)
+
+    resp = admin_client.get("/admin/metrics/db")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["checkouts_total"] == 1
+    assert body["checkouts_per_request_histogram"] == {"<=1": 1}
+    assert "statements_per_request_avg" in body["statements"]
+    metrics.reset()
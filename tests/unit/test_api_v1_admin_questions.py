@@ -6,13 +6,16 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 import pytest
 
+from core.database.dao.base import Page, encode_cursor
 from modules.api.v1.admin import router as admin_router
+from modules.api.v1.admin import upload_router as admin_upload_router
 
 
 @pytest.fixture()
 def client():
     app = FastAPI()
     app.include_router(admin_router)
+    app.include_router(admin_upload_router)
     # Override auth dependencies to always pass for superadmin
     from core.middleware.auth.dependencies import MinRoleChecker, get_current_user
     from core.security.rbac import Role
@@ -29,10 +32,13 @@ def test_list_questions_returns_paginated_results(client, monkeypatch):
          "created_by": "admin", "created_at": "2025-01-01T00:00:00", "id": 1},
     ]
 
-    async def fake_search(keyword=None, question_type=None, status=None, limit=100, offset=0):
-        return fake_questions
+    async def fake_search(
+        keyword=None, question_type=None, status=None, limit=100, offset=0, after_id=None, before_id=None,
+        readonly=True,
+    ):
+        return Page(fake_questions, next_cursor=encode_cursor("a", 1))
 
-    async def fake_count(keyword=None, question_type=None, status=None):
+    async def fake_count(keyword=None, question_type=None, status=None, readonly=True):
         return 1
 
     monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "search_questions", fake_search)
@@ -43,28 +49,38 @@ def test_list_questions_returns_paginated_results(client, monkeypatch):
     data = response.json()
     assert len(data) == 1
     assert data[0]["uuid"] == "q-1"
+    assert response.headers["X-Next-Cursor"] == encode_cursor("a", 1)
+    assert "X-Prev-Cursor" not in response.headers
 
 
 def test_list_questions_supports_filters(client, monkeypatch):
     from modules.api.v1 import admin as admin_module
     captured = {}
 
-    async def fake_search(keyword=None, question_type=None, status=None, limit=100, offset=0):
-        captured.update(keyword=keyword, question_type=question_type, status=status)
-        return []
+    async def fake_search(
+        keyword=None, question_type=None, status=None, limit=100, offset=0, after_id=None, before_id=None,
+        readonly=True,
+    ):
+        captured.update(
+            keyword=keyword, question_type=question_type, status=status, before_id=before_id, readonly=readonly
+        )
+        return Page()
 
     monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "search_questions", fake_search)
 
-    response = client.get("/admin/questions?keyword=test&type=choice&status=active")
+    cursor = encode_cursor("b", 7)
+    response = client.get(f"/admin/questions?keyword=test&type=choice&status=active&cursor={cursor}")
     assert response.status_code == 200
     assert captured["keyword"] == "test"
     assert captured["question_type"] == "choice"
     assert captured["status"] == "active"
+    assert captured["before_id"] == 7
+    assert captured["readonly"] is True  # 无 Redis 时不签发 ETag，可读只读副本
 
 
 def test_questions_total(client, monkeypatch):
     from modules.api.v1 import admin as admin_module
-    async def fake_count(keyword=None, question_type=None, status=None):
+    async def fake_count(keyword=None, question_type=None, status=None, readonly=True):
         return 42
     monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "count_questions", fake_count)
     response = client.get("/admin/questions/total")
@@ -177,7 +193,7 @@ def test_create_question_fill_blank(client, monkeypatch):
 def test_update_question(client, monkeypatch):
     from modules.api.v1 import admin as admin_module
     updated = {}
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "question_type": "choice"}
     async def fake_update(self, uuid, data):
         updated.update(data)
@@ -193,7 +209,7 @@ def test_update_question(client, monkeypatch):
 
 def test_update_nonexistent_question_returns_404(client, monkeypatch):
     from modules.api.v1 import admin as admin_module
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return None
     monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "find_by_uuid", fake_find_by_uuid, raising=False)
     response = client.patch("/admin/questions/nonexistent", json={"question": "测试"})
@@ -264,19 +280,23 @@ def test_single_update_status(client, monkeypatch):
 
 def test_questions_stats(client, monkeypatch):
     from modules.api.v1 import admin as admin_module
-    async def fake_count_by_type(t):
-        return {"choice": 10, "true_false": 5, "fill_blank": 3}.get(t, 0)
-    async def fake_count(keyword=None, question_type=None, status=None):
-        return 18
-    monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "count_by_type", fake_count_by_type)
-    monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "count_questions", fake_count)
+    async def fake_load_stats():
+        return [
+            ("choice", "active", 8), ("choice", "inactive", 2),
+            ("true_false", "active", 5), ("fill_blank", "active", 3), (None, None, 1),
+        ]
+    monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "load_stats", staticmethod(fake_load_stats))
+    monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "_stats_loaded_at", 0.0)
     response = client.get("/admin/questions/stats")
     assert response.status_code == 200
     data = response.json()
-    assert data["total"] == 18
+    assert data["total"] == 19
     assert data["choice"] == 10
     assert data["true_false"] == 5
     assert data["fill_blank"] == 3
+    assert data["by_status"] == {"active": 16, "inactive": 2, "unknown": 1}
+    assert data["by_type"]["choice"] == {"total": 10, "active": 8, "inactive": 2}
+    assert data["by_type"]["unknown"] == {"total": 1, "unknown": 1}
 
 
 def test_create_question_choice_rejects_duplicate_options(client, monkeypatch):
@@ -293,7 +313,7 @@ def test_create_question_choice_rejects_duplicate_options(client, monkeypatch):
 def test_update_question_true_false_validates_answer(client, monkeypatch):
     from modules.api.v1 import admin as admin_module
 
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "question_type": "true_false"}
 
     monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "find_by_uuid", fake_find_by_uuid, raising=False)
@@ -309,7 +329,7 @@ def test_update_question_true_false_validates_answer(client, monkeypatch):
 def test_update_question_at_least_one_field(client, monkeypatch):
     from modules.api.v1 import admin as admin_module
 
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "question_type": "choice"}
 
     monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "find_by_uuid", fake_find_by_uuid, raising=False)
@@ -324,7 +344,7 @@ def test_update_question_at_least_one_field(client, monkeypatch):
 def test_update_question_choice_answer_not_in_options(client, monkeypatch):
     from modules.api.v1 import admin as admin_module
 
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "question_type": "choice"}
 
     monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "find_by_uuid", fake_find_by_uuid, raising=False)
@@ -335,3 +355,207 @@ def test_update_question_choice_answer_not_in_options(client, monkeypatch):
     )
     assert response.status_code == 400
     assert "答案必须在选项中" in response.json()["detail"]
+
+
+# ---------------------------------------------------------------------------
+# POST /admin/questions/import
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def importer(client, monkeypatch):
+    """替换数据库写入：记录会话开启次数、每次 bulk_create 的行、事务是否回滚以及题库失效次数。"""
+    from contextlib import asynccontextmanager
+
+    from modules.api.v1 import admin as admin_module
+
+    state = {"sessions": 0, "chunks": [], "rolled_back": False, "invalidated": 0}
+
+    @asynccontextmanager
+    async def fake_session(*args, **kwargs):
+        state["sessions"] += 1
+        try:
+            yield object()
+        except Exception:
+            state["rolled_back"] = True
+            raise
+
+    async def fake_bulk_create(self, rows, *, returning=False, chunk_size=None, session=None):
+        state["chunks"].append(list(rows))
+        return len(state["chunks"][-1])
+
+    def fake_invalidate():
+        state["invalidated"] += 1
+
+    monkeypatch.setattr(admin_module, "get_session", fake_session)
+    monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "bulk_create", fake_bulk_create)
+    monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "invalidate_pool", staticmethod(fake_invalidate))
+    monkeypatch.setattr(admin_module, "CustomLog", lambda *a, **kw: None)
+    return state
+
+
+def test_import_csv_validates_rows_and_reports_errors(client, importer):
+    body = (
+        "﻿question,question_type,answer,options,question_level\r\n"
+        '"多行\n题目？",choice,B,A|B|C,easy\r\n'
+        "地球是圆的,true_false,true,,\r\n"
+        "答案不在选项,choice,D,A|B,\r\n"
+        '"JSON 选项, 含逗号",choice,"x, y","[""x, y"", ""z""]",\r\n'
+        "只有两列,choice\r\n"
+    )
+    response = client.post(
+        "/admin/questions/import", content=body.encode("utf-8"), headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["inserted"] == 3 and data["error_count"] == 2
+    assert [e["line"] for e in data["errors"]] == [5, 7]
+    assert "答案必须在选项中" in data["errors"][0]["error"]
+
+    (chunk,) = importer["chunks"]
+    assert chunk[0]["question"] == "多行\n题目？"
+    assert json.loads(chunk[0]["options"]) == ["A", "B", "C"]
+    assert chunk[1]["options"] is None and chunk[1]["current_status"] == "active"
+    assert json.loads(chunk[2]["options"]) == ["x, y", "z"]
+    assert {tuple(sorted(row)) for row in chunk} == {tuple(sorted(chunk[0]))}  # 列集合一致，同一条多行 INSERT
+    assert importer["invalidated"] == 1
+
+
+def test_import_ndjson_validates_first_then_inserts_in_one_session(client, importer):
+    lines = [json.dumps({"question": f"题目{i}", "question_type": "fill_blank", "answer": str(i)}) for i in range(5)]
+    lines.insert(2, "not json")
+    response = client.post("/admin/questions/import?format=ndjson", content="\n".join(lines).encode())
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 5
+    assert response.json()["errors"][0]["line"] == 3
+    assert importer["sessions"] == 1
+    assert [len(chunk) for chunk in importer["chunks"]] == [5]  # 由 bulk_create 按 BULK_CHUNK_SIZE 分块
+    assert importer["invalidated"] == 1
+
+
+def test_import_atomic_rolls_back_on_any_error(client, importer):
+    body = "question,question_type,answer\n好题,fill_blank,答案\n坏题,true_false,maybe\n"
+    response = client.post(
+        "/admin/questions/import?atomic=true", content=body.encode(), headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"]["error_count"] == 1
+    assert importer["sessions"] == 0 and importer["invalidated"] == 0  # 校验失败时不开启数据库会话
+
+
+@pytest.mark.parametrize(
+    "body, headers, expected",
+    [
+        (b"question,answer\nq,a\n", {"Content-Type": "text/csv"}, 400),  # 缺少 question_type 列
+        (b"{}", {"Content-Type": "application/json"}, 415),
+        (b"\xff\xfe", {"Content-Type": "text/csv"}, 400),
+    ],
+)
+def test_import_rejects_bad_uploads(client, importer, body, headers, expected):
+    response = client.post("/admin/questions/import", content=body, headers=headers)
+    assert response.status_code == expected
+    assert importer["chunks"] == [] and importer["invalidated"] == 0
+
+
+def test_import_enforces_row_limit(client, importer, monkeypatch):
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "QUESTION_IMPORT_MAX_ROWS", 2)
+    lines = "\n".join(json.dumps({"question": "q", "question_type": "fill_blank", "answer": "a"}) for _ in range(3))
+    response = client.post("/admin/questions/import?format=ndjson", content=lines.encode())
+    assert response.status_code == 413
+    assert importer["sessions"] == 0
+
+
+def test_import_enforces_byte_limit_without_newlines(client, importer, monkeypatch):
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "QUESTION_IMPORT_MAX_BYTES", 1024)
+
+    def body():  # 分块发送、不带换行也不带 Content-Length
+        for _ in range(8):
+            yield b"x" * 256
+
+    response = client.post("/admin/questions/import?format=csv", content=body())
+    assert response.status_code == 413
+    assert importer["sessions"] == 0
+
+    declared = client.post("/admin/questions/import?format=csv", content=b"y" * 2048)
+    assert declared.status_code == 413
+
+
+def test_import_holds_no_connection_while_reading_upload(monkeypatch):
+    """挂在完整 v1 路由下（工作单元开启、鉴权缓存未命中）时，读取请求体期间没有签出的连接。"""
+    from core.config import settings
+    from core.database.connection import pgsql
+    from core.database.dao.users import UsersDAO
+    from core.security.jwt_handler import create_access_token
+    from modules.api.v1 import admin as admin_module
+    from modules.api.v1.router import router as api_v1_router
+
+    monkeypatch.setattr(settings, "DB_REQUEST_UNIT_OF_WORK", True)
+    monkeypatch.setattr(settings, "JWT_SECRET_KEY", "test-jwt-secret-for-unit-tests")
+    monkeypatch.setattr(
+        "core.middleware.auth.dependencies.redis_conn", type("R", (), {"get_client": lambda self: None})()
+    )
+
+    checked_out: set = set()
+    statements: list[str] = []
+    auth_row = tuple(
+        {"uuid": "admin-uuid", "user_role": "superadmin", "current_status": "normal"}.get(name)
+        for name in UsersDAO.PROJECTIONS["auth"]
+    )
+
+    class _Result:
+        def first(self):
+            return auth_row
+
+    class _Session:
+        """首次执行语句时签出连接，事务结束（提交 / 回滚 / 关闭）时归还。"""
+
+        async def execute(self, stmt):
+            checked_out.add(self)
+            statements.append(type(stmt).__name__)
+            return _Result()
+
+        async def commit(self):
+            checked_out.discard(self)
+
+        async def rollback(self):
+            checked_out.discard(self)
+
+        async def close(self):
+            checked_out.discard(self)
+
+    monkeypatch.setattr(pgsql, "_get_session_factory", lambda: _Session)
+
+    observed: list[int] = []
+    original_lines = admin_module._iter_upload_lines
+
+    async def spying_lines(request):
+        async for line in original_lines(request):
+            observed.append(len(checked_out))
+            yield line
+
+    async def fake_bulk_create(self, rows, *, returning=False, chunk_size=None, session=None):
+        await session.execute(object())
+        return len(rows)
+
+    monkeypatch.setattr(admin_module, "_iter_upload_lines", spying_lines)
+    monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "bulk_create", fake_bulk_create)
+    monkeypatch.setattr(admin_module.RegisterQuestionsDAO, "invalidate_pool", staticmethod(lambda: None))
+    monkeypatch.setattr(admin_module, "CustomLog", lambda *a, **kw: None)
+
+    app = FastAPI()
+    app.include_router(api_v1_router)
+    lines = [json.dumps({"question": f"题目{i}", "question_type": "fill_blank", "answer": "a"}) for i in range(3)]
+    response = TestClient(app).post(
+        "/admin/questions/import?format=ndjson",
+        content="\n".join(lines).encode(),
+        headers={"Authorization": f"Bearer {create_access_token('admin-uuid')}"},
+    )
+
+    assert response.status_code == 200 and response.json()["inserted"] == 3
+    assert len(statements) == 2  # 鉴权查询 + 批量写入
+    assert observed == [0, 0, 0]
+    assert not checked_out
@@ -166,7 +166,7 @@ def test_read_users_me_returns_current_user_payload(client, monkeypatch):
         "current_status": "normal",
     }
 
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return {
             "uuid": uuid,
             "username": None,
@@ -218,7 +218,7 @@ def test_refresh_token_success(client, monkeypatch):
     monkeypatch.setattr(auth_v1.RefreshTokensDAO, "revoke", fake_revoke, raising=False)
     monkeypatch.setattr(auth_v1.RefreshTokensDAO, "create", fake_create, raising=False)
     # Mock UsersDAO().find_by_uuid to return a valid user (refresh now validates user)
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "real_name": "Test", "current_status": "normal"}
     monkeypatch.setattr(auth_v1.UsersDAO, "find_by_uuid", fake_find_by_uuid, raising=False)
     monkeypatch.setattr(auth_v1, "create_access_token", lambda subject: "new-access-token")
@@ -380,7 +380,7 @@ def test_refresh_returns_401_when_user_not_found(client, monkeypatch):
     async def fake_find_active(h):
         return record if h == token_hash else None
 
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return None
 
     monkeypatch.setattr(auth_v1.RefreshTokensDAO, "find_active", fake_find_active, raising=False)
@@ -402,7 +402,7 @@ def test_refresh_returns_401_when_user_disabled(client, monkeypatch):
     async def fake_find_active(h):
         return record if h == token_hash else None
 
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return {"uuid": uuid, "current_status": "disabled"}
 
     monkeypatch.setattr(auth_v1.RefreshTokensDAO, "find_active", fake_find_active, raising=False)
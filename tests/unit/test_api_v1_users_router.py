@@ -2,12 +2,16 @@
 
 import hashlib
 import json
+import os
+import threading
+import uuid as uuid_lib
 from contextlib import asynccontextmanager
 from types import SimpleNamespace
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
 
 from core.config import settings
 from modules.api.v1 import users as users_v1
@@ -51,11 +55,8 @@ def _fake_questions(count: int = 5) -> list[dict]:
 
 
 def _build_sheet_data(questions: list[dict], ip: str = "127.0.0.1") -> dict:
-    return {
-        "questions": [{"uuid": q["uuid"], "question": q["question"]} for q in questions],
-        "answers": {q["uuid"]: q["answer"].lower() for q in questions},
-        "issued_ip": ip,
-    }
+    """问题表 Hash 的字段（与 Redis 返回一致，值均为字符串）。"""
+    return {k: str(v) for k, v in users_v1._sheet_mapping(questions, ip).items()}
 
 
 # ---------------------------------------------------------------------------
@@ -70,12 +71,7 @@ def test_get_questions_returns_sheet(client, monkeypatch):
     async def fake_find_random_active(count=5):
         return questions
 
-    mock_redis = SimpleNamespace(
-        get=lambda key: None,
-        set=lambda *a, **kw: None,
-        incr=lambda key: 1,
-        expire=lambda key, ttl: None,
-    )
+    mock_redis = _FakeRegisterRedis(None)
 
     monkeypatch.setattr(users_v1.RegisterQuestionsDAO, "find_random_active", fake_find_random_active)
     monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
@@ -93,6 +89,10 @@ def test_get_questions_returns_sheet(client, monkeypatch):
         assert "answer" not in q
         assert "uuid" in q
         assert "question" in q
+    # 答案与尝试次数存于同一个 Hash，并设置了 TTL
+    sheet_key = f"{users_v1._REDIS_QSHEET_PREFIX}{data['sheet_id']}"
+    assert mock_redis.hashes[sheet_key] == _build_sheet_data(questions, ip="testclient")
+    assert mock_redis.ttls[sheet_key] == settings.REG_SHEET_TTL_SECONDS
 
 
 def test_get_questions_returns_429_when_ip_at_limit(client, monkeypatch):
@@ -164,53 +164,114 @@ _VALID_REGISTER_BODY = {
 }
 
 
-def _build_mock_redis(sheet_data: dict, ip_count: int = 0, name_count: int = 0, sheet_count: int = 0):
-    """构建一个模拟 Redis 客户端（支持 get/incr/expire/delete）。"""
-    _sheet_raw = json.dumps(sheet_data, ensure_ascii=False)
-    _incr_store: dict[str, int] = {}
-    _deleted: list = []
-
-    def _get(key: str):
-        if "qsheet:" in key and "qsheet_atm" not in key:
-            return _sheet_raw
-        return None
-
-    def _incr(key: str) -> int:
-        _incr_store[key] = _incr_store.get(key, 0) + 1
-        return _incr_store[key]
-
-    def _expire(key: str, ttl: int) -> None:
-        pass
-
-    def _delete(*keys) -> None:
-        _deleted.extend(keys)
-
-    def _get_int_factory(ip_c, name_c, sheet_c):
-        def _get_int(client, key: str) -> int:
-            if "ip_atm" in key:
-                return ip_c
-            if "name_atm" in key:
-                return name_c
-            if "qsheet_atm" in key:
-                return sheet_c
-            if "ip_sheets" in key:
-                return 0
-            return 0
-        return _get_int
-
-    return SimpleNamespace(get=_get, incr=_incr, expire=_expire, delete=_delete), _get_int_factory(
-        ip_count, name_count, sheet_count
-    )
+class _FakeRegisterRedis:
+    """模拟 Redis 客户端（计数器 + 问题表 Hash），注册计数脚本按与 Lua 相同的语义在锁内原子执行。
+
+    ``sheet_data`` 为问题表 Hash 模板，任意 ``reg:qsheet:*`` key 首次访问时复制一份（删除后不再出现）；
+    ``counts`` 为计数器初始值，按 key 片段匹配（ip_atm / name_atm），问题表计数为 Hash 的 atm 字段。
+    """
+
+    def __init__(self, sheet_data: dict | None, counts: dict[str, int] | None = None):
+        self.sheet_template = sheet_data
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.store: dict[str, int] = {}
+        self.ttls: dict[str, int] = {}
+        self.defaults = counts or {}
+        self.deleted: list = []
+        self.script_calls = 0
+        self._lock = threading.RLock()
+
+    def count(self, key: str) -> int:
+        if key in self.store:
+            return self.store[key]
+        return next((v for frag, v in self.defaults.items() if frag in key), 0)
+
+    def sheet(self, key: str) -> dict[str, str] | None:
+        if key not in self.hashes and key not in self.deleted and self.sheet_template is not None:
+            self.hashes[key] = dict(self.sheet_template)
+        return self.hashes.get(key)
+
+    def get(self, key: str):
+        return self.store.get(key)
+
+    def incr(self, key: str) -> int:
+        self.store[key] = self.count(key) + 1
+        return self.store[key]
+
+    def expire(self, key: str, ttl: int) -> None:
+        self.ttls[key] = ttl
+
+    def ttl(self, key: str) -> int:
+        return self.ttls.get(key, 600) if key in self.hashes or key in self.store else -2
+
+    def hset(self, key: str, mapping: dict) -> None:
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    def delete(self, *keys) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self.sheet(key) is not None:
+                    del self.hashes[key]
+                    removed += 1
+                elif self.store.pop(key, None) is not None:
+                    removed += 1
+                self.deleted.append(key)
+            return removed
+
+    def pipeline(self, transaction: bool = True):
+        return _FakePipeline(self)
+
+    def register_script(self, lua: str):
+        assert lua is users_v1._REGISTER_ATTEMPT_LUA
+        return self._register_attempt
+
+    def _register_attempt(self, keys, args):
+        ip_key, name_key, sheet_key = keys
+        ip_limit, name_limit, sheet_limit, _ttl = (int(a) for a in args)
+        with self._lock:
+            self.script_calls += 1
+            for tripped, key, limit in (("ip", ip_key, ip_limit), ("name", name_key, name_limit)):
+                if self.count(key) >= limit:
+                    return [tripped, self.count(key), None]
+            sheet = self.sheet(sheet_key)
+            if sheet is None:
+                return ["sheet_missing", 0, None]
+            attempts = int(sheet.get("atm", 0))
+            if attempts >= sheet_limit:
+                return ["sheet", attempts, None]
+            for key in (ip_key, name_key):
+                self.incr(key)
+            sheet["atm"] = str(attempts + 1)
+            return ["", attempts + 1, [x for item in sheet.items() for x in item]]
+
+
+class _FakePipeline:
+    """记录命令，execute 时在锁内依次执行。"""
+
+    def __init__(self, redis: _FakeRegisterRedis):
+        self.redis = redis
+        self.commands: list = []
+
+    def __getattr__(self, name):
+        return lambda *a, **kw: self.commands.append((name, a, kw))
+
+    def execute(self) -> list:
+        with self.redis._lock:
+            return [getattr(self.redis, name)(*a, **kw) for name, a, kw in self.commands]
+
+
+def _build_mock_redis(sheet_data: dict | None, ip_count: int = 0, name_count: int = 0, sheet_count: int = 0):
+    if sheet_data is not None:
+        sheet_data = {**sheet_data, "atm": str(sheet_count)}
+    return _FakeRegisterRedis(sheet_data, {"ip_atm": ip_count, "name_atm": name_count})
 
 
 def test_register_success(client, monkeypatch):
     """全部条件满足时注册成功，返回 201 和 temp_token。"""
     questions = _fake_questions()
     sheet_data = _build_sheet_data(questions)
-    mock_redis, mock_get_int = _build_mock_redis(sheet_data)
-
-    async def fake_find_duplicate(session, real_name, class_):
-        return None  # 无重复
+    mock_redis = _build_mock_redis(sheet_data)
 
     async def fake_create(self, data):
         return {
@@ -232,9 +293,7 @@ def test_register_success(client, monkeypatch):
 
     monkeypatch.setattr(users_v1, "get_session", _mock_get_session())
     monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
-    monkeypatch.setattr(users_v1, "_redis_get_int", mock_get_int)
-    monkeypatch.setattr(users_v1.UsersDAO, "find_duplicate_student", fake_find_duplicate)
-    monkeypatch.setattr(users_v1.UsersDAO, "create", fake_create, raising=False)
+    monkeypatch.setattr(users_v1.UsersDAO, "create_student", fake_create)
     monkeypatch.setattr(users_v1, "create_temp_token", lambda subject, purpose=None, expires_minutes=None: "mock-temp-token")
 
     response = client.post("/api/v1/users/register", json=_VALID_REGISTER_BODY)
@@ -254,14 +313,9 @@ def test_register_returns_429_when_ip_limit_reached(client, monkeypatch):
     """IP 今日注册尝试次数达上限时返回 429。"""
     questions = _fake_questions()
     sheet_data = _build_sheet_data(questions)
-    mock_redis, _ = _build_mock_redis(sheet_data, ip_count=settings.REG_MAX_IP_ATTEMPTS_PER_DAY)
+    mock_redis = _build_mock_redis(sheet_data, ip_count=settings.REG_MAX_IP_ATTEMPTS_PER_DAY)
 
     monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
-    monkeypatch.setattr(
-        users_v1,
-        "_redis_get_int",
-        lambda client, key: settings.REG_MAX_IP_ATTEMPTS_PER_DAY if "ip_atm" in key else 0,
-    )
 
     response = client.post("/api/v1/users/register", json=_VALID_REGISTER_BODY)
     assert response.status_code == 429
@@ -272,16 +326,9 @@ def test_register_returns_429_when_name_limit_reached(client, monkeypatch):
     """real_name 今日尝试次数达上限时返回 429。"""
     questions = _fake_questions()
     sheet_data = _build_sheet_data(questions)
-    mock_redis, _ = _build_mock_redis(sheet_data, name_count=settings.REG_MAX_NAME_ATTEMPTS_PER_DAY)
+    mock_redis = _build_mock_redis(sheet_data, name_count=settings.REG_MAX_NAME_ATTEMPTS_PER_DAY)
 
     monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
-    monkeypatch.setattr(
-        users_v1,
-        "_redis_get_int",
-        lambda client, key: (
-            settings.REG_MAX_NAME_ATTEMPTS_PER_DAY if "name_atm" in key else 0
-        ),
-    )
 
     response = client.post("/api/v1/users/register", json=_VALID_REGISTER_BODY)
     assert response.status_code == 429
@@ -290,13 +337,8 @@ def test_register_returns_429_when_name_limit_reached(client, monkeypatch):
 
 def test_register_returns_400_when_sheet_not_found(client, monkeypatch):
     """问题表不存在时返回 400。"""
-    mock_redis = SimpleNamespace(
-        get=lambda key: None,  # 问题表不存在
-        incr=lambda k: 1,
-        expire=lambda k, t: None,
-    )
+    mock_redis = _build_mock_redis(None)  # 问题表不存在
     monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
-    monkeypatch.setattr(users_v1, "_redis_get_int", lambda client, key: 0)
 
     response = client.post("/api/v1/users/register", json=_VALID_REGISTER_BODY)
     assert response.status_code == 400
@@ -307,14 +349,9 @@ def test_register_returns_400_when_sheet_attempts_exceeded(client, monkeypatch):
     """问题表尝试次数达上限时返回 400。"""
     questions = _fake_questions()
     sheet_data = _build_sheet_data(questions)
-    mock_redis, _ = _build_mock_redis(sheet_data, sheet_count=settings.REG_MAX_SHEET_ATTEMPTS)
+    mock_redis = _build_mock_redis(sheet_data, sheet_count=settings.REG_MAX_SHEET_ATTEMPTS)
 
     monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
-    monkeypatch.setattr(
-        users_v1,
-        "_redis_get_int",
-        lambda client, key: settings.REG_MAX_SHEET_ATTEMPTS if "qsheet_atm" in key else 0,
-    )
 
     response = client.post("/api/v1/users/register", json=_VALID_REGISTER_BODY)
     assert response.status_code == 400
@@ -325,10 +362,9 @@ def test_register_returns_400_when_too_few_correct_answers(client, monkeypatch):
     """答对题目不足 3 道时返回 400。"""
     questions = _fake_questions()
     sheet_data = _build_sheet_data(questions)
-    mock_redis, mock_get_int = _build_mock_redis(sheet_data)
+    mock_redis = _build_mock_redis(sheet_data)
 
     monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
-    monkeypatch.setattr(users_v1, "_redis_get_int", mock_get_int)
     monkeypatch.setattr(users_v1, "get_session", _mock_get_session())
 
     # 所有答案都错误
@@ -349,20 +385,58 @@ def test_register_returns_409_when_duplicate_student(client, monkeypatch):
     """数据库中已存在相同姓名+班级的学生时返回 409。"""
     questions = _fake_questions()
     sheet_data = _build_sheet_data(questions)
-    mock_redis, mock_get_int = _build_mock_redis(sheet_data)
+    mock_redis = _build_mock_redis(sheet_data)
 
-    async def fake_find_duplicate(session, real_name, class_):
-        return SimpleNamespace(uuid="existing-uuid")  # 已存在
+    async def fake_create_student(self, data):
+        return None  # 唯一索引冲突，未插入
 
     monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
-    monkeypatch.setattr(users_v1, "_redis_get_int", mock_get_int)
     monkeypatch.setattr(users_v1, "get_session", _mock_get_session())
-    monkeypatch.setattr(users_v1.UsersDAO, "find_duplicate_student", fake_find_duplicate)
+    monkeypatch.setattr(users_v1.UsersDAO, "create_student", fake_create_student)
 
     response = client.post("/api/v1/users/register", json=_VALID_REGISTER_BODY)
     assert response.status_code == 409
     assert "已存在" in response.json()["detail"]
 
+    # 问题表已恢复（保留剩余 TTL 与已计入的尝试次数），可再次提交
+    sheet_key = f"{users_v1._REDIS_QSHEET_PREFIX}{_VALID_REGISTER_BODY['sheet_id']}"
+    assert mock_redis.hashes[sheet_key]["atm"] == "1"
+    assert mock_redis.ttls[sheet_key] == 600
+    assert client.post("/api/v1/users/register", json=_VALID_REGISTER_BODY).status_code == 409
+    assert mock_redis.hashes[sheet_key]["atm"] == "2"
+
+
+def test_create_student_relies_on_partial_unique_index(monkeypatch):
+    """create_student 以 ON CONFLICT 命中同名同班级部分唯一索引，冲突时返回 None。"""
+    import asyncio
+
+    from sqlalchemy.dialects import postgresql
+
+    from core.database.dao import users as users_dao
+
+    executed = []
+
+    class _Result:
+        def first(self):
+            return None
+
+    class _Session:
+        async def execute(self, stmt):
+            executed.append(str(stmt.compile(dialect=postgresql.dialect())))
+            return _Result()
+
+    @asynccontextmanager
+    async def fake_session():
+        yield _Session()
+
+    monkeypatch.setattr(users_dao, "get_session", fake_session)
+    created = asyncio.run(users_dao.UsersDAO().create_student({"uuid": "u-1", "real_name": "明明", "class": "1班"}))
+
+    assert created is None
+    (sql,) = executed
+    assert "ON CONFLICT (real_name, class) WHERE real_name IS NOT NULL AND class IS NOT NULL DO NOTHING" in sql
+    assert "SELECT" not in sql
+
 
 def test_register_returns_503_when_redis_unavailable(client, monkeypatch):
     """Redis 不可用时返回 503。"""
@@ -396,10 +470,7 @@ def test_register_case_insensitive_answers(client, monkeypatch):
     """答案校验对大小写不敏感。"""
     questions = _fake_questions()
     sheet_data = _build_sheet_data(questions)
-    mock_redis, mock_get_int = _build_mock_redis(sheet_data)
-
-    async def fake_find_duplicate(session, real_name, class_):
-        return None
+    mock_redis = _build_mock_redis(sheet_data)
 
     async def fake_create(self, data):
         return {
@@ -421,9 +492,7 @@ def test_register_case_insensitive_answers(client, monkeypatch):
 
     monkeypatch.setattr(users_v1, "get_session", _mock_get_session())
     monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
-    monkeypatch.setattr(users_v1, "_redis_get_int", mock_get_int)
-    monkeypatch.setattr(users_v1.UsersDAO, "find_duplicate_student", fake_find_duplicate)
-    monkeypatch.setattr(users_v1.UsersDAO, "create", fake_create, raising=False)
+    monkeypatch.setattr(users_v1.UsersDAO, "create_student", fake_create)
     monkeypatch.setattr(users_v1, "create_temp_token", lambda subject, purpose=None, expires_minutes=None: "mock-temp-token")
 
     # 答案全部大写（原始答案为小写）
@@ -439,6 +508,133 @@ def test_register_case_insensitive_answers(client, monkeypatch):
     assert response.status_code == 201
 
 
+def test_register_checks_and_counts_in_one_script_call(client, monkeypatch):
+    """限额检查、三个计数器递增与读取问题表在一次脚本调用中完成。"""
+    mock_redis = _build_mock_redis(_build_sheet_data(_fake_questions()))
+    monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
+    monkeypatch.setattr(users_v1, "get_session", _mock_get_session())
+
+    body = {**_VALID_REGISTER_BODY, "answers": [{"question_uuid": "q-uuid-1", "answer": "wrong"}]}
+    response = client.post("/api/v1/users/register", json=body)
+
+    assert response.status_code == 400
+    assert f"剩余尝试次数：{settings.REG_MAX_SHEET_ATTEMPTS - 1}" in response.json()["detail"]
+    assert mock_redis.script_calls == 1
+    assert sorted(mock_redis.store.values()) == [1, 1]
+    assert mock_redis.hashes["reg:qsheet:test-sheet-id"]["atm"] == "1"
+
+
+def _submit_in_parallel(monkeypatch, mock_redis, bodies):
+    """多个线程（模拟多个 worker）同时提交，返回各自的 (状态码, detail)。"""
+    monkeypatch.setattr(users_v1, "redis_conn", SimpleNamespace(get_client=lambda: mock_redis))
+    monkeypatch.setattr(users_v1, "get_session", _mock_get_session())
+    app = FastAPI()
+    app.include_router(users_v1.router, prefix="/api/v1")
+    TestClient(app).get("/")  # 先构建中间件栈，避免首个请求的惰性初始化在线程间竞争
+    barrier = threading.Barrier(len(bodies))
+    results = [None] * len(bodies)
+
+    def worker(i):
+        local_client = TestClient(app)
+        barrier.wait()
+        response = local_client.post("/api/v1/users/register", json=bodies[i])
+        results[i] = (response.status_code, response.json().get("detail"))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(bodies))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+_WRONG_ANSWERS = [{"question_uuid": f"q-uuid-{i}", "answer": "wrong"} for i in range(1, 6)]
+
+
+def test_parallel_submissions_respect_sheet_limit(monkeypatch):
+    """同一问题表的并发提交：恰好 REG_MAX_SHEET_ATTEMPTS 次进入答案校验，计数不超限。"""
+    mock_redis = _build_mock_redis(_build_sheet_data(_fake_questions()))
+    body = {**_VALID_REGISTER_BODY, "answers": _WRONG_ANSWERS}
+
+    results = _submit_in_parallel(monkeypatch, mock_redis, [body] * 12)
+
+    graded = [detail for code, detail in results if "答题未通过" in detail]
+    rejected = [detail for code, detail in results if "尝试次数已达上限" in detail]
+    assert len(graded) == settings.REG_MAX_SHEET_ATTEMPTS
+    assert len(rejected) == 12 - settings.REG_MAX_SHEET_ATTEMPTS
+    assert sorted(mock_redis.store.values()) == [settings.REG_MAX_SHEET_ATTEMPTS] * 2
+    assert mock_redis.hashes["reg:qsheet:test-sheet-id"]["atm"] == str(settings.REG_MAX_SHEET_ATTEMPTS)
+
+
+def test_parallel_submissions_respect_ip_limit(monkeypatch):
+    """不同问题表、同一 IP 的并发提交：IP 计数恰好停在上限，其余返回 429。"""
+    monkeypatch.setattr(settings, "REG_MAX_IP_ATTEMPTS_PER_DAY", 5)
+    monkeypatch.setattr(settings, "REG_MAX_NAME_ATTEMPTS_PER_DAY", 100)
+    mock_redis = _build_mock_redis(_build_sheet_data(_fake_questions()))
+    bodies = [
+        {**_VALID_REGISTER_BODY, "sheet_id": f"sheet-{i}", "answers": _WRONG_ANSWERS} for i in range(12)
+    ]
+
+    results = _submit_in_parallel(monkeypatch, mock_redis, bodies)
+
+    assert sorted(code for code, _ in results) == [400] * 5 + [429] * 7
+    ip_counts = [v for k, v in mock_redis.store.items() if k.startswith(users_v1._REDIS_IP_ATTEMPTS)]
+    assert ip_counts == [5]
+
+
+def test_parallel_double_submission_creates_one_user(monkeypatch):
+    """同一问题表的并发正确提交：只有一个请求能消费问题表，只创建一个用户。"""
+    mock_redis = _build_mock_redis(_build_sheet_data(_fake_questions()))
+    created = []
+
+    async def fake_create(self, data):
+        created.append(data["uuid"])
+        return {**data, "class": data["class"]}
+
+    monkeypatch.setattr(users_v1.UsersDAO, "create_student", fake_create)
+    monkeypatch.setattr(users_v1, "create_temp_token", lambda subject, purpose=None, expires_minutes=None: "t")
+
+    results = _submit_in_parallel(monkeypatch, mock_redis, [_VALID_REGISTER_BODY] * settings.REG_MAX_SHEET_ATTEMPTS)
+
+    assert sorted(code for code, _ in results) == [201] + [400] * (settings.REG_MAX_SHEET_ATTEMPTS - 1)
+    assert len(created) == 1
+    assert "reg:qsheet:test-sheet-id" not in mock_redis.hashes
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_REDIS_URL"), reason="需要 TEST_REDIS_URL 指向可写的 Redis")
+def test_register_attempt_script_is_atomic_on_real_redis(monkeypatch):
+    """在真实 Redis 上并发执行 Lua 脚本：通过次数恰好等于问题表上限。"""
+    import redis as redis_lib
+
+    client = redis_lib.from_url(os.environ["TEST_REDIS_URL"], decode_responses=True)
+    prefix = f"test:reg:{uuid_lib.uuid4()}:"
+    keys = {
+        "ip_key": f"{prefix}ip",
+        "name_key": f"{prefix}name",
+        "sheet_key": f"{prefix}sheet",
+    }
+    client.hset(keys["sheet_key"], mapping=_build_sheet_data(_fake_questions()))
+    client.expire(keys["sheet_key"], 60)
+    barrier = threading.Barrier(20)
+    outcomes = []
+
+    def worker():
+        barrier.wait()
+        outcomes.append(users_v1._claim_register_attempt(client, **keys)[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert outcomes.count("") == settings.REG_MAX_SHEET_ATTEMPTS
+        assert int(client.hget(keys["sheet_key"], "atm")) == settings.REG_MAX_SHEET_ATTEMPTS
+        assert 0 < client.ttl(keys["ip_key"]) <= settings.REG_SHEET_TTL_SECONDS
+    finally:
+        client.delete(*keys.values())
+
+
 # ---------------------------------------------------------------------------
 # PATCH /api/v1/users/me/password — 修改密码
 # ---------------------------------------------------------------------------
@@ -690,14 +886,9 @@ def test_update_profile_success_nickname(profile_client, monkeypatch):
 def test_update_profile_success_real_name_and_class(profile_client, monkeypatch):
     """同时修改姓名和班级，无重复冲突时成功。"""
 
-    async def fake_find_dup(session, real_name, class_, exclude_uuid):
-        return None  # 无冲突
-
     async def fake_update(self, uuid, data):
         return {**_FAKE_USER, **{k: v for k, v in data.items()}}
 
-    monkeypatch.setattr(users_v1, "get_session", _mock_get_session())
-    monkeypatch.setattr(users_v1.UsersDAO, "find_duplicate_student_exclude_self", fake_find_dup)
     monkeypatch.setattr(users_v1.UsersDAO, "update", fake_update, raising=False)
 
     response = profile_client.patch(
@@ -709,14 +900,39 @@ def test_update_profile_success_real_name_and_class(profile_client, monkeypatch)
     assert response.json()["class"] == "高二(2)班"
 
 
+class _UniqueViolation(Exception):
+    """模拟 asyncpg.UniqueViolationError：带 constraint_name。"""
+
+    def __init__(self, constraint_name):
+        super().__init__("duplicate key value violates unique constraint")
+        self.constraint_name = constraint_name
+
+
+def _student_conflict(constraint_name="uq_users_real_name_class", sqlstate="23505"):
+    """构造 SQLAlchemy asyncpg 适配层抛出的 IntegrityError（原始异常在 orig.__cause__）。"""
+    orig = Exception("<class 'asyncpg.exceptions.UniqueViolationError'>")
+    orig.sqlstate = sqlstate
+    orig.__cause__ = _UniqueViolation(constraint_name)
+    return IntegrityError("UPDATE users ...", {}, orig)
+
+
+def test_is_duplicate_student_checks_sqlstate_and_constraint():
+    assert users_v1.UsersDAO.is_duplicate_student(_student_conflict())
+    assert not users_v1.UsersDAO.is_duplicate_student(_student_conflict("uq_users_username"))
+    assert not users_v1.UsersDAO.is_duplicate_student(_student_conflict(sqlstate="23503"))
+    # 错误文本中含索引名但不是唯一冲突：不再误判
+    assert not users_v1.UsersDAO.is_duplicate_student(
+        IntegrityError("x", {}, Exception('violates "uq_users_real_name_class"'))
+    )
+
+
 def test_update_profile_returns_409_on_duplicate(profile_client, monkeypatch):
     """修改姓名和班级后与其他用户冲突时返回 409。"""
 
-    async def fake_find_dup(session, real_name, class_, exclude_uuid):
-        return SimpleNamespace(uuid="other-uuid")  # 冲突
+    async def fake_update(self, uuid, data):
+        raise _student_conflict()
 
-    monkeypatch.setattr(users_v1, "get_session", _mock_get_session())
-    monkeypatch.setattr(users_v1.UsersDAO, "find_duplicate_student_exclude_self", fake_find_dup)
+    monkeypatch.setattr(users_v1.UsersDAO, "update", fake_update, raising=False)
 
     response = profile_client.patch(
         "/api/v1/users/me/profile",
@@ -1047,7 +1263,7 @@ def test_read_users_me_not_found(monkeypatch):
     app.dependency_overrides[users_v1.get_current_user] = lambda: {"uuid": "nonexistent-uuid"}
     client = TestClient(app)
 
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         return None
     monkeypatch.setattr(users_v1.UsersDAO, "find_by_uuid", fake_find_by_uuid, raising=False)
 
@@ -217,6 +217,160 @@ def test_invalidate_user_cache_calls_redis_delete(monkeypatch):
     assert "auth:user:target-uuid" in deleted_keys
 
 
+def test_invalidate_user_cache_waits_for_commit(monkeypatch):
+    """Inside a unit of work the cache key is deleted only after commit, not at call time."""
+    deleted_keys = []
+    pending = []
+
+    class FakeRedisClient:
+        def delete(self, *keys):
+            deleted_keys.extend(keys)
+
+    monkeypatch.setattr(
+        "core.middleware.auth.dependencies.redis_conn",
+        SimpleNamespace(get_client=lambda: FakeRedisClient()),
+    )
+    monkeypatch.setattr("core.middleware.auth.dependencies.call_after_commit", pending.append)
+    monkeypatch.setattr("core.helper.etag.call_after_commit", pending.append)
+
+    invalidate_user_cache("target-uuid")
+    assert deleted_keys == []
+
+    for callback in pending:  # 模拟事务提交
+        callback()
+    assert "auth:user:target-uuid" in deleted_keys
+
+
+# ---------------------------------------------------------------------------
+# get_current_user
+# ---------------------------------------------------------------------------
+
+def test_get_current_user_loads_and_caches_auth_projection(monkeypatch):
+    """Cache misses load only the "auth" projection as a Record, cached as a compact JSON array."""
+    import json
+
+    monkeypatch.setattr("core.config.settings.JWT_SECRET_KEY", "test-jwt-secret-for-unit-tests")
+
+    from core.database.dao.users import UsersDAO
+    from core.middleware.auth.dependencies import get_current_user
+    from core.security.jwt_handler import create_access_token
+
+    requested = []
+    cached = {}
+
+    async def fake_find_record_by_uuid(self, uuid, columns=None):
+        requested.append(columns)
+        return UsersDAO.record_type(columns)(uuid=uuid, user_role="superadmin")
+
+    class FakeRedisClient:
+        def get(self, key):
+            return cached.get(key)
+
+        def setex(self, key, ttl, value):
+            cached[key] = value
+
+    monkeypatch.setattr(UsersDAO, "find_record_by_uuid", fake_find_record_by_uuid)
+    monkeypatch.setattr(
+        "core.middleware.auth.dependencies.redis_conn",
+        SimpleNamespace(get_client=lambda: FakeRedisClient()),
+    )
+
+    app = FastAPI()
+
+    @app.get("/me")
+    async def endpoint(user: dict = Depends(get_current_user)):
+        assert user["user_role"] == user.get("user_role") == "superadmin"
+        return user.to_dict()
+
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token('user-1')}"}
+    first = client.get("/me", headers=headers).json()
+    second = client.get("/me", headers=headers).json()
+
+    assert requested == ["auth"]
+    assert first == second
+    assert set(first) == set(UsersDAO.PROJECTIONS["auth"])
+    # 缓存为 [列摘要, 按投影列顺序的值...] 的紧凑 JSON 数组
+    payload = json.loads(cached["auth:user:user-1"])
+    assert payload[0] == UsersDAO.record_type("auth")._schema
+    assert len(payload) == len(UsersDAO.PROJECTIONS["auth"]) + 1 and payload[1] == "user-1"
+
+
+def test_get_current_user_ignores_cache_written_for_other_columns(monkeypatch):
+    """A cached array from a deploy with a different auth projection is treated as a miss."""
+    import json
+
+    monkeypatch.setattr("core.config.settings.JWT_SECRET_KEY", "test-jwt-secret-for-unit-tests")
+
+    from core.database.dao.users import UsersDAO
+    from core.middleware.auth.dependencies import get_current_user
+    from core.security.jwt_handler import create_access_token
+
+    # 旧部署的投影少了一列：按位置解码会把后面的值错位到其他列上
+    names = [n for n in UsersDAO.PROJECTIONS["auth"] if n != "current_status"]
+    stale_type = UsersDAO.record_type(tuple(names))
+    stale = stale_type.from_dict({"uuid": "user-1", "user_role": "banned-looking"}).dumps()
+    cached = {"auth:user:user-1": stale}
+    loaded = []
+
+    async def fake_find_record_by_uuid(self, uuid, columns=None):
+        loaded.append(uuid)
+        return UsersDAO.record_type(columns)(uuid=uuid, user_role="normal-user")
+
+    class FakeRedisClient:
+        def get(self, key):
+            return cached.get(key)
+
+        def setex(self, key, ttl, value):
+            cached[key] = value
+
+    monkeypatch.setattr(UsersDAO, "find_record_by_uuid", fake_find_record_by_uuid)
+    monkeypatch.setattr(
+        "core.middleware.auth.dependencies.redis_conn",
+        SimpleNamespace(get_client=lambda: FakeRedisClient()),
+    )
+
+    app = FastAPI()
+
+    @app.get("/me")
+    async def endpoint(user: dict = Depends(get_current_user)):
+        return user.to_dict()
+
+    client = TestClient(app)
+    body = client.get("/me", headers={"Authorization": f"Bearer {create_access_token('user-1')}"}).json()
+    assert loaded == ["user-1"]
+    assert body["user_role"] == "normal-user"
+    # 旧缓存被按当前投影重新写入
+    assert json.loads(cached["auth:user:user-1"])[0] == UsersDAO.record_type("auth")._schema
+
+
+def test_get_current_user_reads_legacy_dict_cache(monkeypatch):
+    """Cache entries written before the record format (JSON objects) are still accepted."""
+    import json
+
+    monkeypatch.setattr("core.config.settings.JWT_SECRET_KEY", "test-jwt-secret-for-unit-tests")
+
+    from core.middleware.auth.dependencies import get_current_user
+    from core.security.jwt_handler import create_access_token
+
+    legacy = json.dumps({"uuid": "user-1", "user_role": "normal-user", "password": "hash", "other_info": {}})
+    monkeypatch.setattr(
+        "core.middleware.auth.dependencies.redis_conn",
+        SimpleNamespace(get_client=lambda: SimpleNamespace(get=lambda key: legacy)),
+    )
+
+    app = FastAPI()
+
+    @app.get("/me")
+    async def endpoint(user: dict = Depends(get_current_user)):
+        return user.to_dict()
+
+    client = TestClient(app)
+    body = client.get("/me", headers={"Authorization": f"Bearer {create_access_token('user-1')}"}).json()
+    assert body["uuid"] == "user-1" and body["user_role"] == "normal-user"
+    assert "password" not in body and "other_info" not in body
+
+
 # ---------------------------------------------------------------------------
 # get_temp_user
 # ---------------------------------------------------------------------------
@@ -231,7 +385,7 @@ def test_get_temp_user_valid_token(monkeypatch):
 
     token = create_temp_token("user-temp-1", "register_complete", expires_minutes=10)
 
-    async def fake_find_by_uuid(self, uuid):
+    async def fake_find_by_uuid(self, uuid, columns=None):
         if uuid == "user-temp-1":
             return {"uuid": uuid, "nickname": "TempUser"}
         return None
@@ -0,0 +1,505 @@
+"""Unit tests — core.database.dao.base (single-statement RETURNING writes)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from core.database.dao import base as base_dao
+from core.database.dao.base import row_converter
+from core.database.dao.relations import RelationsDAO
+from core.database.dao.users import UsersDAO
+
+
+class _FakeResult:
+    def __init__(self, row):
+        self._row = row
+
+    def one(self):
+        return self._row
+
+    def first(self):
+        return self._row
+
+
+class _FakeSession:
+    """记录执行的语句并返回预设的行（按 row_converter 列顺序排列的元组）。"""
+
+    def __init__(self, returned):
+        self.statements = []
+        self._returned = returned
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return _FakeResult(self._returned)
+
+    async def scalar(self, stmt):
+        self.statements.append(stmt)
+        return None if self._returned is None else 1
+
+
+def _install(monkeypatch, returned):
+    session = _FakeSession(returned)
+
+    @asynccontextmanager
+    async def fake_get_session():
+        yield session
+
+    monkeypatch.setattr(base_dao, "get_session", fake_get_session)
+    return session
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _user_row(**values):
+    return tuple(values.get(name) for name in row_converter(UsersDAO.MODEL).names)
+
+
+def test_create_is_single_insert_returning(monkeypatch):
+    session = _install(monkeypatch, _user_row(id=1, uuid="u-1", real_name="张三", **{"class": "1班"}))
+
+    created = asyncio.run(UsersDAO().create({"uuid": "u-1", "real_name": "张三", "class_": "1班"}))
+
+    assert len(session.statements) == 1
+    sql = _sql(session.statements[0])
+    assert sql.startswith("INSERT INTO users") and "RETURNING" in sql
+    assert "(uuid, real_name, class," in sql
+    assert created["uuid"] == "u-1" and created["class"] == "1班"
+    assert list(created) == [c.name for c in UsersDAO.MODEL.__table__.columns]
+
+
+def test_create_rejects_unknown_keys(monkeypatch):
+    _install(monkeypatch, None)
+    with pytest.raises(TypeError):
+        asyncio.run(UsersDAO().create({"uuid": "u-1", "nope": 1}))
+
+
+def test_update_is_single_update_returning(monkeypatch):
+    session = _install(monkeypatch, _user_row(id=1, uuid="u-1", current_status="banned"))
+
+    updated = asyncio.run(UsersDAO().update("u-1", {"current_status": "banned", "unknown": 1}))
+
+    assert len(session.statements) == 1
+    sql = _sql(session.statements[0])
+    assert sql.startswith("UPDATE users SET current_status=") and "RETURNING" in sql
+    assert updated["current_status"] == "banned"
+
+
+def test_update_missing_row_returns_none(monkeypatch):
+    _install(monkeypatch, None)
+    assert asyncio.run(UsersDAO().update("missing", {"current_status": "normal"})) is None
+
+
+def test_delete_is_single_delete_returning(monkeypatch):
+    session = _install(monkeypatch, {})
+    assert asyncio.run(UsersDAO().delete("u-1")) is True
+    sql = _sql(session.statements[0])
+    assert sql.startswith("DELETE FROM users") and "RETURNING users.id" in sql
+
+    _install(monkeypatch, None)
+    assert asyncio.run(UsersDAO().delete("missing")) is False
+
+
+def test_relations_update_by_id_uses_primary_key(monkeypatch):
+    row = (None,) * len(row_converter(RelationsDAO.MODEL).names)
+    session = _install(monkeypatch, row)
+    asyncio.run(RelationsDAO().update_by_id(5, {"relation_type": "tag"}))
+    assert "WHERE relations.id =" in _sql(session.statements[0])
+
+
+def test_row_converter_is_cached_and_matches_orm_conversion():
+    from core.database.dao.system_logs import SystemLog
+
+    converter = row_converter(SystemLog)
+    assert row_converter(SystemLog) is converter
+
+    obj = SystemLog(uuid="log-1", content={"unexpected": "json"}, log_level="INFO")
+    from_obj = base_dao.BaseDAO._to_dict(obj)
+    from_row = converter.from_row(tuple(from_obj.get(name) for name in converter.names) + ("extra",))
+
+    assert from_obj == from_row
+    assert from_obj["content"] == "{'unexpected': 'json'}"
+    assert list(from_obj) == list(converter.names)
+
+
+def test_data_to_columns_accepts_attribute_and_column_names():
+    assert UsersDAO._data_to_columns({"class_": "1班", "real_name": "张三"}) == {
+        "class": "1班",
+        "real_name": "张三",
+    }
+    assert UsersDAO._data_to_kwargs({"class": "1班"}) == {"class_": "1班"}
+
+
+# ---------------------------------------------------------------------------
+# 列投影
+# ---------------------------------------------------------------------------
+
+def test_find_by_uuid_with_projection_selects_only_those_columns(monkeypatch):
+    names = UsersDAO.PROJECTIONS["auth"]
+    session = _install(monkeypatch, tuple(f"v-{name}" for name in names))
+
+    user = asyncio.run(UsersDAO().find_by_uuid("u-1", columns="auth"))
+
+    sql = _sql(session.statements[0])
+    select_list = sql.split("FROM")[0]
+    assert "password" not in select_list and "other_info" not in select_list
+    assert "users.class" in select_list
+    assert list(user) == list(names)
+    assert user["class"] == "v-class"
+
+
+def test_projection_accepts_attribute_names_and_keeps_model_order():
+    converter = row_converter(UsersDAO.MODEL, ("current_status", "class_", "uuid"))
+    assert converter.names == ("uuid", "class", "current_status")
+    assert row_converter(UsersDAO.MODEL, ("current_status", "class_", "uuid")) is converter
+    assert row_converter(UsersDAO.MODEL) is not converter
+
+
+def test_projection_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        UsersDAO._converter("nope")
+    with pytest.raises(TypeError):
+        UsersDAO._converter(("uuid", "nope"))
+
+
+def test_find_all_with_projection(monkeypatch):
+    session = _install(monkeypatch, None)
+
+    class _Rows(_FakeResult):
+        def all(self):
+            # 键集分页在行尾追加排序键
+            return [("u-1", "normal", 1), ("u-2", "banned", 2)]
+
+    async def execute(stmt):
+        session.statements.append(stmt)
+        return _Rows(None)
+
+    session.execute = execute
+    rows = asyncio.run(UsersDAO().find_all(columns=["uuid", "current_status"]))
+    assert rows == [
+        {"uuid": "u-1", "current_status": "normal"},
+        {"uuid": "u-2", "current_status": "banned"},
+    ]
+    assert rows.next_cursor is None and rows.prev_cursor is None
+    assert _sql(session.statements[0]).split("FROM")[0].split() == [
+        "SELECT", "users.uuid,", "users.current_status,", "users.id"
+    ]
+
+
+# ---------------------------------------------------------------------------
+# 键集分页
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def questions_db():
+    """内存 SQLite 中的 register_questions 表（id 1..7），session 以异步接口包装同步连接。"""
+    from sqlalchemy import create_engine, insert
+
+    from core.database.dao.register_questions import RegisterQuestions
+
+    engine = create_engine("sqlite://")
+    RegisterQuestions.__table__.create(engine)
+    conn = engine.connect()
+    conn.execute(insert(RegisterQuestions), [
+        {"uuid": f"q-{i}", "question": f"题目{i}", "answer": "A", "current_status": "active"}
+        for i in range(1, 8)
+    ])
+
+    class _Session:
+        async def execute(self, stmt):
+            return conn.execute(stmt)
+
+    yield _Session()
+    conn.close()
+    engine.dispose()
+
+
+def _page(session, **kwargs):
+    from core.database.dao.register_questions import RegisterQuestions
+
+    converter = row_converter(RegisterQuestions, ("uuid",))
+    page = asyncio.run(base_dao.keyset_page(
+        session, converter.select(), converter.from_rows, RegisterQuestions.id, limit=3, **kwargs
+    ))
+    return [row["uuid"] for row in page], page
+
+
+def _cursor_args(cursor):
+    after_id, before_id = base_dao.decode_cursor(cursor)
+    return {"after_id": after_id, "before_id": before_id}
+
+
+@pytest.mark.parametrize("descending, first, second", [
+    (False, ["q-1", "q-2", "q-3"], ["q-4", "q-5", "q-6"]),
+    (True, ["q-7", "q-6", "q-5"], ["q-4", "q-3", "q-2"]),
+])
+def test_keyset_page_walks_forward_and_back(questions_db, descending, first, second):
+    uuids, page = _page(questions_db, descending=descending)
+    assert uuids == first
+    assert page.prev_cursor is None and page.next_cursor is not None
+
+    uuids, page = _page(questions_db, descending=descending, **_cursor_args(page.next_cursor))
+    assert uuids == second
+    assert page.prev_cursor is not None and page.next_cursor is not None
+
+    uuids, page = _page(questions_db, descending=descending, **_cursor_args(page.prev_cursor))
+    assert uuids == first
+    assert page.prev_cursor is None
+
+
+def test_keyset_page_last_page_has_no_next_cursor(questions_db):
+    uuids, page = _page(questions_db, after_id=6)
+    assert uuids == ["q-7"]
+    assert page.next_cursor is None and base_dao.decode_cursor(page.prev_cursor) == (None, 7)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_page_with_total_counts_all_matches_on_every_page(questions_db, descending):
+    uuids, page = _page(questions_db, descending=descending, with_total=True)
+    assert len(uuids) == 3 and page.total == 7
+
+    uuids, page = _page(questions_db, descending=descending, with_total=True, **_cursor_args(page.next_cursor))
+    assert len(uuids) == 3 and page.total == 7  # 游标条件不影响总数
+
+    uuids, page = _page(questions_db, descending=descending, with_total=True, **_cursor_args(page.prev_cursor))
+    assert uuids == (["q-7", "q-6", "q-5"] if descending else ["q-1", "q-2", "q-3"]) and page.total == 7
+
+
+def test_keyset_page_with_total_past_the_end_falls_back_to_count(questions_db):
+    uuids, page = _page(questions_db, after_id=7, with_total=True)
+    assert uuids == [] and page.total == 7
+    assert _page(questions_db, with_total=False)[1].total is None
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert base_dao.decode_cursor(base_dao.encode_cursor("a", 42)) == (42, None)
+    assert base_dao.decode_cursor(base_dao.encode_cursor("b", 1)) == (None, 1)
+    for bad in ("", "!!!", base_dao.encode_cursor("x", 1), "YTpmb28"):  # 最后一个为 "a:foo"
+        with pytest.raises(ValueError):
+            base_dao.decode_cursor(bad)
+
+
+# ---------------------------------------------------------------------------
+# Record
+# ---------------------------------------------------------------------------
+
+def test_record_matches_dict_conversion_and_behaves_like_a_mapping():
+    from core.database.dao.system_logs import SystemLog
+
+    converter = row_converter(SystemLog)
+    obj = SystemLog(uuid="log-1", content={"unexpected": "json"}, log_level="INFO")
+    row = tuple(converter.from_object(obj).values()) + ("extra",)
+
+    record = converter.record(row)
+    assert not hasattr(record, "__dict__")
+    assert record == converter.from_row(row) and record.to_dict() == converter.from_row(row)
+    assert record["content"] == "{'unexpected': 'json'}"
+    assert record.get("missing", 1) == 1 and "uuid" in record and "nope" not in record
+    assert list(record) == list(converter.names) and dict(record) == record.to_dict()
+    with pytest.raises(KeyError):
+        record["nope"]
+
+
+def test_record_type_uses_attribute_slots_and_column_keys():
+    record_type = UsersDAO.record_type("auth")
+    assert UsersDAO.record_type("auth") is record_type
+    record = record_type.from_dict({"uuid": "u-1", "class_": "1班", "password": "ignored"})
+    assert record.class_ == "1班" and record["class"] == "1班"
+    assert "password" not in record
+
+
+def test_record_compact_serialization_round_trip():
+    from datetime import datetime
+
+    record_type = UsersDAO.record_type(("uuid", "joined_at", "is_verified"))
+    record = record_type("u-1", datetime(2026, 1, 2, 3, 4, 5), True)
+
+    raw = record.dumps()
+    assert raw == f'["{record_type._schema}","u-1","2026-01-02 03:04:05",true]'
+    assert record_type.loads(raw).to_dict() == {
+        "uuid": "u-1", "joined_at": "2026-01-02 03:04:05", "is_verified": True,
+    }
+    assert record_type.loads('{"uuid": "u-2"}')["uuid"] == "u-2"
+
+
+def test_record_loads_rejects_other_column_layouts():
+    record_type = UsersDAO.record_type(("uuid", "current_status", "user_role"))
+    reordered = UsersDAO.record_type(("uuid", "user_role"))
+    assert record_type._schema != reordered._schema
+
+    with pytest.raises(ValueError):
+        record_type.loads(reordered("u-1", "superadmin").dumps())
+    # 不带列摘要的旧数组格式同样拒绝
+    with pytest.raises(ValueError):
+        record_type.loads('["u-1","normal","superadmin"]')
+
+
+def test_find_record_by_uuid_returns_record(monkeypatch):
+    _install(monkeypatch, tuple(f"v-{name}" for name in UsersDAO.PROJECTIONS["auth"]))
+    user = asyncio.run(UsersDAO().find_record_by_uuid("u-1", columns="auth"))
+    assert isinstance(user, base_dao.Record) and user["class"] == "v-class"
+
+    _install(monkeypatch, None)
+    assert asyncio.run(UsersDAO().find_record_by_uuid("missing")) is None
+
+
+# ---------------------------------------------------------------------------
+# 批量写入
+# ---------------------------------------------------------------------------
+
+
+class _BulkResult:
+    def __init__(self, rowcount, rows):
+        self.rowcount = rowcount
+        self._rows = rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class _BulkSession:
+    """记录语句；rowcount 取自语句中的行数，RETURNING 时按行返回全 None 的元组。"""
+
+    def __init__(self, model):
+        self.statements = []
+        self._width = len(row_converter(model).names)
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        count = _sql(stmt).count("), (") + 1
+        return _BulkResult(count, [(None,) * self._width] * count)
+
+
+def _all_daos():
+    import importlib
+    import pkgutil
+
+    import core.database.dao as dao_pkg
+
+    daos = []
+    for info in pkgutil.iter_modules(dao_pkg.__path__):
+        module = importlib.import_module(f"core.database.dao.{info.name}")
+        for obj in vars(module).values():
+            if (
+                isinstance(obj, type)
+                and issubclass(obj, base_dao.BaseDAO)
+                and obj.__module__ == module.__name__
+                and getattr(obj, "MODEL", None) is not None
+            ):
+                daos.append(obj)
+    return daos
+
+
+def _sample_value(col, i):
+    from sqlalchemy import BigInteger, Boolean, Integer, Numeric
+    from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
+
+    if isinstance(col.type, (Integer, BigInteger)):
+        return i
+    if isinstance(col.type, Boolean):
+        return True
+    if isinstance(col.type, Numeric):
+        return 1.5
+    if isinstance(col.type, JSONB):
+        return {"i": i}
+    if isinstance(col.type, TIMESTAMP):
+        from datetime import datetime
+
+        return datetime(2024, 1, 1)
+    return f"v{i}"
+
+
+def _sample_rows(model, n):
+    cols = [c for c in model.__table__.columns if not c.primary_key]
+    return [{c.name: _sample_value(c, i) for c in cols} for i in range(n)]
+
+
+@pytest.mark.parametrize("dao_cls", _all_daos(), ids=lambda cls: cls.__name__)
+def test_bulk_writes_compile_for_every_model(dao_cls):
+    """每个 DAO 模型都能生成合法的批量 INSERT / UPSERT / UPDATE 语句。"""
+    model = dao_cls.MODEL
+    session = _BulkSession(model)
+    rows = _sample_rows(model, 3)
+
+    assert asyncio.run(dao_cls().bulk_create(rows, session=session)) == 3
+    created = asyncio.run(dao_cls().bulk_create(rows, returning=True, session=session))
+    assert len(created) == 3 and list(created[0]) == list(row_converter(model).names)
+
+    # 无 uuid 的模型任取一个各行取值不同的文本列作冲突列（仅校验语句生成）
+    text_cols = [name for name, value in rows[0].items() if isinstance(value, str)]
+    conflict = ["uuid"] if "uuid" in model.__table__.c else text_cols[:1]
+    assert asyncio.run(dao_cls().bulk_upsert(rows, conflict, session=session)) == 3
+    sql = _sql(session.statements[-1])
+    assert "ON CONFLICT" in sql and "DO UPDATE SET" in sql
+
+    if "uuid" in model.__table__.c:
+        assert asyncio.run(dao_cls().bulk_update_by_uuid(rows, session=session)) == 3
+        assert "FROM (VALUES" in _sql(session.statements[-1])
+    else:
+        with pytest.raises(TypeError):
+            asyncio.run(dao_cls().bulk_update_by_uuid(rows, session=session))
+
+    for stmt in session.statements:
+        stmt.compile(dialect=postgresql.asyncpg.dialect())
+
+
+def test_bulk_create_chunks_and_uses_multi_row_values(monkeypatch):
+    session = _BulkSession(UsersDAO.MODEL)
+    monkeypatch.setattr(base_dao, "get_session", _session_cm(session))
+    rows = [{"uuid": f"u-{i}", "class_": "1班"} for i in range(5)]
+
+    assert asyncio.run(UsersDAO().bulk_create(rows, chunk_size=2)) == 5
+    assert len(session.statements) == 3
+    assert _sql(session.statements[0]).count("), (") == 1
+
+
+def test_bulk_create_chunk_size_respects_bind_parameter_limit():
+    width = len(UsersDAO.MODEL.__table__.columns)
+    chunks = list(UsersDAO._bulk_chunks(({"uuid": str(i)} for i in range(40000)), 100000))
+    assert max(len(chunk) for _, chunk in chunks) == base_dao._MAX_BIND_PARAMS // width
+
+
+def test_bulk_upsert_dedupes_conflict_keys_and_supports_do_nothing():
+    session = _BulkSession(UsersDAO.MODEL)
+    rows = [{"uuid": "u-1", "nickname": "a"}, {"uuid": "u-1", "nickname": "b"}]
+
+    assert asyncio.run(UsersDAO().bulk_upsert(rows, ["uuid"], ["nickname"], session=session)) == 1
+    stmt = session.statements[-1]
+    assert "DO UPDATE SET nickname = excluded.nickname" in _sql(stmt)
+    assert stmt.compile(dialect=postgresql.dialect()).params["nickname_m0"] == "b"
+
+    asyncio.run(UsersDAO().bulk_upsert(rows, ["uuid"], [], session=session))
+    assert "ON CONFLICT (uuid) DO NOTHING" in _sql(session.statements[-1])
+
+    with pytest.raises(ValueError):
+        asyncio.run(UsersDAO().bulk_upsert([{"nickname": "x"}], ["uuid"], session=session))
+
+
+def test_bulk_update_by_uuid_groups_rows_by_columns():
+    session = _BulkSession(UsersDAO.MODEL)
+    rows = [
+        {"uuid": "u-1", "current_status": "banned"},
+        {"uuid": "u-2", "current_status": "normal"},
+        {"uuid": "u-3", "class_": "2班"},
+    ]
+
+    assert asyncio.run(UsersDAO().bulk_update_by_uuid(rows, session=session)) == 3
+    assert len(session.statements) == 2
+    sql = _sql(session.statements[0])
+    assert sql.startswith("UPDATE users SET current_status=v.current_status FROM (VALUES")
+    assert "WHERE users.uuid = v.uuid" in sql
+    assert "class=v.class" in _sql(session.statements[1])
+
+    with pytest.raises(ValueError):
+        asyncio.run(UsersDAO().bulk_update_by_uuid([{"current_status": "x"}], session=session))
+
+
+def _session_cm(session):
+    @asynccontextmanager
+    async def fake_get_session():
+        yield session
+
+    return fake_get_session
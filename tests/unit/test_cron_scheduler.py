@@ -3,34 +3,86 @@
 from unittest.mock import patch
 
 
-def test_start_registers_cleanup_job(monkeypatch):
-    """start() adds the cleanup_expired_deletions job to the scheduler."""
+def _capture_jobs(monkeypatch) -> list[dict]:
+    """Patch scheduler.add_job/start and return the list that collects added jobs."""
     from core.cron.scheduler import scheduler
 
     jobs_added = []
-    original_add_job = scheduler.add_job
 
-    def capture_add_job(func, trigger=None, hours=None, id=None, replace_existing=None):
+    def capture_add_job(func, trigger=None, id=None, replace_existing=None, **interval):
         jobs_added.append({
             "func": func,
             "trigger": trigger,
-            "hours": hours,
             "id": id,
+            **interval,
         })
 
     monkeypatch.setattr(scheduler, "add_job", capture_add_job)
     monkeypatch.setattr(scheduler, "start", lambda: None)
+    return jobs_added
+
+
+def test_start_registers_cleanup_job(monkeypatch):
+    """start() adds the cleanup_expired_deletions job to the scheduler."""
+    jobs_added = _capture_jobs(monkeypatch)
 
     from core.cron.scheduler import start
     start()
 
-    assert len(jobs_added) == 1
-    job = jobs_added[0]
-    assert job["id"] == "cleanup_expired_deletions"
+    jobs = {j["id"]: j for j in jobs_added}
+    assert "cleanup_expired_deletions" in jobs
+    job = jobs["cleanup_expired_deletions"]
     assert job["trigger"] == "interval"
     assert job["hours"] is not None  # should be from settings
 
 
+def test_start_registers_rollup_job(monkeypatch):
+    """start() adds the hourly log rollup job with a minute interval from settings."""
+    from core.config import settings
+
+    jobs_added = _capture_jobs(monkeypatch)
+
+    from core.cron.scheduler import start
+    start()
+
+    jobs = {j["id"]: j for j in jobs_added}
+    assert "rollup_hourly_stats" in jobs
+    job = jobs["rollup_hourly_stats"]
+    assert job["trigger"] == "interval"
+    assert job["minutes"] == settings.CRON_ROLLUP_INTERVAL_MINUTES
+
+
+def test_start_registers_user_stats_job(monkeypatch):
+    """start() adds the user_stats reconciliation job with an hour interval from settings."""
+    from core.config import settings
+
+    jobs_added = _capture_jobs(monkeypatch)
+
+    from core.cron.scheduler import start
+    start()
+
+    jobs = {j["id"]: j for j in jobs_added}
+    assert jobs["reconcile_user_stats"]["trigger"] == "interval"
+    assert jobs["reconcile_user_stats"]["hours"] == settings.CRON_USER_STATS_INTERVAL_HOURS
+
+
+def test_archive_job_follows_enabled_flag(monkeypatch):
+    """start() registers the log archive job only when LOG_ARCHIVE_ENABLED is on."""
+    from core.config import settings
+    from core.cron.scheduler import start
+
+    monkeypatch.setattr(settings, "LOG_ARCHIVE_ENABLED", True)
+    jobs_added = _capture_jobs(monkeypatch)
+    start()
+    jobs = {j["id"]: j for j in jobs_added}
+    assert jobs["archive_old_logs"]["hours"] == settings.CRON_ARCHIVE_INTERVAL_HOURS
+
+    monkeypatch.setattr(settings, "LOG_ARCHIVE_ENABLED", False)
+    jobs_added.clear()
+    start()
+    assert "archive_old_logs" not in {j["id"] for j in jobs_added}
+
+
 def test_stop_calls_shutdown(monkeypatch):
     """stop() calls scheduler.shutdown(wait=False)."""
     from core.cron.scheduler import scheduler
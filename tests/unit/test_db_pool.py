@@ -0,0 +1,102 @@
+"""Unit tests — core.database.connection.pool (pool settings, wait stats, idle pre-ping)."""
+
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from core.config import settings
+from core.database.connection import metrics, pgsql, pool
+
+
+class _InstrumentedQueuePool(pool._InstrumentedPoolMixin, QueuePool):
+    """同步版本，便于在无数据库环境下测试统计逻辑。"""
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_engine_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_POOL_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 4)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE", 600)
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", True)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_IDLE_SECONDS", 30)
+
+    options = pool.engine_options()
+    assert options["pool_size"] == 7 and options["max_overflow"] == 3
+    assert options["pool_timeout"] == 4 and options["pool_recycle"] == 600
+    assert options["connect_args"] == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    # 按空闲时长预检时关闭原生的每次预检
+    assert options["pool_pre_ping"] is False
+
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_IDLE_SECONDS", 0)
+    assert pool.engine_options()["pool_pre_ping"] is True
+
+
+def test_created_engine_uses_instrumented_pool(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 2)
+    engine = pgsql._create_engine("postgresql://u:p@localhost:1/db", "test")
+    try:
+        assert isinstance(engine.sync_engine.pool, pool.InstrumentedAsyncQueuePool)
+        assert engine.sync_engine.url.drivername == "postgresql+asyncpg"
+        assert metrics.snapshot()["pools"]["test"]["size"] == 2
+    finally:
+        metrics._engines.pop("test", None)
+
+
+def test_pool_records_wait_time_and_timeouts():
+    qp = _InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.01)
+    conn = qp.connect()
+    with pytest.raises(exc.TimeoutError):
+        qp.connect()
+    conn.close()
+    qp.connect().close()
+
+    stats = metrics.snapshot()
+    assert stats["pool_waits_total"] == 3
+    assert stats["pool_timeouts_total"] == 1
+    assert sum(stats["pool_wait_ms_histogram"].values()) == 3
+
+
+class _Record:
+    def __init__(self, checked_in_at=None):
+        self.info = {} if checked_in_at is None else {pool._CHECKIN_AT: checked_in_at}
+
+
+class _Dialect:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.pings = 0
+
+    def do_ping(self, dbapi_connection):
+        self.pings += 1
+        return self.alive
+
+
+def test_idle_pre_ping_only_pings_idle_connections():
+    dialect = _Dialect()
+    on_checkout = pool._idle_pre_ping(30, dialect)
+
+    on_checkout(object(), _Record(), None)  # 新建连接
+    on_checkout(object(), _Record(time.monotonic()), None)  # 刚归还
+    assert dialect.pings == 0
+
+    on_checkout(object(), _Record(time.monotonic() - 60), None)
+    assert dialect.pings == 1
+    assert metrics.snapshot()["pre_pings_total"] == 1
+
+
+def test_idle_pre_ping_failure_invalidates_connection():
+    on_checkout = pool._idle_pre_ping(30, _Dialect(alive=False))
+    with pytest.raises(exc.DisconnectionError):
+        on_checkout(object(), _Record(time.monotonic() - 60), None)
+    assert metrics.snapshot()["pre_ping_failures_total"] == 1
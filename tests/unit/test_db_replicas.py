@@ -0,0 +1,146 @@
+"""Unit tests — read-replica routing (core.database.connection.replicas / pgsql.get_session)."""
+
+import asyncio
+
+import pytest
+
+from core.database.connection import pgsql
+from core.database.connection.replicas import ReplicaRouter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _router(lags, clock, **kwargs):
+    """lags: {url: 延迟秒数 | Exception}，探测时按 url 返回。"""
+
+    async def probe(engine):
+        value = lags[engine]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    options = {"max_lag_seconds": 5, "check_interval": 10, "retry_interval": 30}
+    options.update(kwargs)
+    # engine_factory 直接返回 url，便于 probe 按 url 查表
+    return ReplicaRouter(list(lags), lambda url, name: url, probe=probe, clock=clock, **options)
+
+
+def _pick_names(router, n):
+    async def run():
+        return [(await router.pick()) for _ in range(n)]
+
+    return [r.name if r else None for r in asyncio.run(run())]
+
+
+def test_round_robin_across_healthy_replicas():
+    router = _router({"a": 0.0, "b": 1.0}, _Clock())
+    assert _pick_names(router, 4) == ["replica-0", "replica-1", "replica-0", "replica-1"]
+
+
+def test_lagging_replica_is_skipped_until_it_catches_up():
+    clock = _Clock()
+    lags = {"a": 0.0, "b": 60.0}
+    router = _router(lags, clock)
+    assert _pick_names(router, 3) == ["replica-0", "replica-0", "replica-0"]
+    assert router.status()[1] == {"name": "replica-1", "available": False, "lag_seconds": 60.0}
+
+    lags["b"] = 0.5
+    clock.now += 11
+    assert "replica-1" in _pick_names(router, 2)
+
+
+def test_unreachable_replica_falls_back_and_retries_later():
+    clock = _Clock()
+    lags = {"a": ConnectionRefusedError("down")}
+    router = _router(lags, clock)
+    assert _pick_names(router, 2) == [None, None]
+
+    lags["a"] = 0.0
+    clock.now += 11  # 未到 retry_interval
+    assert _pick_names(router, 1) == [None]
+    clock.now += 30
+    assert _pick_names(router, 1) == ["replica-0"]
+
+
+class _Session:
+    def __init__(self, label, in_tx=False):
+        self.label = label
+        self.closed = False
+        self._in_tx = in_tx
+
+    def in_transaction(self):
+        return self._in_tx
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def routed(monkeypatch):
+    router = _router({"a": 0.0}, _Clock())
+    monkeypatch.setattr(pgsql, "_get_replica_router", lambda: router)
+    monkeypatch.setattr(pgsql, "_get_session_factory", lambda: (lambda: _Session("primary")))
+    monkeypatch.setattr(pgsql, "_replica_session_factory", lambda replica: (lambda: _Session(replica.name)))
+    return router
+
+
+def _label(**kwargs):
+    async def run():
+        async with pgsql.get_session(**kwargs) as session:
+            return session.label
+
+    return asyncio.run(run())
+
+
+def test_readonly_session_uses_replica(routed):
+    assert _label(readonly=True) == "replica-0"
+    assert _label() == "primary"
+
+
+def test_readonly_session_falls_back_to_primary_without_replicas(monkeypatch, routed):
+    monkeypatch.setattr(pgsql, "_get_replica_router", lambda: None)
+    assert _label(readonly=True) == "primary"
+
+
+def test_connection_error_on_replica_marks_it_down(routed):
+    async def run():
+        async with pgsql.get_session(readonly=True):
+            raise OSError("connection reset")
+
+    with pytest.raises(OSError):
+        asyncio.run(run())
+    assert routed.replicas[0].available is False
+    assert _label(readonly=True) == "primary"
+
+
+def test_unit_of_work_with_open_transaction_keeps_reads_on_primary(monkeypatch, routed):
+    uow_session = _Session("uow", in_tx=True)
+
+    class _Nested:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    uow_session.begin_nested = lambda: _Nested()
+    monkeypatch.setattr(pgsql, "_get_session_factory", lambda: (lambda: uow_session))
+
+    async def run():
+        async with pgsql.unit_of_work():
+            async with pgsql.get_session(readonly=True) as session:
+                return session.label
+
+    assert asyncio.run(run()) == "uow"
@@ -0,0 +1,108 @@
+"""Unit tests — core.database.connection.statements (statement timing, budget, N+1)."""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from core.config import settings
+from core.database.connection import statements
+from core.helper.CustomLog.index import LogContext, reset_log_context, set_log_context
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    statements.reset()
+    yield
+    statements.reset()
+
+
+@pytest.fixture
+def logs(monkeypatch):
+    captured = []
+    monkeypatch.setattr(
+        statements, "CustomLog", lambda level, content, **kwargs: captured.append((level, content, kwargs))
+    )
+    return captured
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    statements.install_statement_listeners(engine)
+    statements.install_statement_listeners(engine)  # 重复注册无副作用
+    yield engine
+    engine.dispose()
+
+
+def test_statements_are_counted_per_request(engine, logs):
+    with statements.track_request_statements() as counter:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 3"))  # 请求外的语句只计入全局
+
+    assert counter.statements == 2
+    stats = statements.snapshot()
+    assert stats["statements_total"] == 3
+    assert stats["statements_per_request_avg"] == 2
+    assert stats["statements_per_request_histogram"] == {"<=2": 1}
+    assert sum(stats["statement_ms_histogram"].values()) == 3
+
+
+def test_slow_statement_is_logged_with_trace_id(engine, logs, monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_STATEMENT_MS", 0.000001)
+    token = set_log_context(LogContext(trace_id="trace-1"))
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT   1"))
+    finally:
+        reset_log_context(token)
+
+    (level, content, kwargs), = logs
+    assert level == "WARNING" and "SELECT 1" in content
+    assert kwargs["event_type"] == "SLOW_STATEMENT" and kwargs["sid"] is True
+    assert kwargs["trace_id"] == "trace-1"
+    assert statements.snapshot()["recent_slow_statements"][0]["trace_id"] == "trace-1"
+
+
+def test_statement_budget_exceeded_is_logged(engine, logs, monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_STATEMENT_MS", 0)
+    monkeypatch.setattr(settings, "DB_REQUEST_STATEMENT_BUDGET", 2)
+    with statements.track_request_statements():
+        with engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text(f"SELECT {i}"))
+
+    assert [kwargs["event_type"] for _, _, kwargs in logs] == ["STATEMENT_BUDGET_EXCEEDED"]
+    assert statements.snapshot()["statement_budget_exceeded_total"] == 1
+
+
+def test_n_plus_one_warns_once_per_shape_in_development(engine, logs, monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_STATEMENT_MS", 0)
+    monkeypatch.setattr(settings, "DB_REQUEST_STATEMENT_BUDGET", 0)
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "APP_ENV", "development")
+
+    with statements.track_request_statements():
+        with engine.connect() as conn:
+            for i in range(6):
+                conn.execute(text("SELECT :v"), {"v": i})
+
+    assert len(logs) == 1 and "N+1" in logs[0][1]
+    assert statements.snapshot()["n_plus_one_warnings_total"] == 1
+
+    monkeypatch.setattr(settings, "APP_ENV", "production")
+    with statements.track_request_statements():
+        with engine.connect() as conn:
+            for i in range(6):
+                conn.execute(text("SELECT :v"), {"v": i})
+    assert len(logs) == 1
+
+
+def test_statement_shape_ignores_parameter_counts():
+    assert statements.statement_shape("SELECT * FROM t WHERE id IN ($1, $2, $3)") == (
+        statements.statement_shape("SELECT *\n FROM t WHERE id IN ($1)")
+    )
+    assert statements.statement_shape("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == (
+        "INSERT INTO t (a, b) VALUES (?)"
+    )
@@ -0,0 +1,141 @@
+"""Unit tests — core.helper.etag 与使用 ETag 的接口（/users/me、管理端题目）。"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.database.dao.register_questions import QUESTIONS_ETAG_KEY, RegisterQuestionsDAO
+from core.helper import etag
+from core.middleware.auth.dependencies import (
+    MinRoleChecker,
+    get_current_user,
+    invalidate_user_cache,
+    user_etag_key,
+)
+from core.security.rbac import Role
+from modules.api.v1 import admin as admin_v1
+from modules.api.v1 import users as users_v1
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        self.ttls[key] = ex
+        return True
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key) or 0) + 1)
+        return int(self.store[key])
+
+    def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(etag.redis_conn, "get_client", lambda: fake)
+    return fake
+
+
+def test_resource_etag_is_stable_until_bumped(redis):
+    first = etag.resource_etag("etag:test", ttl=60)
+    assert first.startswith('W/"') and etag.resource_etag("etag:test", ttl=60) == first
+    assert redis.ttls["etag:test"] == 60
+
+    etag.bump_etag("etag:test")  # 不在工作单元中：立即删除
+    assert etag.resource_etag("etag:test", ttl=60) != first
+
+
+def test_resource_etag_without_redis_is_none(monkeypatch):
+    monkeypatch.setattr(etag.redis_conn, "get_client", lambda: None)
+    assert etag.resource_etag("etag:test", ttl=60) is None
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [('W/"abc"', True), ('"abc"', True), ('"x", W/"abc"', True), ("*", True), ('W/"abd"', False)],
+)
+def test_if_none_match_uses_weak_comparison(header, expected):
+    assert etag._matches(header, 'W/"abc"') is expected
+
+
+# ---------------------------------------------------------------------------
+# GET /users/me
+# ---------------------------------------------------------------------------
+
+
+def test_users_me_returns_304_without_database(redis, monkeypatch):
+    app = FastAPI()
+    app.include_router(users_v1.router)
+    app.dependency_overrides[users_v1.get_current_user] = lambda: {"uuid": "u-1"}
+    client = TestClient(app)
+    loads = []
+
+    async def fake_find_by_uuid(self, uuid, columns=None):
+        loads.append(uuid)
+        return {"uuid": uuid, "nickname": f"昵称{len(loads)}"}
+
+    monkeypatch.setattr(users_v1.UsersDAO, "find_by_uuid", fake_find_by_uuid, raising=False)
+
+    first = client.get("/users/me")
+    tag = first.headers["ETag"]
+    assert first.status_code == 200 and redis.get(user_etag_key("u-1"))
+
+    cached = client.get("/users/me", headers={"If-None-Match": tag})
+    assert cached.status_code == 304 and cached.headers["ETag"] == tag
+    assert loads == ["u-1"]  # 304 未查询数据库
+
+    invalidate_user_cache("u-1")  # 任一写入路径都会更换版本戳
+    refreshed = client.get("/users/me", headers={"If-None-Match": tag})
+    assert refreshed.status_code == 200 and refreshed.headers["ETag"] != tag
+    assert refreshed.json()["nickname"] == "昵称2"
+
+
+# ---------------------------------------------------------------------------
+# 管理端题目
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def admin_client():
+    app = FastAPI()
+    app.include_router(admin_v1.router)
+    app.dependency_overrides[MinRoleChecker(Role.SUPERADMIN.value)] = lambda: {"uuid": "admin-uuid"}
+    app.dependency_overrides[get_current_user] = lambda: {"uuid": "admin-uuid", "user_role": "superadmin"}
+    return TestClient(app)
+
+
+def test_question_reads_share_version_until_questions_change(redis, admin_client, monkeypatch):
+    counts = []
+
+    async def fake_count(keyword=None, question_type=None, status=None, readonly=True):
+        counts.append((question_type, readonly))
+        return 3
+
+    async def fake_load_stats():
+        return [("choice", "active", 1), ("true_false", "active", 1), ("fill_blank", "inactive", 1)]
+
+    monkeypatch.setattr(admin_v1.RegisterQuestionsDAO, "count_questions", fake_count)
+    monkeypatch.setattr(admin_v1.RegisterQuestionsDAO, "load_stats", staticmethod(fake_load_stats))
+    monkeypatch.setattr(admin_v1.RegisterQuestionsDAO, "_stats_loaded_at", 0.0)
+
+    tag = admin_client.get("/admin/questions/total").headers["ETag"]
+    assert admin_client.get("/admin/questions/total", headers={"If-None-Match": tag}).status_code == 304
+    assert admin_client.get("/admin/questions/stats", headers={"If-None-Match": tag}).status_code == 304
+    assert counts == [(None, False)]  # 带 ETag 的响应读主库
+
+    RegisterQuestionsDAO.invalidate_pool()  # 题目写入接口均会调用
+    assert QUESTIONS_ETAG_KEY not in redis.store
+    response = admin_client.get("/admin/questions/stats", headers={"If-None-Match": tag})
+    assert response.status_code == 200 and response.json()["total"] == 3
+
@@ -0,0 +1,128 @@
+"""Unit tests — core.database.archive.log_archive (cold archive write / query / rollback)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+from core.database.archive import log_archive
+from core.database.archive.log_archive import load_manifest, query_archive
+from core.helper.CustomLog.filters import match_log_row
+
+
+def _system_row(i, created_at, **extra):
+    row = {
+        "id": i,
+        "trace_id": f"t-{i}",
+        "event_type": "LOGIN",
+        "log_type": "auth",
+        "severity": "info",
+        "status": "SUCCESS",
+        "client_ip": "1.1.1.1",
+        "content": f"user logged in #{i}",
+        "created_at": created_at,
+    }
+    row.update(extra)
+    return row
+
+
+class _FakeMappings:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self._rows
+
+
+def _fake_get_session(rows, *, fail_on_commit=False):
+    """第一次 DELETE 返回 rows，之后返回空；可模拟提交失败。"""
+    batches = [rows]
+
+    class _Session:
+        async def execute(self, stmt):
+            return _FakeMappings(batches.pop(0) if batches else [])
+
+    @asynccontextmanager
+    async def _get_session():
+        yield _Session()
+        if fail_on_commit:
+            raise RuntimeError("commit failed")
+
+    return _get_session
+
+
+# ---------------------------------------------------------------------------
+# 过滤
+# ---------------------------------------------------------------------------
+
+
+def test_match_log_row_mirrors_search_filters():
+    row = _system_row(1, datetime(2024, 1, 1, 12))
+    assert match_log_row(row, {})
+    assert match_log_row(row, {"event_type": "LOGIN", "keyword": "LOGGED IN"})
+    assert not match_log_row(row, {"status": "FAIL"})
+    assert not match_log_row(row, {"start_time": datetime(2024, 1, 2)})
+    assert match_log_row(
+        {**row, "created_at": row["created_at"].isoformat()},
+        {"start_time": datetime(2024, 1, 1), "end_time": datetime(2024, 1, 1, 12)},
+    )
+    assert not match_log_row({**row, "user_uuid": "u1"}, {"user_uuids": ["u2"]})
+
+
+def test_match_log_row_field_map_for_illegal_requests():
+    row = {"type": "SQLI", "ip": "2.2.2.2", "path": "/admin/Login", "happened_at": datetime(2024, 1, 1)}
+    field_map = log_archive.ARCHIVE_TABLES["illegal_requests"].field_map
+    assert match_log_row(row, {"client_ip": "2.2.2.2", "keyword": "login"},
+                         time_field="happened_at", field_map=field_map)
+    assert not match_log_row(row, {"event_type": "XSS"}, time_field="happened_at", field_map=field_map)
+
+
+# ---------------------------------------------------------------------------
+# 归档
+# ---------------------------------------------------------------------------
+
+
+def test_archive_writes_date_partitions_and_query_filters(monkeypatch, tmp_path):
+    rows = [
+        _system_row(1, datetime(2024, 1, 1, 8)),
+        _system_row(2, datetime(2024, 1, 1, 9), status="FAIL"),
+        _system_row(3, datetime(2024, 1, 2, 10)),
+    ]
+    monkeypatch.setattr(log_archive, "get_session", _fake_get_session(rows))
+
+    archived = asyncio.run(log_archive.archive_expired_logs(
+        tmp_path, datetime(2024, 6, 1), batch_size=100, tables=("system_logs",),
+    ))
+    assert archived == {"system_logs": 3}
+
+    files = load_manifest(tmp_path)["files"]
+    assert sorted(f["date"] for f in files) == ["2024-01-01", "2024-01-02"]
+    assert all(f["path"].endswith(".jsonl.gz") and (tmp_path / f["path"]).exists() for f in files)
+
+    items, total = query_archive(tmp_path, "system_logs")
+    assert total == 3
+    assert [i["id"] for i in items] == [3, 2, 1]
+
+    items, total = query_archive(tmp_path, "system_logs", status="FAIL")
+    assert total == 1 and items[0]["id"] == 2
+
+    items, total = query_archive(tmp_path, "system_logs", start_time=datetime(2024, 1, 2), limit=10)
+    assert [i["id"] for i in items] == [3]
+
+
+def test_archive_removes_files_when_commit_fails(monkeypatch, tmp_path):
+    rows = [_system_row(1, datetime(2024, 1, 1, 8))]
+    monkeypatch.setattr(log_archive, "get_session", _fake_get_session(rows, fail_on_commit=True))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(log_archive.archive_expired_logs(
+            tmp_path, datetime(2024, 6, 1), tables=("system_logs",),
+        ))
+    assert load_manifest(tmp_path)["files"] == []
+    assert not list(tmp_path.rglob("*.jsonl.gz"))
+
+
+def test_query_archive_rejects_unknown_table(tmp_path):
+    with pytest.raises(ValueError):
+        query_archive(tmp_path, "users")
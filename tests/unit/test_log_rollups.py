@@ -0,0 +1,176 @@
+"""Unit tests — 日志汇总高水位推进（LogRollupsDAO.advance / _advance_log_source / _lock_watermark）。"""
+
+import asyncio
+import re
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.expression import Insert, Update
+
+from core.database.dao import log_rollups as rollups_dao
+from core.database.dao.log_rollups import LogRollupsDAO
+from core.database.dao.system_logs import SystemLog
+
+
+def _compile(stmt):
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+class _FakeSession:
+    """以内存中的源表行 / 高水位 / 汇总计数模拟汇总任务涉及的语句。"""
+
+    def __init__(self, rows=None, watermarks=None):
+        # {源表名: [(id, 时间), ...]}
+        self.rows = rows or {}
+        self.watermarks = dict(watermarks or {})
+        self.rollups: Counter = Counter()
+        self.locked: list[str] = []
+        self.sql: list[str] = []
+
+    def _source(self, sql: str) -> list:
+        table = re.search(r"FROM (\w+)", sql).group(1)
+        return self.rows.get(table, [])
+
+    async def execute(self, stmt):
+        sql, params = _compile(stmt)
+        self.sql.append(sql)
+        if isinstance(stmt, Insert) and stmt.table.name == "rollup_watermarks":
+            assert "ON CONFLICT (name) DO NOTHING" in sql
+            self.watermarks.setdefault(params["name"], params["last_id"])
+        elif isinstance(stmt, Insert):
+            last_id, upper = params["id_1"], params["id_2"]
+            for row_id, ts in self._source(sql):
+                if last_id < row_id <= upper:
+                    self.rollups[(stmt.table.name, ts.replace(minute=0, second=0, microsecond=0))] += 1
+        elif isinstance(stmt, Update):
+            self.watermarks[params["name_1"]] = params["last_id"]
+
+    async def scalar(self, stmt):
+        sql, params = _compile(stmt)
+        self.sql.append(sql)
+        if sql.endswith("FOR UPDATE"):
+            self.locked.append(params["name_1"])
+            return self.watermarks.get(params["name_1"])
+        if sql.startswith("SELECT min("):
+            settle_before = params.get("created_at_1", params.get("happened_at_1"))
+            ids = [i for i, ts in self._source(sql) if i > params["id_1"] and ts > settle_before]
+            return min(ids) if ids else None
+        ids = sorted(i for i, _ in self._source(sql) if i > params["id_1"])
+        if "id_2" in params:
+            ids = [i for i in ids if i < params["id_2"]]
+        ids = ids[: params["param_1"]]
+        return max(ids) if ids else None
+
+
+def _install(monkeypatch, session: _FakeSession) -> list:
+    opened = []
+
+    @asynccontextmanager
+    async def fake_get_session(*args, **kwargs):
+        opened.append(session)
+        yield session
+
+    monkeypatch.setattr(rollups_dao, "get_session", fake_get_session)
+    return opened
+
+
+def _settled(ids, hours_ago: int = 2) -> list:
+    at = datetime.now() - timedelta(hours=hours_ago)
+    return [(i, at) for i in ids]
+
+
+def test_lock_watermark_initialises_then_locks():
+    session = _FakeSession()
+    assert asyncio.run(LogRollupsDAO._lock_watermark(session, "system_logs")) == 0
+    assert session.watermarks == {"system_logs": 0}
+    assert session.locked == ["system_logs"]
+
+    session = _FakeSession(watermarks={"system_logs": 42})
+    assert asyncio.run(LogRollupsDAO._lock_watermark(session, "system_logs")) == 42
+    # 已有高水位不被初始化语句覆盖
+    assert session.watermarks == {"system_logs": 42}
+
+
+def test_advance_log_source_moves_watermark_by_one_batch(monkeypatch):
+    session = _FakeSession(rows={"system_logs": _settled(range(1, 26))})
+    opened = _install(monkeypatch, session)
+    settle_before = datetime.now() - timedelta(seconds=60)
+
+    step = asyncio.run(LogRollupsDAO._advance_log_source("system", SystemLog, settle_before, 10))
+
+    assert step == 10
+    assert session.watermarks["system_logs"] == 10
+    assert sum(session.rollups.values()) == 10
+    assert len(opened) == 1
+
+
+def test_advance_log_source_is_noop_when_caught_up(monkeypatch):
+    session = _FakeSession(
+        rows={"system_logs": _settled(range(1, 6))}, watermarks={"system_logs": 5}
+    )
+    _install(monkeypatch, session)
+
+    step = asyncio.run(
+        LogRollupsDAO._advance_log_source("system", SystemLog, datetime.now(), 10)
+    )
+
+    assert step == 0
+    assert session.watermarks["system_logs"] == 5
+    assert not session.rollups
+    assert not any(sql.startswith("UPDATE") for sql in session.sql)
+
+
+def test_advance_log_source_stops_before_first_unsettled_row(monkeypatch):
+    # id 6 仍在 settle 窗口内：即使更大的 id 7 已经可见，高水位也只能停在 5
+    recent = datetime.now()
+    rows = _settled(range(1, 6)) + [(6, recent)] + _settled([7])
+    session = _FakeSession(rows={"system_logs": rows})
+    _install(monkeypatch, session)
+    settle_before = recent - timedelta(seconds=60)
+
+    step = asyncio.run(LogRollupsDAO._advance_log_source("system", SystemLog, settle_before, 100))
+
+    assert step == 5
+    assert session.watermarks["system_logs"] == 5
+    assert sum(session.rollups.values()) == 5
+
+    # 窗口内的第一行即未结算时不推进
+    step = asyncio.run(LogRollupsDAO._advance_log_source("system", SystemLog, settle_before, 100))
+    assert step == 0
+    assert session.watermarks["system_logs"] == 5
+
+
+def test_advance_counts_each_row_once_across_batches(monkeypatch):
+    hour = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+    rows = [(i, hour + timedelta(minutes=i)) for i in range(1, 26)]
+    session = _FakeSession(rows={"system_logs": rows})
+    opened = _install(monkeypatch, session)
+
+    advanced = asyncio.run(LogRollupsDAO.advance(batch_size=10, max_batches=20))
+
+    assert advanced == {"system_logs": 25, "personal_logs": 0, "illegal_requests": 0}
+    assert session.watermarks["system_logs"] == 25
+    assert session.rollups == {("log_hourly_rollups", hour): 25}
+    # 10 + 10 + 5，再加一次追平探测；personal / firewall 各一次空批次
+    assert len(opened) == 4 + 1 + 1
+
+
+def test_advance_leaves_backlog_beyond_max_batches(monkeypatch):
+    session = _FakeSession(
+        rows={"system_logs": _settled(range(1, 31)), "illegal_requests": _settled(range(1, 4))}
+    )
+    _install(monkeypatch, session)
+
+    advanced = asyncio.run(LogRollupsDAO.advance(batch_size=10, max_batches=2))
+    assert advanced == {"system_logs": 20, "personal_logs": 0, "illegal_requests": 3}
+    assert session.watermarks["system_logs"] == 20
+
+    # 剩余积压由下一轮继续推进
+    advanced = asyncio.run(LogRollupsDAO.advance(batch_size=10, max_batches=2))
+    assert advanced == {"system_logs": 10, "personal_logs": 0, "illegal_requests": 0}
+    assert session.watermarks["system_logs"] == 30
+    assert sum(n for (table, _), n in session.rollups.items() if table == "log_hourly_rollups") == 30
+    assert sum(n for (table, _), n in session.rollups.items() if table == "firewall_hourly_rollups") == 3
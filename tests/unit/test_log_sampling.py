@@ -0,0 +1,132 @@
+"""Unit tests — core.helper.CustomLog.sampling (LogSampler policies, caps, summaries)."""
+
+import pytest
+
+from core.helper.CustomLog import index as custom_log_index
+from core.helper.CustomLog.index import CustomLog
+from core.helper.CustomLog.sampling import (
+    SUPPRESSED_EVENT_TYPE,
+    LogSampler,
+    SamplingPolicy,
+)
+
+
+class _Clock:
+    """可手动推进的假时钟。"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _admit(sampler, *, event_type="LOGIN", log_type="auth", level="SUCCESS", status="SUCCESS"):
+    return sampler.admit(event_type=event_type, log_type=log_type, level=level, status=status)
+
+
+# ---------------------------------------------------------------------------
+# Policy resolution
+# ---------------------------------------------------------------------------
+
+def test_no_policy_keeps_everything():
+    sampler = LogSampler()
+    assert _admit(sampler) == (True, [])
+
+
+def test_most_specific_policy_wins():
+    sampler = LogSampler()
+    sampler.register(SamplingPolicy(0.5), event_type="LOGIN")
+    sampler.register(SamplingPolicy(0.1), event_type="LOGIN", log_type="auth")
+    key, policy = sampler.resolve("LOGIN", "auth", "SUCCESS")
+    assert key == ("LOGIN", "auth", None)
+    assert policy.sample_ratio == 0.1
+    key, policy = sampler.resolve("LOGIN", "other", "SUCCESS")
+    assert key == ("LOGIN", None, None)
+
+
+def test_sample_ratio_uses_rng():
+    values = iter([0.05, 0.95])
+    sampler = LogSampler(rng=lambda: next(values))
+    sampler.register(SamplingPolicy(0.1), event_type="LOGIN")
+    assert _admit(sampler)[0] is True
+    assert _admit(sampler)[0] is False
+
+
+@pytest.mark.parametrize("level,status", [("ERROR", "SUCCESS"), ("WARNING", "FAIL")])
+def test_fail_and_error_always_kept(level, status):
+    sampler = LogSampler(rng=lambda: 0.99)
+    sampler.register(SamplingPolicy(0.0, max_per_second=0), event_type="LOGIN")
+    assert _admit(sampler, level=level, status=status)[0] is True
+
+
+def test_disabled_sampler_keeps_everything():
+    sampler = LogSampler(rng=lambda: 0.99)
+    sampler.register(SamplingPolicy(0.0), event_type="LOGIN")
+    sampler.enabled = False
+    assert _admit(sampler)[0] is True
+
+
+def test_default_policies_cap_slow_statement_logs(monkeypatch):
+    from core.config import settings
+    from core.helper.CustomLog.sampling import _install_default_policies
+
+    monkeypatch.setattr(settings, "LOG_RATE_CAP_PER_SECOND", 2)
+    sampler = LogSampler(clock=_Clock())
+    _install_default_policies(sampler)
+
+    key, policy = sampler.resolve("SLOW_STATEMENT", "db", "WARNING")
+    assert key == ("SLOW_STATEMENT", None, None) and policy == SamplingPolicy(1.0, 2)
+    kept = [_admit(sampler, event_type="SLOW_STATEMENT", log_type="db", level="WARNING", status=None)[0]
+            for _ in range(5)]
+    assert kept == [True, True, False, False, False]
+
+
+# ---------------------------------------------------------------------------
+# Per-second cap + suppressed summaries
+# ---------------------------------------------------------------------------
+
+def test_cap_suppresses_and_reports_next_second():
+    clock = _Clock()
+    sampler = LogSampler(clock=clock)
+    sampler.register(SamplingPolicy(max_per_second=2), event_type="LOGIN")
+
+    kept = [_admit(sampler)[0] for _ in range(5)]
+    assert kept == [True, True, False, False, False]
+
+    clock.now += 1
+    keep, summaries = _admit(sampler, event_type="OTHER")
+    assert keep is True
+    assert len(summaries) == 1
+    assert summaries[0].key == ("LOGIN", None, None)
+    assert summaries[0].suppressed == 3
+
+    # 汇总只上报一次，新窗口重新计数
+    keep, summaries = _admit(sampler)
+    assert keep is True
+    assert summaries == []
+
+
+# ---------------------------------------------------------------------------
+# CustomLog integration
+# ---------------------------------------------------------------------------
+
+def test_custom_log_skips_store_when_sampled_out(monkeypatch):
+    clock = _Clock()
+    sampler = LogSampler(clock=clock)
+    sampler.register(SamplingPolicy(max_per_second=1), event_type="LOGIN")
+    monkeypatch.setattr(custom_log_index, "log_sampler", sampler)
+
+    stored: list[tuple[str | None, str]] = []
+    monkeypatch.setattr(CustomLog, "_store", lambda self: stored.append((self.event_type, self.content)))
+
+    for _ in range(3):
+        CustomLog("SUCCESS", "login ok", print_out=False, sid=True, sidp="personal", event_type="LOGIN")
+    CustomLog("SUCCESS", "login bad", print_out=False, sid=True, event_type="LOGIN", status="FAIL")
+    assert [e for e, _ in stored] == ["LOGIN", "LOGIN"]
+
+    clock.now += 1
+    CustomLog("INFO", "other", print_out=False, sid=True, event_type="OTHER")
+    assert stored[2][0] == SUPPRESSED_EVENT_TYPE
+    assert "已抑制 2 条相似日志" in stored[2][1]
+    assert stored[3][0] == "OTHER"
@@ -0,0 +1,148 @@
+"""Unit tests — core.helper.CustomLog.stream (shared LISTEN hub, SSE framing)."""
+
+import asyncio
+import json
+
+from core.helper.CustomLog import stream
+from core.helper.CustomLog.stream import LogStreamHub, build_notify_payload
+from modules.api.v1 import logs as logs_v1
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.listeners = {}
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        pass
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def _fake_hub():
+    connections = []
+
+    async def connect():
+        conn = _FakeConnection()
+        connections.append(conn)
+        return conn
+
+    return LogStreamHub(connect=connect), connections
+
+
+def _notify(conn, row):
+    conn.listeners["system_logs_stream"](conn, 1, "system_logs_stream", json.dumps(row))
+
+
+def test_notify_payload_truncates_long_fields():
+    payload = build_notify_payload({"content": "x" * 20000, "trace_id": "t", "error_msg": None})
+    data = json.loads(payload)
+    assert len(payload.encode("utf-8")) < 8000
+    assert data["trace_id"] == "t"
+    assert "error_msg" not in data
+
+
+def test_hub_shares_one_listener_and_filters_per_subscriber():
+    async def scenario():
+        hub, connections = _fake_hub()
+        errors = hub.subscribe({"severity": "ERROR"}, maxsize=10)
+        logins = hub.subscribe({"event_type": "LOGIN", "keyword": "alice"}, maxsize=10)
+        await asyncio.sleep(0)
+
+        assert len(connections) == 1
+        conn = connections[0]
+        _notify(conn, {"severity": "ERROR", "event_type": "DB", "content": "boom"})
+        _notify(conn, {"severity": "INFO", "event_type": "LOGIN", "content": "Alice logged in"})
+
+        assert errors.queue.qsize() == 1 and logins.queue.qsize() == 1
+        assert (await logins.queue.get())["event_type"] == "LOGIN"
+
+        await hub.unsubscribe(errors)
+        assert not conn.closed
+        await hub.unsubscribe(logins)
+        assert conn.closed
+        assert hub.subscriber_count == 0
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_drops_oldest():
+    async def scenario():
+        hub, connections = _fake_hub()
+        sub = hub.subscribe({}, maxsize=2)
+        for i in range(3):
+            hub.dispatch(json.dumps({"uuid": str(i)}))
+        assert sub.dropped == 1
+        assert [sub.queue.get_nowait()["uuid"] for _ in range(2)] == ["1", "2"]
+        await hub.close()
+
+    asyncio.run(scenario())
+
+
+def test_sse_events_frames_rows_and_unsubscribes(monkeypatch):
+    class _Request:
+        def __init__(self):
+            self.checks = 0
+
+        async def is_disconnected(self):
+            self.checks += 1
+            return self.checks > 1
+
+    async def scenario():
+        hub, _ = _fake_hub()
+        monkeypatch.setattr(logs_v1, "log_stream_hub", hub)
+        events = logs_v1._sse_events(_Request(), {})
+        assert hub.subscriber_count == 0  # 生成器开始运行前不订阅
+
+        first = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)
+        assert hub.subscriber_count == 1
+        hub.dispatch(json.dumps({"uuid": "log-1", "content": "hi"}))
+        frames = [await first] + [frame async for frame in events]
+        assert frames == ['id: log-1\nevent: log\ndata: {"uuid": "log-1", "content": "hi"}\n\n']
+        assert hub.subscriber_count == 0
+
+    asyncio.run(scenario())
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.exists_calls = 0
+
+    def set(self, key, value, ex=None):
+        self.store[key] = (value, ex)
+
+    def exists(self, key):
+        self.exists_calls += 1
+        return int(key in self.store)
+
+
+def test_subscriber_flag_gates_publishing(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr("core.database.connection.redis.redis_conn.get_client", lambda: fake)
+    monkeypatch.setattr(stream, "_active_checked_at", 0.0)
+    clock = [100.0]
+    monkeypatch.setattr(stream.time, "monotonic", lambda: clock[0])
+
+    assert stream.stream_has_subscribers() is False
+    stream.mark_stream_active()  # 任一进程出现订阅者
+    assert fake.store[stream.LOG_STREAM_ACTIVE_KEY][1] == stream._ACTIVE_KEY_TTL_SECONDS
+    assert stream.stream_has_subscribers() is False  # 1 秒内沿用缓存结果
+    assert fake.exists_calls == 1
+
+    clock[0] += stream._ACTIVE_CHECK_INTERVAL
+    assert stream.stream_has_subscribers() is True
+
+
+def test_subscriber_flag_without_redis_keeps_publishing(monkeypatch):
+    monkeypatch.setattr("core.database.connection.redis.redis_conn.get_client", lambda: None)
+    monkeypatch.setattr(stream, "_active_checked_at", 0.0)
+    assert stream.stream_has_subscribers() is True
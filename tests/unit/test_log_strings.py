@@ -0,0 +1,193 @@
+"""Unit tests — core.database.dao.log_strings (intern cache, search join-back)."""
+
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from core.database.dao import log_strings
+from core.database.dao.log_strings import (
+    INTERNED_COLUMNS,
+    LogStringsDAO,
+    resolve_strings,
+    select_resolved,
+    select_with_strings,
+)
+from core.database.dao.personal_logs import PersonalLog
+from core.database.dao.system_logs import SystemLog
+from core.helper.CustomLog.index import CustomLog
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _FakeSession:
+    """模拟 log_strings 表：INSERT ... DO NOTHING 只为新值分配 id 并返回，SELECT 返回已存在的值。"""
+
+    def __init__(self, existing=(), sync_session=None):
+        self.statements = []
+        # 真实的同步 Session，只用于触发 after_commit / after_soft_rollback 事件
+        self.sync_session = sync_session or Session()
+        self.sync_session.begin()
+        self.info = self.sync_session.info
+        self._next_id = 100
+        self.table = {}
+        for kind, value in existing:
+            self._add(kind, log_strings._hash(value))
+
+    def _add(self, kind, value_hash):
+        self.table[(kind, value_hash)] = self._next_id
+        self._next_id += 1
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        rows = []
+        if stmt.is_insert:
+            i = 0
+            while f"kind_m{i}" in params:
+                key = (params[f"kind_m{i}"], params[f"value_hash_m{i}"])
+                if key not in self.table:
+                    self._add(*key)
+                    rows.append(SimpleNamespace(id=self.table[key], kind=key[0], value_hash=key[1]))
+                i += 1
+        else:
+            wanted = set(params["param_1"])
+            rows = [SimpleNamespace(id=i, kind=k, value_hash=h) for (k, h), i in self.table.items() if (k, h) in wanted]
+        return _FakeResult(rows)
+
+    async def commit(self):
+        self.sync_session.commit()
+        self.sync_session.begin()
+
+    async def rollback(self):
+        self.sync_session.rollback()
+        self.sync_session.begin()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache(monkeypatch):
+    monkeypatch.setattr(LogStringsDAO, "_cache", OrderedDict())
+
+
+def test_intern_many_inserts_misses_once_then_hits_cache():
+    session = _FakeSession()
+    values = {"user_agent": "Mozilla/5.0", "service_name": "api", "host_name": None}
+
+    ids = asyncio.run(LogStringsDAO.intern_many(session, values))
+    assert set(ids) == {"user_agent", "service_name"}
+    assert len(session.statements) == 1  # 全是新值：RETURNING 已覆盖，无需再查
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_log_strings_kind_hash DO NOTHING" in sql
+    assert "RETURNING" in sql
+    # 提交前不进入缓存
+    assert not LogStringsDAO._cache
+
+    asyncio.run(session.commit())
+    again = asyncio.run(LogStringsDAO.intern_many(session, values))
+    assert again == ids
+    assert len(session.statements) == 1
+
+
+def test_intern_many_does_not_cache_ids_from_rolled_back_transaction():
+    session = _FakeSession()
+    asyncio.run(LogStringsDAO.intern_many(session, {"user_agent": "Mozilla/5.0"}))
+    asyncio.run(session.rollback())
+    assert not LogStringsDAO._cache
+
+    # 回滚后再次提交也不会把已丢弃的 id 写入缓存
+    asyncio.run(session.commit())
+    assert not LogStringsDAO._cache
+
+
+def test_intern_many_discards_pending_ids_on_savepoint_rollback():
+    session = _FakeSession(sync_session=Session(create_engine("sqlite://")))
+    nested = session.sync_session.begin_nested()
+    asyncio.run(LogStringsDAO.intern_many(session, {"user_agent": "Mozilla/5.0"}))
+    nested.rollback()
+    asyncio.run(session.commit())
+    assert not LogStringsDAO._cache
+
+
+def test_intern_many_selects_existing_values_without_updating_them():
+    session = _FakeSession(existing=[("user_agent", "curl/8.0")])
+    ids = asyncio.run(LogStringsDAO.intern_many(session, {"user_agent": "curl/8.0", "host_name": "h1"}))
+    assert ids == {"user_agent": 100, "host_name": 101}
+    assert len(session.statements) == 2
+    sql = str(session.statements[1].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT") and "(log_strings.kind, log_strings.value_hash) IN" in sql
+
+
+def test_intern_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(log_strings.settings, "LOG_INTERN_CACHE_SIZE", 2)
+    session = _FakeSession()
+    for value in ("a", "b", "a", "c"):  # 第二次 a 命中，变为最近使用
+        asyncio.run(LogStringsDAO.intern_many(session, {"user_agent": value}))
+        asyncio.run(session.commit())
+    assert list(LogStringsDAO._cache) == [("user_agent", "a"), ("user_agent", "c")]
+
+
+def test_match_uses_cached_id_when_known():
+    LogStringsDAO._cache[("service_name", "api")] = 7
+    sql = str(LogStringsDAO.match(SystemLog, "service_name", "api").compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+    ))
+    assert "service_name_id = 7" in sql
+    assert "log_strings" not in sql
+
+
+def test_select_with_strings_joins_each_interned_column():
+    sql = str(select_with_strings(SystemLog).compile(dialect=postgresql.dialect()))
+    assert sql.count("LEFT OUTER JOIN log_strings") == 4
+    sql = str(select_with_strings(PersonalLog).compile(dialect=postgresql.dialect()))
+    assert sql.count("LEFT OUTER JOIN log_strings") == 2
+
+
+def test_select_resolved_coalesces_strings_and_drops_ids():
+    stmt, converter = select_resolved(PersonalLog)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.count("LEFT OUTER JOIN log_strings") == 2
+    assert "coalesce(personal_logs.user_agent, user_agent__str.value) AS user_agent" in sql
+    assert "user_agent_id" not in converter.names and "user_agent" in converter.names
+    assert len(stmt.selected_columns) == len(converter.names)
+
+
+def test_resolve_strings_prefers_legacy_text_and_drops_ids():
+    data = {"user_agent": None, "user_agent_id": 3, "request_url": "/legacy", "request_url_id": None}
+    row = {"user_agent__str": "curl/8.0", "request_url__str": None}
+    assert resolve_strings("personal_logs", data, row) == {
+        "user_agent": "curl/8.0",
+        "request_url": "/legacy",
+    }
+
+
+def test_custom_log_writes_ids_instead_of_text(monkeypatch):
+    async def fake_intern_many(session, values):
+        return {k: 1 for k, v in values.items() if v}
+
+    monkeypatch.setattr(LogStringsDAO, "intern_many", fake_intern_many)
+    log = CustomLog("INFO", "x", print_out=False, sid=False, user_agent="UA", host_name="h1")
+    columns = asyncio.run(log._interned_columns(None, INTERNED_COLUMNS["system_logs"]))
+    assert columns == {
+        "user_agent": None, "user_agent_id": 1,
+        "host_name": None, "host_name_id": 1,
+        "service_name": None,
+    }
+
+
+def test_request_url_is_stored_raw_but_legacy_ids_still_resolve():
+    assert "request_url" not in INTERNED_COLUMNS["system_logs"]
+    assert "request_url" not in INTERNED_COLUMNS["personal_logs"]
+    stmt, converter = select_resolved(SystemLog)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "coalesce(system_logs.request_url, request_url__str.value) AS request_url" in sql
+    assert "request_url_id" not in converter.names
@@ -3,10 +3,18 @@
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from core.database.dao.base import row_converter
+from core.database.dao.personal_logs import PersonalLog
+from core.database.dao.system_logs import SystemLog
 from core.middleware.auth.dependencies import get_current_user
 from modules.api.v1 import logs as logs_v1
 
 
+def _record(model, **data):
+    """DAO 的 search 返回 Record，由路由在响应边界转换为字典。"""
+    return row_converter(model).record_type.from_dict(data)
+
+
 def _build_client(user: dict):
     app = FastAPI()
     app.include_router(logs_v1.router)
@@ -26,7 +34,7 @@ def test_system_logs_requires_superadmin(monkeypatch):
 
 def test_system_logs_returns_paginated_response(monkeypatch):
     async def fake_search(*args, **kwargs):
-        return [{"uuid": "log-1", "event_type": "TEST"}], 1
+        return [_record(SystemLog, uuid="log-1", event_type="TEST")], 1
     monkeypatch.setattr(logs_v1.SystemLogsDAO, "search", fake_search, raising=False)
 
     client = _build_client({"uuid": "admin-1", "user_role": "superadmin"})
@@ -43,7 +51,7 @@ def test_personal_logs_normal_user_can_query_self(monkeypatch):
 
     async def fake_search(*args, **kwargs):
         captured["user_uuids"] = kwargs.get("user_uuids")
-        return [{"uuid": "log-1", "user_uuid": "u-1"}], 1
+        return [_record(PersonalLog, uuid="log-1", user_uuid="u-1")], 1
     monkeypatch.setattr(logs_v1.PersonalLogsDAO, "search", fake_search, raising=False)
 
     client = _build_client({"uuid": "u-1", "user_role": "normal-user"})
@@ -67,7 +75,7 @@ def test_personal_logs_admin_can_query_specific_user(monkeypatch):
 
     async def fake_search(*args, **kwargs):
         captured["user_uuids"] = kwargs.get("user_uuids")
-        return [{"uuid": "log-1", "user_uuid": "u-2"}], 1
+        return [_record(PersonalLog, uuid="log-1", user_uuid="u-2")], 1
     monkeypatch.setattr(logs_v1.PersonalLogsDAO, "search", fake_search, raising=False)
 
     client = _build_client({"uuid": "admin-1", "user_role": "superadmin"})
@@ -91,10 +99,16 @@ def test_personal_logs_by_user_path_admin_allowed(monkeypatch):
 
     async def fake_search(*args, **kwargs):
         captured["user_uuids"] = kwargs.get("user_uuids")
-        return [{"uuid": "log-1", "user_uuid": "u-2"}], 1
+        return [_record(PersonalLog, uuid="log-1", user_uuid="u-2")], 1
     monkeypatch.setattr(logs_v1.PersonalLogsDAO, "search", fake_search, raising=False)
 
     client = _build_client({"uuid": "admin-1", "user_role": "superadmin"})
     resp = client.get("/logs/personal/u-2")
     assert resp.status_code == 200
     assert captured["user_uuids"] == ["u-2"]
+
+
+def test_system_log_stream_requires_superadmin():
+    client = _build_client({"uuid": "u-1", "user_role": "normal-user"})
+    resp = client.get("/logs/system/stream")
+    assert resp.status_code == 403
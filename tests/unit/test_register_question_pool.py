@@ -0,0 +1,156 @@
+"""Unit tests — RegisterQuestionsDAO 进程内题库缓存（版本号失效 / TTL / 提交后通知）。"""
+
+import asyncio
+
+import pytest
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database.connection import pgsql
+from core.database.dao import register_questions
+from core.database.dao.register_questions import POOL_VERSION_KEY, RegisterQuestionsDAO
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key) or 0) + 1)
+        return int(self.store[key])
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """替换数据库加载、Redis 与时钟，返回 (loads, redis, clock)。"""
+    loads = []
+    questions = [(f"q-{i}", f"题目{i}", f"答案{i}") for i in range(10)]
+
+    async def fake_load():
+        loads.append(1)
+        return list(questions)
+
+    redis = _FakeRedis()
+    clock = _Clock()
+    monkeypatch.setattr(RegisterQuestionsDAO, "load_active_pool", staticmethod(fake_load))
+    monkeypatch.setattr(register_questions.redis_conn, "get_client", lambda: redis)
+    monkeypatch.setattr(register_questions, "time", clock)
+    monkeypatch.setattr(RegisterQuestionsDAO, "_pool", [])
+    monkeypatch.setattr(RegisterQuestionsDAO, "_pool_version", None)
+    monkeypatch.setattr(RegisterQuestionsDAO, "_pool_loaded_at", 0.0)
+    monkeypatch.setattr(RegisterQuestionsDAO, "_stats_loaded_at", 0.0)
+    monkeypatch.setattr(settings, "REG_QUESTION_POOL_TTL_SECONDS", 300)
+    return loads, redis, clock
+
+
+def _sample(count=5):
+    return asyncio.run(RegisterQuestionsDAO.find_random_active(count=count))
+
+
+def test_pool_is_loaded_once_and_sampled_without_repeats(pool):
+    loads, _, _ = pool
+    for _ in range(3):
+        sheet = _sample()
+        assert len(sheet) == 5
+        assert len({q["uuid"] for q in sheet}) == 5
+        assert set(sheet[0]) == {"uuid", "question", "answer"}
+    assert len(loads) == 1
+    assert len(_sample(count=50)) == 10  # 题目不足时返回全部，由调用方判断
+
+
+def test_version_bump_reloads_every_worker(pool):
+    loads, redis, _ = pool
+    _sample()
+    redis.incr(POOL_VERSION_KEY)  # 其他进程修改了题目
+    _sample()
+    _sample()
+    assert len(loads) == 2
+
+
+def test_pool_expires_after_ttl_without_redis(pool, monkeypatch):
+    loads, _, clock = pool
+    monkeypatch.setattr(register_questions.redis_conn, "get_client", lambda: None)
+    _sample()
+    clock.now += 299
+    _sample()
+    clock.now += 1
+    _sample()
+    assert len(loads) == 2
+
+
+def test_invalidate_pool_bumps_version_and_local_cache(pool):
+    loads, redis, _ = pool
+    _sample()
+    RegisterQuestionsDAO.invalidate_pool()
+    assert redis.store[POOL_VERSION_KEY] == "1"
+    _sample()
+    assert len(loads) == 2
+
+
+def test_invalidate_pool_waits_for_unit_of_work_commit(pool, monkeypatch):
+    _, redis, _ = pool
+
+    class _FakeSession:
+        def __init__(self):
+            self.sync_session = Session()
+
+        async def commit(self):
+            self.sync_session.commit()
+
+        async def rollback(self):
+            self.sync_session.rollback()
+
+        async def close(self):
+            pass
+
+    monkeypatch.setattr(pgsql, "_get_session_factory", lambda: _FakeSession)
+
+    async def run(fail):
+        async with pgsql.unit_of_work():
+            RegisterQuestionsDAO.invalidate_pool()
+            assert POOL_VERSION_KEY not in redis.store  # 提交前不通知
+            if fail:
+                raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run(fail=True))
+    assert POOL_VERSION_KEY not in redis.store  # 回滚不通知
+
+    asyncio.run(run(fail=False))
+    assert redis.store[POOL_VERSION_KEY] == "1"
+
+
+def test_stats_are_cached_until_version_bump(pool, monkeypatch):
+    _, redis, clock = pool
+    aggregates = []
+
+    async def fake_load_stats():
+        aggregates.append(1)
+        return [("choice", "active", 4), ("choice", "inactive", 1), ("fill_blank", "active", 2)]
+
+    monkeypatch.setattr(RegisterQuestionsDAO, "load_stats", staticmethod(fake_load_stats))
+
+    stats = asyncio.run(RegisterQuestionsDAO.get_stats())
+    assert stats["total"] == 7 and stats["choice"] == 5 and stats["true_false"] == 0
+    assert stats["by_status"] == {"active": 6, "inactive": 1}
+    asyncio.run(RegisterQuestionsDAO.get_stats())
+    assert len(aggregates) == 1
+
+    RegisterQuestionsDAO.invalidate_pool()
+    asyncio.run(RegisterQuestionsDAO.get_stats())
+    redis.incr(POOL_VERSION_KEY)  # 其他进程修改了题目
+    asyncio.run(RegisterQuestionsDAO.get_stats())
+    clock.now += settings.REG_QUESTION_POOL_TTL_SECONDS
+    asyncio.run(RegisterQuestionsDAO.get_stats())
+    assert len(aggregates) == 4
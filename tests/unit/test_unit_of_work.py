@@ -0,0 +1,189 @@
+"""Unit tests — request-scoped unit of work (core.database.connection.pgsql / metrics)."""
+
+import asyncio
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from core.config import settings
+from core.database.connection import metrics, pgsql
+from core.middleware.unit_of_work import request_unit_of_work
+
+
+class _FakeNested:
+    def __init__(self, session):
+        self._session = session
+
+    async def __aenter__(self):
+        self._session.events.append("savepoint")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._session.events.append("release" if exc_type is None else "rollback_savepoint")
+        return False
+
+
+class _FakeSession:
+    def __init__(self, registry):
+        self.events = []
+        registry.append(self)
+
+    def begin_nested(self):
+        return _FakeNested(self)
+
+    async def commit(self):
+        self.events.append("commit")
+
+    async def rollback(self):
+        self.events.append("rollback")
+
+    async def close(self):
+        self.events.append("close")
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    created = []
+    monkeypatch.setattr(pgsql, "_get_session_factory", lambda: (lambda: _FakeSession(created)))
+    return created
+
+
+def test_get_session_without_unit_of_work_opens_own_session(sessions):
+    async def run():
+        async with pgsql.get_session():
+            pass
+        async with pgsql.get_session():
+            pass
+
+    asyncio.run(run())
+    assert len(sessions) == 2
+    assert sessions[0].events == ["commit", "close"]
+
+
+def test_unit_of_work_shares_one_session_without_savepoints(sessions):
+    async def run():
+        async with pgsql.unit_of_work() as uow_session:
+            async with pgsql.get_session() as first:
+                assert first is uow_session
+            async with pgsql.get_session() as second:
+                assert second is uow_session
+            # 可重入
+            async with pgsql.unit_of_work() as inner:
+                assert inner is uow_session
+
+    asyncio.run(run())
+    assert len(sessions) == 1
+    # 普通 get_session() 不额外发送 SAVEPOINT / RELEASE
+    assert sessions[0].events == ["commit", "close"]
+
+
+def test_savepoint_only_rolls_back_its_block(sessions):
+    async def run():
+        async with pgsql.unit_of_work():
+            with pytest.raises(ValueError):
+                async with pgsql.savepoint():
+                    async with pgsql.get_session():
+                        raise ValueError("duplicate")
+            async with pgsql.savepoint():
+                async with pgsql.get_session():
+                    pass
+
+    asyncio.run(run())
+    assert sessions[0].events == ["savepoint", "rollback_savepoint", "savepoint", "release", "commit", "close"]
+
+
+def test_savepoint_is_a_noop_outside_unit_of_work(sessions):
+    async def run():
+        async with pgsql.savepoint():
+            async with pgsql.get_session():
+                pass
+
+    asyncio.run(run())
+    assert len(sessions) == 1
+    assert sessions[0].events == ["commit", "close"]
+
+
+def test_client_error_commits_server_error_rolls_back(sessions):
+    async def run(exc):
+        with pytest.raises(type(exc)):
+            async with pgsql.unit_of_work():
+                async with pgsql.get_session():
+                    pass
+                raise exc
+
+    asyncio.run(run(HTTPException(status_code=401)))
+    asyncio.run(run(RuntimeError("boom")))
+    assert sessions[0].events[-2:] == ["commit", "close"]
+    assert sessions[1].events[-2:] == ["rollback", "close"]
+
+
+def test_background_tasks_do_not_share_the_request_session(sessions):
+    async def background():
+        async with pgsql.get_session() as session:
+            return session
+
+    async def run():
+        async with pgsql.unit_of_work() as uow_session:
+            other = await asyncio.get_running_loop().create_task(background())
+            assert other is not uow_session
+
+    asyncio.run(run())
+    assert len(sessions) == 2
+    assert sessions[1].events == ["commit", "close"]
+
+
+def test_request_dependency_wires_unit_of_work_and_counts_checkouts(sessions, monkeypatch):
+    monkeypatch.setattr(settings, "DB_REQUEST_UNIT_OF_WORK", True)
+    metrics.reset()
+
+    router = APIRouter(dependencies=[Depends(request_unit_of_work, scope="function")])
+
+    @router.get("/two-daos")
+    async def two_daos():
+        async with pgsql.get_session() as a:
+            metrics._on_checkout(None, None, None)
+        async with pgsql.get_session() as b:
+            pass
+        return {"same": a is b}
+
+    @router.get("/no-db")
+    async def no_db():
+        return {}
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    assert client.get("/two-daos").json() == {"same": True}
+    assert client.get("/no-db").status_code == 200
+    assert sessions[0].events[-2:] == ["commit", "close"]
+    assert "savepoint" not in sessions[0].events
+    # 未访问数据库的请求 AsyncSession 不会签出连接
+    assert sessions[1].events == ["commit", "close"]
+
+    stats = metrics.snapshot()
+    assert stats["requests_total"] == 2
+    assert stats["checkouts_total"] == 1
+    assert stats["checkouts_per_request_histogram"] == {"<=0": 1, "<=1": 1}
+    metrics.reset()
+
+
+def test_request_dependency_can_be_disabled(sessions, monkeypatch):
+    monkeypatch.setattr(settings, "DB_REQUEST_UNIT_OF_WORK", False)
+
+    router = APIRouter(dependencies=[Depends(request_unit_of_work, scope="function")])
+
+    @router.get("/two-daos")
+    async def two_daos():
+        async with pgsql.get_session() as a:
+            pass
+        async with pgsql.get_session() as b:
+            pass
+        return {"same": a is b}
+
+    app = FastAPI()
+    app.include_router(router)
+    assert TestClient(app).get("/two-daos").json() == {"same": False}
+    assert len(sessions) == 2
+    metrics.reset()
@@ -0,0 +1,117 @@
+"""Unit tests — user_stats 计数表的读取与校正（UsersDAO.get_user_stats / count_by_role / reconcile_stats）。"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.expression import CompoundSelect, Delete, Insert
+
+from core.database.dao import users as users_dao
+from core.database.dao.users import UsersDAO
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalar(self):
+        return self._rows[0][0] if self._rows else None
+
+
+def _rows(source: str, counts: dict[tuple[str, str], int]) -> list:
+    return [SimpleNamespace(source=source, dimension=d, value=v, user_count=n) for (d, v), n in counts.items()]
+
+
+class _FakeSession:
+    """同一条 UNION ALL 返回 users 实际分布与 user_stats 当前内容，并记录执行的语句。"""
+
+    def __init__(self, actual, stored):
+        self.actual = actual
+        self.stored = stored
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        if isinstance(stmt, CompoundSelect):
+            return _FakeResult(_rows("actual", self.actual) + _rows("stored", self.stored))
+        return _FakeResult([])
+
+
+def test_get_user_stats_is_a_point_read_of_status_counters():
+    class _Session:
+        async def execute(self, stmt):
+            self.sql = _sql(stmt)
+            return _FakeResult([("normal", 5), ("banned", 2), ("", 1)])
+
+    session = _Session()
+    stats = asyncio.run(UsersDAO.get_user_stats(session))
+    assert stats == {"total": 8, "normal": 5, "disabled": 0, "banned": 2, "pending_deletion": 0}
+    assert "FROM user_stats" in session.sql and "users" not in session.sql.replace("user_stats", "")
+
+
+def test_count_by_role_reads_role_counter():
+    class _Session:
+        async def execute(self, stmt):
+            self.stmt = stmt
+            return _FakeResult([(3,)])
+
+    session = _Session()
+    assert asyncio.run(UsersDAO.count_by_role(session, "superadmin")) == 3
+    assert session.stmt.compile().params == {"dimension_1": "role", "value_1": "superadmin"}
+
+    class _Empty:
+        async def execute(self, stmt):
+            return _FakeResult([])
+
+    assert asyncio.run(UsersDAO.count_by_role(_Empty(), "superadmin")) == 0
+
+
+def _reconcile(monkeypatch, actual, stored):
+    session = _FakeSession(actual, stored)
+
+    @asynccontextmanager
+    async def fake_get_session(*args, **kwargs):
+        yield session
+
+    monkeypatch.setattr(users_dao, "get_session", fake_get_session)
+    return asyncio.run(UsersDAO.reconcile_stats()), session
+
+
+def test_reconcile_rewrites_counters_when_drifted(monkeypatch):
+    actual = {("status", "normal"): 4, ("status", ""): 1, ("role", "normal-user"): 5}
+    stored = {("status", "normal"): 6, ("status", "banned"): 1, ("role", "normal-user"): 5}
+
+    drift, session = _reconcile(monkeypatch, actual, stored)
+
+    assert drift == {("status", "normal"): 2, ("status", "banned"): 1, ("status", ""): -1}
+    # 实际分布与计数表在同一条语句中读取，不锁表
+    assert len(session.statements) == 2
+    snapshot = _sql(session.statements[0])
+    assert "LOCK" not in snapshot
+    assert "GROUP BY coalesce(users.current_status, '')" in snapshot
+    assert "GROUP BY coalesce(users.user_role, '')" in snapshot
+    assert "FROM user_stats" in snapshot
+
+    # 只对有偏差的项按主键顺序增量校正，不删除重建
+    upsert = session.statements[1]
+    assert isinstance(upsert, Insert)
+    sql = _sql(upsert)
+    assert "ON CONFLICT (dimension, value) DO UPDATE SET user_count = (user_stats.user_count + excluded.user_count)" in sql
+    params = upsert.compile().params
+    rows = [(params[f"dimension_m{i}"], params[f"value_m{i}"], params[f"user_count_m{i}"]) for i in range(3)]
+    assert rows == [("status", "", 1), ("status", "banned", -1), ("status", "normal", -2)]
+
+
+def test_reconcile_leaves_matching_counters_untouched(monkeypatch):
+    counts = {("status", "normal"): 4, ("role", "superadmin"): 2}
+    drift, session = _reconcile(monkeypatch, counts, dict(counts))
+    assert drift == {}
+    assert not any(isinstance(stmt, (Delete, Insert)) for stmt in session.statements)
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Any
+import json
+from typing import Any, Iterator
 
 
 class ApiClient:
@@ -38,12 +39,29 @@ class ApiClient:
         *,
         params: dict[str, Any] | None = None,
         json_data: dict[str, Any] | None = None,
+    ) -> Any:
+        resp = self._send(method, path, params=params, json_data=json_data)
+        if resp.status_code == 204:
+            return None
+        return resp.json()
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None,
+        content: Any = None,
+        content_type: str | None = None,
     ) -> Any:
         if not self.token:
             raise RuntimeError("尚未登录，请先调用 login()")
         headers = {"Authorization": f"Bearer {self.token}"}
+        if content_type:
+            headers["Content-Type"] = content_type
         resp = self._client_sync().request(
-            method, path, params=params, json=json_data, headers=headers
+            method, path, params=params, json=json_data, content=content, headers=headers
         )
         try:
             resp.raise_for_status()
@@ -53,16 +71,60 @@ class ApiClient:
             except Exception:
                 detail = resp.text
             raise RuntimeError(f"API 错误 ({resp.status_code}): {detail}") from exc
-        if resp.status_code == 204:
-            return None
-        return resp.json()
+        return resp
+
+    def stream_events(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """订阅 SSE 接口，逐条产出 ``data:`` 中的 JSON 对象（心跳注释被忽略）。"""
+        if not self.token:
+            raise RuntimeError("尚未登录，请先调用 login()")
+        headers = {"Authorization": f"Bearer {self.token}", "Accept": "text/event-stream"}
+        timeout = self._httpx.Timeout(30, read=None)
+        with self._client_sync().stream(
+            "GET", path, params=params, headers=headers, timeout=timeout
+        ) as resp:
+            if resp.status_code >= 400:
+                resp.read()
+                raise RuntimeError(f"API 错误 ({resp.status_code}): {resp.text}")
+            for line in resp.iter_lines():
+                if line.startswith("data:"):
+                    yield json.loads(line[len("data:"):].strip())
 
     def get(self, path: str, params: dict[str, Any] | None = None) -> Any:
         return self.request("GET", path, params=params)
 
+    def get_page(self, path: str, params: dict[str, Any] | None = None) -> tuple[Any, str | None]:
+        """GET 键集分页的列表接口，返回 ``(数据, 下一页游标)``（游标取自 X-Next-Cursor 响应头）。"""
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        resp = self._send("GET", path, params=params)
+        return resp.json(), resp.headers.get("X-Next-Cursor")
+
     def post(self, path: str, json_data: dict[str, Any] | None = None) -> Any:
         return self.request("POST", path, json_data=json_data)
 
+    def upload(
+        self,
+        path: str,
+        file_path: str,
+        content_type: str,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """以原始请求体 POST 本地文件（分块发送，不整体读入内存）。"""
+
+        def _chunks() -> Iterator[bytes]:
+            with open(file_path, "rb") as f:
+                while True:
+                    chunk = f.read(64 * 1024)
+                    if not chunk:
+                        return
+                    yield chunk
+
+        resp = self._send(
+            "POST", path, params=params, content=_chunks(), content_type=content_type
+        )
+        return resp.json()
+
     def patch(self, path: str, json_data: dict[str, Any] | None = None) -> Any:
         return self.request("PATCH", path, json_data=json_data)
 
@@ -9,6 +9,7 @@ from typing import Any
 from sqlalchemy import text
 
 from core.database.connection.pgsql import get_session
+from core.database.dao.base import Page, decode_cursor
 
 
 class DbClient:
@@ -36,10 +37,12 @@ class DbClient:
         role: str | None = None,
         limit: int = 20,
         offset: int = 0,
-    ) -> list[dict[str, Any]]:
+        cursor: str | None = None,
+    ) -> Page:
         from core.database.dao.users import UsersDAO
 
-        async with get_session() as session:
+        after_id, before_id = decode_cursor(cursor) if cursor else (None, None)
+        async with get_session(readonly=True) as session:
             return await UsersDAO.search_users(
                 session,
                 keyword=keyword,
@@ -47,6 +50,8 @@ class DbClient:
                 role=role,
                 limit=limit,
                 offset=offset,
+                after_id=after_id,
+                before_id=before_id,
             )
 
     async def count_users(
@@ -58,7 +63,7 @@ class DbClient:
     ) -> int:
         from core.database.dao.users import UsersDAO
 
-        async with get_session() as session:
+        async with get_session(readonly=True) as session:
             return await UsersDAO.count_users(
                 session, keyword=keyword, status=status, role=role
             )
@@ -114,6 +119,32 @@ class DbClient:
         dao = UsersDAO()
         return await dao.update(user_uuid, {"current_status": status_map[action]})
 
+    async def batch_set_user_status(
+        self, uuids: list[str], status: str
+    ) -> dict[str, Any]:
+        """与 POST /admin/users/batch-status 相同：单条 UPDATE，非 normal 时撤销 refresh token。
+
+        DB 模式不连接 Redis，用户认证缓存在 AUTH_USER_CACHE_TTL_SECONDS 内过期。
+        """
+        from core.database.dao.refresh_tokens import RefreshTokensDAO
+        from core.database.dao.users import UsersDAO
+        from core.security.rbac import Role
+
+        uuids = list(dict.fromkeys(uuids))
+        async with get_session() as session:
+            changed = await UsersDAO.batch_set_status(
+                session, uuids, status, protected_roles=(Role.SUPERADMIN.value,)
+            )
+        changed_uuids = {row["uuid"] for row in changed}
+        revoked = 0
+        if status != "normal":
+            revoked = await RefreshTokensDAO.revoke_all_for_users(list(changed_uuids))
+        return {
+            "updated": len(changed_uuids),
+            "skipped": [u for u in uuids if u not in changed_uuids],
+            "revoked_tokens": revoked,
+        }
+
     async def reset_password(
         self, user_uuid: str, new_password: str
     ) -> dict[str, Any] | None:
@@ -141,15 +172,19 @@ class DbClient:
         status: str | None = None,
         limit: int = 20,
         offset: int = 0,
-    ) -> list[dict[str, Any]]:
+        cursor: str | None = None,
+    ) -> Page:
         from core.database.dao.register_questions import RegisterQuestionsDAO
 
+        after_id, before_id = decode_cursor(cursor) if cursor else (None, None)
         return await RegisterQuestionsDAO.search_questions(
             keyword=keyword,
             question_type=question_type,
             status=status,
             limit=limit,
             offset=offset,
+            after_id=after_id,
+            before_id=before_id,
         )
 
     async def count_questions(
@@ -198,17 +233,21 @@ class DbClient:
     # 日志
     # ------------------------------------------------------------------
 
+    # DAO 返回 Record，CLI 输出（print_json / render_table）使用普通字典
+
     async def search_system_logs(self, **kwargs: Any) -> tuple[list[dict[str, Any]], int]:
         from core.database.dao.system_logs import SystemLogsDAO
 
-        return await SystemLogsDAO.search(**kwargs)
+        items, total = await SystemLogsDAO.search(**kwargs)
+        return [item.to_dict() for item in items], total
 
     async def search_personal_logs(
         self, **kwargs: Any
     ) -> tuple[list[dict[str, Any]], int]:
         from core.database.dao.personal_logs import PersonalLogsDAO
 
-        return await PersonalLogsDAO.search(**kwargs)
+        items, total = await PersonalLogsDAO.search(**kwargs)
+        return [item.to_dict() for item in items], total
 
 
 # ---------------------------------------------------------------------------
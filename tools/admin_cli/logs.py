@@ -34,6 +34,8 @@ def run_interactive(ctx: AdminContext) -> None:
         [
             ("1", "查询系统日志 (仅 superadmin)", lambda: query_system(ctx, None)),
             ("2", "查询个人日志", lambda: query_personal(ctx, None)),
+            ("3", "查询归档日志 (读取本地归档目录)", lambda: query_archive(ctx, None)),
+            ("4", "实时跟踪系统日志 (仅 superadmin)", lambda: tail_system(ctx, None)),
         ],
     )
 
@@ -141,6 +143,106 @@ def query_personal(ctx: AdminContext, sub: argparse.Namespace | None) -> None:
     _print_log_result(data)
 
 
+# ---------------------------------------------------------------------------
+# 归档日志
+# ---------------------------------------------------------------------------
+
+_ARCHIVE_TABLES: dict[str, str] = {
+    "system": "system_logs",
+    "personal": "personal_logs",
+    "illegal": "illegal_requests",
+}
+
+_ILLEGAL_COLUMNS: list[tuple[str, str]] = [
+    ("id", "ID"),
+    ("type", "类型"),
+    ("ip", "IP"),
+    ("path", "路径"),
+    ("user", "用户"),
+    ("happened_at", "时间"),
+]
+
+
+def query_archive(ctx: AdminContext, sub: argparse.Namespace | None) -> None:
+    """查询冷归档文件；过滤参数与在线日志查询一致，两种模式均直接读取本地归档目录。"""
+    from core.config import settings
+    from core.database.archive.log_archive import query_archive as _query
+
+    table = getattr(sub, "table", None) if sub else None
+    if not table:
+        table = prompt("归档来源 (system/personal/illegal)", default="system")
+    if table not in _ARCHIVE_TABLES:
+        raise ValueError(f"未知归档来源: {table}")
+    params = _collect_log_params(sub, kind="归档")
+    kwargs = build_log_db_kwargs(params)
+    user_uuid = getattr(sub, "user_uuid", None) if sub else None
+    if user_uuid:
+        kwargs["user_uuids"] = [user_uuid]
+    root = (getattr(sub, "archive_dir", None) if sub else None) or settings.LOG_ARCHIVE_DIR
+
+    items, total = _query(root, _ARCHIVE_TABLES[table], **kwargs)
+    print(f"共 {total} 条")
+    render_table(items, _ILLEGAL_COLUMNS if table == "illegal" else _LOG_COLUMNS)
+
+
+# ---------------------------------------------------------------------------
+# 实时跟踪
+# ---------------------------------------------------------------------------
+
+_TAIL_FILTERS: tuple[str, ...] = (
+    "event_type",
+    "log_type",
+    "status",
+    "severity",
+    "service_name",
+    "trace_id",
+    "client_ip",
+    "keyword",
+)
+
+
+def _print_tail_row(row: dict[str, Any]) -> None:
+    print(
+        f"{row.get('created_at', '')} [{row.get('severity', '')}] "
+        f"{row.get('event_type') or '-'} {row.get('status', '')} "
+        f"[{row.get('trace_id', '')}] {row.get('content', '')}"
+    )
+
+
+async def _tail_db(filters: dict[str, Any]) -> None:
+    """db 模式：在本进程内直接 LISTEN，复用服务端同一套过滤逻辑。"""
+    from core.helper.CustomLog.stream import log_stream_hub
+
+    subscription = log_stream_hub.subscribe(filters)
+    try:
+        while True:
+            _print_tail_row(await subscription.queue.get())
+    finally:
+        await log_stream_hub.unsubscribe(subscription)
+
+
+def tail_system(ctx: AdminContext, sub: argparse.Namespace | None) -> None:
+    if sub is not None:
+        filters = {k: getattr(sub, k, None) for k in _TAIL_FILTERS}
+    else:
+        print("--- 实时跟踪系统日志 (留空跳过对应字段，Ctrl+C 退出) ---")
+        filters = {
+            "event_type": prompt("事件类型") or None,
+            "severity": prompt("严重级别 (INFO/WARN/ERROR)") or None,
+            "keyword": prompt("内容关键词") or None,
+        }
+    filters = {k: v for k, v in filters.items() if v not in (None, "")}
+    try:
+        if ctx.mode == "api":
+            ctx.ensure_login()
+            for row in ctx.require_api().stream_events("/api/v1/logs/system/stream", filters):
+                _print_tail_row(row)
+        else:
+            run_async(_tail_db(filters))
+    except KeyboardInterrupt:
+        print("\n已停止跟踪")
+
+
 # ---------------------------------------------------------------------------
 # argparse 派发
 # ---------------------------------------------------------------------------
@@ -151,5 +253,9 @@ def dispatch(ctx: AdminContext, sub: argparse.Namespace) -> None:
         query_system(ctx, sub)
     elif sub.action == "personal":
         query_personal(ctx, sub)
+    elif sub.action == "archive":
+        query_archive(ctx, sub)
+    elif sub.action == "tail":
+        tail_system(ctx, sub)
     else:
         raise ValueError(f"未知 logs 子命令: {sub.action}")
@@ -15,6 +15,7 @@ def build_users_subparser() -> argparse.ArgumentParser:
     list_p.add_argument("--role", help="按角色筛选")
     list_p.add_argument("--limit", type=int, default=20)
     list_p.add_argument("--offset", type=int, default=0)
+    list_p.add_argument("--cursor", help="翻页游标（上一次列表输出的“下一页游标”）")
 
     get_p = sub.add_parser("get", help="查看用户详情")
     get_p.add_argument("uuid", nargs="?", help="用户 UUID")
@@ -39,6 +40,11 @@ def build_users_subparser() -> argparse.ArgumentParser:
         p = sub.add_parser(action, help=f"{action} 用户")
         p.add_argument("uuid", nargs="?", help="用户 UUID")
 
+    batch_p = sub.add_parser("batch-status", help="批量修改用户状态")
+    batch_p.add_argument("uuids", nargs="*", help="用户 UUID 列表")
+    batch_p.add_argument("--status", choices=("normal", "disabled", "banned"), help="目标状态")
+    batch_p.add_argument("--file", help="从文件读取 UUID（每行一个）")
+
     return parser
 
 
@@ -52,6 +58,7 @@ def build_questions_subparser() -> argparse.ArgumentParser:
     list_p.add_argument("--status", help="按状态筛选")
     list_p.add_argument("--limit", type=int, default=20)
     list_p.add_argument("--offset", type=int, default=0)
+    list_p.add_argument("--cursor", help="翻页游标（上一次列表输出的“下一页游标”）")
 
     get_p = sub.add_parser("get", help="查看题目详情")
     get_p.add_argument("uuid", nargs="?", help="题目 UUID")
@@ -66,6 +73,11 @@ def build_questions_subparser() -> argparse.ArgumentParser:
     delete_p = sub.add_parser("delete", help="删除题目")
     delete_p.add_argument("uuid", nargs="?", help="题目 UUID")
 
+    import_p = sub.add_parser("import", help="从 CSV / NDJSON 文件批量导入题目（仅 API 模式）")
+    import_p.add_argument("file", nargs="?", help="文件路径")
+    import_p.add_argument("--format", choices=["csv", "ndjson"], help="文件格式（默认按扩展名判断）")
+    import_p.add_argument("--atomic", action="store_true", help="任一行出错则整体不导入")
+
     return parser
 
 
@@ -73,7 +85,7 @@ def build_logs_subparser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="logs")
     sub = parser.add_subparsers(dest="action", required=True)
 
-    for name in ("system", "personal"):
+    for name in ("system", "personal", "archive"):
         p = sub.add_parser(name, help=f"查询{name}日志")
         p.add_argument("--event-type", help="事件类型")
         p.add_argument("--log-type", help="日志类型")
@@ -89,6 +101,25 @@ def build_logs_subparser() -> argparse.ArgumentParser:
 
     personal = sub.choices["personal"]  # type: ignore[index]
     personal.add_argument("--user-uuid", help="指定用户 UUID（仅 superadmin）")
+    archive = sub.choices["archive"]  # type: ignore[index]
+    archive.add_argument(
+        "--table",
+        choices=("system", "personal", "illegal"),
+        default="system",
+        help="归档来源表",
+    )
+    archive.add_argument("--user-uuid", help="指定用户 UUID（仅 personal）")
+    archive.add_argument("--archive-dir", help="归档目录（默认读取 LOG_ARCHIVE_DIR）")
+
+    tail = sub.add_parser("tail", help="实时跟踪新写入的系统日志（Ctrl+C 退出）")
+    tail.add_argument("--event-type", help="事件类型")
+    tail.add_argument("--log-type", help="日志类型")
+    tail.add_argument("--status", help="状态")
+    tail.add_argument("--severity", help="严重级别")
+    tail.add_argument("--service-name", help="服务名")
+    tail.add_argument("--trace-id", help="Trace ID")
+    tail.add_argument("--client-ip", help="客户端 IP")
+    tail.add_argument("--keyword", help="内容关键词")
     return parser
 
 
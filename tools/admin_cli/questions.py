@@ -34,6 +34,7 @@ def run_interactive(ctx: AdminContext) -> None:
             ("3", "创建题目", lambda: create_question(ctx, None)),
             ("4", "更新题目", lambda: update_question(ctx, None)),
             ("5", "删除题目", lambda: delete_question(ctx, None)),
+            ("6", "批量导入题目", lambda: import_questions(ctx, None)),
         ],
     )
 
@@ -45,25 +46,32 @@ def run_interactive(ctx: AdminContext) -> None:
 
 def list_questions(ctx: AdminContext, sub: argparse.Namespace | None) -> None:
     params = _collect_list_params(sub)
-    if ctx.mode == "api":
-        ctx.ensure_login()
-        data = ctx.require_api().get("/api/v1/admin/questions", params)
-        items = data if isinstance(data, list) else data.get("items", [])
-        total = data.get("total") if isinstance(data, dict) else None
-    else:
-        items = run_async(
-            ctx.require_db().list_questions(
-                keyword=params.get("keyword"),
-                question_type=params.get("type"),
-                status=params.get("status"),
-                limit=params.get("limit", 20),
-                offset=params.get("offset", 0),
+    while True:
+        if ctx.mode == "api":
+            ctx.ensure_login()
+            items, next_cursor = ctx.require_api().get_page("/api/v1/admin/questions", params)
+        else:
+            items = run_async(
+                ctx.require_db().list_questions(
+                    keyword=params.get("keyword"),
+                    question_type=params.get("type"),
+                    status=params.get("status"),
+                    limit=params.get("limit", 20),
+                    offset=params.get("offset", 0),
+                    cursor=params.get("cursor"),
+                )
             )
-        )
-        total = None
-    if total is not None:
-        print(f"共 {total} 条")
-    render_table(items, _QUESTION_COLUMNS)
+            next_cursor = items.next_cursor
+        render_table(items, _QUESTION_COLUMNS)
+        if not next_cursor:
+            return
+        # 命令行模式打印游标供 --cursor 续查；交互模式直接按游标翻页
+        if sub is not None:
+            print(f"下一页游标: {next_cursor}")
+            return
+        if not confirm("显示下一页？", default=True):
+            return
+        params = {**params, "cursor": next_cursor, "offset": 0}
 
 
 def _collect_list_params(sub: argparse.Namespace | None) -> dict[str, Any]:
@@ -85,6 +93,7 @@ def _collect_list_params(sub: argparse.Namespace | None) -> dict[str, Any]:
         "status": sub.status,
         "limit": sub.limit,
         "offset": sub.offset,
+        "cursor": getattr(sub, "cursor", None),
     }
 
 
@@ -237,6 +246,40 @@ def delete_question(ctx: AdminContext, sub: argparse.Namespace | None) -> None:
         print("删除成功" if ok else "删除失败或题目不存在")
 
 
+# ---------------------------------------------------------------------------
+# 批量导入
+# ---------------------------------------------------------------------------
+
+_IMPORT_CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def import_questions(ctx: AdminContext, sub: argparse.Namespace | None) -> None:
+    """上传 CSV / NDJSON 文件到 POST /admin/questions/import，由服务端逐行校验后分批写入。"""
+    if ctx.mode != "api":
+        print("批量导入需要服务端逐行校验，仅支持 API 模式（--mode api）")
+        return
+    path = getattr(sub, "file", None) if sub else None
+    if not path:
+        path = prompt("文件路径", required=True)
+    fmt = getattr(sub, "format", None) if sub else None
+    if not fmt:
+        fmt = "ndjson" if path.lower().endswith((".ndjson", ".jsonl")) else "csv"
+    atomic = bool(getattr(sub, "atomic", False)) if sub else confirm(
+        "任一行出错时整体不导入？", default=False
+    )
+
+    ctx.ensure_login()
+    data = ctx.require_api().upload(
+        "/api/v1/admin/questions/import",
+        path,
+        _IMPORT_CONTENT_TYPES[fmt],
+        params={"format": fmt, "atomic": str(atomic).lower()},
+    )
+    print(f"已导入 {data.get('inserted', 0)} 道题目，错误 {data.get('error_count', 0)} 行")
+    if data.get("errors"):
+        render_table(data["errors"], [("line", "行号"), ("error", "错误")])
+
+
 # ---------------------------------------------------------------------------
 # argparse 派发
 # ---------------------------------------------------------------------------
@@ -249,6 +292,7 @@ def dispatch(ctx: AdminContext, sub: argparse.Namespace) -> None:
         "create": create_question,
         "update": update_question,
         "delete": delete_question,
+        "import": import_questions,
     }.get(sub.action)
     if handler is None:
         raise ValueError(f"未知 questions 子命令: {sub.action}")
@@ -55,6 +55,7 @@ def run_interactive(ctx: AdminContext) -> None:
             ("5", "删除用户", lambda: delete_user(ctx, None)),
             ("6", "重置密码", lambda: reset_password(ctx, None)),
             ("7", "封禁/解封/禁用/启用", lambda: change_status(ctx)),
+            ("8", "批量修改状态", lambda: batch_status(ctx, None)),
         ],
     )
 
@@ -66,25 +67,32 @@ def run_interactive(ctx: AdminContext) -> None:
 
 def list_users(ctx: AdminContext, sub: argparse.Namespace | None) -> None:
     params = _collect_list_params(sub)
-    if ctx.mode == "api":
-        ctx.ensure_login()
-        data = ctx.require_api().get("/api/v1/admin/users", params)
-        items = data if isinstance(data, list) else data.get("items", [])
-        total = data.get("total") if isinstance(data, dict) else None
-    else:
-        items = run_async(
-            ctx.require_db().list_users(
-                keyword=params.get("keyword"),
-                status=params.get("status"),
-                role=params.get("role"),
-                limit=params.get("limit", 20),
-                offset=params.get("offset", 0),
+    while True:
+        if ctx.mode == "api":
+            ctx.ensure_login()
+            items, next_cursor = ctx.require_api().get_page("/api/v1/admin/users", params)
+        else:
+            items = run_async(
+                ctx.require_db().list_users(
+                    keyword=params.get("keyword"),
+                    status=params.get("status"),
+                    role=params.get("role"),
+                    limit=params.get("limit", 20),
+                    offset=params.get("offset", 0),
+                    cursor=params.get("cursor"),
+                )
             )
-        )
-        total = None
-    if total is not None:
-        print(f"共 {total} 条")
-    render_table(items, _USER_COLUMNS)
+            next_cursor = items.next_cursor
+        render_table(items, _USER_COLUMNS)
+        if not next_cursor:
+            return
+        # 命令行模式打印游标供 --cursor 续查；交互模式直接按游标翻页
+        if sub is not None:
+            print(f"下一页游标: {next_cursor}")
+            return
+        if not confirm("显示下一页？", default=True):
+            return
+        params = {**params, "cursor": next_cursor, "offset": 0}
 
 
 def _collect_list_params(sub: argparse.Namespace | None) -> dict[str, Any]:
@@ -107,6 +115,7 @@ def _collect_list_params(sub: argparse.Namespace | None) -> dict[str, Any]:
         "role": sub.role,
         "limit": sub.limit,
         "offset": sub.offset,
+        "cursor": getattr(sub, "cursor", None),
     }
 
 
@@ -326,6 +335,38 @@ def change_status(ctx: AdminContext) -> None:
     print(f"操作 {action} 成功")
 
 
+def batch_status(ctx: AdminContext, sub: argparse.Namespace | None) -> None:
+    """批量修改用户状态：UUID 来自命令行参数 / --file，缺失时交互式输入。"""
+    uuids = list(getattr(sub, "uuids", None) or []) if sub else []
+    path = getattr(sub, "file", None) if sub else None
+    if path:
+        with open(path, encoding="utf-8") as f:
+            uuids.extend(line.strip() for line in f if line.strip())
+    if not uuids:
+        print("--- 批量修改用户状态 ---")
+        raw = prompt("用户 UUID（逗号或空格分隔）", required=True)
+        uuids = [u for u in raw.replace(",", " ").split() if u]
+    target = getattr(sub, "status", None) if sub else None
+    if not target:
+        target = prompt_choice(
+            "目标状态:",
+            [("banned", "封禁"), ("disabled", "禁用"), ("normal", "正常")],
+        )
+    if sub is None and not confirm(f"确认将 {len(uuids)} 个用户的状态改为 {target}？", default=False):
+        print("已取消")
+        return
+
+    if ctx.mode == "api":
+        ctx.ensure_login()
+        data = ctx.require_api().post(
+            "/api/v1/admin/users/batch-status",
+            json_data={"uuids": uuids, "status": target},
+        )
+    else:
+        data = run_async(ctx.require_db().batch_set_user_status(uuids, target))
+    print_json(data)
+
+
 # ---------------------------------------------------------------------------
 # argparse 派发辅助
 # ---------------------------------------------------------------------------
@@ -345,6 +386,7 @@ def dispatch(ctx: AdminContext, sub: argparse.Namespace) -> None:
         "update": update_user,
         "delete": delete_user,
         "reset-password": reset_password,
+        "batch-status": batch_status,
     }.get(action)
     if handler is None:
         raise ValueError(f"未知 users 子命令: {action}")
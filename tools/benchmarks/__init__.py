@@ -0,0 +1 @@
+"""Performance benchmark scripts — one module per topic, run with ``python tools/benchmarks/<name>.py``."""
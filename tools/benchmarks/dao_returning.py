@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+BaseDAO 写操作往返次数与延迟对比（需要可连接的 PostgreSQL）。
+
+在临时表 bench_dao_rows 上分别执行 N 次 create / update / delete：
+  * legacy    — 旧实现：ORM add + flush + refresh / SELECT + setattr + flush + refresh / SELECT + delete
+  * returning — 当前 BaseDAO：单条 INSERT/UPDATE/DELETE ... RETURNING
+统计每次调用的 SQL 语句数（before_cursor_execute 事件）与平均耗时。
+
+用法:
+  python tools/benchmarks/dao_returning.py               # 默认每种操作 500 次
+  python tools/benchmarks/dao_returning.py --calls 2000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import Integer, Text, event, func, select, text
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.database.connection import pgsql
+from core.database.connection.pgsql import Base, dispose_engine, get_session
+from core.database.dao.base import BaseDAO
+
+_TABLE = "bench_dao_rows"
+
+
+class BenchRow(Base):
+    __tablename__ = _TABLE
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    uuid: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
+    name: Mapped[str | None] = mapped_column(Text)
+    current_status: Mapped[str | None] = mapped_column(Text, server_default="normal")
+    score: Mapped[int | None] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime | None] = mapped_column(TIMESTAMP, server_default=func.now())
+
+
+class ReturningDAO(BaseDAO):
+    MODEL = BenchRow
+
+
+class LegacyDAO(BaseDAO):
+    """旧版 create / update / delete 实现，仅用于对比。"""
+
+    MODEL = BenchRow
+
+    async def create(self, data):
+        obj = BenchRow(**self._data_to_kwargs(data))
+        async with get_session() as session:
+            session.add(obj)
+            await session.flush()
+            await session.refresh(obj)
+            return self._to_dict(obj)
+
+    async def update(self, uuid, data):
+        async with get_session() as session:
+            obj = (await session.scalars(select(BenchRow).where(BenchRow.uuid == uuid))).first()
+            if obj is None:
+                return None
+            for k, v in self._data_to_kwargs(data).items():
+                setattr(obj, k, v)
+            await session.flush()
+            await session.refresh(obj)
+            return self._to_dict(obj)
+
+    async def delete(self, uuid):
+        async with get_session() as session:
+            obj = (await session.scalars(select(BenchRow).where(BenchRow.uuid == uuid))).first()
+            if obj is None:
+                return False
+            await session.delete(obj)
+            return True
+
+
+class _StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+async def _measure(label, calls, counter, op):
+    counter.count = 0
+    start = time.perf_counter()
+    for i in range(calls):
+        await op(i)
+    elapsed = time.perf_counter() - start
+    # 每次调用还包含 BEGIN/COMMIT，由驱动自动发出，不计入语句数
+    print(f"  {label:<22} {counter.count / calls:5.2f} 条语句/次   {elapsed / calls * 1000:7.3f} ms/次")
+
+
+async def _run(dao, label, calls, counter):
+    uuids = [str(uuid.uuid4()) for _ in range(calls)]
+    print(f"\n[{label}]")
+    await _measure("create", calls, counter, lambda i: dao.create({"uuid": uuids[i], "name": f"n{i}"}))
+    await _measure("update", calls, counter, lambda i: dao.update(uuids[i], {"current_status": "banned"}))
+    await _measure("delete", calls, counter, lambda i: dao.delete(uuids[i]))
+
+
+async def main(calls: int) -> None:
+    async with get_session() as session:
+        await session.execute(text(f"DROP TABLE IF EXISTS {_TABLE}"))
+        await session.execute(text(f"""
+            CREATE TABLE {_TABLE} (
+                id SERIAL PRIMARY KEY,
+                uuid TEXT NOT NULL UNIQUE,
+                name TEXT,
+                current_status TEXT DEFAULT 'normal',
+                score INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+
+    counter = _StatementCounter()
+    event.listen(pgsql._get_engine().sync_engine, "before_cursor_execute", counter)
+
+    # 预热连接池
+    await _run(ReturningDAO(), "warmup", 20, counter)
+    await _run(LegacyDAO(), "legacy", calls, counter)
+    await _run(ReturningDAO(), "returning", calls, counter)
+
+    event.remove(pgsql._get_engine().sync_engine, "before_cursor_execute", counter)
+    async with get_session() as session:
+        await session.execute(text(f"DROP TABLE IF EXISTS {_TABLE}"))
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BaseDAO RETURNING 写操作对比")
+    parser.add_argument("--calls", type=int, default=500, help="每种操作的调用次数")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
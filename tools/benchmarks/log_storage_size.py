@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+日志字符串字典化的存储占用对比（需要可连接的 PostgreSQL）。
+
+在临时表中生成同一批模拟日志两份：
+  * plain    — user_agent / request_url / host_name / service_name 直接存文本（旧存储）
+  * interned — 以上四列只存 log_strings 风格字典表的整数 id（新存储）
+然后比较 pg_total_relation_size（含索引与 TOAST；interned 方案包含字典表本身）。
+
+用法:
+  python tools/benchmarks/log_storage_size.py                 # 默认 100000 行
+  python tools/benchmarks/log_storage_size.py --rows 500000
+  python tools/benchmarks/log_storage_size.py --keep          # 保留临时表便于手动检查
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import sys
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import text
+
+from core.database.connection.pgsql import dispose_engine, get_session
+
+_PLAIN = "bench_logs_plain"
+_INTERNED = "bench_logs_interned"
+_STRINGS = "bench_log_strings"
+
+_USER_AGENTS = [
+    f"Mozilla/5.0 ({os_}) AppleWebKit/537.36 (KHTML, like Gecko) {browser}"
+    for os_ in (
+        "Windows NT 10.0; Win64; x64",
+        "Macintosh; Intel Mac OS X 10_15_7",
+        "X11; Linux x86_64",
+        "iPhone; CPU iPhone OS 17_4 like Mac OS X",
+        "Linux; Android 14; Pixel 8",
+    )
+    for browser in (
+        "Chrome/124.0.0.0 Safari/537.36",
+        "Version/17.4 Mobile/15E148 Safari/604.1",
+        "Chrome/124.0.0.0 Mobile Safari/537.36 EdgA/124.0.0.0",
+        "Firefox/125.0",
+    )
+] + ["python-httpx/0.27.0", "curl/8.5.0"]
+
+_PATHS = [
+    "/api/v1/auth/login", "/api/v1/auth/refresh", "/api/v1/auth/logout",
+    "/api/v1/users/me", "/api/v1/users/me/profile", "/api/v1/users/register",
+    "/api/v1/users/register/sheet/request", "/api/v1/logs/system", "/api/v1/logs/personal",
+    "/api/v1/admin/users", "/api/v1/admin/questions", "/api/v1/admin/users/stats",
+]
+_URLS = [f"https://tinder.example.edu.cn{p}" for p in _PATHS] + [
+    f"https://tinder.example.edu.cn/api/v1/admin/users?limit={n}&offset={o}"
+    for n in (20, 50, 100) for o in range(0, 500, 100)
+]
+_HOSTS = [f"tinder-api-{i}.internal" for i in range(4)]
+_SERVICES = ["tinder-api", "tinder-cron", "tinder-admin-cli"]
+
+_KINDS = {
+    "user_agent": _USER_AGENTS,
+    "request_url": _URLS,
+    "host_name": _HOSTS,
+    "service_name": _SERVICES,
+}
+
+
+def _md5(value: str) -> str:
+    return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+async def _create_tables(session) -> None:
+    await session.execute(text(f"DROP TABLE IF EXISTS {_PLAIN}, {_INTERNED}, {_STRINGS}"))
+    common = """
+        id SERIAL PRIMARY KEY,
+        uuid TEXT NOT NULL UNIQUE,
+        log_level TEXT,
+        log_type TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        content TEXT,
+        event_type TEXT,
+        status TEXT,
+        trace_id TEXT,
+        client_ip TEXT
+    """
+    await session.execute(text(f"""
+        CREATE TABLE {_PLAIN} ({common},
+            user_agent TEXT, request_url TEXT, host_name TEXT, service_name TEXT)
+    """))
+    await session.execute(text(f"""
+        CREATE TABLE {_INTERNED} ({common},
+            user_agent_id INTEGER, request_url_id INTEGER, host_name_id INTEGER, service_name_id INTEGER)
+    """))
+    await session.execute(text(f"""
+        CREATE TABLE {_STRINGS} (
+            id SERIAL PRIMARY KEY,
+            kind TEXT NOT NULL,
+            value TEXT NOT NULL,
+            value_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (kind, value_hash)
+        )
+    """))
+
+
+async def _seed(session, rows: int, chunk: int = 2000) -> None:
+    string_ids: dict[tuple[str, str], int] = {}
+    for kind, pool in _KINDS.items():
+        for value in pool:
+            string_id = await session.scalar(
+                text(f"INSERT INTO {_STRINGS} (kind, value, value_hash) VALUES (:k, :v, :h) RETURNING id"),
+                {"k": kind, "v": value, "h": _md5(value)},
+            )
+            string_ids[(kind, value)] = string_id
+
+    rng = random.Random(42)
+    for start in range(0, rows, chunk):
+        plain_batch, interned_batch = [], []
+        for _ in range(min(chunk, rows - start)):
+            base = {
+                "uuid": str(uuid.uuid4()),
+                "log_level": rng.choice(["INFO", "SUCCESS", "WARNING"]),
+                "log_type": rng.choice(["auth", "admin", "firewall"]),
+                "content": f"[Auth] 用户登录 user={uuid.uuid4()}",
+                "event_type": rng.choice(["LOGIN", "LOGOUT", "REFRESH"]),
+                "status": "SUCCESS",
+                "trace_id": str(uuid.uuid4()),
+                "client_ip": f"10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)}",
+            }
+            strings = {kind: rng.choice(pool) for kind, pool in _KINDS.items()}
+            plain_batch.append({**base, **strings})
+            interned_batch.append({
+                **base,
+                **{f"{kind}_id": string_ids[(kind, value)] for kind, value in strings.items()},
+            })
+
+        await session.execute(text(f"""
+            INSERT INTO {_PLAIN} (uuid, log_level, log_type, content, event_type, status, trace_id,
+                                  client_ip, user_agent, request_url, host_name, service_name)
+            VALUES (:uuid, :log_level, :log_type, :content, :event_type, :status, :trace_id,
+                    :client_ip, :user_agent, :request_url, :host_name, :service_name)
+        """), plain_batch)
+        await session.execute(text(f"""
+            INSERT INTO {_INTERNED} (uuid, log_level, log_type, content, event_type, status, trace_id,
+                                     client_ip, user_agent_id, request_url_id, host_name_id, service_name_id)
+            VALUES (:uuid, :log_level, :log_type, :content, :event_type, :status, :trace_id,
+                    :client_ip, :user_agent_id, :request_url_id, :host_name_id, :service_name_id)
+        """), interned_batch)
+
+
+async def _size(session, table: str) -> int:
+    return int(await session.scalar(text("SELECT pg_total_relation_size(:t)"), {"t": table}))
+
+
+def _fmt(size: int) -> str:
+    return f"{size / 1024 / 1024:8.2f} MiB"
+
+
+async def main(rows: int, keep: bool) -> None:
+    async with get_session() as session:
+        await _create_tables(session)
+    async with get_session() as session:
+        await _seed(session, rows)
+
+    async with get_session() as session:
+        plain = await _size(session, _PLAIN)
+        interned = await _size(session, _INTERNED)
+        strings = await _size(session, _STRINGS)
+
+    print(f"\n日志行数: {rows}")
+    print(f"  plain    (文本列)           {_fmt(plain)}")
+    print(f"  interned (id 列)            {_fmt(interned)}")
+    print(f"  + 字典表 {_STRINGS:<18} {_fmt(strings)}")
+    total = interned + strings
+    print(f"  interned 合计               {_fmt(total)}  ({total / plain:.1%} of plain)")
+
+    if not keep:
+        async with get_session() as session:
+            await session.execute(text(f"DROP TABLE IF EXISTS {_PLAIN}, {_INTERNED}, {_STRINGS}"))
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="日志字符串字典化存储占用对比")
+    parser.add_argument("--rows", type=int, default=100000, help="模拟日志行数")
+    parser.add_argument("--keep", action="store_true", help="保留临时表")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.keep))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+请求级工作单元前后对比：注册与登录流程（需要可连接的 PostgreSQL 与 Redis，且题库中有足够的启用题目）。
+
+在进程内通过 ASGI 直接调用 /api/v1 路由，分别在 DB_REQUEST_UNIT_OF_WORK 关闭 / 开启时执行 N 轮：
+  * register  — POST /users/register/sheet/request → POST /users/register → POST /users/register/complete
+  * login     — POST /auth/login
+统计每个接口的平均连接池签出次数（core.database.connection.metrics）与平均耗时。
+基准期间在进程内放宽注册 / 登录限流配置，结束后删除创建的用户与 refresh token。
+
+用法:
+  python tools/benchmarks/request_unit_of_work.py             # 默认每种模式 50 轮
+  python tools/benchmarks/request_unit_of_work.py --rounds 200
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from core.config import settings
+from core.database.connection import metrics
+from core.database.connection.pgsql import dispose_engine, get_session
+from core.database.connection.redis import redis_conn
+from modules.api.v1 import users as users_v1
+from modules.api.v1.router import router as api_v1_router
+
+_PASSWORD = hashlib.sha256(hashlib.sha256(b"bench-password").hexdigest().encode()).hexdigest()
+
+_RELAXED_LIMITS = {
+    "REG_MAX_IP_ATTEMPTS_PER_DAY": 10 ** 9,
+    "REG_MAX_SHEETS_PER_IP_PER_DAY": 10 ** 9,
+    "REG_MAX_NAME_ATTEMPTS_PER_DAY": 10 ** 9,
+    "LOGIN_MAX_ATTEMPTS_PER_IP_PER_MINUTE": 10 ** 9,
+    "LOGIN_MAX_ATTEMPTS_PER_USERNAME_PER_MINUTE": 10 ** 9,
+}
+
+
+class _Endpoint:
+    def __init__(self):
+        self.calls = 0
+        self.elapsed = 0.0
+        self.checkouts = 0
+
+
+async def _call(client, stats, name, method, url, **kwargs):
+    before = metrics.snapshot()
+    start = time.perf_counter()
+    resp = await client.request(method, url, **kwargs)
+    elapsed = time.perf_counter() - start
+    if resp.status_code >= 400:
+        raise RuntimeError(f"{name} 失败: {resp.status_code} {resp.text}")
+    after = metrics.snapshot()
+    entry = stats.setdefault(name, _Endpoint())
+    entry.calls += 1
+    entry.elapsed += elapsed
+    entry.checkouts += after["request_checkouts_total"] - before["request_checkouts_total"]
+    return resp.json()
+
+
+async def _register(client, stats, redis, tag: str) -> tuple[str, str]:
+    prefix = settings.API_V1_PREFIX
+    sheet = await _call(client, stats, "sheet/request", "POST", f"{prefix}/users/register/sheet/request")
+    stored = json.loads(redis.get(f"{users_v1._REDIS_QSHEET_PREFIX}{sheet['sheet_id']}"))
+    answers = [{"question_uuid": k, "answer": v} for k, v in stored["answers"].items()]
+    registered = await _call(client, stats, "register", "POST", f"{prefix}/users/register", json={
+        "nickname": tag,
+        "real_name": tag,
+        "classtype": "university",
+        "class": "bench",
+        "sheet_id": sheet["sheet_id"],
+        "answers": answers,
+    })
+    await _call(
+        client, stats, "register/complete", "POST", f"{prefix}/users/register/complete",
+        json={"username": tag, "password": _PASSWORD},
+        headers={"Authorization": f"Bearer {registered['temp_token']}"},
+    )
+    return registered["user"]["uuid"], tag
+
+
+async def _run_mode(app, enabled: bool, rounds: int, redis, created: list[str]) -> None:
+    settings.DB_REQUEST_UNIT_OF_WORK = enabled
+    stats: dict[str, _Endpoint] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        usernames = []
+        for _ in range(rounds):
+            user_uuid, username = await _register(client, stats, redis, f"bench_{uuid.uuid4().hex[:12]}")
+            created.append(user_uuid)
+            usernames.append(username)
+        for username in usernames:
+            await _call(
+                client, stats, "login", "POST", f"{settings.API_V1_PREFIX}/auth/login",
+                json={"username": username, "password": _PASSWORD},
+            )
+
+    print(f"\n[unit of work {'on' if enabled else 'off'}]  {rounds} 轮")
+    for name, entry in stats.items():
+        print(
+            f"  {name:<20} {entry.checkouts / entry.calls:5.2f} 次签出/请求"
+            f"   {entry.elapsed / entry.calls * 1000:7.2f} ms/请求"
+        )
+
+
+async def main(rounds: int) -> None:
+    redis_conn.start()
+    redis = redis_conn.get_client()
+    if redis is None:
+        print("Redis 不可用，注册流程无法执行")
+        redis_conn.stop()
+        return
+    for key, value in _RELAXED_LIMITS.items():
+        setattr(settings, key, value)
+
+    app = FastAPI()
+    app.include_router(api_v1_router, prefix=settings.API_V1_PREFIX)
+
+    created: list[str] = []
+    try:
+        # 预热连接池
+        await _run_mode(app, True, 3, redis, created)
+        await _run_mode(app, False, rounds, redis, created)
+        await _run_mode(app, True, rounds, redis, created)
+    finally:
+        # 等待 CustomLog 后台写入完成，再清理数据
+        await asyncio.sleep(1)
+        if created:
+            async with get_session() as session:
+                await session.execute(
+                    text("DELETE FROM refresh_tokens WHERE user_uuid = ANY(:uuids)"), {"uuids": created}
+                )
+                await session.execute(text("DELETE FROM users WHERE uuid = ANY(:uuids)"), {"uuids": created})
+        await dispose_engine()
+        redis_conn.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="请求级工作单元注册 / 登录对比")
+    parser.add_argument("--rounds", type=int, default=50, help="每种模式的注册 + 登录轮数")
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+行 → 字典转换微基准（纯 Python，无需数据库）。
+
+对同一批 system_logs 行（默认 10000 行）比较：
+  * reflect   — 旧版 _to_dict：逐行遍历 __mapper__.column_attrs 并做 isinstance(Text) 判断
+  * object    — row_converter(model).from_object(ORM 实例)
+  * core row  — row_converter(model).from_rows(Core 行元组)，即 DAO 读路径当前使用的方式
+
+注意：core row 方案在真实查询中还省去了 ORM 实例化与 identity map 登记，
+该部分开销不在本基准中体现（需数据库），实际收益大于此处数字。
+
+用法:
+  python tools/benchmarks/row_conversion.py
+  python tools/benchmarks/row_conversion.py --rows 50000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import Text
+
+from core.database.dao.base import row_converter
+from core.database.dao.system_logs import SystemLog
+
+
+def _reflect_to_dict(obj):
+    """旧实现，仅用于对比。"""
+    result = {}
+    for col_prop in type(obj).__mapper__.column_attrs:
+        col = col_prop.columns[0]
+        value = getattr(obj, col_prop.key)
+        if value is not None and isinstance(col.type, Text) and not isinstance(value, str):
+            value = str(value)
+        result[col.name] = value
+    return result
+
+
+def _make_objects(rows: int) -> list[SystemLog]:
+    now = datetime.now()
+    return [
+        SystemLog(
+            id=i,
+            uuid=str(uuid.uuid4()),
+            log_level="INFO",
+            log_type="auth",
+            content=f"[Auth] 用户登录 #{i}",
+            event_type="LOGIN",
+            status="SUCCESS",
+            severity="INFO",
+            trace_id=str(uuid.uuid4()),
+            client_ip="10.0.0.1",
+            request_method="POST",
+            created_at=now,
+        )
+        for i in range(rows)
+    ]
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rows: int, repeat: int) -> None:
+    converter = row_converter(SystemLog)
+    objects = _make_objects(rows)
+    tuples = [tuple(converter.from_object(o).values()) for o in objects]
+
+    results = {
+        "reflect": _best(lambda: [_reflect_to_dict(o) for o in objects], repeat),
+        "object": _best(lambda: [converter.from_object(o) for o in objects], repeat),
+        "core row": _best(lambda: converter.from_rows(tuples), repeat),
+    }
+
+    print(f"\n{rows} 行 × {len(converter.names)} 列（取 {repeat} 次中最快）")
+    base = results["reflect"]
+    for label, elapsed in results.items():
+        print(f"  {label:<10} {elapsed * 1000:8.2f} ms   {base / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="行转换微基准")
+    parser.add_argument("--rows", type=int, default=10000, help="行数")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
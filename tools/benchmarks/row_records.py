@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+字典 vs Record（__slots__ 行记录）微基准（纯 Python，无需数据库）。
+
+对三种热点数据分别比较 row_converter 的 from_rows（字典）与 records（Record）：
+  * auth user     — UsersDAO "auth" 投影（get_current_user 及其缓存）
+  * refresh token — refresh_tokens 全部列（RefreshTokensDAO.find_active）
+  * system log    — system_logs 去掉 *_id 的列（SystemLogsDAO.search）
+
+输出：
+  * 每对象内存（tracemalloc 统计的净分配 / 对象数，含容器本身，不含共享的值对象）
+  * 构造耗时（由 Core 行元组批量构造）
+  * get_current_user 缓存：序列化后的字节数，以及 json.loads + 构造的耗时
+
+用法:
+  python tools/benchmarks/row_records.py
+  python tools/benchmarks/row_records.py --rows 50000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.database.dao.base import row_converter
+from core.database.dao.log_strings import select_resolved
+from core.database.dao.refresh_tokens import RefreshToken
+from core.database.dao.system_logs import SystemLog
+from core.database.dao.users import UsersDAO
+
+
+def _auth_rows(rows: int) -> list[tuple]:
+    return [
+        (str(uuid.uuid4()), f"user{i}", f"昵称{i}", f"姓名{i}", "高一(1)班", "highschool", "normal", "normal-user", True)
+        for i in range(rows)
+    ]
+
+
+def _token_rows(rows: int) -> list[tuple]:
+    now = datetime.now()
+    return [(i, str(uuid.uuid4()), uuid.uuid4().hex * 2, now, None) for i in range(rows)]
+
+
+def _log_rows(converter, rows: int) -> list[tuple]:
+    now = datetime.now()
+    sample = {
+        "log_level": "INFO",
+        "log_type": "auth",
+        "event_type": "LOGIN",
+        "status": "SUCCESS",
+        "severity": "INFO",
+        "client_ip": "10.0.0.1",
+        "request_method": "POST",
+        "user_agent": "Mozilla/5.0",
+        "request_url": "/api/v1/auth/login",
+        "created_at": now,
+    }
+    return [
+        tuple(
+            i if name == "id"
+            else str(uuid.uuid4()) if name in ("uuid", "trace_id")
+            else f"[Auth] 用户登录 #{i}" if name == "content"
+            else sample.get(name)
+            for name in converter.names
+        )
+        for i in range(rows)
+    ]
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _bytes_per_object(build, rows: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / rows
+
+
+def _compare(label: str, converter, tuples: list[tuple], repeat: int) -> None:
+    converter.record_type  # 预先生成类，不计入构造耗时
+    rows = len(tuples)
+    dict_mem = _bytes_per_object(lambda: converter.from_rows(tuples), rows)
+    record_mem = _bytes_per_object(lambda: converter.records(tuples), rows)
+    dict_time = _best(lambda: converter.from_rows(tuples), repeat)
+    record_time = _best(lambda: converter.records(tuples), repeat)
+
+    print(f"\n[{label}]  {rows} 行 × {len(converter.names)} 列")
+    print(f"  dict    {dict_mem:7.1f} B/对象   {dict_time * 1000:8.2f} ms")
+    print(
+        f"  record  {record_mem:7.1f} B/对象   {record_time * 1000:8.2f} ms"
+        f"   内存 {record_mem / dict_mem:4.0%}，耗时 {record_time / dict_time:4.0%}"
+    )
+
+
+def _compare_cache(tuples: list[tuple], repeat: int) -> None:
+    converter = UsersDAO._converter("auth")
+    record_type = converter.record_type
+    dicts = converter.from_rows(tuples)
+    records = converter.records(tuples)
+    dict_payloads = [json.dumps(d, ensure_ascii=False, default=str) for d in dicts]
+    record_payloads = [r.dumps() for r in records]
+
+    dict_bytes = sum(len(p.encode()) for p in dict_payloads) / len(tuples)
+    record_bytes = sum(len(p.encode()) for p in record_payloads) / len(tuples)
+    dict_time = _best(lambda: [json.loads(p) for p in dict_payloads], repeat)
+    record_time = _best(lambda: [record_type.loads(p) for p in record_payloads], repeat)
+
+    print(f"\n[auth user 缓存]  {len(tuples)} 条")
+    print(f"  dict JSON    {dict_bytes:6.1f} B/条   读取 {dict_time * 1000:8.2f} ms")
+    print(f"  record JSON  {record_bytes:6.1f} B/条   读取 {record_time * 1000:8.2f} ms")
+
+
+def main(rows: int, repeat: int) -> None:
+    auth_rows = _auth_rows(rows)
+    _compare("auth user", UsersDAO._converter("auth"), auth_rows, repeat)
+    _compare("refresh token", row_converter(RefreshToken), _token_rows(rows), repeat)
+    _, log_converter = select_resolved(SystemLog)
+    _compare("system log", log_converter, _log_rows(log_converter, rows), repeat)
+    _compare_cache(auth_rows, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="字典 vs Record 微基准")
+    parser.add_argument("--rows", type=int, default=10000, help="行数")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
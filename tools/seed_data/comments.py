@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.comments import CommentsDAO
 from tools.seed_data.base import (
     USER_UUIDS, fake, _choice, _maybe, _input_int,
     ensure_users_exist,
@@ -52,18 +53,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO comments
-                    (uuid, status, comment_place, author, content,
-                     ip_address, user_agent, location)
-                VALUES
-                    (:uuid, :status, :comment_place, :author, :content,
-                     :ip_address, :user_agent, :location)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await CommentsDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 条评论")
     except Exception as e:
@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.favourites import FavouritesDAO
 from tools.seed_data.base import (
     USER_UUIDS, _input_int,
     ensure_users_exist,
@@ -36,14 +37,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO favourites (uuid, user_uuid, types)
-                VALUES (:uuid, :user_uuid, :types)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await FavouritesDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 条收藏记录")
     except Exception as e:
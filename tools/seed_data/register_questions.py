@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.register_questions import RegisterQuestionsDAO
 from tools.seed_data.base import (
     USER_UUIDS, fake, _choice, _maybe, _input_int,
     ensure_users_exist,
@@ -52,18 +53,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO register_questions
-                    (uuid, question, answer, created_by, question_level,
-                     question_type, current_status, options)
-                VALUES
-                    (:uuid, :question, :answer, :created_by, :question_level,
-                     :question_type, :current_status, :options)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await RegisterQuestionsDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 个注册问题")
     except Exception as e:
@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.relations import RelationsDAO
 from tools.seed_data.base import _input_int
 
 TYPES = ["tag_song", "tag_saying", "tag_user", "user_song"]
@@ -28,13 +29,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO relations (tags_uuid, related_uuid, relation_type)
-                VALUES (:tags_uuid, :related_uuid, :relation_type)
-            """),
-            values,
-        )
+        await RelationsDAO().bulk_create(values, session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 条关联关系")
     except Exception as e:
@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.song_arrangements import SongArrangementsDAO
 from tools.seed_data.base import (
     USER_UUIDS, fake, _input_int,
     ensure_users_exist,
@@ -36,16 +37,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO song_arrangements
-                    (uuid, week_number, content, created_by, likes)
-                VALUES
-                    (:uuid, :week_number, :content, :created_by, :likes)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await SongArrangementsDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 个歌单安排")
     except Exception as e:
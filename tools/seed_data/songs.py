@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.songs import SongsDAO
 from tools.seed_data.base import (
     USER_UUIDS, fake, _choice, _maybe, _input_int,
     ensure_users_exist,
@@ -50,16 +51,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO songs (uuid, name, singer, platform, status, vote,
-                                   recommend_by, recommend_words, reason)
-                VALUES (:uuid, :name, :singer, :platform, :status, :vote,
-                        :recommend_by, :recommend_words, :reason)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await SongsDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 首歌曲")
     except Exception as e:
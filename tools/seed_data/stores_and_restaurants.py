@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.stores_and_restaurants import StoresAndRestaurantsDAO
 from tools.seed_data.base import _choice, _input_int
 
 PREFIXES = ["老王", "小李", "阿明", "大壮", "小美", "阿强", "刘叔", "陈姐", "张哥", "胖哥"]
@@ -34,16 +35,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO stores_and_restaurants
-                    (uuid, name, location, likes, ratings, status)
-                VALUES
-                    (:uuid, :name, :location, :likes, :ratings, :status)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await StoresAndRestaurantsDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 间商铺")
     except Exception as e:
@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.tags import TagsDAO
 from tools.seed_data.base import (
     USER_UUIDS, _choice, _maybe, _input_int,
     ensure_users_exist,
@@ -38,14 +39,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO tags (uuid, tag_name, created_by, current_status)
-                VALUES (:uuid, :tag_name, :created_by, :current_status)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await TagsDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 个标签")
     except Exception as e:
@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.tasks import TasksDAO
 from tools.seed_data.base import (
     USER_UUIDS, fake, _choice, _input_int,
     ensure_users_exist,
@@ -38,14 +39,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO tasks (uuid, content, parts, assigner, status)
-                VALUES (:uuid, :content, :parts, :assigner, :status)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await TasksDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 个任务")
     except Exception as e:
@@ -4,6 +4,8 @@ import random
 import uuid
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.users import UsersDAO
 from tools.seed_data.base import (
     USER_UUIDS, fake, _choice, _maybe, _input_int, _input_bool,
     default_password, _double_sha256,
@@ -92,42 +94,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
             print(f"⚠️  所有用户已存在，跳过插入")
             return
 
-        sql_params = [
-            {
-                "uuid": d["uuid"],
-                "username": d["username"],
-                "email": d["email"],
-                "avatar_url": d["avatar_url"],
-                "nickname": d["nickname"],
-                "real_name": d["real_name"],
-                "class_": d["class_"],
-                "class_type": d["class_type"],
-                "current_status": d["current_status"],
-                "score": d["score"],
-                "user_role": d["user_role"],
-                "title": d["title"],
-                "views": d["views"],
-                "is_verified": d["is_verified"],
-                "password": d["password"],
-                "invited_by": d["invited_by"],
-            }
-            for d in users_to_insert
-        ]
-
-        await session.execute(
-            text("""
-                INSERT INTO users
-                    (uuid, username, email, avatar_url, nickname, real_name, class,
-                     class_type, current_status, score, user_role, title,
-                     views, is_verified, password, invited_by)
-                VALUES
-                    (:uuid, :username, :email, :avatar_url, :nickname, :real_name, :class_,
-                     :class_type, :current_status, :score, :user_role, :title,
-                     :views, :is_verified, :password, :invited_by)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            sql_params,
-        )
+        await UsersDAO().bulk_upsert(users_to_insert, ["uuid"], [], session=session)
         await session.commit()
 
         new_uuids = [u["uuid"] for u in users_to_insert]
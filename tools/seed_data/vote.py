@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.vote import VoteDAO
 from tools.seed_data.base import (
     USER_UUIDS, _input_int,
     ensure_users_exist,
@@ -37,14 +38,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO vote (uuid, vote_type, committed_by, content)
-                VALUES (:uuid, :vote_type, :committed_by, :content)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await VoteDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 条投票记录")
     except Exception as e:
@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.wall_looking_for import WallLookingForDAO
 from tools.seed_data.base import (
     USER_UUIDS, _choice, _input_int,
     ensure_users_exist,
@@ -47,18 +48,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO wall_looking_for
-                    (uuid, current_status, real_status, seeker,
-                     looking_for_type, helper, clues)
-                VALUES
-                    (:uuid, :current_status, :real_status, :seeker,
-                     :looking_for_type, :helper, :clues)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await WallLookingForDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 条寻物/寻人记录")
     except Exception as e:
@@ -2,8 +2,9 @@
 
 import random
 import uuid
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.dao.wall_sayings import WallSayingsDAO
 from tools.seed_data.base import (
     USER_UUIDS, fake, _choice, _maybe, _input_int,
     ensure_users_exist,
@@ -59,18 +60,7 @@ async def generate(session: AsyncSession, interactive: bool = True) -> None:
         })
 
     try:
-        await session.execute(
-            text("""
-                INSERT INTO wall_sayings
-                    (uuid, author_uuid, content, saying_status, saying_type,
-                     likes, share_count, views)
-                VALUES
-                    (:uuid, :author_uuid, :content, :saying_status, :saying_type,
-                     :likes, :share_count, :views)
-                ON CONFLICT (uuid) DO NOTHING
-            """),
-            values,
-        )
+        await WallSayingsDAO().bulk_upsert(values, ["uuid"], [], session=session)
         await session.commit()
         print(f"✅ 成功插入 {count} 条说说")
     except Exception as e: